@@ -6,25 +6,83 @@ Provides simple HTTP-like interface for React/TypeScript frontend
 
 import os
 import json
+import hashlib
 import logging
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (.env is a local-dev convenience; Lambda config comes from the function)
+if not os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+    from dotenv import load_dotenv
+    load_dotenv()
 
-# Import backend services
-from lambdas.league_data import LeagueDataFetcher
-from lambdas.humor_context import HumorGenerator
-from lambdas.insights import InsightsGenerator
-from services.analytics import RiftRewindAnalytics
-from services.aws_clients import upload_to_s3, download_from_s3
+# Import backend services. The fetcher, analytics and AI generators (requests,
+# Bedrock) are imported inside the routes that use them so health/regions/
+# session reads don't pay for them on a cold start.
+from services.aws_clients import upload_to_s3, download_from_s3, check_s3_object_exists
 from services.constants import REGIONS, VALID_PLATFORMS
+from services.http_response import request_header
 from services.session_cache import SessionCacheManager
+from services.slide_payloads import (SLIDE_COUNT, SlideDeck, build_slide_payload, load_slide_bundle,
+                                     load_slide_payload, slides_since)
+from services.tracing import traced, timing_summary
+
+
+# Friend group rewinds (POST /api/rewind/group)
+MIN_GROUP_SIZE = 2
+MAX_GROUP_SIZE = 5
+
+
+def _normalize_region(val: str) -> str:
+    """
+    Defensive normalization of region values coming from varied clients.
+    Accepts common malformed values like 'TR.riotgamesapi', 'TR', or uppercased codes.
+    """
+    if not val:
+        return val
+    v = val.strip()
+    # Already a known platform
+    if v in VALID_PLATFORMS:
+        return v
+    low = v.lower()
+    if low in VALID_PLATFORMS:
+        return low
+    # If the value looks like 'tr.riotgamesapi' -> take first segment 'tr'
+    if '.' in low:
+        first = low.split('.')[0]
+        if first in VALID_PLATFORMS:
+            return first
+        # handle short country codes like 'tr' -> 'tr1'
+        if len(first) <= 3 and (first + '1') in VALID_PLATFORMS:
+            return first + '1'
+    # Try prefix/suffix matching against known platforms
+    for p in VALID_PLATFORMS:
+        if low.startswith(p) or p.startswith(low):
+            return p
+    # Fallback to original
+    return v
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 specifies for it).
+    
+    Args:
+        if_none_match: Request header value ('*' or a list of entity tags)
+        etag: Current entity tag, quoted
+    
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in tags)
 
 
 class RiftRewindAPI:
@@ -46,13 +104,17 @@ class RiftRewindAPI:
         """
         Create API Gateway-style response.
         
+        The body stays a native structure: the transport serializes it once
+        (services.http_response: to_api_gateway in Lambda, encode_response
+        in server.py).
+        
         Args:
             status_code: HTTP status code
-            body: Response body (will be JSON serialized)
+            body: Response body (dict/list, or None for an empty body)
             headers: Optional response headers
         
         Returns:
-            API Gateway response format
+            API Gateway response format, with an unserialized body
         """
         default_headers = {
             'Content-Type': 'application/json',
@@ -67,7 +129,7 @@ class RiftRewindAPI:
         return {
             'statusCode': status_code,
             'headers': default_headers,
-            'body': json.dumps(body)
+            'body': body
         }
     
     def get_regions(self) -> Dict[str, Any]:
@@ -119,13 +181,27 @@ class RiftRewindAPI:
             status_data['player'] = player_info
         if fetcher_data:
             status_data['fetcherData'] = fetcher_data
+        timings = timing_summary()
+        if timings:
+            status_data['timings'] = timings
         
         status_key = f"sessions/{session_id}/status.json"
         upload_to_s3(status_key, status_data)
         logger.info(f" Status updated: {status} - {message}")
     
+    @traced('process_rewind', level=logging.INFO, root=True)
     def _process_rewind_async(self, session_id: str, game_name: str, tag_line: str, region: str, fetcher_data: dict):
         """Background processing of rewind data"""
+        from lambdas.league_data import LeagueDataFetcher
+        from lambdas.humor_context import HumorGenerator
+        from lambdas.insights import InsightsGenerator
+        from services.analytics import RiftRewindAnalytics
+        from services.population_stats import get_population_index, record_player
+        from services.analytics_prefetch import start_prefetch, join_prefetch
+        from services.analytics_cache import (
+            analytics_fingerprint, load_cached_analytics, save_cached_analytics, refresh_context
+        )
+
         try:
             # Update status: analyzing
             self._update_session_status(session_id, 'analyzing', 'Analyzing your match history...')
@@ -150,35 +226,60 @@ class RiftRewindAPI:
                 self._update_session_status(session_id, 'error', error_message)
                 return
             
-            # NO SAMPLING - Analyze ALL matches
-            matches_to_fetch = match_ids
-            fetcher.data['samplingMetadata'] = {
-                'totalMatches': total_matches,
-                'analyzedMatches': total_matches,
-                'samplePercentage': 100.0,
-                'strategy': 'full_analysis'
-            }
-            logger.info(f"Analyzing ALL {total_matches} ranked matches (no sampling)")
-            
-            matches = fetcher.fetch_match_details_batch(matches_to_fetch, region, use_sampling=False)
-            
-            # Calculate analytics
-            logger.info(" Calculating analytics...")
-            raw_data = {
-                'account': fetcher.data.get('account', {}),
-                'summoner': fetcher.data.get('summoner', {}),
-                'ranked': fetcher.data.get('ranked', {}),
-                'matches': matches,
-                'puuid': puuid
-            }
+            # Same history and rank as an earlier run: serve its analytics without
+            # fetching match details
+            fingerprint = analytics_fingerprint(fetcher_data, match_ids)
+            analytics = load_cached_analytics(fingerprint)
+            if analytics is not None:
+                analytics = refresh_context(analytics, fetcher_data, region, fetcher.riot_client)
+            else:
+                # Ladder position/icons don't depend on matches: prefetch them while
+                # the details are fetched (a cache hit only re-reads the ladder position)
+                prefetch = start_prefetch(fetcher_data, region, fetcher.riot_client)
+                
+                # NO SAMPLING - Analyze ALL matches
+                matches_to_fetch = match_ids
+                fetcher.data['samplingMetadata'] = {
+                    'totalMatches': total_matches,
+                    'analyzedMatches': total_matches,
+                    'samplePercentage': 100.0,
+                    'strategy': 'full_analysis'
+                }
+                logger.info(f"Analyzing ALL {total_matches} ranked matches (no sampling)")
             
-            analytics_engine = RiftRewindAnalytics(raw_data)
-            analytics = analytics_engine.calculate_all()
+                matches = fetcher.fetch_match_details_batch(matches_to_fetch, region, use_sampling=False)
+            
+                # Calculate analytics
+                logger.info(" Calculating analytics...")
+                raw_data = {
+                    'account': fetcher.data.get('account', {}),
+                    'summoner': fetcher.data.get('summoner', {}),
+                    'ranked': fetcher.data.get('ranked', {}),
+                    'matches': matches,
+                    'puuid': puuid,
+                    'metadata': {'region': region},
+                    'prefetched': join_prefetch(prefetch)
+                }
+            
+                population = get_population_index()
+                analytics_engine = RiftRewindAnalytics(raw_data, population=population)
+                analytics = analytics_engine.calculate_all()
+                save_cached_analytics(fingerprint, analytics)
+            
+                # Add this player to the population for future sessions (once per season)
+                if population is not None:
+                    try:
+                        tier = analytics_engine.get_ranked_journey().get('tier', 'UNRANKED')
+                        record_player(population, puuid, analytics_engine.population_metrics(), tier, region)
+                    except Exception as e:
+                        logger.warning(f" Failed to record population stats: {e}")
             
             # Upload analytics to S3
             analytics_key = f"sessions/{session_id}/analytics.json"
             upload_to_s3(analytics_key, analytics)
             logger.info(f" Analytics uploaded to S3")
+            deck = SlideDeck(session_id)
+            deck.write(analytics)
             
             # Update status: generating humor
             self._update_session_status(session_id, 'generating', 'Generating personalized insights...')
@@ -187,6 +288,7 @@ class RiftRewindAPI:
             logger.info(" Generating AI humor for all slides...")
             humor_generator = HumorGenerator()
             humor_slides = list(range(2, 16))
+            humor_by_slide = {}
             
             import time
             for idx, slide_num in enumerate(humor_slides):
@@ -194,7 +296,8 @@ class RiftRewindAPI:
                     if idx > 0:
                         time.sleep(4)
                     
-                    humor_generator.generate(session_id, slide_num)
+                    humor_by_slide[slide_num] = humor_generator.generate(session_id, slide_num)
+                    deck.write(analytics, humor_by_slide, slides=[slide_num])
                     logger.info(f"   Slide {slide_num} humor generated")
                 except Exception as e:
                     logger.warning(f"    Slide {slide_num} humor failed: {e}")
@@ -220,10 +323,12 @@ class RiftRewindAPI:
                     
                     # Re-upload analytics with insights
                     upload_to_s3(analytics_key, analytics)
+                    deck.write(analytics, humor_by_slide, slides=[10, 11])
                     logger.info(" Insights integrated into analytics")
                     
             except Exception as e:
                 logger.error(f" Insights generation failed: {e}")
+            deck.finish()
             
             # Collect all humor for caching
             humor_data = {}
@@ -257,7 +362,7 @@ class RiftRewindAPI:
             self.cache_manager.save_session_to_cache(
                 game_name, tag_line, region,
                 session_id, analytics, humor_data, player_info,
-                len(matches_to_fetch), total_matches
+                len(match_ids), total_matches
             )
             logger.info(" Session saved to cache")
             
@@ -271,6 +376,7 @@ class RiftRewindAPI:
             traceback.print_exc()
             self._update_session_status(session_id, 'error', str(e))
     
+    @traced('start_rewind', level=logging.INFO, root=True)
     def start_rewind(self, game_name: str, tag_line: str, region: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         POST /api/rewind
@@ -292,33 +398,6 @@ class RiftRewindAPI:
                     'error': 'Missing required fields: gameName, tagLine, region'
                 })
 
-            # Defensive normalization of region values coming from varied clients
-            # Accept common malformed values like 'TR.riotgamesapi', 'TR', or uppercased codes
-            def _normalize_region(val: str) -> str:
-                if not val:
-                    return val
-                v = val.strip()
-                # Already a known platform
-                if v in VALID_PLATFORMS:
-                    return v
-                low = v.lower()
-                if low in VALID_PLATFORMS:
-                    return low
-                # If the value looks like 'tr.riotgamesapi' -> take first segment 'tr'
-                if '.' in low:
-                    first = low.split('.')[0]
-                    if first in VALID_PLATFORMS:
-                        return first
-                    # handle short country codes like 'tr' -> 'tr1'
-                    if len(first) <= 3 and (first + '1') in VALID_PLATFORMS:
-                        return first + '1'
-                # Try prefix/suffix matching against known platforms
-                for p in VALID_PLATFORMS:
-                    if low.startswith(p) or p.startswith(low):
-                        return p
-                # Fallback to original
-                return v
-
             region = _normalize_region(region)
             
             # Check cache first (unless force refresh)
@@ -344,6 +423,7 @@ class RiftRewindAPI:
             logger.info(f" Session ID: {session_id}")
             
             # Step 1: Quick account lookup to confirm player exists
+            from lambdas.league_data import LeagueDataFetcher
             fetcher = LeagueDataFetcher()
             
             logger.info(f" Looking up account for {game_name}#{tag_line}-{region}")
@@ -425,6 +505,157 @@ class RiftRewindAPI:
                 'error': f'Internal server error: {str(e)}'
             })
     
+    @traced('start_group_rewind', level=logging.INFO, root=True)
+    def start_group_rewind(self, players: list, region: str) -> Dict[str, Any]:
+        """
+        POST /api/rewind/group
+        Start rewinds for a friend group. Games the members played together are
+        fetched once and shared; each member still gets their own session.
+        
+        Args:
+            players: 2-5 Riot IDs as [{'gameName', 'tagLine'}, ...]
+            region: Platform region code shared by the group
+        
+        Returns:
+            Group ID, status and each member's session ID
+        """
+        try:
+            if not region or not isinstance(players, list) or not MIN_GROUP_SIZE <= len(players) <= MAX_GROUP_SIZE:
+                return self.create_response(400, {
+                    'error': f'Provide region and {MIN_GROUP_SIZE}-{MAX_GROUP_SIZE} players (gameName, tagLine)'
+                })
+            if not all(isinstance(p, dict) and p.get('gameName') and p.get('tagLine') for p in players):
+                return self.create_response(400, {
+                    'error': 'Every player needs gameName and tagLine'
+                })
+            
+            region = _normalize_region(region)
+            
+            import uuid
+            from lambdas.league_data import LeagueDataFetcher
+            from services.analytics_prefetch import profile_icon_url
+            group_id = str(uuid.uuid4())
+            
+            # Look up every member first so a typo fails the group before any work starts
+            members = []
+            seen_puuids = set()
+            for player in players:
+                fetcher = LeagueDataFetcher()
+                account_data = fetcher.fetch_account_data(player['gameName'], player['tagLine'], region)
+                puuid = account_data['puuid']
+                if puuid in seen_puuids:
+                    continue
+                seen_puuids.add(puuid)
+                fetcher.fetch_summoner_data(puuid, region)
+                fetcher.fetch_ranked_info(puuid, region)
+                members.append((player['gameName'], player['tagLine'], fetcher))
+            
+            member_events = []
+            member_info = []
+            for game_name, tag_line, fetcher in members:
+                session_id = str(uuid.uuid4())
+                profile_icon_id = fetcher.data['summoner']['profileIconId']
+                player_info = {
+                    'gameName': game_name,
+                    'tagLine': tag_line,
+                    'region': region,
+                    'summonerLevel': fetcher.data['summoner']['summonerLevel'],
+                    'profileIconId': profile_icon_id,
+                    'profileIconUrl': profile_icon_url(profile_icon_id),
+                    'rank': fetcher.data.get('ranked', {}).get('tier', 'UNRANKED')
+                }
+                self._update_session_status(session_id, 'found', 'Found your squad! Analyzing your match history...', player_info, fetcher.data)
+                
+                raw_key = f"sessions/{session_id}/raw_data.json"
+                upload_to_s3(raw_key, fetcher.data)
+                member_events.append({
+                    'session_id': session_id,
+                    'raw_data_s3_key': raw_key,
+                    'game_name': game_name,
+                    'tag_line': tag_line,
+                })
+                member_info.append({'sessionId': session_id, 'player': player_info})
+            
+            import datetime
+            upload_to_s3(f"groups/{group_id}/group.json", {
+                'groupId': group_id,
+                'region': region,
+                'members': member_info,
+                'status': 'found',
+                'message': 'Found your squad!',
+                'createdAt': datetime.datetime.now().isoformat()
+            })
+            
+            # One processor invocation for the whole group
+            try:
+                import boto3
+                lambda_client = boto3.client('lambda')
+                processor_name = os.getenv('PROCESSOR_LAMBDA_NAME', 'rift-rewind-processor')
+                lambda_client.invoke(
+                    FunctionName=processor_name,
+                    InvocationType='Event',
+                    Payload=json.dumps({
+                        'group_id': group_id,
+                        'region': region,
+                        'members': member_events,
+                    }).encode('utf-8')
+                )
+                logger.info(f" Started async group processor for group {group_id} ({len(member_events)} members)")
+            except Exception as e:
+                logger.error(f"Failed to invoke processor Lambda: {e}")
+            
+            return self.create_response(200, {
+                'groupId': group_id,
+                'status': 'found',
+                'members': member_info
+            })
+        
+        except ValueError as e:
+            return self.create_response(400, {
+                'error': str(e)
+            })
+        except Exception as e:
+            return self.create_response(500, {
+                'error': f'Internal server error: {str(e)}'
+            })
+    
+    def get_group(self, group_id: str) -> Dict[str, Any]:
+        """
+        GET /api/rewind/group/{groupId}
+        Group status (from the member sessions while they're processed),
+        member sessions and (once fetched) group stats
+        
+        Args:
+            group_id: Group ID from start_group_rewind
+        
+        Returns:
+            Group manifest plus 'stats' when available
+        """
+        try:
+            manifest_str = download_from_s3(f"groups/{group_id}/group.json")
+            if not manifest_str:
+                return self.create_response(404, {
+                    'error': 'Group not found'
+                })
+            group = json.loads(manifest_str)
+            if group.get('status') == 'analyzing':
+                # Each member's session runs in its own processor invocation
+                from services.group_stats import group_status
+                member_status = {}
+                for member in group.get('members', []):
+                    status_str = download_from_s3(f"sessions/{member['sessionId']}/status.json")
+                    member_status[member['sessionId']] = json.loads(status_str).get('status') if status_str else None
+                group['memberStatus'] = member_status
+                group['status'], group['message'] = group_status(member_status)
+            stats_str = download_from_s3(f"groups/{group_id}/stats.json")
+            if stats_str:
+                group['stats'] = json.loads(stats_str)
+            return self.create_response(200, group)
+        except Exception as e:
+            return self.create_response(500, {
+                'error': f'Internal server error: {str(e)}'
+            })
+    
     def get_session(self, session_id: str, game_name: str = None, tag_line: str = None, region: str = None) -> Dict[str, Any]:
         """
         GET /api/rewind/{sessionId}
@@ -448,13 +679,20 @@ class RiftRewindAPI:
                 
                 # If still processing, return status update
                 if current_status in ['searching', 'found', 'analyzing', 'generating']:
-                    return self.create_response(200, {
+                    body = {
                         'sessionId': session_id,
                         'status': current_status,
                         'message': status_data.get('message', ''),
                         'player': status_data.get('player', {}),
                         'fromCache': False
-                    })
+                    }
+                    # Progressive fetch: approximate slides while the rest is fetched
+                    if status_data.get('preview'):
+                        preview_str = download_from_s3(f"sessions/{session_id}/analytics_preview.json")
+                        if preview_str:
+                            body['analytics'] = json.loads(preview_str)
+                            body['approximate'] = status_data['preview']
+                    return self.create_response(200, body)
                 
                 # If error, return error status
                 if current_status == 'error':
@@ -576,6 +814,28 @@ class RiftRewindAPI:
                 'error': f'Failed to fetch session: {str(e)}'
             })
     
+    def _slide_sections(self, session_id: str, slide_number: int) -> Optional[Dict[str, Any]]:
+        """
+        The analytics sections a slide reads, before analytics.json exists, as
+        persisted by the processor. Never computed here: the processor's
+        sections use its prefetched ladder and icon inputs, which raw_data
+        doesn't carry.
+        
+        Args:
+            session_id: Session ID
+            slide_number: Slide number
+        
+        Returns:
+            Section key -> value, or None until the processor has stored them all
+        """
+        from services.lazy_analytics import SectionStore, sections_for_slide
+        
+        keys = sections_for_slide(slide_number)
+        if not keys or slide_number == 1:  # Slide 1 also needs playerInfo (preview)
+            return None
+        sections = SectionStore(session_id).load(keys)
+        return sections if len(sections) == len(keys) else None
+    
     def get_slide(self, session_id: str, slide_number: int) -> Dict[str, Any]:
         """
         GET /api/rewind/{sessionId}/slide/{slideNumber}
@@ -594,91 +854,129 @@ class RiftRewindAPI:
                     'error': 'Slide number must be between 1 and 15'
                 })
             
-            # Download analytics
-            analytics_str = download_from_s3(f"sessions/{session_id}/analytics.json")
-            if not analytics_str:
-                return self.create_response(404, {
-                    'error': 'Session not found'
-                })
-            
-            analytics = json.loads(analytics_str)
-            
-            # Map slide number to analytics key
-            slide_keys = {
-                1: None,  # Player details - no analytics
-                2: 'slide2_timeSpent',
-                3: 'slide3_favoriteChampions',
-                4: 'slide4_bestMatch',
-                5: 'slide5_kda',
-                6: 'slide6_rankedJourney',
-                7: 'slide7_visionScore',
-                8: 'slide8_championPool',
-                9: 'slide9_duoPartner',
-                10: 'slide10_11_analysis',
-                11: 'slide10_11_analysis',
-                12: 'slide12_progress',
-                13: 'slide13_achievements',
-                14: 'slide14_percentile',
-                15: None  # Final recap - uses multiple analytics
-            }
+            # Materialized by the processor: data, humor and headline in one object
+            payload = load_slide_payload(session_id, slide_number)
+            if payload:
+                return self.create_response(200, payload)
             
-            slide_data = {}
-            
-            if slide_number == 1:
-                # Player details from analytics (raw_data is deleted after processing)
-                player_info = analytics.get('playerInfo', {})
-                slide_data = {
-                    'account': {
-                        'gameName': player_info.get('gameName'),
-                        'tagLine': player_info.get('tagLine')
-                    },
-                    'summoner': {
-                        'summonerLevel': player_info.get('summonerLevel'),
-                        'profileIconId': player_info.get('profileIconId'),
-                        'profileIconUrl': player_info.get('profileIconUrl')
-                    },
-                    'ranked': analytics.get('slide6_rankedJourney', {})
-                }
-            elif slide_number == 15:
-                # Final recap uses multiple analytics
-                slide_data = {
-                    'timeSpent': analytics.get('slide2_timeSpent', {}),
-                    'rankedJourney': analytics.get('slide6_rankedJourney', {}),
-                    'favoriteChampions': analytics.get('slide3_favoriteChampions', [])
-                }
-            else:
-                # Regular slide
-                slide_key = slide_keys.get(slide_number)
-                slide_data = analytics.get(slide_key, {})
+            # Otherwise build it: from analytics.json, else this slide's sections,
+            # else the approximate preview of a progressive fetch
+            analytics_str = download_from_s3(f"sessions/{session_id}/analytics.json")
+            analytics = json.loads(analytics_str) if analytics_str else self._slide_sections(session_id, slide_number)
+            if analytics is None:
+                preview_str = download_from_s3(f"sessions/{session_id}/analytics_preview.json")
+                if not preview_str:
+                    if check_s3_object_exists(f"sessions/{session_id}/status.json"):
+                        # Processing, nothing for this slide yet
+                        return self.create_response(202, {
+                            'status': 'processing',
+                            'message': 'Slide not ready yet'
+                        })
+                    return self.create_response(404, {
+                        'error': 'Session not found'
+                    })
+                analytics = json.loads(preview_str)
             
             # Try to get humor (may not exist for all slides yet)
-            humor_text = None
+            humor = None
             if slide_number > 1:  # Slides 2-15 have humor
                 humor_str = download_from_s3(f"sessions/{session_id}/humor/slide_{slide_number}.json")
                 if humor_str:
-                    humor_data = json.loads(humor_str)
-                    humor_text = humor_data.get('humorText')
-                    headline = humor_data.get('headline')
-                    
-                    # Inject AI-generated headline into slide data if present
-                    if headline:
-                        if slide_number == 10: # Strengths
-                            slide_data['strengths'] = [headline]
-                        elif slide_number == 11: # Weaknesses
-                            slide_data['weaknesses'] = [headline]
+                    humor = json.loads(humor_str)
             
-            return self.create_response(200, {
-                'sessionId': session_id,
-                'slideNumber': slide_number,
-                'data': slide_data,
-                'humor': humor_text
-            })
+            return self.create_response(200, build_slide_payload(session_id, slide_number, analytics, humor))
         
         except Exception as e:
             return self.create_response(500, {
                 'error': f'Failed to fetch slide: {str(e)}'
             })
-    
+
+    def _assemble_slides(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        All slides of a session without a SlideDeck bundle (processed before
+        decks were written, or still at the preview stage), built like get_slide.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Bundle-shaped body with version 0 (unversioned), or None if not found
+        """
+        humor_by_slide = {}
+        analytics_str = download_from_s3(f"sessions/{session_id}/analytics.json")
+        if analytics_str:
+            analytics = json.loads(analytics_str)
+            for slide_num in range(2, SLIDE_COUNT + 1):
+                humor_str = download_from_s3(f"sessions/{session_id}/humor/slide_{slide_num}.json")
+                if humor_str:
+                    humor_by_slide[slide_num] = json.loads(humor_str)
+            status_str = download_from_s3(f"sessions/{session_id}/status.json")
+            complete = bool(status_str) and json.loads(status_str).get('status') == 'complete'
+        else:
+            preview_str = download_from_s3(f"sessions/{session_id}/analytics_preview.json")
+            if not preview_str:
+                return None
+            analytics = json.loads(preview_str)
+            complete = False
+
+        return {
+            'sessionId': session_id,
+            'version': 0,
+            'complete': complete,
+            'slides': [build_slide_payload(session_id, n, analytics, humor_by_slide.get(n))
+                       for n in range(1, SLIDE_COUNT + 1)]
+        }
+
+    def get_slides(self, session_id: str, since: Optional[int] = None,
+                   if_none_match: Optional[str] = None) -> Dict[str, Any]:
+        """
+        GET /api/rewind/{sessionId}/slides
+        Every slide payload in one response, with a strong ETag of the deck
+        version ("<version>-<since>" for a `since` subset): a repeat view with
+        If-None-Match gets an empty 304, and a client polling while humor
+        arrives passes `since` to get only the slides written after the
+        version it holds.
+
+        Args:
+            session_id: Session ID
+            since: Deck version the client already has (optional)
+            if_none_match: If-None-Match request header (optional)
+
+        Returns:
+            {'sessionId', 'version', 'complete', 'slides'} or 304
+        """
+        try:
+            bundle = load_slide_bundle(session_id)
+            if bundle:
+                # A `since` subset is a different representation of the same
+                # version, so it gets its own tag
+                etag = (f'"{bundle["version"]}"' if since is None
+                        else f'"{bundle["version"]}-{since}"')
+                bundle['slides'] = slides_since(bundle, since)
+            else:
+                # Unversioned: `since` can't apply, the ETag is the content's
+                bundle = self._assemble_slides(session_id)
+                if bundle is None:
+                    return self.create_response(404, {
+                        'error': 'Session not found'
+                    })
+                digest = hashlib.sha256(json.dumps(bundle, sort_keys=True).encode('utf-8')).hexdigest()
+                etag = f'"0-{digest[:16]}"'
+
+            headers = {
+                'ETag': etag,
+                'Cache-Control': 'no-cache',
+                'Access-Control-Expose-Headers': 'ETag'
+            }
+            if _etag_matches(if_none_match, etag):
+                return self.create_response(304, None, headers)
+            return self.create_response(200, bundle, headers)
+
+        except Exception as e:
+            return self.create_response(500, {
+                'error': f'Failed to fetch slides: {str(e)}'
+            })
+
     def check_cache(self, game_name: str, tag_line: str, region: str) -> Dict[str, Any]:
         """
         GET /api/cache/check
@@ -743,7 +1041,8 @@ class RiftRewindAPI:
 
 
 # Convenience functions for direct use
-def handle_request(method: str, path: str, body: Optional[Dict] = None) -> Dict[str, Any]:
+def handle_request(method: str, path: str, body: Optional[Dict] = None,
+                   query: Optional[Dict] = None, headers: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Handle API request (mimics API Gateway)
     
@@ -751,9 +1050,11 @@ def handle_request(method: str, path: str, body: Optional[Dict] = None) -> Dict[
         method: HTTP method (GET, POST)
         path: Request path
         body: Request body for POST
+        query: Query string parameters
+        headers: Request headers
     
     Returns:
-        API response
+        API response (native body; see services.http_response)
     """
     api = RiftRewindAPI()
     
@@ -772,10 +1073,28 @@ def handle_request(method: str, path: str, body: Optional[Dict] = None) -> Dict[
         
         return api.start_rewind(game_name, tag_line, region)
     
+    elif method == 'POST' and path == '/api/rewind/group':
+        if not body:
+            return api.create_response(400, {'error': 'Request body required'})
+        
+        return api.start_group_rewind(body.get('players', []), body.get('region', ''))
+    
+    elif method == 'GET' and path.startswith('/api/rewind/group/'):
+        parts = path.split('/')
+        if len(parts) == 5:  # /api/rewind/group/{groupId}
+            return api.get_group(parts[4])
+    
     elif method == 'GET' and path.startswith('/api/rewind/'):
         parts = path.split('/')
         if len(parts) == 4:  # /api/rewind/{sessionId}
             return api.get_session(parts[3])
+        elif len(parts) == 5 and parts[4] == 'slides':  # /api/rewind/{sessionId}/slides
+            query = query or {}
+            try:
+                since = int(query['since']) if query.get('since') else None
+            except ValueError:
+                return api.create_response(400, {'error': 'Invalid since version'})
+            return api.get_slides(parts[3], since, request_header(headers, 'If-None-Match'))
         elif len(parts) == 6 and parts[4] == 'slide':  # /api/rewind/{sessionId}/slide/{slideNumber}
             try:
                 slide_number = int(parts[5])
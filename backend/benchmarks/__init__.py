@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for the Rift Rewind backend. Run from backend/, e.g.
+``python -m benchmarks.pipeline run``. Not packaged into the Lambdas.
+"""
@@ -0,0 +1,183 @@
+"""
+Match Decode Micro-Benchmark
+============================
+Compares ways of turning raw Match-V5 response bytes into the slim records
+kept by the pipeline (decode + match_projection.project_match):
+
+    serial    one thread
+    thread    10 threads (what _get_matches_parallel does today)
+    process   10 threads handing bytes to a process pool, which decodes and
+              projects so only the slim record is pickled back
+
+each with the stdlib json and orjson (if installed).
+
+Payloads are 1000 synthetic matches by default; --record/--payloads save and
+replay a fixed set so runs are comparable across machines and commits.
+
+Usage (from backend/):
+    python -m benchmarks.decode
+    python -m benchmarks.decode --record /tmp/payloads.jsonl
+    python -m benchmarks.decode --payloads /tmp/payloads.jsonl --processes 4 --output decode.json
+"""
+
+import argparse
+import concurrent.futures
+import functools
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, Any, List, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from services.match_projection import project_match
+
+DECODERS = {'json': json.loads}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+FETCH_THREADS = 10
+
+
+def _work(decoder: str, puuid: str, project: bool, data: bytes) -> Any:
+    # Module-level so it pickles into the process pool
+    decoded = DECODERS[decoder](data)
+    return project_match(decoded, puuid) if project else decoded
+
+
+def generate_payloads(count: int, seed: int) -> Tuple[str, List[bytes]]:
+    """
+    Build `count` compact Match-V5 payloads for one synthetic player.
+
+    Returns:
+        (puuid, payload bytes)
+    """
+    from stubs.synthetic_history import SyntheticWorld
+
+    world = SyntheticWorld(seed=seed)
+    player = world.add_player('DecodeBench', 'BNCH', 'na1', match_count=count)
+    payloads = [json.dumps(world.match_payload(match_id), separators=(',', ':')).encode('utf-8')
+                for _, match_id, _ in player.history[:count]]
+    return player.puuid, payloads
+
+
+def save_payloads(path: str, puuid: str, payloads: List[bytes]):
+    with open(path, 'wb') as f:
+        f.write(json.dumps({'puuid': puuid, 'count': len(payloads)}).encode('utf-8') + b'\n')
+        for payload in payloads:
+            f.write(payload + b'\n')
+
+
+def load_payloads(path: str) -> Tuple[str, List[bytes]]:
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline())
+        payloads = [line.rstrip(b'\n') for line in f if line.strip()]
+    return header['puuid'], payloads
+
+
+def run_mode(where: str, decoder: str, puuid: str, payloads: List[bytes], project: bool,
+             processes: int) -> float:
+    """
+    Decode all payloads once.
+
+    Returns:
+        Elapsed seconds
+    """
+    work = functools.partial(_work, decoder, puuid, project)
+
+    if where == 'serial':
+        start = time.perf_counter()
+        for payload in payloads:
+            work(payload)
+        return time.perf_counter() - start
+
+    if where == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_THREADS) as threads:
+            start = time.perf_counter()
+            list(threads.map(work, payloads))
+            return time.perf_counter() - start
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_THREADS) as threads:
+        # Warm the workers so process start-up isn't counted
+        list(pool.map(work, payloads[:processes]))
+        start = time.perf_counter()
+        list(threads.map(lambda payload: pool.submit(work, payload).result(), payloads))
+        return time.perf_counter() - start
+
+
+def run(puuid: str, payloads: List[bytes], repeat: int, processes: int, project: bool) -> Dict[str, Any]:
+    total_bytes = sum(len(p) for p in payloads)
+    modes = [(where, decoder) for where in ('serial', 'thread', 'process') for decoder in DECODERS]
+    results = {}
+    for where, decoder in modes:
+        timings = [run_mode(where, decoder, puuid, payloads, project, processes) for _ in range(repeat)]
+        elapsed = statistics.median(timings)
+        results[f'{where}-{decoder}'] = {
+            'seconds': round(elapsed, 4),
+            'usPerPayload': round(elapsed / len(payloads) * 1e6, 1),
+            'payloadsPerSecond': round(len(payloads) / elapsed, 1),
+            'mbPerSecond': round(total_bytes / elapsed / 1e6, 1),
+        }
+
+    reference = results['thread-json']['seconds']
+    for result in results.values():
+        result['speedupVsThreadJson'] = round(reference / result['seconds'], 2)
+
+    return {
+        'suite': 'decode',
+        'python': sys.version.split()[0],
+        'cpus': os.cpu_count(),
+        'payloads': len(payloads),
+        'avgPayloadKB': round(total_bytes / len(payloads) / 1024, 1),
+        'project': project,
+        'processes': processes,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Match decode micro-benchmark')
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1337)
+    parser.add_argument('--payloads', help='Replay payloads recorded with --record')
+    parser.add_argument('--record', help='Write the generated payloads here and exit')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument('--no-project', action='store_true', help='Decode only, skip projection')
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args()
+
+    if args.payloads:
+        puuid, payloads = load_payloads(args.payloads)
+    else:
+        puuid, payloads = generate_payloads(args.count, args.seed)
+    if args.record:
+        save_payloads(args.record, puuid, payloads)
+        print(f"Recorded {len(payloads)} payloads to {args.record}")
+        return 0
+
+    result = run(puuid, payloads, args.repeat, args.processes, not args.no_project)
+    print(f"{result['payloads']} payloads, {result['avgPayloadKB']} KB avg, {result['cpus']} CPU(s), "
+          f"{'decode + project' if result['project'] else 'decode only'}, "
+          f"{result['processes']} processes, median of {result['repeat']}\n")
+    print(f"{'mode':<16} {'total s':>9} {'us/payload':>11} {'payloads/s':>11} {'MB/s':>8} {'speedup':>8}")
+    for mode, r in result['results'].items():
+        print(f"{mode:<16} {r['seconds']:>9.3f} {r['usPerPayload']:>11.1f} {r['payloadsPerSecond']:>11.1f} "
+              f"{r['mbPerSecond']:>8.1f} {r['speedupVsThreadJson']:>7.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+In-Process AWS Stand-ins for Benchmarks
+=======================================
+Minimal S3 and Lambda clients that count every call and byte, so the
+pipeline benchmark can run without AWS and report I/O volume. The LLM is
+replaced by services.llm_client.StubLLMClient.
+"""
+
+import io
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+
+class _NoSuchKey(Exception):
+    """Raised like botocore's ClientError for a missing key (callers only catch Exception)."""
+
+
+class FakeS3:
+    """
+    Dict-backed object store implementing the S3 calls the backend makes.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.objects: Dict[str, bytes] = {}
+        self.latency_ms = latency_ms
+        self._lock = threading.Lock()
+        self.stats = {'get': 0, 'put': 0, 'head': 0, 'delete': 0, 'list': 0,
+                      'bytes_in': 0, 'bytes_out': 0}
+
+    def _sleep(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+
+    def put_object(self, Bucket: str, Key: str, Body: Any, **kwargs) -> Dict[str, Any]:
+        self._sleep()
+        body = Body.encode('utf-8') if isinstance(Body, str) else bytes(Body)
+        with self._lock:
+            self.objects[f"{Bucket}/{Key}"] = body
+            self.stats['put'] += 1
+            self.stats['bytes_in'] += len(body)
+        return {'ETag': f'"{hash(body) & 0xffffffff:08x}"'}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self._sleep()
+        with self._lock:
+            self.stats['get'] += 1
+            body = self.objects.get(f"{Bucket}/{Key}")
+            if body is None:
+                raise _NoSuchKey(f"NoSuchKey: {Key}")
+            self.stats['bytes_out'] += len(body)
+        return {'Body': io.BytesIO(body), 'ContentLength': len(body)}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self._sleep()
+        with self._lock:
+            self.stats['head'] += 1
+            body = self.objects.get(f"{Bucket}/{Key}")
+        if body is None:
+            raise _NoSuchKey(f"NoSuchKey: {Key}")
+        return {'ContentLength': len(body)}
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self._sleep()
+        with self._lock:
+            self.stats['delete'] += 1
+            self.objects.pop(f"{Bucket}/{Key}", None)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = '', **kwargs) -> Dict[str, Any]:
+        self._sleep()
+        with self._lock:
+            self.stats['list'] += 1
+            prefix = f"{Bucket}/{Prefix}"
+            contents = [{'Key': k[len(Bucket) + 1:], 'Size': len(v)}
+                        for k, v in self.objects.items() if k.startswith(prefix)]
+        return {'Contents': contents, 'KeyCount': len(contents), 'IsTruncated': False}
+
+
+class FakeLambda:
+    """
+    Records async invocations instead of running them; the benchmark
+    drives the processor itself so it can time it.
+    """
+
+    def __init__(self):
+        self.invocations: List[Dict[str, Any]] = []
+
+    def invoke(self, FunctionName: str, InvocationType: str = 'RequestResponse',
+               Payload: bytes = b'{}', **kwargs) -> Dict[str, Any]:
+        self.invocations.append({'function': FunctionName, 'payload': json.loads(Payload)})
+        return {'StatusCode': 202}
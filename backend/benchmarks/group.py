@@ -0,0 +1,130 @@
+"""
+Group Rewind Benchmark
+======================
+Riot calls for a friend group done as N back-to-back individual rewinds vs
+one group rewind (api.start_group_rewind), against the stub with a premade
+group that shares most of its games.
+
+Each mode runs in a fresh interpreter with its own stub, fake S3 and LLM
+stub, so caches (ladder snapshots, population index) don't leak between them.
+
+Usage (from backend/):
+    python -m benchmarks.group
+    python -m benchmarks.group --members 5 --shared 200 --solo 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Any
+
+from benchmarks.pipeline import BACKEND_DIR, BENCH_APP_RATE_LIMIT, _free_port
+
+
+def run_mode(mode: str, members: int, shared: int, solo: int, seed: int) -> Dict[str, Any]:
+    """
+    Rewind the whole group once in this interpreter.
+
+    Args:
+        mode: 'individual' or 'group'
+        members: Group size (2-5)
+        shared: Games the full group played together
+        solo: Extra games per member without the group
+        seed: Synthetic world seed
+
+    Returns:
+        Riot request counts and wall time
+    """
+    port = _free_port()
+    os.environ['RIOT_API_PLATFORM_BASE'] = f'http://127.0.0.1:{port}/{{platform}}'
+    os.environ['RIOT_API_REGIONAL_BASE'] = f'http://127.0.0.1:{port}/{{regional}}'
+    os.environ['RIOT_API_KEY'] = 'bench-key'
+
+    import boto3
+    from stubs import RiotStub, StubConfig, SyntheticWorld, run_server
+    from benchmarks.fakes import FakeS3, FakeLambda
+    from services import aws_clients
+    from services.llm_client import StubLLMClient, set_llm_client
+
+    world = SyntheticWorld(seed=seed)
+    players = [world.add_player(f'Squad{i}', 'GRP', 'na1', match_count=solo) for i in range(1, members + 1)]
+    world.add_group(players, shared_matches=shared)
+    stub = RiotStub(world, StubConfig(app_rate_limit=BENCH_APP_RATE_LIMIT, seed=seed))
+    server = run_server(stub, port=port, background=True)
+
+    lambda_client = FakeLambda()
+    aws_clients._s3_client = FakeS3()
+    set_llm_client(StubLLMClient(seed=seed))
+    fakes = {'s3': aws_clients._s3_client, 'lambda': lambda_client}
+    boto3.client = lambda service_name=None, *args, **kwargs: fakes[service_name]
+
+    from api import RiftRewindAPI
+    from lambdas import processor
+
+    api = RiftRewindAPI()
+    started = time.perf_counter()
+    statuses = []
+    if mode == 'group':
+        api.start_group_rewind([{'gameName': p.game_name, 'tagLine': p.tag_line} for p in players], 'na1')
+        statuses.append(processor.lambda_handler(lambda_client.invocations[-1]['payload'], None)['status'])
+    else:
+        for p in players:
+            api.start_rewind(p.game_name, p.tag_line, p.platform, force_refresh=True)
+            statuses.append(processor.lambda_handler(lambda_client.invocations[-1]['payload'], None)['status'])
+    wall_s = time.perf_counter() - started
+    server.shutdown()
+
+    return {
+        'mode': mode,
+        'status': statuses,
+        'wall_s': round(wall_s, 3),
+        'riot_requests': stub.stats['requests'],
+        'match_requests': stub.stats['by_method'].get('match_by_id', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Group rewind benchmark')
+    parser.add_argument('--members', type=int, default=5)
+    parser.add_argument('--shared', type=int, default=200)
+    parser.add_argument('--solo', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1337)
+    parser.add_argument('--mode', choices=['individual', 'group'], help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args()
+
+    if args.mode:
+        # Child: one mode, result on the last stdout line
+        import logging
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(run_mode(args.mode, args.members, args.shared, args.solo, args.seed)))
+        return 0
+
+    results = {}
+    for mode in ('individual', 'group'):
+        cmd = [sys.executable, '-m', 'benchmarks.group', '--mode', mode, '--members', str(args.members),
+               '--shared', str(args.shared), '--solo', str(args.solo), '--seed', str(args.seed)]
+        proc = subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{mode} failed:\n{proc.stderr[-2000:]}")
+        results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print(f"{args.members} members, {args.shared} shared + {args.solo} solo games each\n")
+    print(f"{'mode':<12} {'riot calls':>11} {'match calls':>12} {'wall s':>8}  status")
+    for mode, r in results.items():
+        print(f"{mode:<12} {r['riot_requests']:>11} {r['match_requests']:>12} {r['wall_s']:>8.2f}  {','.join(r['status'])}")
+    individual, group = results['individual'], results['group']
+    print(f"\nRiot calls: {individual['riot_requests'] / group['riot_requests']:.2f}x fewer, "
+          f"match calls: {individual['match_requests'] / group['match_requests']:.2f}x fewer")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'suite': 'group', 'config': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Lambda Cold-Start Import Profiler
+=================================
+Measures what each Lambda entry point imports on a cold start, using
+`python -X importtime` in a fresh interpreter per run.
+
+profile: per-module self/cumulative import cost for an entry point
+check:   fails (exit 1) if the health/regions cold start loads heavy modules
+         (boto3, requests, analytics, the AI generators) or its median
+         import + first-request time exceeds the budget / baseline
+
+Usage (from backend/):
+    python -m benchmarks.import_profile profile orchestrator.health --top 30
+    python -m benchmarks.import_profile check
+    python -m benchmarks.import_profile check --baseline cold.json --output cold.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Any, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> code run in the fresh interpreter (import + first request)
+ENTRY_POINTS = {
+    'orchestrator.health': (
+        "import lambdas.orchestrator as o; "
+        "o.lambda_handler({'httpMethod': 'GET', 'path': '/api/health'}, None)"
+    ),
+    'orchestrator.regions': (
+        "import lambdas.orchestrator as o; "
+        "o.lambda_handler({'httpMethod': 'GET', 'path': '/api/regions'}, None)"
+    ),
+    'orchestrator.import': "import lambdas.orchestrator",
+    'processor.import': "import lambdas.processor",
+}
+
+# Entry points gated by `check`
+CHECKED_ENTRY_POINTS = ['orchestrator.health', 'orchestrator.regions']
+
+# Modules the lightweight routes must not load
+FORBIDDEN_COLD_START = [
+    'boto3',
+    'botocore',
+    'requests',
+    'services.analytics',
+    'services.riot_api_client',
+    'services.session_manager',
+    'lambdas.league_data',
+    'lambdas.humor_context',
+    'lambdas.insights',
+]
+
+DEFAULT_BUDGET_MS = 150.0
+
+_MEASURE = """
+import json, sys, time
+_t = time.perf_counter()
+{code}
+_elapsed = (time.perf_counter() - _t) * 1000
+print('__RESULT__' + json.dumps({{'ms': _elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Behave like the deployed function: no .env loading, no AWS calls at import
+    env.setdefault('AWS_LAMBDA_FUNCTION_NAME', 'import-profile')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        List of {module, selfUs, cumulativeUs, depth} in import order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_field, cumulative_field, name = line.split(':', 1)[1].split('|', 2)
+            self_us, cumulative_us = int(self_field), int(cumulative_field)
+        except ValueError:
+            continue
+        # importtime indents nested imports by two spaces after the separator's space
+        name = name[1:] if name.startswith(' ') else name
+        rows.append({
+            'module': name.strip(),
+            'selfUs': self_us,
+            'cumulativeUs': cumulative_us,
+            'depth': (len(name) - len(name.lstrip(' '))) // 2,
+        })
+    return rows
+
+
+def measure(entry_point: str, importtime: bool = False) -> Dict[str, Any]:
+    """
+    Run an entry point once in a fresh interpreter.
+
+    Args:
+        entry_point: Key of ENTRY_POINTS
+        importtime: Also collect per-module -X importtime data
+
+    Returns:
+        Dict with ms (import + first request), modules and optional imports
+    """
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += ['-c', _MEASURE.format(code=ENTRY_POINTS[entry_point])]
+    proc = subprocess.run(cmd, cwd=BACKEND_DIR, env=_child_env(), capture_output=True, text=True)
+    result_line = next((l for l in proc.stdout.splitlines() if l.startswith('__RESULT__')), None)
+    if proc.returncode != 0 or result_line is None:
+        raise RuntimeError(f"{entry_point} failed:\n{proc.stderr[-2000:]}")
+
+    result = json.loads(result_line[len('__RESULT__'):])
+    if importtime:
+        result['imports'] = parse_importtime(proc.stderr)
+    return result
+
+
+def profile(entry_point: str, top: int) -> Dict[str, Any]:
+    result = measure(entry_point, importtime=True)
+    # Only modules imported by our code, not interpreter startup (site, encodings, ...)
+    project = [r for r in result['imports'] if r['depth'] == 0 and r['module'].split('.')[0]
+               in ('lambdas', 'services', 'api')]
+    total_us = sum(r['cumulativeUs'] for r in project)
+
+    print(f"{entry_point}: {result['ms']:.1f} ms import + first request, "
+          f"{len(result['modules'])} modules loaded, {total_us / 1000:.1f} ms in project imports\n")
+    print(f"{'module':<48} {'self ms':>9} {'cumul ms':>9}")
+    for row in sorted(result['imports'], key=lambda r: r['cumulativeUs'], reverse=True)[:top]:
+        print(f"{'  ' * row['depth'] + row['module']:<48} {row['selfUs'] / 1000:>9.1f} "
+              f"{row['cumulativeUs'] / 1000:>9.1f}")
+    return result
+
+
+def check(runs: int, budget_ms: float, baseline: Dict[str, Any] = None,
+          threshold: float = 0.25) -> Dict[str, Any]:
+    """
+    Cold-start gate for the lightweight routes.
+
+    Args:
+        runs: Fresh interpreters per entry point (median is kept)
+        budget_ms: Absolute ceiling for median import + first request
+        baseline: Previous check output to compare against
+        threshold: Allowed slowdown vs baseline (fraction)
+
+    Returns:
+        Dict with per-entry-point results and a list of failures
+    """
+    results, failures = {}, []
+    for entry_point in CHECKED_ENTRY_POINTS:
+        samples = [measure(entry_point) for _ in range(runs)]
+        median_ms = statistics.median(s['ms'] for s in samples)
+        modules = samples[0]['modules']
+        forbidden = [m for m in FORBIDDEN_COLD_START if m in modules]
+        results[entry_point] = {'medianMs': round(median_ms, 1), 'modules': len(modules),
+                                'forbidden': forbidden}
+
+        if forbidden:
+            failures.append(f"{entry_point} loads {', '.join(forbidden)}")
+        if median_ms > budget_ms:
+            failures.append(f"{entry_point} took {median_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+        base = (baseline or {}).get('entryPoints', {}).get(entry_point)
+        if base and median_ms > base['medianMs'] * (1 + threshold):
+            failures.append(f"{entry_point} took {median_ms:.1f} ms vs baseline {base['medianMs']} ms "
+                            f"(+{(median_ms / base['medianMs'] - 1) * 100:.0f}%)")
+        if base and len(modules) > base['modules']:
+            failures.append(f"{entry_point} loads {len(modules)} modules vs baseline {base['modules']}")
+
+        print(f"{entry_point:<24} {median_ms:>7.1f} ms  {len(modules):>4} modules  "
+              f"{'forbidden: ' + ', '.join(forbidden) if forbidden else 'ok'}")
+
+    return {'entryPoints': results, 'budgetMs': budget_ms, 'failures': failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lambda cold-start import profiler')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    prof = sub.add_parser('profile', help='Per-module import cost for an entry point')
+    prof.add_argument('entry_point', choices=list(ENTRY_POINTS), nargs='?', default='orchestrator.health')
+    prof.add_argument('--top', type=int, default=25)
+    prof.add_argument('--output', help='Write raw results JSON here')
+
+    chk = sub.add_parser('check', help='Fail if health/regions cold start regresses')
+    chk.add_argument('--runs', type=int, default=5)
+    chk.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    chk.add_argument('--baseline', help='Previous check output to compare against')
+    chk.add_argument('--threshold', type=float, default=0.25)
+    chk.add_argument('--output', help='Write check results JSON here')
+
+    args = parser.parse_args()
+
+    if args.command == 'profile':
+        result = profile(args.entry_point, args.top)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result, f, indent=2)
+        return 0
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    result = check(args.runs, args.budget_ms, baseline, args.threshold)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    for failure in result['failures']:
+        print(f"FAIL: {failure}")
+    print(f"\n{len(result['failures'])} failure(s)")
+    return 1 if result['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,429 @@
+"""
+End-to-End Pipeline Benchmark
+=============================
+Drives start_rewind -> processor -> get_session for synthetic players of
+different sizes against in-process stand-ins for Riot (stubs.riot_stub_server),
+S3 and Lambda (benchmarks.fakes) and the LLM (services.llm_client stub), and
+reports per-stage wall time, Riot calls, S3 GETs/PUTs/bytes, LLM calls and
+peak RSS.
+
+Each profile runs in a fresh interpreter so peak RSS is per profile.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline run --output bench.json
+    python -m benchmarks.pipeline run --profiles small median --repeat 3
+    python -m benchmarks.pipeline compare baseline.json bench.json
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ranked games per synthetic player
+PROFILES = {
+    'small': 40,
+    'median': 300,
+    'whale': 3200,
+}
+
+# Production-key limits so the stub's edge doesn't dominate; the shared request
+# scheduler (RIOT_API_RATE_LIMITS, default 20:1) still applies and is measured.
+BENCH_APP_RATE_LIMIT = '500:10,30000:600'
+
+# Stage name -> (module, class, method) wrapped with a timer. A stage may hook
+# several methods (the processor's progressive and PROCESSOR_PROGRESSIVE=false
+# paths fetch details through different ones).
+STAGE_HOOKS = [
+    ('processor.fetch_match_ids', 'lambdas.league_data', 'LeagueDataFetcher', 'fetch_match_history'),
+    ('processor.fetch_match_histogram', 'lambdas.league_data', 'LeagueDataFetcher', 'fetch_match_histogram'),
+    ('processor.fetch_match_details', 'lambdas.league_data', 'LeagueDataFetcher', 'fetch_match_details_progressive'),
+    ('processor.fetch_match_details', 'lambdas.league_data', 'LeagueDataFetcher', 'fetch_match_details_batch'),
+    ('processor.analytics', 'services.analytics', 'RiftRewindAnalytics', 'calculate_all'),
+    ('processor.humor', 'lambdas.humor_context', 'HumorGenerator', 'generate'),
+    ('processor.insights', 'lambdas.insights', 'InsightsGenerator', 'generate'),
+    ('processor.cache_save', 'services.session_cache', 'SessionCacheManager', 'save_session_to_cache'),
+]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class StageRecorder:
+    """
+    Accumulates wall time and I/O counter deltas per named stage.
+    """
+
+    def __init__(self, counters):
+        self._counters = counters
+        self._local = threading.local()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        # Re-entrant calls (e.g. humor slide 10 generating a headline) count once
+        depth = getattr(self._local, 'depth', {})
+        self._local.depth = depth
+        if depth.get(name):
+            yield
+            return
+        depth[name] = 1
+        before = self._counters()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            after = self._counters()
+            depth[name] = 0
+            entry = self.stages.setdefault(name, {'wall_s': 0.0, 'calls': 0})
+            entry['wall_s'] = round(entry['wall_s'] + elapsed, 4)
+            entry['calls'] += 1
+            for key, value in after.items():
+                entry[key] = entry.get(key, 0) + (value - before.get(key, 0))
+
+    def hook(self, stage: str, owner: Any, attr: str):
+        original = getattr(owner, attr)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            with self.stage(stage):
+                return original(*args, **kwargs)
+
+        setattr(owner, attr, wrapper)
+
+
+def run_profile(profile: str, seed: int = 1337, riot_latency_ms: float = 0.0,
+                riot_jitter_ms: float = 0.0, s3_latency_ms: float = 0.0,
+                bedrock_latency_ms: float = 0.0, llm_tokens_per_second: float = 0.0,
+                llm_throttle_rate: float = 0.0, llm_malformed_rate: float = 0.0) -> Dict[str, Any]:
+    """
+    Run one session end to end in this interpreter.
+
+    Must run before services.* is imported elsewhere in the process, since the
+    Riot base URLs are read from the environment at import time.
+
+    Args:
+        profile: Key of PROFILES
+        seed: Synthetic world seed
+        riot_latency_ms: Stub Riot latency per request
+        riot_jitter_ms: Stub Riot latency jitter
+        s3_latency_ms: Fake S3 latency per call
+        bedrock_latency_ms: Stub LLM latency per call (before generation)
+        llm_tokens_per_second: Stub LLM generation throughput (0 = instant)
+        llm_throttle_rate: Fraction of LLM calls rejected with ThrottlingException
+        llm_malformed_rate: Fraction of LLM calls returning malformed output
+
+    Returns:
+        Result dict for the profile
+    """
+    port = _free_port()
+    os.environ['RIOT_API_PLATFORM_BASE'] = f'http://127.0.0.1:{port}/{{platform}}'
+    os.environ['RIOT_API_REGIONAL_BASE'] = f'http://127.0.0.1:{port}/{{regional}}'
+    os.environ['RIOT_API_KEY'] = 'bench-key'
+    os.environ.setdefault('PROCESSOR_LAMBDA_NAME', 'rift-rewind-processor')
+
+    import boto3
+    import importlib
+    from stubs import RiotStub, StubConfig, SyntheticWorld, run_server
+    from benchmarks.fakes import FakeS3, FakeLambda
+    from services import aws_clients
+    from services.http_response import encode_body
+    from services.llm_client import StubLLMClient, set_llm_client
+    from services.riot_metrics import riot_metrics
+    from services.riot_scheduler import riot_scheduler
+
+    world = SyntheticWorld(seed=seed)
+    player = world.add_player(f'Bench{profile.title()}', 'BNCH', 'na1', match_count=PROFILES[profile])
+    stub = RiotStub(world, StubConfig(app_rate_limit=BENCH_APP_RATE_LIMIT, latency_ms=riot_latency_ms,
+                                      jitter_ms=riot_jitter_ms, seed=seed))
+    server = run_server(stub, port=port, background=True)
+
+    s3 = FakeS3(latency_ms=s3_latency_ms)
+    llm = StubLLMClient(latency_ms=bedrock_latency_ms, tokens_per_second=llm_tokens_per_second,
+                        throttle_rate=llm_throttle_rate, malformed_rate=llm_malformed_rate, seed=seed)
+    lambda_client = FakeLambda()
+    aws_clients._s3_client = s3
+    set_llm_client(llm)
+    fakes = {'s3': s3, 'lambda': lambda_client}
+    boto3.client = lambda service_name=None, *args, **kwargs: fakes[service_name]
+
+    def counters() -> Dict[str, int]:
+        return {
+            'riot_requests': stub.stats['requests'],
+            's3_get': s3.stats['get'],
+            's3_put': s3.stats['put'],
+            's3_bytes_in': s3.stats['bytes_in'],
+            's3_bytes_out': s3.stats['bytes_out'],
+            'bedrock_calls': llm.stats['calls'],
+        }
+
+    recorder = StageRecorder(counters)
+    for stage, module_name, class_name, method in STAGE_HOOKS:
+        recorder.hook(stage, getattr(importlib.import_module(module_name), class_name), method)
+
+    from api import RiftRewindAPI
+    from lambdas import processor
+
+    baseline_rss = _peak_rss_mb()
+    api = RiftRewindAPI()
+    started = time.perf_counter()
+
+    with recorder.stage('start_rewind'):
+        response = api.start_rewind(player.game_name, player.tag_line, player.platform, force_refresh=True)
+    start_body = response['body']
+    session_id = start_body.get('sessionId')
+
+    processor_result = {'status': 'not_invoked'}
+    if lambda_client.invocations:
+        with recorder.stage('processor'):
+            processor_result = processor.lambda_handler(lambda_client.invocations[-1]['payload'], None)
+
+    with recorder.stage('get_session'):
+        session = api.get_session(session_id)
+
+    wall_s = time.perf_counter() - started
+    server.shutdown()
+    session_body = session['body']
+
+    return {
+        'profile': profile,
+        'matches': PROFILES[profile],
+        'status': session_body.get('status'),
+        'processorStatus': processor_result.get('status'),
+        'wall_s': round(wall_s, 4),
+        'stages': recorder.stages,
+        'totals': dict(counters(), riot_rate_limited=stub.stats['rate_limited'],
+                       llm_throttled=llm.stats['throttled'], llm_malformed=llm.stats['malformed'],
+                       response_bytes=len(encode_body(session['body']))),
+        'riotClient': riot_metrics.snapshot()['totals'],
+        'scheduler': riot_scheduler.snapshot()['classes'],
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _run_child(profile: str, args: argparse.Namespace) -> Dict[str, Any]:
+    cmd = [sys.executable, '-m', 'benchmarks.pipeline', '_child', profile,
+           '--seed', str(args.seed),
+           '--riot-latency-ms', str(args.riot_latency_ms),
+           '--riot-jitter-ms', str(args.riot_jitter_ms),
+           '--s3-latency-ms', str(args.s3_latency_ms),
+           '--bedrock-latency-ms', str(args.bedrock_latency_ms),
+           '--llm-tokens-per-second', str(args.llm_tokens_per_second),
+           '--llm-throttle-rate', str(args.llm_throttle_rate),
+           '--llm-malformed-rate', str(args.llm_malformed_rate)]
+    if args.verbose:
+        cmd.append('--verbose')
+    proc = subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=True, text=True)
+    if args.verbose and proc.stderr:
+        sys.stderr.write(proc.stderr)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Profile {profile} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    results = {}
+    for profile in args.profiles:
+        runs = []
+        for i in range(args.repeat):
+            print(f"  {profile} run {i + 1}/{args.repeat}...", file=sys.stderr)
+            runs.append(_run_child(profile, args))
+        # Keep the median run by total wall time so one noisy run can't skew it
+        runs.sort(key=lambda r: r['wall_s'])
+        result = runs[len(runs) // 2]
+        result['wall_s_runs'] = [r['wall_s'] for r in runs]
+        results[profile] = result
+
+    return {
+        'suite': 'pipeline',
+        'createdAt': datetime.utcnow().isoformat() + 'Z',
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'config': {
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'riotLatencyMs': args.riot_latency_ms,
+            'riotJitterMs': args.riot_jitter_ms,
+            's3LatencyMs': args.s3_latency_ms,
+            'bedrockLatencyMs': args.bedrock_latency_ms,
+            'llmTokensPerSecond': args.llm_tokens_per_second,
+            'llmThrottleRate': args.llm_throttle_rate,
+            'llmMalformedRate': args.llm_malformed_rate,
+        },
+        'profiles': results,
+    }
+
+
+# ==================== COMPARISON ====================
+
+COUNT_METRICS = ['riot_requests', 's3_get', 's3_put', 's3_bytes_in', 's3_bytes_out', 'bedrock_calls', 'response_bytes']
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], time_threshold: float = 0.15,
+                    count_threshold: float = 0.0, memory_threshold: float = 0.10,
+                    min_time_delta_s: float = 0.05) -> List[Dict[str, Any]]:
+    """
+    Compare two result files metric by metric.
+
+    Args:
+        baseline: Earlier result dict
+        current: New result dict
+        time_threshold: Allowed relative slowdown for wall times
+        count_threshold: Allowed relative increase for call/byte counts
+        memory_threshold: Allowed relative increase for peak RSS
+        min_time_delta_s: Ignore wall-time changes smaller than this (noise)
+
+    Returns:
+        Rows with profile, metric, baseline, current, change and regression flag
+    """
+    rows = []
+
+    def add(profile, metric, base, cur, threshold, min_delta=0.0):
+        if base is None or cur is None:
+            return
+        change = (cur - base) / base if base else (0.0 if cur == base else float('inf'))
+        regression = change > threshold and (cur - base) > min_delta
+        rows.append({'profile': profile, 'metric': metric, 'baseline': base, 'current': cur,
+                     'change': change, 'regression': regression})
+
+    for profile, cur in current.get('profiles', {}).items():
+        base = baseline.get('profiles', {}).get(profile)
+        if not base:
+            continue
+        add(profile, 'wall_s', base['wall_s'], cur['wall_s'], time_threshold, min_time_delta_s)
+        for stage in sorted(set(base['stages']) | set(cur['stages'])):
+            add(profile, f'{stage}.wall_s', base['stages'].get(stage, {}).get('wall_s'),
+                cur['stages'].get(stage, {}).get('wall_s'), time_threshold, min_time_delta_s)
+        for metric in COUNT_METRICS:
+            add(profile, metric, base['totals'].get(metric), cur['totals'].get(metric), count_threshold)
+        add(profile, 'peak_rss_mb', base.get('peak_rss_mb'), cur.get('peak_rss_mb'), memory_threshold)
+    return rows
+
+
+def _print_results(results: Dict[str, Any]):
+    for profile, r in results['profiles'].items():
+        t = r['totals']
+        print(f"\n{profile} ({r['matches']} matches) - {r['status']} in {r['wall_s']:.2f}s, "
+              f"peak RSS {r['peak_rss_mb']} MB")
+        print(f"  riot={t['riot_requests']} (429s={t['riot_rate_limited']})  s3 get={t['s3_get']} put={t['s3_put']} "
+              f"in={t['s3_bytes_in'] / 1e6:.1f}MB out={t['s3_bytes_out'] / 1e6:.1f}MB  "
+              f"llm={t['bedrock_calls']} (throttled={t.get('llm_throttled', 0)} "
+              f"malformed={t.get('llm_malformed', 0)})  response={t['response_bytes'] / 1e3:.0f}KB")
+        for stage, s in r['stages'].items():
+            print(f"  {stage:<32} {s['wall_s']:>9.3f}s  x{s['calls']:<3} riot={s['riot_requests']:<5} "
+                  f"s3 get={s['s3_get']:<3} put={s['s3_put']:<3} llm={s['bedrock_calls']}")
+
+
+def _print_comparison(rows: List[Dict[str, Any]]) -> int:
+    regressions = [r for r in rows if r['regression']]
+    for r in rows:
+        if r['baseline'] == r['current']:
+            continue
+        flag = 'REGRESSION' if r['regression'] else ''
+        print(f"{r['profile']:<8} {r['metric']:<42} {r['baseline']:>14} -> {r['current']:>14} "
+              f"{r['change'] * 100:+7.1f}% {flag}")
+    print(f"\n{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rift Rewind end-to-end pipeline benchmark')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_run_options(p):
+        p.add_argument('--seed', type=int, default=1337)
+        p.add_argument('--riot-latency-ms', type=float, default=0.0)
+        p.add_argument('--riot-jitter-ms', type=float, default=0.0)
+        p.add_argument('--s3-latency-ms', type=float, default=0.0)
+        p.add_argument('--bedrock-latency-ms', type=float, default=0.0)
+        p.add_argument('--llm-tokens-per-second', type=float, default=0.0)
+        p.add_argument('--llm-throttle-rate', type=float, default=0.0)
+        p.add_argument('--llm-malformed-rate', type=float, default=0.0)
+        p.add_argument('--verbose', action='store_true', help='Show backend logs')
+
+    run = sub.add_parser('run', help='Run the suite')
+    run.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+    run.add_argument('--repeat', type=int, default=1)
+    run.add_argument('--output', help='Write results JSON here')
+    run.add_argument('--baseline', help='Compare against this results file after running')
+    add_run_options(run)
+
+    child = sub.add_parser('_child')
+    child.add_argument('profile', choices=list(PROFILES))
+    add_run_options(child)
+
+    cmp = sub.add_parser('compare', help='Compare two results files')
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--time-threshold', type=float, default=0.15)
+    cmp.add_argument('--count-threshold', type=float, default=0.0)
+    cmp.add_argument('--memory-threshold', type=float, default=0.10)
+
+    args = parser.parse_args()
+
+    if args.command == '_child':
+        logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+        if not args.verbose:
+            logging.disable(logging.WARNING)
+        result = run_profile(args.profile, args.seed, args.riot_latency_ms, args.riot_jitter_ms,
+                             args.s3_latency_ms, args.bedrock_latency_ms, args.llm_tokens_per_second,
+                             args.llm_throttle_rate, args.llm_malformed_rate)
+        print(json.dumps(result))
+        return 0
+
+    if args.command == 'run':
+        results = run_suite(args)
+        _print_results(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"\nResults written to {args.output}")
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            print()
+            return _print_comparison(compare_results(baseline, results))
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return _print_comparison(compare_results(baseline, current, args.time_threshold,
+                                             args.count_threshold, args.memory_threshold))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Shared Rate Limit Store Check
+=============================
+Several worker processes, each with its own RiotRequestScheduler and
+several threads, send as fast as their schedulers admit against one shared
+token bucket store (services/rate_limit_store.py). The check passes when the
+workers together stayed within every limit window:
+
+    no span of seconds * (1 - LEASE_TTL_FRACTION) - jitter held more than
+    count sends
+
+A leased token may be spent up to the lease TTL after the store counted it,
+and send times are taken after the grant, so a full `seconds` window can hold
+one or two more. The store must also have answered every lease; a worker
+that failed open to its local limits fails the check.
+
+Run it against the store a deployment uses, e.g. an ElastiCache endpoint
+reachable from a bastion:
+
+    RIOT_RATE_REDIS_URL=redis://10.0.0.12:6379/0 python -m benchmarks.rate_store
+
+Without RIOT_RATE_REDIS_URL the redis check starts a throwaway redis-server
+on a free port, and is skipped (exit 0) when none is installed. Before the
+window check it runs the Redis store's own checks:
+
+    take         grants stop at the bucket's count, then report a wait
+    give_back    unspent tokens come off the caller's list entry
+    reload       after SCRIPT FLUSH, a lease still succeeds (NOSCRIPT -> EVAL)
+                 and leaves the script cached again
+
+Usage (from backend/):
+    python -m benchmarks.rate_store                      # redis (RIOT_RATE_REDIS_URL or local)
+    python -m benchmarks.rate_store --store file         # flock'd file, this host only
+    python -m benchmarks.rate_store --workers 8 --limits 20:1,100:10 --seconds 12
+
+Exits 1 when a window was exceeded or the store failed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.pipeline import BACKEND_DIR
+
+
+def run_worker(limits: str, lease_size: int, threads: int, start_at: float, seconds: float) -> Dict[str, Any]:
+    """
+    Send through one scheduler from several threads until the deadline.
+
+    Args:
+        limits: RIOT_API_RATE_LIMITS of the host
+        lease_size: Tokens per store round trip
+        threads: Sending threads (each its own fairness session)
+        start_at: Wall clock time to start sending at
+        seconds: How long to send for
+
+    Returns:
+        Wall clock send times and the store counters
+    """
+    from services.rate_limit_store import store_from_env
+    from services.riot_scheduler import BACKFILL, RiotRequestScheduler, parse_limits
+
+    scheduler = RiotRequestScheduler(parse_limits(limits), store=store_from_env(), lease_size=lease_size)
+    sends: List[float] = []
+    lock = threading.Lock()
+
+    def send(session: str):
+        while time.time() < start_at + seconds:
+            scheduler.acquire('na1', BACKFILL, session)
+            sent = time.time()
+            with lock:
+                sends.append(sent)
+
+    time.sleep(max(start_at - time.time(), 0))
+    workers = [threading.Thread(target=send, args=(f'thread-{i}',)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return {'sends': sends, 'store': scheduler.snapshot()['store']}
+
+
+def busiest(sends: List[float], span: float) -> int:
+    """Most sends in any window of `span` seconds (sends sorted)."""
+    most, first = 0, 0
+    for last, sent in enumerate(sends):
+        while sent - sends[first] >= span:
+            first += 1
+        most = max(most, last - first + 1)
+    return most
+
+
+def check(sends: List[float], limits: List[Tuple[int, float]], jitter: float) -> List[Dict[str, Any]]:
+    """
+    Busiest window per limit, full length and shortened by the lease slack.
+
+    Args:
+        sends: Send times of every worker
+        limits: (count, seconds) windows
+        jitter: Seconds between a grant and its recorded send time
+
+    Returns:
+        One result per limit ('ok' when the shortened window is within count)
+    """
+    from services.rate_limit_store import LEASE_TTL_FRACTION
+
+    sends = sorted(sends)
+    ttl = min(seconds for _, seconds in limits) * LEASE_TTL_FRACTION
+    results = []
+    for count, seconds in limits:
+        span = seconds - ttl - jitter
+        strict = busiest(sends, span)
+        results.append({'limit': f'{count}:{seconds:g}', 'busiestWindow': busiest(sends, seconds),
+                        'busiestShortWindow': strict, 'shortWindowS': round(span, 3), 'ok': strict <= count})
+    return results
+
+
+def start_redis_server() -> Optional[Tuple[subprocess.Popen, str]]:
+    """
+    Start a throwaway redis-server on a free port (no persistence).
+
+    Returns:
+        (process, url), or None when redis-server isn't installed
+    """
+    binary = shutil.which('redis-server')
+    if binary is None:
+        return None
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen([binary, '--port', str(port), '--bind', '127.0.0.1', '--save', '',
+                             '--appendonly', 'no'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 5.0
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return proc, f'redis://127.0.0.1:{port}/0'
+        except OSError:
+            if proc.poll() is not None or time.time() > deadline:
+                proc.terminate()
+                raise RuntimeError(f'redis-server did not start on port {port}')
+            time.sleep(0.05)
+
+
+def check_redis_store(url: str) -> List[Dict[str, Any]]:
+    """
+    Take, give_back and script reload against a live Redis-protocol server.
+
+    Args:
+        url: redis:// URL of the server
+
+    Returns:
+        One result per check ('ok' and what was observed)
+    """
+    from services.rate_limit_store import RedisTokenBucketStore
+
+    store = RedisTokenBucketStore(url, timeout=2.0)
+    prefix = f'rate-store-check-{uuid.uuid4().hex}'
+    take_key, back_key, reload_key = (f'{prefix}:{name}' for name in ('take', 'back', 'reload'))
+    results = []
+
+    def entries(key: str) -> List[int]:
+        with store._lock:
+            return [int(entry.rsplit(':', 1)[1]) for entry in store._command('LRANGE', key, 0, -1)]
+
+    try:
+        # take: 3 + 2 of a 5-token bucket, then nothing with a wait
+        bucket = [(take_key, 5, 10.0)]
+        first, second, third = (store.lease(bucket, want) for want in (3, 3, 1))
+        results.append({'check': 'take', 'ok': (first[0], second[0], third[0]) == (3, 2, 0) and third[1] > 0,
+                        'observed': f'granted {first[0]}, {second[0]}, {third[0]} (wait {third[1]:.2f}s)'})
+
+        # give_back: lease 4, hand 3 back with the next lease of 1
+        bucket = [(back_key, 5, 10.0)]
+        granted, _, leased_at = store.lease(bucket, 4)
+        store.lease(bucket, 1, give_back=(leased_at, granted - 1))
+        after = entries(back_key)
+        rest = store.lease(bucket, 5)[0]
+        results.append({'check': 'give_back', 'ok': after == [1, 1] and rest == 3,
+                        'observed': f'entries {after}, then {rest} of 5 free'})
+
+        # reload: a flushed script cache must be refilled by the lease itself
+        with store._lock:
+            store._command('SCRIPT', 'FLUSH')
+        granted = store.lease([(reload_key, 5, 10.0)], 2)[0]
+        with store._lock:
+            cached = store._command('SCRIPT', 'EXISTS', store._sha)
+        results.append({'check': 'reload', 'ok': granted == 2 and cached == [1],
+                        'observed': f'granted {granted} after SCRIPT FLUSH, script cached {cached == [1]}'})
+    except Exception as e:
+        results.append({'check': 'store', 'ok': False, 'observed': f'{type(e).__name__}: {e}'})
+    finally:
+        try:
+            with store._lock:
+                if store._sock is not None:
+                    store._command('DEL', take_key, back_key, reload_key)
+        except Exception:
+            pass
+        store._close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared rate limit store check')
+    parser.add_argument('--store', choices=['redis', 'file'], default='redis')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4, help='Sending threads per worker')
+    parser.add_argument('--limits', default='20:1', help='RIOT_API_RATE_LIMITS shared by the workers')
+    parser.add_argument('--lease-size', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args()
+
+    if args.worker:
+        # Child: one scheduler, result on the last stdout line
+        print(json.dumps(run_worker(args.limits, args.lease_size, args.threads, args.start_at, args.seconds)))
+        return 0
+
+    env = dict(os.environ, RIOT_RATE_STORE=args.store,
+               # Fresh bucket keys, so an earlier run's leases don't count
+               RIOT_API_KEY=f'rate-store-check-{uuid.uuid4().hex}')
+    store_path = os.path.join(BACKEND_DIR, f'.rate-store-check-{os.getpid()}.json')
+    server, store_checks = None, []
+    if args.store == 'file':
+        env['RIOT_RATE_STORE_PATH'] = store_path
+        target = store_path
+    else:
+        target = env.get('RIOT_RATE_REDIS_URL')
+        if not target:
+            started = start_redis_server()
+            if started is None:
+                print('redis: RIOT_RATE_REDIS_URL is unset and no redis-server is installed\n\nSKIPPED')
+                return 0
+            server, target = started
+            env['RIOT_RATE_REDIS_URL'] = target
+    try:
+        if args.store == 'redis':
+            store_checks = check_redis_store(target)
+        return run_check(args, env, target, store_path, store_checks)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def run_check(args: argparse.Namespace, env: Dict[str, str], target: str, store_path: str,
+              store_checks: List[Dict[str, Any]]) -> int:
+    """
+    Run the worker processes and check their sends against the limits.
+
+    Args:
+        args: Parsed command line
+        env: Worker environment (store settings, fresh API key)
+        target: Store URL or path, for the report
+        store_path: File store path to clean up
+        store_checks: Results of check_redis_store, reported alongside
+
+    Returns:
+        Exit code (0 when every check passed)
+    """
+    from services.riot_scheduler import parse_limits
+
+    start_at = time.time() + 2.0
+    cmd = [sys.executable, '-m', 'benchmarks.rate_store', '--worker', '--limits', args.limits,
+           '--lease-size', str(args.lease_size), '--threads', str(args.threads),
+           '--seconds', str(args.seconds), '--start-at', repr(start_at)]
+    procs = [subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              text=True) for _ in range(args.workers)]
+    workers = []
+    for proc in procs:
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"worker failed:\n{stderr[-2000:]}")
+        workers.append(json.loads(stdout.strip().splitlines()[-1]))
+    if os.path.exists(store_path):
+        os.remove(store_path)
+
+    limits = parse_limits(args.limits)
+    sends = [sent for worker in workers for sent in worker['sends']]
+    windows = check(sends, limits, args.jitter)
+    store = {key: sum(worker['store'][key] for worker in workers)
+             for key in ('roundTrips', 'leasedTokens', 'returnedTokens', 'errors')}
+    ok = (all(window['ok'] for window in windows) and store['errors'] == 0
+          and all(result['ok'] for result in store_checks))
+
+    for result in store_checks:
+        print(f"{result['check']:<10} {'ok' if result['ok'] else 'FAILED':<7} {result['observed']}")
+    if store_checks:
+        print()
+    print(f"{args.workers} workers x {args.threads} threads on {args.store} ({target}), "
+          f"limits {args.limits}, lease size {args.lease_size}, {args.seconds:g}s\n")
+    print(f"sends {len(sends)} ({len(sends) / args.seconds:.1f}/s), store round trips {store['roundTrips']}, "
+          f"leased {store['leasedTokens']}, handed back {store['returnedTokens']}, errors {store['errors']}\n")
+    print(f"{'limit':<10} {'busiest':>8} {'short window':>13} {'busiest':>8}  result")
+    for window in windows:
+        print(f"{window['limit']:<10} {window['busiestWindow']:>8} {window['shortWindowS']:>12g}s "
+              f"{window['busiestShortWindow']:>8}  {'ok' if window['ok'] else 'EXCEEDED'}")
+    if store['errors']:
+        print(f"\nThe store failed {store['errors']}x; those requests were admitted on local limits only")
+    print(f"\n{'PASS' if ok else 'FAIL'}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'suite': 'rate_store', 'config': vars(args), 'ok': ok, 'store': store,
+                       'storeChecks': store_checks, 'windows': windows}, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Response Encoding Micro-Benchmark
+=================================
+Size and encode time of a completed session's get_session response, the
+largest body the API sends (the whole analytics plus humor):
+
+    double-json   json.dumps in create_response, then jsonify of that string
+                  (what server.py used to send: a JSON-encoded string)
+    json          one stdlib json.dumps of the native body
+    orjson        one orjson.dumps (services.json_codec.dumps, if installed)
+
+then each content coding services.http_response can negotiate (gzip at a
+few levels, brotli if installed) applied to the single-encoded bytes.
+
+The session is built offline: synthetic matches -> calculate_all() ->
+analytics.json and humor in the S3 fake -> RiftRewindAPI.get_session().
+
+Usage (from backend/):
+    python -m benchmarks.responses
+    python -m benchmarks.responses --matches 1000 --repeat 20 --output responses.json
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from services import http_response
+from services.json_codec import DECODER_NAME, dumps
+
+
+def build_session_body(matches: int, seed: int) -> Dict[str, Any]:
+    """
+    get_session body of a completed synthetic session.
+
+    Args:
+        matches: Matches in the player's history
+        seed: SyntheticWorld seed
+
+    Returns:
+        Native response body
+    """
+    from benchmarks.fakes import FakeS3
+    from services import aws_clients
+    from services.analytics import RiftRewindAnalytics
+    from services.match_projection import project_match
+    from stubs.synthetic_history import SyntheticWorld
+
+    world = SyntheticWorld(seed=seed)
+    player = world.add_player('ResponseBench', 'BNCH', 'na1', match_count=matches)
+    raw_data = {
+        'account': {'puuid': player.puuid, 'gameName': player.game_name, 'tagLine': player.tag_line},
+        'summoner': {'summonerLevel': player.summoner_level, 'profileIconId': player.profile_icon_id},
+        'ranked': {},
+        'matches': [project_match(world.match_payload(match_id), player.puuid)
+                    for _, match_id, _ in player.history[:matches]],
+        'puuid': player.puuid,
+        'metadata': {'region': 'na1'},
+    }
+    analytics = RiftRewindAnalytics(raw_data).calculate_all()
+    analytics['playerInfo'] = {'gameName': player.game_name, 'tagLine': player.tag_line, 'region': 'na1',
+                               'summonerLevel': player.summoner_level, 'profileIconId': player.profile_icon_id}
+
+    aws_clients._s3_client = FakeS3()
+    session_id = 'response-bench'
+    aws_clients.upload_to_s3(f"sessions/{session_id}/analytics.json", analytics)
+    for slide_num in range(2, 16):
+        aws_clients.upload_to_s3(f"sessions/{session_id}/humor/slide_{slide_num}.json", {
+            'humorText': f"Slide {slide_num}: " + 'a suitably roasting line of commentary ' * 4,
+        })
+
+    from api import RiftRewindAPI
+    return RiftRewindAPI().get_session(session_id)['body']
+
+
+def _time(fn: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = fn()
+        timings.append(time.perf_counter() - start)
+    return {'bytes': len(data), 'ms': round(statistics.median(timings) * 1000, 3)}
+
+
+def run(body: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    serializers = {
+        'double-json': lambda: json.dumps(json.dumps(body)).encode('utf-8'),
+        'json': lambda: json.dumps(body, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+    }
+    if DECODER_NAME == 'orjson':
+        serializers['orjson'] = lambda: dumps(body)
+    serialized = {name: _time(fn, repeat) for name, fn in serializers.items()}
+
+    data = dumps(body)
+    codings = {
+        'gzip-1': lambda: gzip.compress(data, compresslevel=1, mtime=0),
+        f'gzip-{http_response.GZIP_LEVEL}': lambda: http_response.compress(data, 'gzip'),
+        'gzip-9': lambda: gzip.compress(data, compresslevel=9, mtime=0),
+    }
+    if http_response.brotli is not None:
+        codings[f'br-{http_response.BROTLI_QUALITY}'] = lambda: http_response.compress(data, 'br')
+        codings['br-11'] = lambda: http_response.brotli.compress(data, quality=11)
+    compressed = {name: _time(fn, repeat) for name, fn in codings.items()}
+    for result in compressed.values():
+        result['ratio'] = round(len(data) / result['bytes'], 2)
+
+    return {
+        'suite': 'responses',
+        'python': sys.version.split()[0],
+        'cpus': os.cpu_count(),
+        'encoder': DECODER_NAME,
+        'repeat': repeat,
+        'serialize': serialized,
+        'compress': compressed,
+        # What a browser sending 'gzip, deflate, br' gets from to_api_gateway / server.py
+        'negotiated': _time(lambda: http_response.encode_response(
+            {'statusCode': 200, 'headers': {}, 'body': body}, 'gzip, deflate, br')[2], repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='get_session response encoding micro-benchmark')
+    parser.add_argument('--matches', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1337)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    body = build_session_body(args.matches, args.seed)
+    result = run(body, args.repeat)
+    result['matches'] = args.matches
+
+    print(f"get_session body, {args.matches} matches, {result['cpus']} CPU(s), median of {result['repeat']}\n")
+    print(f"{'serialize':<14} {'bytes':>10} {'ms':>9}")
+    for name, r in result['serialize'].items():
+        print(f"{name:<14} {r['bytes']:>10} {r['ms']:>9.3f}")
+    print(f"\n{'compress':<14} {'bytes':>10} {'ms':>9} {'ratio':>7}")
+    for name, r in result['compress'].items():
+        print(f"{name:<14} {r['bytes']:>10} {r['ms']:>9.3f} {r['ratio']:>6.2f}x")
+    negotiated = result['negotiated']
+    print(f"\nnegotiated (gzip, deflate, br): {negotiated['bytes']} bytes in {negotiated['ms']:.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
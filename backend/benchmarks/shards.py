@@ -0,0 +1,135 @@
+"""
+Sharded Fetch Benchmark
+=======================
+Processor wall time for one long history fetched serially vs split across
+shard workers (lambdas/match_shards.py, local process pool), against the
+stub with per-request latency.
+
+A single processor tops out at its 10 fetch threads / round-trip latency;
+shards multiply that until the shared rate budget (RIOT_API_RATE_LIMITS,
+shared across workers through RIOT_RATE_STORE=file) is the bottleneck.
+
+Usage (from backend/):
+    python -m benchmarks.shards
+    python -m benchmarks.shards --matches 1200 --shard-size 300 --rate-limits 20:1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Any
+
+from benchmarks.pipeline import BACKEND_DIR, _free_port
+
+
+def run_mode(mode: str, matches: int, shard_size: int, latency_ms: float, rate_limits: str,
+             seed: int) -> Dict[str, Any]:
+    """
+    Run one rewind through the processor in this interpreter.
+
+    Args:
+        mode: 'serial' or 'sharded'
+        matches: Ranked games of the synthetic player
+        shard_size: PROCESSOR_SHARD_MATCHES for the sharded mode
+        latency_ms: Stub latency per request
+        rate_limits: RIOT_API_RATE_LIMITS (shared by all workers)
+        seed: Synthetic world seed
+
+    Returns:
+        Processor wall time and Riot request counts
+    """
+    port = _free_port()
+    os.environ['RIOT_API_PLATFORM_BASE'] = f'http://127.0.0.1:{port}/{{platform}}'
+    os.environ['RIOT_API_REGIONAL_BASE'] = f'http://127.0.0.1:{port}/{{regional}}'
+    os.environ['RIOT_API_KEY'] = 'bench-key'
+    os.environ['RIOT_API_RATE_LIMITS'] = rate_limits
+    os.environ['PROCESSOR_SHARD_MATCHES'] = str(shard_size if mode == 'sharded' else 0)
+    os.environ['PROCESSOR_SHARD_DISPATCH'] = 'local'
+    os.environ['RIOT_RATE_STORE_PATH'] = os.path.join(BACKEND_DIR, f'.bench-riot-rate-{port}.json')
+
+    import boto3
+    from stubs import RiotStub, StubConfig, SyntheticWorld, run_server
+    from benchmarks.fakes import FakeS3, FakeLambda
+    from services import aws_clients
+    from services.llm_client import StubLLMClient, set_llm_client
+
+    world = SyntheticWorld(seed=seed)
+    player = world.add_player('ShardWhale', 'BIG', 'na1', match_count=matches)
+    stub = RiotStub(world, StubConfig(app_rate_limit=rate_limits, latency_ms=latency_ms, seed=seed))
+    server = run_server(stub, port=port, background=True)
+
+    lambda_client = FakeLambda()
+    aws_clients._s3_client = FakeS3()
+    set_llm_client(StubLLMClient(seed=seed))
+    fakes = {'s3': aws_clients._s3_client, 'lambda': lambda_client}
+    boto3.client = lambda service_name=None, *args, **kwargs: fakes[service_name]
+
+    from api import RiftRewindAPI
+    from lambdas import processor
+
+    RiftRewindAPI().start_rewind(player.game_name, player.tag_line, player.platform, force_refresh=True)
+    event = lambda_client.invocations[-1]['payload']
+    started = time.perf_counter()
+    status = processor.lambda_handler(event, None)['status']
+    wall_s = time.perf_counter() - started
+    server.shutdown()
+    if os.path.exists(os.environ['RIOT_RATE_STORE_PATH']):
+        os.remove(os.environ['RIOT_RATE_STORE_PATH'])
+
+    analytics = json.loads(aws_clients.download_from_s3(f"sessions/{event['session_id']}/analytics.json"))
+    return {
+        'mode': mode,
+        'status': status,
+        'wall_s': round(wall_s, 3),
+        'games_analyzed': analytics.get('slide2_timeSpent', {}).get('totalGames'),
+        'match_requests': stub.stats['by_method'].get('match_by_id', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded fetch benchmark')
+    parser.add_argument('--matches', type=int, default=600)
+    parser.add_argument('--shard-size', type=int, default=150)
+    parser.add_argument('--latency-ms', type=float, default=500.0)
+    parser.add_argument('--rate-limits', default='200:1', help='RIOT_API_RATE_LIMITS shared by the workers')
+    parser.add_argument('--seed', type=int, default=1337)
+    parser.add_argument('--mode', choices=['serial', 'sharded'], help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args()
+
+    if args.mode:
+        # Child: one mode, result on the last stdout line
+        import logging
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(run_mode(args.mode, args.matches, args.shard_size, args.latency_ms,
+                                  args.rate_limits, args.seed)))
+        return 0
+
+    results = {}
+    for mode in ('serial', 'sharded'):
+        cmd = [sys.executable, '-m', 'benchmarks.shards', '--mode', mode, '--matches', str(args.matches),
+               '--shard-size', str(args.shard_size), '--latency-ms', str(args.latency_ms),
+               '--rate-limits', args.rate_limits, '--seed', str(args.seed)]
+        proc = subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{mode} failed:\n{proc.stderr[-2000:]}")
+        results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print(f"{args.matches} matches, {args.latency_ms:g}ms stub latency, shard size {args.shard_size}, "
+          f"limits {args.rate_limits}\n")
+    print(f"{'mode':<9} {'wall s':>8} {'match calls':>12} {'games':>6}  status")
+    for mode, r in results.items():
+        print(f"{mode:<9} {r['wall_s']:>8.2f} {r['match_requests']:>12} {r['games_analyzed']:>6}  {r['status']}")
+    print(f"\nSharded: {results['serial']['wall_s'] / results['sharded']['wall_s']:.2f}x faster")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'suite': 'shards', 'config': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
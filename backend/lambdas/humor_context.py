@@ -17,7 +17,9 @@ from typing import Dict, Any, Optional
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-from services.aws_clients import get_bedrock_client, download_from_s3, upload_to_s3
+from services.aws_clients import download_from_s3, upload_to_s3
+from services.llm_client import get_llm_client
+from services.tracing import traced, current_span
 
 SYSTEM_PROMPT = """
 You are a toxic, sarcastic, and brutally honest League of Legends streamer reviewing a player's year-in-review. 
@@ -223,12 +225,10 @@ class HumorGenerator:
     Generates AI humor for Rift Rewind slides using Bedrock.
     """
     
-    def __init__(self):
-        self.bedrock_client = get_bedrock_client()
-        self.model_id = os.environ.get(
-            'BEDROCK_MODEL_ID', 
-            'us.meta.llama3-1-70b-instruct-v1:0'  # Cross-region inference profile
-        )
+    def __init__(self, llm_client=None):
+        # Bedrock by default; LLM_CLIENT=stub swaps in the local stand-in
+        self.llm_client = llm_client or get_llm_client()
+        self.model_id = self.llm_client.model_id
     
     def download_analytics(self, session_id: str) -> Dict[str, Any]:
         """
@@ -485,32 +485,14 @@ class HumorGenerator:
             Generated humor text
         """
         
-        # Meta Llama 3.1 chat template
-        llama_prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-{SYSTEM_PROMPT}<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>
-
-"""
-        
-        request_body = {
-            "prompt": llama_prompt,
-            "max_gen_len": 100,  
-            "temperature": 0.9,  
-            "top_p": 0.95  
-        }
-        
-        # Invoke Bedrock
-        response = self.bedrock_client.invoke_model(
-            modelId=self.model_id,
-            body=json.dumps(request_body)
+        humor_text = self.llm_client.complete(
+            prompt,
+            system=SYSTEM_PROMPT,
+            max_tokens=100,
+            temperature=0.9,
+            top_p=0.95
         )
         
-        # Parse response
-        response_body = json.loads(response['body'].read())
-        humor_text = response_body.get('generation', '').strip()
-        
         # Clean up any quotes or extra formatting
         humor_text = humor_text.strip('"').strip("'").strip()
         
@@ -566,6 +548,7 @@ class HumorGenerator:
         upload_to_s3(s3_key, data)
         logger.info(f"Stored humor for session {session_id} slide {slide_number} (headline: {headline})")
     
+    @traced('humor.generate', level=logging.INFO)
     def generate(self, session_id: str, slide_number: int) -> Dict[str, Any]:
         """
         Generate humor for a specific slide.
@@ -577,6 +560,7 @@ class HumorGenerator:
         Returns:
             Result dict with humor text
         """
+        current_span().set(slide=slide_number)
         
         # Step 1: Download analytics
         analytics = self.download_analytics(session_id)
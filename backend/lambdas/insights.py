@@ -19,7 +19,9 @@ from datetime import datetime
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-from services.aws_clients import get_bedrock_client, download_from_s3, upload_to_s3
+from services.aws_clients import download_from_s3, upload_to_s3
+from services.llm_client import get_llm_client
+from services.tracing import traced, current_span
 
 
 class InsightsGenerator:
@@ -27,14 +29,10 @@ class InsightsGenerator:
     Generates actionable coaching insights using Bedrock.
     """
     
-    def __init__(self):
-        self.bedrock_client = get_bedrock_client()
-        # Use inference profile ARN for Llama models (required for cross-region inference)
-        # OR use Claude if Llama inference profile not available
-        self.model_id = os.environ.get(
-            'BEDROCK_MODEL_ID',
-            'us.meta.llama3-1-70b-instruct-v1:0'  # Cross-region inference profile
-        )
+    def __init__(self, llm_client=None):
+        # Bedrock by default; LLM_CLIENT=stub swaps in the local stand-in
+        self.llm_client = llm_client or get_llm_client()
+        self.model_id = self.llm_client.model_id
     
     def download_analytics(self, session_id: str) -> Dict[str, Any]:
         """
@@ -203,30 +201,16 @@ A vision score of 40+ is GOOD - don't roast it! Instead focus on deaths, KDA, ch
 Be data-driven and specific. If someone has good stats in an area, acknowledge it and find REAL weaknesses elsewhere.
 Respond ONLY with valid JSON - no other text."""
                 
-                llama_prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>
-
-"""
-                
-                request_body = {
-                    "prompt": llama_prompt,
-                    "max_gen_len": 1500,
-                    "temperature": 0.7,
-                    "top_p": 0.9
-                }
-                
-                # Invoke Bedrock
-                response = self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=json.dumps(request_body)
+                current_span().set(attempts=attempt + 1)
+                insights_text = self.llm_client.complete(
+                    prompt,
+                    system=system_prompt,
+                    max_tokens=1500,
+                    temperature=0.7,
+                    top_p=0.9,
+                    response_format='json'
                 )
                 
-                response_body = json.loads(response['body'].read())
-                insights_text = response_body.get('generation', '').strip()
-                
                 # Log the raw AI response for debugging
                 logger.info(f"==> Bedrock raw response (attempt {attempt + 1}):")
                 logger.info(f"    Full response length: {len(insights_text)} chars")
@@ -412,6 +396,7 @@ Respond ONLY with valid JSON - no other text."""
         logger.info(f"Storing insights to S3: {s3_key}")
         upload_to_s3(s3_key, data)
     
+    @traced('insights.generate', level=logging.INFO)
     def generate(self, session_id: str) -> Dict[str, Any]:
         """
         Generate insights for a session.
@@ -0,0 +1,51 @@
+"""
+Ladder Refresh Lambda
+---------------------
+Scheduled (e.g. an EventBridge rule every few hours) to page the League-V4
+tier/division ladders of each region into S3 snapshots, so leaderboard
+positions during sessions are a lookup (see services/ladder_snapshot.py).
+
+Expected event (all optional):
+{
+  "regions": ["na1", "euw1"],      # default: LADDER_REGIONS env, else na1
+  "queue": "RANKED_SOLO_5x5",
+  "tiers": ["GOLD", "PLATINUM"],   # default: all tiers
+  "force": false                   # refresh even if the stored snapshot is fresh
+}
+"""
+import logging
+import os
+from typing import Any, Dict
+
+from services.constants import VALID_PLATFORMS
+from services.ladder_snapshot import get_ladder_service, DEFAULT_QUEUE
+from services.tracing import start_trace
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def lambda_handler(event: Dict[str, Any], context: Any):
+    event = event or {}
+    regions = event.get('regions') or [
+        r.strip() for r in os.environ.get('LADDER_REGIONS', 'na1').split(',') if r.strip()
+    ]
+    queue = event.get('queue', DEFAULT_QUEUE)
+    service = get_ladder_service()
+
+    results = {}
+    with start_trace('ladder_refresh', regions=','.join(regions)):
+        for region in regions:
+            if region not in VALID_PLATFORMS:
+                logger.warning(f' Skipping unknown region: {region}')
+                continue
+            try:
+                results[region] = service.refresh_region(
+                    region, queue, tiers=event.get('tiers'), stale_only=not event.get('force', False)
+                )
+                logger.info(f' Refreshed {len(results[region])} ladders for {region}')
+            except Exception as e:
+                logger.exception(f' Ladder refresh failed for {region}: {e}')
+                results[region] = {'error': str(e)}
+
+    return {'status': 'ok', 'ladders': results}
@@ -12,6 +12,7 @@ Timeout: 5 minutes
 
 import os
 import json
+import functools
 import uuid
 import logging
 from datetime import datetime
@@ -25,7 +26,10 @@ from services.aws_clients import upload_to_s3
 from services.validators import validate_riot_id, validate_region
 from services.constants import PLATFORM_TO_REGIONAL, SEASON_14_START_TIMESTAMP
 from services.match_analyzer import IntelligentSampler
+from services.match_histogram import fetch_monthly_histogram, restrict_histogram, histogram_counts
 from services.session_manager import SessionManager
+from services.tracing import traced
+from services.match_projection import project_match, project_for_players, fetch_raw_match
 
 
 class LeagueDataFetcher:
@@ -41,7 +45,10 @@ class LeagueDataFetcher:
         self.session_id = None
         self.data = {}
         self.sampling_metadata = {}
+        self.month_buckets = None  # Month -> match IDs, from fetch_match_histogram
         self.checkpoint_batch_size = 100  # Matches per checkpoint
+        # Keep slim match records instead of full Match-V5 payloads (MATCH_PROJECTION=full to disable)
+        self.project_matches = os.getenv('MATCH_PROJECTION', 'slim').lower() != 'full'
     
     def validate_input(self, game_name: str, tag_line: str, region: str) -> Dict[str, Any]:
         """
@@ -72,6 +79,7 @@ class LeagueDataFetcher:
             'errors': errors
         }
     
+    @traced('fetch.account', level=logging.INFO)
     def fetch_account_data(self, game_name: str, tag_line: str, region: str) -> Dict[str, Any]:
         """
         Fetch account data using ACCOUNT-V1 API (Riot ID lookup).
@@ -108,6 +116,7 @@ class LeagueDataFetcher:
         logger.info(f" Account found - PUUID: {account_data.get('puuid')[:10]}...")
         return account_data
     
+    @traced('fetch.summoner', level=logging.INFO)
     def fetch_summoner_data(self, puuid: str, region: str) -> Dict[str, Any]:
         """
         Fetch summoner data using SUMMONER-V4 API.
@@ -139,6 +148,7 @@ class LeagueDataFetcher:
         logger.info(f" Summoner Level: {summoner_data.get('summonerLevel')}")
         return summoner_data
     
+    @traced('fetch.ranked', level=logging.INFO)
     def fetch_ranked_info(self, puuid: str, region: str) -> Dict[str, Any]:
         """
         Fetch ranked information using LEAGUE-V4 API (by PUUID).
@@ -182,6 +192,7 @@ class LeagueDataFetcher:
         
         return league_entries
     
+    @traced('fetch.match_ids', level=logging.INFO)
     def fetch_match_history(self, puuid: str, region: str, start_time: Optional[int] = None) -> List[str]:
         """
         Fetch match IDs using MATCH-V5 API for the full year.
@@ -301,6 +312,36 @@ class LeagueDataFetcher:
         
         return all_match_ids
     
+    @traced('fetch.match_histogram', level=logging.INFO)
+    def fetch_match_histogram(self, puuid: str, region: str, match_ids: Optional[List[str]] = None,
+                              start_time: Optional[int] = None) -> Optional[Dict[str, List[str]]]:
+        """
+        Bucket the player's match IDs by month (no match details fetched).
+        
+        The buckets stratify later sampling, and their counts are stored as
+        data['matchesByMonth'] for the progress slide.
+        
+        Args:
+            puuid: Player PUUID
+            region: Platform region
+            match_ids: Ranked match IDs to bucket (default: data['matchIds'])
+            start_time: Unix timestamp of the first month (default: season start)
+        
+        Returns:
+            Month key -> match IDs, or None if the histogram couldn't be built
+        """
+        if match_ids is None:
+            match_ids = self.data.get('matchIds', [])
+        histogram = fetch_monthly_histogram(
+            self.riot_client, puuid, region,
+            start_time=start_time if start_time is not None else SEASON_14_START_TIMESTAMP
+        )
+        self.month_buckets = restrict_histogram(histogram, match_ids) if histogram is not None else None
+        if self.month_buckets is not None:
+            self.data['matchesByMonth'] = histogram_counts(self.month_buckets)
+        return self.month_buckets
+    
+    @traced('fetch.match_details', level=logging.INFO)
     def fetch_match_details_batch(self, match_ids: List[str], region: str, use_sampling: bool = True) -> List[Dict[str, Any]]:
         """
         Fetch match details using intelligent sampling for efficiency.
@@ -319,7 +360,7 @@ class LeagueDataFetcher:
         if use_sampling and total_matches > 0:
             logger.info(f"[5/6] Applying intelligent sampling...")
             
-            sampling_result = self.sampler.sample_matches(match_ids)
+            sampling_result = self.sampler.sample_matches(match_ids, self.month_buckets)
             sampled_ids = sampling_result['sampled_match_ids']
             
             # Store sampling metadata
@@ -359,7 +400,8 @@ class LeagueDataFetcher:
             match_ids=match_ids_to_fetch,
             platform=region,
             batch_size=10,  # 10 parallel workers
-            parallel=True   # Enable parallel processing
+            parallel=True,  # Enable parallel processing
+            transform=self._match_transform()  # Project to slim records as they arrive
         )
         
         self.data['matches'] = matches
@@ -370,6 +412,151 @@ class LeagueDataFetcher:
         
         return matches
     
+    def fetch_match_details_progressive(
+        self,
+        match_ids: List[str],
+        region: str,
+        on_update=None,
+        refine_chunks: int = 3,
+        first_look: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch every match, sample first, reporting progress as it converges.
+
+        1. Fetch the IntelligentSampler's stratified sample, its first
+           `first_look` evenly spread matches first.
+        2. on_update(matches, sampler) so approximate slides can be published.
+        3. Fetch the rest in refine_chunks chunks that each span the whole
+           history, calling on_update after each, until the set is complete.
+
+        Args:
+            match_ids: All match IDs (most recent first)
+            region: Platform region
+            on_update: Optional callback(matches fetched so far, sampler), not
+                called for the final, complete set
+            refine_chunks: Refinement rounds after the sample
+            first_look: Matches in the earliest update (0 = whole sample)
+
+        Returns:
+            All match details in match ID order (same as fetch_match_details_batch)
+        """
+        sampling_result = self.sampler.sample_matches(match_ids, self.month_buckets)
+        sampled_ids = sampling_result['sampled_match_ids']
+        sampled = set(sampled_ids)
+        remaining_ids = [mid for mid in match_ids if mid not in sampled]
+        rounds = [sampled_ids]
+        if 0 < first_look < len(sampled_ids):
+            first_ids = self.sampler.select_samples_from_month(sampled_ids, first_look)
+            first = set(first_ids)
+            rounds = [first_ids, [mid for mid in sampled_ids if mid not in first]]
+        rounds += self.sampler.refinement_chunks(remaining_ids, refine_chunks)
+        logger.info(f" Progressive fetch: sample of {len(sampled_ids)}/{len(match_ids)} "
+                    f"({sampling_result['metadata']['sampling_tier']}), {len(rounds)} rounds")
+
+        fetched: List[Dict[str, Any]] = []
+        for round_num, round_ids in enumerate(rounds):
+            fetched.extend(self.riot_client.get_matches_batch(
+                match_ids=round_ids,
+                platform=region,
+                batch_size=10,
+                parallel=True,
+                transform=self._match_transform()
+            ))
+            if on_update and round_num < len(rounds) - 1:
+                try:
+                    on_update(fetched, self.sampler)
+                except Exception as e:
+                    logger.warning(f" Progressive update failed: {e}")
+
+        order = {mid: i for i, mid in enumerate(match_ids)}
+        matches = sorted(fetched, key=lambda m: order.get(m.get('metadata', {}).get('matchId'), len(order)))
+
+        self.sampling_metadata = {
+            'total_matches': len(match_ids),
+            'sample_count': len(match_ids),
+            'sample_percentage': 100.0,
+            'sampling_tier': 'Progressive (sample first)',
+            'statistical_confidence': 'Complete',
+            'is_full_analysis': True,
+            'monthly_breakdown': sampling_result['monthly_breakdown']
+        }
+        self.data['matches'] = matches
+        self.data['allMatchIds'] = match_ids
+        self.data['sampledMatchIds'] = sampled_ids
+
+        logger.info(f" Retrieved {len(matches)}/{len(match_ids)} match details")
+        return matches
+
+    def fetch_group_match_details(
+        self,
+        match_ids_by_puuid: Dict[str, List[str]],
+        region: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch a friend group's matches once and fan each out to every member in it.
+        
+        Games the members played together are fetched a single time (the union of
+        their match IDs) and projected per member in the worker thread.
+        
+        Args:
+            match_ids_by_puuid: Each member's match IDs (from fetch_match_history)
+            region: Platform region
+        
+        Returns:
+            Dict of puuid -> that member's matches, in their match ID order
+        """
+        union_ids = list(dict.fromkeys(mid for ids in match_ids_by_puuid.values() for mid in ids))
+        requested = sum(len(ids) for ids in match_ids_by_puuid.values())
+        logger.info(f"Fetching {len(union_ids)} unique matches for {len(match_ids_by_puuid)} members "
+                    f"({requested} member matches, {requested - len(union_ids)} shared fetches saved)")
+        
+        transform = functools.partial(project_for_players, puuids=tuple(match_ids_by_puuid),
+                                      project=self.project_matches)
+        records = self.riot_client.get_matches_batch(
+            match_ids=union_ids,
+            platform=region,
+            batch_size=10,
+            parallel=True,
+            transform=transform
+        )
+        
+        by_match_id = {}
+        for per_member in records:
+            any_record = next(iter(per_member.values()))
+            by_match_id[any_record.get('metadata', {}).get('matchId')] = per_member
+        
+        return {
+            puuid: [by_match_id[mid][puuid] for mid in ids if puuid in by_match_id.get(mid, {})]
+            for puuid, ids in match_ids_by_puuid.items()
+        }
+    
+    def _match_transform(self):
+        """
+        Per-match projection for get_matches_batch.
+        
+        Returns:
+            Callable reducing a Match-V5 payload to the slim record, or None
+            when projection is disabled or the player's PUUID is unknown
+        """
+        puuid = self.data.get('account', {}).get('puuid')
+        if not self.project_matches or not puuid:
+            return None
+        # partial (not a lambda) so it can be shipped to the decode process pool
+        return functools.partial(project_match, puuid=puuid)
+    
+    def fetch_raw_match(self, match_id: str, region: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the full Match-V5 payload behind a slim record on demand.
+        
+        Args:
+            match_id: Match ID
+            region: Platform code
+        
+        Returns:
+            Full match payload or None
+        """
+        return fetch_raw_match(self.riot_client, match_id, region)
+    
     def store_to_s3(self) -> str:
         """
         Store collected data to S3 with sampling metadata.
@@ -469,7 +656,8 @@ class LeagueDataFetcher:
                 match_ids=batch_ids,
                 platform=region,
                 batch_size=10,
-                parallel=True
+                parallel=True,
+                transform=self._match_transform()
             )
             
             all_matches.extend(batch_matches)
@@ -606,7 +794,8 @@ class LeagueDataFetcher:
                 match_ids=batch_ids,
                 platform=region,
                 batch_size=10,
-                parallel=True
+                parallel=True,
+                transform=self._match_transform()
             )
             
             all_analyzed_ids.extend(batch_ids)
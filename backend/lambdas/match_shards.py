@@ -0,0 +1,276 @@
+"""
+Sharded Match Fetching
+----------------------
+Map-reduce split of one player's match history across processor
+invocations, so a 3000-match history isn't fetched inside a single
+processor's timeout.
+
+    coordinator  processor run that finds more than PROCESSOR_SHARD_MATCHES
+                 IDs: plan_shards() and dispatch_shards()
+    worker       fetches one shard's matches (slim records) and writes them
+                 as its partial: sessions/{id}/shards/{index}.json
+    reducer      merge_partials() in match-ID order, then the normal
+                 analytics/humor/insights pipeline over the merged list
+
+Dispatch (PROCESSOR_SHARD_DISPATCH):
+    lambda  one async ('Event') processor invoke per shard; the worker that
+            completes the set claims the reduce (default on AWS Lambda)
+    local   a spawn process pool; the coordinator reduces (default elsewhere)
+
+Workers share the app rate limit through RiotRequestScheduler; run them with
+RIOT_RATE_STORE=redis (lambda) or file (local, set automatically) so N
+workers don't each assume the full budget.
+
+A failed lambda worker raises so Lambda retries the invoke; the session
+stays 'analyzing' until PROCESSOR_SHARD_ATTEMPTS attempts have failed
+(record_shard_failure counts them in S3, since async invokes don't carry
+their attempt number).
+
+Worker event:
+{
+  "shard": {"session_id", "raw_data_s3_key", "game_name", "tag_line", "region",
+            "puuid", "index", "count", "match_ids": [...]}
+}
+"""
+import concurrent.futures
+import concurrent.futures.process
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.aws_clients import upload_to_s3, download_from_s3, delete_from_s3, list_s3_keys
+
+logger = logging.getLogger(__name__)
+
+# Histories longer than this are sharded (0 disables sharding)
+SHARD_MATCHES = int(os.environ.get('PROCESSOR_SHARD_MATCHES', '600'))
+MAX_SHARDS = int(os.environ.get('PROCESSOR_MAX_SHARDS', '8'))
+# Attempts per async shard invoke: 1 + the function's MaximumRetryAttempts (Lambda default 2)
+SHARD_ATTEMPTS = int(os.environ.get('PROCESSOR_SHARD_ATTEMPTS', '3'))
+# Seconds between writing a reduce claim and reading it back
+CLAIM_SETTLE_SECONDS = 0.5
+
+
+def dispatch_mode() -> str:
+    """'lambda' on AWS Lambda, 'local' elsewhere, unless PROCESSOR_SHARD_DISPATCH is set."""
+    default = 'lambda' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'local'
+    return os.environ.get('PROCESSOR_SHARD_DISPATCH', default).lower()
+
+
+def plan_shards(match_ids: List[str], shard_size: int = SHARD_MATCHES,
+                max_shards: int = MAX_SHARDS) -> List[List[str]]:
+    """
+    Split match IDs into contiguous, evenly sized shards.
+
+    Args:
+        match_ids: All match IDs (most recent first)
+        shard_size: Target matches per shard (0 = never shard)
+        max_shards: Upper bound on shards (larger shards beyond it)
+
+    Returns:
+        List of shards; a single shard means "don't shard"
+    """
+    if shard_size <= 0 or len(match_ids) <= shard_size:
+        return [match_ids]
+    count = min(max_shards, math.ceil(len(match_ids) / shard_size))
+    size = math.ceil(len(match_ids) / count)
+    return [match_ids[i:i + size] for i in range(0, len(match_ids), size)]
+
+
+def shard_prefix(session_id: str) -> str:
+    return f"sessions/{session_id}/shards/"
+
+
+def shard_events(base_event: Dict[str, Any], puuid: str, shards: List[List[str]]) -> List[Dict[str, Any]]:
+    """
+    Worker events for a coordinator's shards.
+
+    Args:
+        base_event: The coordinator's processor event
+        puuid: Player PUUID (to project each match to the player's record)
+        shards: Output of plan_shards
+
+    Returns:
+        One {'shard': {...}} event per shard
+    """
+    return [{
+        'shard': {
+            'session_id': base_event['session_id'],
+            'raw_data_s3_key': base_event['raw_data_s3_key'],
+            'game_name': base_event.get('game_name'),
+            'tag_line': base_event.get('tag_line'),
+            'region': base_event.get('region'),
+            'puuid': puuid,
+            'index': index,
+            'count': len(shards),
+            'match_ids': match_ids,
+        }
+    } for index, match_ids in enumerate(shards)]
+
+
+def run_shard(shard: Dict[str, Any], store: bool = True) -> Dict[str, Any]:
+    """
+    Worker: fetch one shard's matches.
+
+    Args:
+        shard: The 'shard' object of a worker event
+        store: Write the partial to S3 (lambda dispatch); local workers
+            return it to the coordinator instead
+
+    Returns:
+        Partial: {'index', 'count', 'matchIds', 'matches', 'failed', 'elapsedS'}
+    """
+    from lambdas.league_data import LeagueDataFetcher  # after any worker env setup
+
+    started = time.perf_counter()
+    fetcher = LeagueDataFetcher()
+    fetcher.data = {'account': {'puuid': shard['puuid']}}
+    matches = fetcher.fetch_match_details_batch(shard['match_ids'], shard['region'], use_sampling=False)
+    partial = {
+        'index': shard['index'],
+        'count': shard['count'],
+        'matchIds': shard['match_ids'],
+        'matches': matches,
+        'failed': len(shard['match_ids']) - len(matches),
+        'elapsedS': round(time.perf_counter() - started, 3),
+    }
+    logger.info(f" Shard {shard['index'] + 1}/{shard['count']}: {len(matches)}/{len(shard['match_ids'])} "
+                f"matches in {partial['elapsedS']}s")
+    if store:
+        upload_to_s3(f"{shard_prefix(shard['session_id'])}{shard['index']:03d}.json", partial)
+    return partial
+
+
+def record_shard_failure(shard: Dict[str, Any]) -> int:
+    """
+    Count a failed attempt of a lambda shard worker.
+
+    Args:
+        shard: The 'shard' object of the failed worker's event
+
+    Returns:
+        Attempts failed so far (compare with SHARD_ATTEMPTS)
+    """
+    # Not a digit-prefixed name, so collect_partials doesn't take it for a partial
+    key = f"{shard_prefix(shard['session_id'])}failed-{shard['index']:03d}.json"
+    body = download_from_s3(key)
+    attempts = (json.loads(body).get('attempts', 0) if body else 0) + 1
+    upload_to_s3(key, {'attempts': attempts, 'failedAt': time.time()})
+    return attempts
+
+
+def _init_local_worker(env: Dict[str, str]):
+    os.environ.update(env)
+    logging.basicConfig(level=logging.WARNING)
+
+
+def dispatch_shards(events: List[Dict[str, Any]], mode: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Start one worker per shard.
+
+    Args:
+        events: Output of shard_events
+        mode: 'lambda' or 'local' (default: dispatch_mode())
+
+    Returns:
+        Partials (local: workers ran to completion) or None (lambda: the
+        workers reduce when the last one finishes)
+    """
+    mode = mode or dispatch_mode()
+    if mode == 'lambda':
+        import boto3
+        lambda_client = boto3.client('lambda')
+        processor_name = os.getenv('PROCESSOR_LAMBDA_NAME', 'rift-rewind-processor')
+        for event in events:
+            lambda_client.invoke(
+                FunctionName=processor_name,
+                InvocationType='Event',
+                Payload=json.dumps(event).encode('utf-8')
+            )
+        logger.info(f" Dispatched {len(events)} shard workers to '{processor_name}'")
+        return None
+
+    # Fresh interpreters (spawn) so each worker builds its scheduler from the
+    # env below: workers on one host share the budget through the file store
+    env = {'RIOT_RATE_STORE': os.environ.get('RIOT_RATE_STORE', 'file')}
+    if env['RIOT_RATE_STORE'] == 'local':
+        env['RIOT_RATE_STORE'] = 'file'
+    workers = min(len(events), int(os.environ.get('PROCESSOR_LOCAL_SHARD_WORKERS', len(events))))
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                                    initializer=_init_local_worker, initargs=(env,)) as pool:
+            return list(pool.map(run_shard, [event['shard'] for event in events], [False] * len(events)))
+    except (OSError, concurrent.futures.process.BrokenProcessPool) as e:
+        logger.warning(f" Shard process pool unavailable ({e!r}), fetching shards in-process")
+        return [run_shard(event['shard'], store=False) for event in events]
+
+
+def collect_partials(session_id: str, count: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    All partials of a session's shards, if every worker has written one.
+
+    Returns:
+        Partials, or None while some are missing
+    """
+    keys = [key for key in list_s3_keys(shard_prefix(session_id)) if key.rsplit('/', 1)[-1][:3].isdigit()]
+    if len(keys) < count:
+        return None
+    partials = []
+    for key in keys:
+        body = download_from_s3(key)
+        if not body:
+            return None
+        partials.append(json.loads(body))
+    return partials
+
+
+def claim_reduce(session_id: str) -> bool:
+    """
+    Elect one reducer among workers that saw the full set of partials.
+
+    S3 has no compare-and-set in the pinned boto3, so each candidate writes a
+    claim, waits for concurrent writes to settle and proceeds only if its
+    claim is the one that stuck (last writer wins, reads are consistent).
+
+    Returns:
+        True if this invocation should reduce
+    """
+    claim_key = f"{shard_prefix(session_id)}reduce.json"
+    if download_from_s3(claim_key):
+        return False
+    token = uuid.uuid4().hex
+    upload_to_s3(claim_key, {'token': token, 'claimedAt': time.time()})
+    time.sleep(CLAIM_SETTLE_SECONDS)
+    stored = download_from_s3(claim_key)
+    return bool(stored) and json.loads(stored).get('token') == token
+
+
+def merge_partials(partials: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Reducer: concatenate shards back into one history.
+
+    Args:
+        partials: Worker partials, any order
+
+    Returns:
+        (all match IDs, all fetched matches), in the original match-ID order
+    """
+    ordered = sorted(partials, key=lambda p: p['index'])
+    match_ids = [mid for partial in ordered for mid in partial['matchIds']]
+    matches = [match for partial in ordered for match in partial['matches']]
+    failed = sum(partial.get('failed', 0) for partial in ordered)
+    slowest = max((partial.get('elapsedS', 0) for partial in ordered), default=0)
+    logger.info(f" Merged {len(ordered)} shards: {len(matches)}/{len(match_ids)} matches "
+                f"({failed} failed, slowest shard {slowest}s)")
+    return match_ids, matches
+
+
+def clear_shards(session_id: str):
+    """Delete a session's partials, failure counts and reduce claim once merged."""
+    for key in list_s3_keys(shard_prefix(session_id)):
+        delete_from_s3(key)
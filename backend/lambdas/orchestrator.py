@@ -9,12 +9,11 @@ from typing import Dict, Any, Optional
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-from services.session_manager import SessionManager
-from services.analytics import RiftRewindAnalytics
-
-
-# Import API wrapper for handler functions
+# Import API wrapper for handler functions. api.py defers the fetcher, analytics
+# and AI generators to the routes that need them, so this stays cheap and
+# health/regions cold starts don't load requests, boto3 or Bedrock.
 from api import RiftRewindAPI
+from services.http_response import request_header, to_api_gateway
 
 # Initialize API instance
 api = RiftRewindAPI()
@@ -40,6 +39,19 @@ def handle_start_rewind(request_data: Dict[str, Any]) -> Dict[str, Any]:
     return api.start_rewind(game_name, tag_line, region, force_refresh)
 
 
+def handle_start_group_rewind(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle POST /api/rewind/group"""
+    players = request_data.get('players', [])
+    region = request_data.get('region', '')
+
+    return api.start_group_rewind(players, region)
+
+
+def handle_get_group(group_id: str) -> Dict[str, Any]:
+    """Handle GET /api/rewind/group/{groupId}"""
+    return api.get_group(group_id)
+
+
 def handle_get_session(session_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
     """Handle GET /api/rewind/{sessionId}"""
     game_name = request_data.get('gameName')
@@ -54,6 +66,18 @@ def handle_get_slide(session_id: str, slide_number: int) -> Dict[str, Any]:
     return api.get_slide(session_id, slide_number)
 
 
+def handle_get_slides(session_id: str, query_parameters: Dict[str, Any], headers: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle GET /api/rewind/{sessionId}/slides"""
+    since = query_parameters.get('since')
+    if since:
+        try:
+            since = int(since)
+        except ValueError:
+            return api.create_response(400, {'error': 'Invalid since version'})
+
+    return api.get_slides(session_id, since or None, request_header(headers, 'If-None-Match'))
+
+
 def handle_check_cache(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """Handle POST /api/cache/check"""
     game_name = request_data.get('gameName', '')
@@ -75,6 +99,7 @@ def handle_invalidate_cache(request_data: Dict[str, Any]) -> Dict[str, Any]:
 class ProgressiveOrchestrator:
     
     def __init__(self):
+        from services.session_manager import SessionManager
         self.session_manager = SessionManager()
         self.loading_screen_max_seconds = 240
         self.priority_humor_trigger = 210
@@ -99,9 +124,9 @@ class ProgressiveOrchestrator:
             return self._new_session(game_name, tag_line, region)
     
     def _new_session(self, game_name: str, tag_line: str, region: str) -> Dict[str, Any]:
-        from league_data import LeagueDataFetcher
-        from humor_context import HumorGenerator
-        from insights import InsightsGenerator
+        from lambdas.league_data import LeagueDataFetcher
+        from lambdas.humor_context import HumorGenerator
+        from lambdas.insights import InsightsGenerator
         
         fetcher = LeagueDataFetcher()
         checkpoint_callback = self._create_checkpoint_callback()
@@ -175,9 +200,9 @@ class ProgressiveOrchestrator:
         }
     
     def _resume_session(self, existing_session: Dict[str, Any], region: str) -> Dict[str, Any]:
-        from league_data import LeagueDataFetcher
-        from humor_context import HumorGenerator
-        from insights import InsightsGenerator
+        from lambdas.league_data import LeagueDataFetcher
+        from lambdas.humor_context import HumorGenerator
+        from lambdas.insights import InsightsGenerator
         
         session_id = existing_session['sessionId']
         
@@ -309,14 +334,22 @@ class ProgressiveOrchestrator:
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler for API Gateway events.
-    Routes requests based on HTTP method and path.
+    Routes requests based on HTTP method and path, then serializes the
+    response body once (compressed when the client accepts it).
     """
+    response = _route(event)
+    return to_api_gateway(response, request_header(event.get('headers'), 'Accept-Encoding'))
+
+
+def _route(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Dispatch an API Gateway event (response with a native body)."""
     try:
         # Extract API Gateway event details
         http_method = event.get('httpMethod', '')
         path = event.get('path', '').rstrip('/') 
         path_parameters = event.get('pathParameters', {}) or {}
         query_parameters = event.get('queryStringParameters', {}) or {}
+        headers = event.get('headers', {}) or {}
 
         # Parse request body for POST requests
         body = event.get('body', '{}')
@@ -341,6 +374,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         elif path.endswith('/api/rewind') and http_method == 'POST':
             return handle_start_rewind(request_data)
 
+        elif path.endswith('/api/rewind/group') and http_method == 'POST':
+            return handle_start_group_rewind(request_data)
+
+        elif '/api/rewind/group/' in path and http_method == 'GET':
+            return handle_get_group(path.rsplit('/', 1)[-1])
+
         elif path.endswith('/api/cache/check') and http_method == 'POST':
             return handle_check_cache(request_data)
 
@@ -360,6 +399,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     session_id = path_parts[rewind_index + 1]
                     slide_number = path_parts[rewind_index + 3]
                     return handle_get_slide(session_id, int(slide_number))
+
+                # Check for /api/rewind/{sessionId}/slides
+                elif len(path_parts) == rewind_index + 3 and path_parts[rewind_index + 2] == 'slides':
+                    return handle_get_slides(path_parts[rewind_index + 1], query_parameters, headers)
                 
                 # Check for /api/rewind/{sessionId}
                 elif len(path_parts) > rewind_index + 1:
@@ -376,7 +419,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'statusCode': 204,
                 'headers': {
                     'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+                    'Access-Control-Allow-Headers': 'Content-Type,If-None-Match,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
                     'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
                 },
                 'body': ''
@@ -390,7 +433,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'Access-Control-Allow-Origin': '*',
                 'Content-Type': 'application/json'
             },
-            'body': json.dumps({'error': f'Endpoint not found: {http_method} {path}'})
+            'body': {'error': f'Endpoint not found: {http_method} {path}'}
         }
 
     except Exception as e:
@@ -401,5 +444,5 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'Access-Control-Allow-Origin': '*',
                 'Content-Type': 'application/json'
             },
-            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+            'body': {'error': f'Internal server error: {str(e)}'}
         }
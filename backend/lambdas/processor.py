@@ -14,27 +14,55 @@ Expected event:
   "region": "na1"
 }
 
+Long histories are fetched by shard workers (same Lambda, "shard" events) and
+merged before analytics; see lambdas/match_shards.py.
+
+Group rewinds ("group_id" events) fetch the members' matches once, then start
+one invocation per member session.
+
 Note: This module re-uses existing services: RiftRewindAnalytics, InsightsGenerator, HumorGenerator
 """
+import functools
 import json
 import logging
+import os
 import traceback
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-from services.aws_clients import download_from_s3, upload_to_s3
+from services.aws_clients import download_from_s3, upload_to_s3, delete_from_s3
 from services.analytics import RiftRewindAnalytics
 from lambdas.humor_context import HumorGenerator
 from lambdas.insights import InsightsGenerator
 from services.session_cache import SessionCacheManager
-from services.aws_clients import download_from_s3, upload_to_s3
 from lambdas.league_data import LeagueDataFetcher
 from services.riot_api_client import RiotAPIClient
+from services.tracing import start_trace, timing_summary
+from services.population_stats import get_population_index, record_player
+from services.analytics_prefetch import start_prefetch, join_prefetch
+from services.analytics_cache import (
+    analytics_fingerprint, load_cached_analytics, save_cached_analytics, refresh_context
+)
+from services.lazy_analytics import SectionStore
+from services.slide_payloads import SlideDeck
+from services.sample_estimates import approximate_analytics
+from services.match_analyzer import IntelligentSampler
+from services.progress_series import ProgressSeries, player_stats
+from lambdas.match_shards import (
+    plan_shards, shard_events, dispatch_mode, dispatch_shards, run_shard, collect_partials, claim_reduce,
+    merge_partials, clear_shards, record_shard_failure, SHARD_ATTEMPTS
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Sample first, publish approximate slides, refine to exact (PROCESSOR_PROGRESSIVE=false to disable)
+PROGRESSIVE_FETCH = os.environ.get('PROCESSOR_PROGRESSIVE', 'true').lower() != 'false'
+# Smaller histories are fetched whole in one round, so month strata don't matter
+HISTOGRAM_MIN_MATCHES = IntelligentSampler.SAMPLING_TIERS[0][0]
 
-def _update_session_status(session_id: str, status: str, message: str = '', player_info: dict = None, fetcher_data: dict = None):
+
+def _update_session_status(session_id: str, status: str, message: str = '', player_info: dict = None, fetcher_data: dict = None,
+                           preview: dict = None):
     import datetime
     status_data = {
         'status': status,
@@ -45,13 +73,249 @@ def _update_session_status(session_id: str, status: str, message: str = '', play
         status_data['player'] = player_info
     if fetcher_data:
         status_data['fetcherData'] = fetcher_data
+    if preview:
+        status_data['preview'] = preview
+    timings = timing_summary()
+    if timings:
+        status_data['timings'] = timings
 
     status_key = f"sessions/{session_id}/status.json"
     upload_to_s3(status_key, status_data)
     logger.info(f" Status updated: {status} - {message}")
 
 
+def _player_info(raw_data: Dict[str, Any], region: str) -> Dict[str, Any]:
+    profile_icon_id = raw_data.get('summoner', {}).get('profileIconId')
+    return {
+        'gameName': raw_data.get('account', {}).get('gameName'),
+        'tagLine': raw_data.get('account', {}).get('tagLine'),
+        'region': region,
+        'summonerLevel': raw_data.get('summoner', {}).get('summonerLevel'),
+        'profileIconId': profile_icon_id,
+        'profileIconUrl': RiotAPIClient.get_profile_icon_url(profile_icon_id) if profile_icon_id else None
+    }
+
+
+def _publish_preview(session_id: str, raw_data: Dict[str, Any], region: str, total_matches: int,
+                     series: ProgressSeries, matches: list, sampler):
+    """
+    Progressive fetch callback: approximate analytics from the matches so far.
+    Served by get_session/get_slide until the exact analytics.json exists.
+    `series` is carried across rounds so each preview only adds new matches.
+    """
+    preview = approximate_analytics({**raw_data, 'matches': matches, 'progressSeries': series},
+                                    total_matches, sampler)
+    preview['playerInfo'] = _player_info(raw_data, region)
+    upload_to_s3(f"sessions/{session_id}/analytics_preview.json", preview)
+    approximate = preview.get('approximate', {})
+    _update_session_status(
+        session_id, 'analyzing',
+        f"First look from {len(matches)} of {total_matches} matches, refining...",
+        preview={key: approximate.get(key) for key in ('sampleSize', 'totalMatches', 'samplePercentage', 'confidence')}
+    )
+
+
+def _update_group_status(group_id: str, manifest: Dict[str, Any], status: str, message: str = ''):
+    import datetime
+    manifest.update({
+        'status': status,
+        'message': message,
+        'updatedAt': datetime.datetime.now().isoformat()
+    })
+    upload_to_s3(f"groups/{group_id}/group.json", manifest)
+    logger.info(f" Group status updated: {status} - {message}")
+
+
 def lambda_handler(event: Dict[str, Any], context: Any):
+    if event.get('shard'):
+        shard = event['shard']
+        with start_trace('processor.shard', session_id=shard.get('session_id'), shard=shard.get('index')):
+            return _process_shard(shard, context)
+    if event.get('group_id'):
+        with start_trace('processor.group', group_id=event.get('group_id')):
+            return _process_group(event, context)
+    with start_trace('processor', session_id=event.get('session_id')):
+        return _process(event, context)
+
+
+def _dispatch_members(member_events: List[Dict[str, Any]], context: Any) -> Optional[Dict[str, str]]:
+    """
+    Run each group member's session pipeline in its own processor invocation
+    (async Event invokes, like match_shards.dispatch_shards); locally they
+    run in-process, one after another.
+
+    Returns:
+        Session ID -> final status (local), or None (lambda: the group status
+        is read from the members' sessions; see api.get_group)
+    """
+    if dispatch_mode() == 'lambda':
+        import boto3
+        lambda_client = boto3.client('lambda')
+        processor_name = os.getenv('PROCESSOR_LAMBDA_NAME', 'rift-rewind-processor')
+        for member_event in member_events:
+            lambda_client.invoke(
+                FunctionName=processor_name,
+                InvocationType='Event',
+                Payload=json.dumps(member_event).encode('utf-8')
+            )
+        logger.info(f" Dispatched {len(member_events)} member sessions to '{processor_name}'")
+        return None
+    return {member_event['session_id']: _process(member_event, context).get('status')
+            for member_event in member_events}
+
+
+def _process_group(event: Dict[str, Any], context: Any):
+    """
+    Group rewind: fetch the members' match union once, write group stats, then
+    start each member's normal per-session pipeline in its own invocation.
+
+    A union too large for one invocation (more than one shard's worth) isn't
+    fetched here: only the games two or more members share are, for the
+    stats, and each member's invocation fetches (and shards) its own history.
+
+    Expected event:
+    {
+      "group_id": "<uuid>",
+      "region": "na1",
+      "members": [{"session_id", "raw_data_s3_key", "game_name", "tag_line"}, ...]
+    }
+    """
+    from services.group_stats import calculate_group_stats, group_status
+
+    group_id = event['group_id']
+    region = event.get('region')
+    members = event.get('members') or []
+    manifest_str = download_from_s3(f"groups/{group_id}/group.json")
+    manifest = json.loads(manifest_str) if manifest_str else {'groupId': group_id}
+
+    try:
+        _update_group_status(group_id, manifest, 'fetching', 'Fetching your group\'s matches...')
+
+        raw_by_session = {}
+        for member in members:
+            raw_str = download_from_s3(member['raw_data_s3_key'])
+            if not raw_str:
+                raise RuntimeError(f"Raw data not found in S3 at {member['raw_data_s3_key']}")
+            raw_by_session[member['session_id']] = json.loads(raw_str)
+
+        fetcher = LeagueDataFetcher()
+        match_ids_by_puuid = {}
+        for member in members:
+            puuid = raw_by_session[member['session_id']].get('account', {}).get('puuid')
+            match_ids_by_puuid[puuid] = fetcher.fetch_match_history(puuid, region)
+
+        union_ids = list(dict.fromkeys(mid for ids in match_ids_by_puuid.values() for mid in ids))
+        hand_off = len(plan_shards(union_ids)) <= 1
+        if hand_off:
+            matches_by_puuid = fetcher.fetch_group_match_details(match_ids_by_puuid, region)
+        else:
+            seen, shared = set(), set()
+            for ids in match_ids_by_puuid.values():
+                for mid in set(ids):
+                    (shared if mid in seen else seen).add(mid)
+            logger.info(f" {len(union_ids)} group matches: fetching the {len(shared)} shared ones, "
+                        f"members fetch their own histories")
+            matches_by_puuid = fetcher.fetch_group_match_details(
+                {puuid: [mid for mid in ids if mid in shared] for puuid, ids in match_ids_by_puuid.items()},
+                region
+            )
+
+        group_members, member_events = [], []
+        for member in members:
+            raw_data = raw_by_session[member['session_id']]
+            puuid = raw_data['account']['puuid']
+            raw_data.setdefault('metadata', {})['groupId'] = group_id
+            if hand_off:
+                # _process skips fetching for these (even when a member has no matches)
+                raw_data['matches'] = matches_by_puuid.get(puuid, [])
+                raw_data['allMatchIds'] = match_ids_by_puuid[puuid]
+                raw_data['metadata']['totalMatches'] = len(raw_data['matches'])
+                raw_data['metadata']['groupFetched'] = True
+            upload_to_s3(member['raw_data_s3_key'], raw_data)
+            group_members.append({
+                'puuid': puuid,
+                'gameName': member.get('game_name'),
+                'tagLine': member.get('tag_line'),
+                'sessionId': member['session_id'],
+            })
+            member_events.append({
+                'session_id': member['session_id'],
+                'raw_data_s3_key': member['raw_data_s3_key'],
+                'game_name': member.get('game_name'),
+                'tag_line': member.get('tag_line'),
+                'region': region,
+            })
+
+        stats = calculate_group_stats(group_members, matches_by_puuid,
+                                      None if hand_off else match_ids_by_puuid)
+        upload_to_s3(f"groups/{group_id}/stats.json", stats)
+        del raw_by_session, matches_by_puuid
+
+        _update_group_status(group_id, manifest, 'analyzing', 'Building everyone\'s rewind...')
+        results = _dispatch_members(member_events, context)
+        if results is None:
+            return {'status': 'dispatched', 'members': len(member_events)}
+
+        manifest['memberStatus'] = results
+        status, message = group_status(results)
+        _update_group_status(group_id, manifest, status, message)
+        return {'status': status, 'members': results}
+
+    except Exception as e:
+        logger.error(f' Group processor failed for group {group_id}: {e}')
+        traceback.print_exc()
+        _update_group_status(group_id, manifest, 'error', str(e))
+        for member in members:
+            _update_session_status(member['session_id'], 'error', str(e))
+        return {'status': 'error', 'message': str(e)}
+
+
+def _process_shard(shard: Dict[str, Any], context: Any):
+    """
+    Shard worker: fetch one slice of a session's matches and write it as a
+    partial; whichever worker completes the set merges them and runs the
+    rest of the pipeline.
+    """
+    session_id = shard['session_id']
+    try:
+        run_shard(shard)
+    except Exception as e:
+        attempts = record_shard_failure(shard)
+        logger.error(f' Shard {shard["index"]} failed for session {session_id} '
+                     f'(attempt {attempts}/{SHARD_ATTEMPTS}): {e}')
+        if attempts >= SHARD_ATTEMPTS:
+            _update_session_status(session_id, 'error', f'Match batch {shard["index"] + 1} failed: {e}')
+        else:
+            # Non-terminal: the frontend stops polling on 'error'
+            _update_session_status(session_id, 'analyzing',
+                                   f'Match batch {shard["index"] + 1} hit an error, retrying...')
+        raise  # Let the async invoke retry the shard
+
+    partials = collect_partials(session_id, shard['count'])
+    if partials is None or not claim_reduce(session_id):
+        return {'status': 'shard_complete', 'index': shard['index']}
+
+    raw_str = download_from_s3(shard['raw_data_s3_key'])
+    if not raw_str:
+        raise RuntimeError(f"Raw data not found in S3 at {shard['raw_data_s3_key']}")
+    raw_data = json.loads(raw_str)
+    match_ids, matches = merge_partials(partials)
+    raw_data['matches'] = matches
+    raw_data['allMatchIds'] = match_ids
+    raw_data.setdefault('metadata', {}).update({'totalMatches': len(matches), 'shards': len(partials)})
+    upload_to_s3(shard['raw_data_s3_key'], raw_data)
+    clear_shards(session_id)
+
+    return _process({
+        'session_id': session_id,
+        'raw_data_s3_key': shard['raw_data_s3_key'],
+        'game_name': shard.get('game_name'),
+        'tag_line': shard.get('tag_line'),
+        'region': shard.get('region'),
+    }, context)
+
+
+def _process(event: Dict[str, Any], context: Any):
     logger.info(f"Processor invoked with event: {json.dumps(event)}")
 
     session_id = event.get('session_id')
@@ -73,11 +337,17 @@ def lambda_handler(event: Dict[str, Any], context: Any):
             raise RuntimeError(f'Raw data not found in S3 at {raw_key}')
 
         raw_data = json.loads(raw_str)
+        # Ladder position/icons, started once the analytics cache has missed
+        prefetch = None
+        cached_analytics = None
 
         # Ensure we have full match data. Orchestrator uploads only initial fetcher data
         # (account/summoner/ranked). If `matches` is missing or empty, fetch them now
         # using the same LeagueDataFetcher flow used in the orchestrator local worker.
-        if not raw_data.get('matches'):
+        # (Shard reducers and group processors hand over matches already fetched,
+        # possibly none for a group member without ranked games)
+        metadata = raw_data.get('metadata', {})
+        if not raw_data.get('matches') and not metadata.get('shards') and not metadata.get('groupFetched'):
             logger.info(' No matches in raw_data - fetching match history and details now')
             try:
                 fetcher = LeagueDataFetcher()
@@ -93,14 +363,51 @@ def lambda_handler(event: Dict[str, Any], context: Any):
                 if total_matches == 0:
                     logger.warning(f' No ranked matches found for PUUID {puuid} (region={region})')
                     # Continue with analytics - it will compute zeros - but persist updated raw_data
-                # Fetch full match details (no sampling) to ensure complete analytics
-                matches = fetcher.fetch_match_details_batch(match_ids, region, use_sampling=False)
 
-                # Update raw_data with fetched matches and metadata
-                raw_data['matches'] = matches
-                raw_data['allMatchIds'] = match_ids
-                raw_data['metadata'] = raw_data.get('metadata', {})
-                raw_data['metadata'].update({'totalMatches': len(matches), 'fetchedAt': raw_data.get('metadata', {}).get('fetchedAt')})
+                # Same history and rank as an earlier run: serve its analytics
+                cached_analytics = load_cached_analytics(analytics_fingerprint(raw_data, match_ids))
+                if cached_analytics is not None:
+                    logger.info(' Match history unchanged - skipping match details and analytics')
+                    raw_data['allMatchIds'] = match_ids
+                    raw_data.setdefault('metadata', {})['totalMatches'] = total_matches
+                else:
+                    # Ladder position/icons only need account/summoner/ranked: gather
+                    # them while matches are fetched so analytics stays pure CPU
+                    prefetch = start_prefetch(raw_data, region)
+                    series = ProgressSeries()
+                    # Long histories: fan out to shard workers (map), merge (reduce)
+                    shards = plan_shards(match_ids)
+                    if len(shards) > 1:
+                        _update_session_status(session_id, 'analyzing',
+                                               f'Fetching {total_matches} matches in {len(shards)} batches...')
+                        partials = dispatch_shards(shard_events(event, puuid, shards))
+                        if partials is None:
+                            # Lambda workers: the last one to finish carries on from here
+                            return {'status': 'sharded', 'shards': len(shards)}
+                        match_ids, matches = merge_partials(partials)
+                        raw_data.setdefault('metadata', {})['shards'] = len(shards)
+                    elif PROGRESSIVE_FETCH:
+                        # Every match is still fetched; a stratified sample goes first so
+                        # approximate slides are up within seconds
+                        if total_matches > HISTOGRAM_MIN_MATCHES:
+                            # Exact month strata for the sample (and games per month)
+                            fetcher.fetch_match_histogram(puuid, region, match_ids)
+                        matches = fetcher.fetch_match_details_progressive(
+                            match_ids, region,
+                            on_update=functools.partial(_publish_preview, session_id, raw_data, region,
+                                                        total_matches, series)
+                        )
+                    else:
+                        # Fetch full match details (no sampling) to ensure complete analytics
+                        matches = fetcher.fetch_match_details_batch(match_ids, region, use_sampling=False)
+
+                    # Update raw_data with fetched matches and metadata
+                    series.extend(matches, player_stats(puuid))
+                    raw_data['progressSeries'] = series.to_dict()
+                    raw_data['matches'] = matches
+                    raw_data['allMatchIds'] = match_ids
+                    raw_data['metadata'] = raw_data.get('metadata', {})
+                    raw_data['metadata'].update({'totalMatches': len(matches), 'fetchedAt': raw_data.get('metadata', {}).get('fetchedAt')})
 
                 # Re-upload enriched raw_data so other tools can access it
                 try:
@@ -112,49 +419,61 @@ def lambda_handler(event: Dict[str, Any], context: Any):
             except Exception as e:
                 logger.exception(f' Failed while fetching matches in processor: {e}')
 
-        # Build analytics
-        analytics_engine = RiftRewindAnalytics(raw_data)
-        analytics = analytics_engine.calculate_all()
+        # Build analytics (percentiles against the observed population when available),
+        # unless this exact match set was analyzed before (e.g. a retry after a late failure)
+        raw_data.setdefault('metadata', {})['region'] = region
+        fingerprint = analytics_fingerprint(raw_data)
+        if cached_analytics is None:
+            cached_analytics = load_cached_analytics(fingerprint)
+        section_store = None
+        if cached_analytics is not None:
+            # Cached by match set; population percentiles and ladder position are current
+            analytics = refresh_context(cached_analytics, raw_data, region)
+        else:
+            # (Matches handed over by shard/group workers: nothing to overlap with)
+            raw_data['prefetched'] = join_prefetch(prefetch or start_prefetch(raw_data, region))
+            population = get_population_index()
+            analytics_engine = RiftRewindAnalytics(raw_data, population=population)
+            # Each slide section is persisted as soon as it's computed (cheap slides
+            # first) so get_slide can serve it before analytics.json is written
+            section_store = SectionStore(session_id, background=True)
+            analytics = analytics_engine.calculate_all(section_store)
+            save_cached_analytics(fingerprint, analytics)
+
+            # Add this player to the population for future sessions (once per season)
+            if population is not None:
+                try:
+                    tier = analytics_engine.get_ranked_journey().get('tier', 'UNRANKED')
+                    record_player(population, raw_data.get('account', {}).get('puuid') or raw_data.get('puuid'),
+                                  analytics_engine.population_metrics(), tier, region)
+                except Exception as e:
+                    logger.warning(f' Failed to record population stats: {e}')
 
         # This preserves profile icon and other player data after raw_data cleanup
-        from services.riot_api_client import RiotAPIClient
-        profile_icon_id = raw_data.get('summoner', {}).get('profileIconId')
-        profile_icon_url = RiotAPIClient.get_profile_icon_url(profile_icon_id) if profile_icon_id else None
-        
-        analytics['playerInfo'] = {
-            'gameName': raw_data.get('account', {}).get('gameName'),
-            'tagLine': raw_data.get('account', {}).get('tagLine'),
-            'region': region,
-            'summonerLevel': raw_data.get('summoner', {}).get('summonerLevel'),
-            'profileIconId': profile_icon_id,
-            'profileIconUrl': profile_icon_url
-        }
+        analytics['playerInfo'] = _player_info(raw_data, region)
 
         # Upload analytics to S3
         analytics_key = f"sessions/{session_id}/analytics.json"
         upload_to_s3(analytics_key, analytics)
         logger.info(' Analytics uploaded to S3')
-        
-        # Clean up raw_data.json to optimize storage (saves ~8-10 MB per session)
-        try:
-            from services.aws_clients import delete_from_s3
-            if delete_from_s3(raw_key):
-                logger.info(f' Deleted raw_data.json to optimize storage (saved ~8-10 MB)')
-            else:
-                logger.warning(f' Could not delete raw_data.json: {raw_key}')
-        except Exception as e:
-            logger.warning(f' Failed to delete raw_data.json: {e}')
-
+        delete_from_s3(f"sessions/{session_id}/analytics_preview.json")
+        if section_store is not None:
+            section_store.flush()
 
+        # Ready-to-serve slide payloads, refreshed below as humor and insights land
+        deck = SlideDeck(session_id)
+        deck.write(analytics)
 
         # Update status
         _update_session_status(session_id, 'generating', 'Generating personalized insights...')
 
         # Generate humor for slides 2-15
         humor_generator = HumorGenerator()
+        humor_by_slide = {}
         for slide_num in range(2, 16):
             try:
-                humor_generator.generate(session_id, slide_num)
+                humor_by_slide[slide_num] = humor_generator.generate(session_id, slide_num)
+                deck.write(analytics, humor_by_slide, slides=[slide_num])
                 logger.info(f'   Slide {slide_num} humor generated')
             except Exception as e:
                 logger.warning(f'    Slide {slide_num} humor failed: {e}')
@@ -174,9 +493,13 @@ def lambda_handler(event: Dict[str, Any], context: Any):
                     'personality_title': insights.get('personality_title', 'The Rising Summoner')
                 })
                 upload_to_s3(analytics_key, analytics)
+                deck.write(analytics, humor_by_slide, slides=[10, 11])
                 logger.info(' Insights integrated into analytics')
         except Exception as e:
             logger.exception(' Insights generation failed')
+        deck.finish()
+        # analytics.json and the slide payloads supersede the per-section objects
+        SectionStore(session_id).clear()
 
         # Collect humor outputs and build player_info for cache
         humor_data = {}
@@ -191,7 +514,6 @@ def lambda_handler(event: Dict[str, Any], context: Any):
                     humor_data[f"slide{slide_num}_humor"] = humor_text
 
         # Build player info from raw_data
-        from services.riot_api_client import RiotAPIClient
         profile_icon_id = raw_data.get('summoner', {}).get('profileIconId')
         profile_icon_url = RiotAPIClient.get_profile_icon_url(profile_icon_id) if profile_icon_id else None
 
@@ -243,6 +565,17 @@ def lambda_handler(event: Dict[str, Any], context: Any):
             int(match_count), int(total_matches)
         )
 
+        # Clean up raw_data.json to optimize storage (saves ~8-10 MB per session). Kept
+        # until the end so a retry after a late failure still finds the match set
+        # and is served from the analytics cache
+        try:
+            if delete_from_s3(raw_key):
+                logger.info(f' Deleted raw_data.json to optimize storage (saved ~8-10 MB)')
+            else:
+                logger.warning(f' Could not delete raw_data.json: {raw_key}')
+        except Exception as e:
+            logger.warning(f' Failed to delete raw_data.json: {e}')
+
         _update_session_status(session_id, 'complete', 'Your rewind is ready!', player_info)
         logger.info(f' Session {session_id} processing complete!')
 
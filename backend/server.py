@@ -4,7 +4,7 @@ Flask Development Server for Frontend Integration
 Run this server to test frontend locally before deploying to AWS
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 import os
 import logging
@@ -26,6 +26,9 @@ load_dotenv()
 
 # Import API wrapper
 from api import RiftRewindAPI
+from services.http_response import encode_response
+from services.riot_metrics import riot_metrics
+from services.riot_scheduler import riot_scheduler
 
 # Create Flask app
 app = Flask(__name__)
@@ -38,11 +41,18 @@ CORS(app, origins=allowed_origins)
 api = RiftRewindAPI()
 
 
+def send(response):
+    """Serialize an API response once (compressed when the client accepts it)."""
+    status, headers, data = encode_response(response, request.headers.get('Accept-Encoding'))
+    # flask_cors adds the CORS headers for the configured origins
+    headers = {key: value for key, value in headers.items() if not key.startswith('Access-Control-Allow-')}
+    return Response(data, status=status, headers=headers)
+
+
 @app.route('/api/regions', methods=['GET'])
 def get_regions():
     """GET /api/regions - Get available regions"""
-    response = api.get_regions()
-    return jsonify(response['body']), response['statusCode']
+    return send(api.get_regions())
 
 
 @app.route('/api/rewind', methods=['POST', 'OPTIONS'])
@@ -58,8 +68,30 @@ def start_rewind():
         data.get('region', '')
     )
     
-    body = response.get('body')
-    return jsonify(body), response['statusCode']
+    return send(response)
+
+
+@app.route('/api/rewind/group', methods=['POST', 'OPTIONS'])
+def start_group_rewind():
+    """POST /api/rewind/group - Start a friend group rewind"""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    data = request.json
+    response = api.start_group_rewind(
+        data.get('players', []),
+        data.get('region', '')
+    )
+    
+    return send(response)
+
+
+@app.route('/api/rewind/group/<group_id>', methods=['GET'])
+def get_group(group_id):
+    """GET /api/rewind/group/{groupId} - Get group status and stats"""
+    response = api.get_group(group_id)
+    
+    return send(response)
 
 
 @app.route('/api/rewind/<session_id>', methods=['GET'])
@@ -67,8 +99,7 @@ def get_session(session_id):
     """GET /api/rewind/{sessionId} - Get session data"""
     response = api.get_session(session_id)
     
-    body = response.get('body')
-    return jsonify(body), response['statusCode']
+    return send(response)
 
 
 @app.route('/api/rewind/<session_id>/slide/<int:slide_number>', methods=['GET'])
@@ -76,8 +107,19 @@ def get_slide(session_id, slide_number):
     """GET /api/rewind/{sessionId}/slide/{slideNumber} - Get slide data"""
     response = api.get_slide(session_id, slide_number)
     
-    body = response.get('body')
-    return jsonify(body), response['statusCode']
+    return send(response)
+
+
+@app.route('/api/rewind/<session_id>/slides', methods=['GET'])
+def get_slides(session_id):
+    """GET /api/rewind/{sessionId}/slides - Get every slide (If-None-Match, ?since=<version>)"""
+    response = api.get_slides(
+        session_id,
+        request.args.get('since', type=int),
+        request.headers.get('If-None-Match')
+    )
+    
+    return send(response)
 
 
 @app.route('/api/cache/check', methods=['POST'])
@@ -90,8 +132,7 @@ def check_cache():
         data.get('region', '')
     )
     
-    body = response.get('body')
-    return jsonify(body), response['statusCode']
+    return send(response)
 
 
 @app.route('/api/cache/invalidate', methods=['POST'])
@@ -104,20 +145,26 @@ def invalidate_cache():
         data.get('region', '')
     )
     
-    body = response.get('body')
-    return jsonify(body), response['statusCode']
+    return send(response)
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """GET /api/health - Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'testMode': api.test_mode,
-        'maxMatches': api.max_matches_analyze,
-        'cacheEnabled': True,
-        'cacheExpiryDays': api.cache_manager.cache_expiry_days
-    }), 200
+    return send(api.health_check())
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """GET /api/metrics - Riot API client and request scheduler metrics (JSON)"""
+    return jsonify({'riot': riot_metrics.snapshot(), 'scheduler': riot_scheduler.snapshot()}), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """GET /metrics - Riot API client and scheduler metrics in Prometheus text format"""
+    return Response(riot_metrics.to_prometheus() + riot_scheduler.to_prometheus(),
+                    mimetype='text/plain; version=0.0.4')
 
 
 if __name__ == '__main__':
@@ -134,9 +181,12 @@ Server running at: http://localhost:{port}
 API Endpoints:
   GET  /api/health                                 Health check
   GET  /api/regions                                Get regions
+  GET  /api/metrics                                Riot client metrics (JSON)
+  GET  /metrics                                    Riot client metrics (Prometheus)
   POST /api/rewind                                 Start session (checks cache first)
   GET  /api/rewind/:sessionId                      Get session
   GET  /api/rewind/:sessionId/slide/:slideNumber   Get slide
+  GET  /api/rewind/:sessionId/slides               Get all slides (ETag, ?since=)
   POST /api/cache/check                            Check cache status
   POST /api/cache/invalidate                       Force refresh (clear cache)
 
@@ -4,8 +4,24 @@ Shared utilities for Rift Rewind Lambda functions
 
 from .constants import *
 from .validators import *
-from .riot_api_client import RiotAPIClient
-from .aws_clients import get_s3_client, get_bedrock_client
+
+# RiotAPIClient (requests) and the AWS getters are resolved on first access so
+# importing services.constants/validators doesn't pay for requests or boto3.
+_LAZY_ATTRS = {
+    'RiotAPIClient': '.riot_api_client',
+    'get_s3_client': '.aws_clients',
+    'get_bedrock_client': '.aws_clients',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'RiotAPIClient',
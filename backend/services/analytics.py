@@ -3,220 +3,144 @@ Analytics Module: analytics.py
 Purpose: Calculate statistics for all slides
 """
 
+import functools
 import logging
 from typing import Dict, Any, List, Optional
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime, timedelta
 
+from .tracing import traced
+from .match_projection import team_totals
+from .progress_series import ProgressSeries, ROLLING_WINDOW_MONTHS
+from .group_by import MatchTable, GroupBy, aggregate, count, total
+from .champion_registry import get_champion_registry
+from .analytics_prefetch import profile_icon_url
+from .lazy_analytics import LazyAnalytics, SectionStore
+
 
 logger = logging.getLogger(__name__)
 
-CHAMPION_CLASSES = {
-    'Assassin': [
-        {'name': 'Akali', 'secondary': []},
-        {'name': 'Akshan', 'secondary': ['Marksman']},
-        {'name': 'Diana', 'secondary': ['Fighter']},
-        {'name': 'Ekko', 'secondary': ['Fighter']},
-        {'name': 'Evelynn', 'secondary': ['Mage']},
-        {'name': 'Fizz', 'secondary': ['Fighter']},
-        {'name': 'Kassadin', 'secondary': ['Mage']},
-        {'name': 'Katarina', 'secondary': ['Mage']},
-        {'name': 'KhaZix', 'secondary': []},
-        {'name': 'LeBlanc', 'secondary': ['Mage']},
-        {'name': 'MasterYi', 'secondary': ['Fighter']},
-        {'name': 'Naafiri', 'secondary': []},
-        {'name': 'Nidalee', 'secondary': ['Mage']},
-        {'name': 'Nocturne', 'secondary': ['Fighter']},
-        {'name': 'Pyke', 'secondary': ['Support']},
-        {'name': 'Qiyana', 'secondary': ['Fighter']},
-        {'name': 'Rengar', 'secondary': ['Fighter']},
-        {'name': 'Shaco', 'secondary': []},
-        {'name': 'Talon', 'secondary': []},
-        {'name': 'Viego', 'secondary': ['Fighter']},
-        {'name': 'Yone', 'secondary': ['Fighter']},
-        {'name': 'Zed', 'secondary': []}
-    ],
-    'Fighter': [
-        {'name': 'Aatrox', 'secondary': ['Tank']},
-        {'name': 'Ambessa', 'secondary': ['Assassin']},
-        {'name': 'BelVeth', 'secondary': []},
-        {'name': 'Briar', 'secondary': ['Assassin']},
-        {'name': 'Camille', 'secondary': ['Tank']},
-        {'name': 'Darius', 'secondary': ['Tank']},
-        {'name': 'DrMundo', 'secondary': ['Tank']},
-        {'name': 'Fiora', 'secondary': ['Assassin']},
-        {'name': 'Gangplank', 'secondary': []},
-        {'name': 'Garen', 'secondary': ['Tank']},
-        {'name': 'Gnar', 'secondary': ['Tank']},
-        {'name': 'Gragas', 'secondary': ['Mage']},
-        {'name': 'Gwen', 'secondary': ['Assassin']},
-        {'name': 'Hecarim', 'secondary': ['Tank']},
-        {'name': 'Illaoi', 'secondary': ['Tank']},
-        {'name': 'Irelia', 'secondary': ['Assassin']},
-        {'name': 'Jax', 'secondary': ['Assassin']},
-        {'name': 'Jayce', 'secondary': ['Marksman']},
-        {'name': 'Kayle', 'secondary': ['Support']},
-        {'name': 'Kayn', 'secondary': ['Assassin']},
-        {'name': 'Kled', 'secondary': ['Tank']},
-        {'name': 'LeeSin', 'secondary': ['Assassin']},
-        {'name': 'Lillia', 'secondary': ['Mage']},
-        {'name': 'Mordekaiser', 'secondary': ['Mage']},
-        {'name': 'Nasus', 'secondary': ['Tank']},
-        {'name': 'Nilah', 'secondary': ['Assassin']},
-        {'name': 'Olaf', 'secondary': ['Tank']},
-        {'name': 'Pantheon', 'secondary': ['Assassin']},
-        {'name': 'RekSai', 'secondary': ['Tank']},
-        {'name': 'Renekton', 'secondary': ['Tank']},
-        {'name': 'Riven', 'secondary': ['Assassin']},
-        {'name': 'Rumble', 'secondary': ['Mage']},
-        {'name': 'Sett', 'secondary': ['Tank']},
-        {'name': 'Shyvana', 'secondary': ['Tank']},
-        {'name': 'Skarner', 'secondary': ['Tank']},
-        {'name': 'Trundle', 'secondary': ['Tank']},
-        {'name': 'Tryndamere', 'secondary': ['Assassin']},
-        {'name': 'Udyr', 'secondary': ['Tank']},
-        {'name': 'Urgot', 'secondary': ['Tank']},
-        {'name': 'Vi', 'secondary': ['Assassin']},
-        {'name': 'Volibear', 'secondary': ['Tank']},
-        {'name': 'Warwick', 'secondary': ['Tank']},
-        {'name': 'Wukong', 'secondary': ['Tank']},
-        {'name': 'XinZhao', 'secondary': ['Assassin']},
-        {'name': 'Yasuo', 'secondary': ['Assassin']},
-        {'name': 'Yorick', 'secondary': ['Tank']}
-    ],
-    'Mage': [
-        {'name': 'Ahri', 'secondary': ['Assassin']},
-        {'name': 'Anivia', 'secondary': ['Support']},
-        {'name': 'Annie', 'secondary': ['Support']},
-        {'name': 'AurelionSol', 'secondary': []},
-        {'name': 'Aurora', 'secondary': ['Assassin']},
-        {'name': 'Azir', 'secondary': ['Marksman']},
-        {'name': 'Brand', 'secondary': []},
-        {'name': 'Cassiopeia', 'secondary': []},
-        {'name': 'Elise', 'secondary': ['Fighter']},
-        {'name': 'Fiddlesticks', 'secondary': ['Support']},
-        {'name': 'Heimerdinger', 'secondary': ['Support']},
-        {'name': 'Hwei', 'secondary': []},
-        {'name': 'Karthus', 'secondary': []},
-        {'name': 'Kennan', 'secondary': ['Marksman']},
-        {'name': 'KogMaw', 'secondary': ['Marksman']},
-        {'name': 'LeBlanc', 'secondary': ['Assassin']},
-        {'name': 'Lissandra', 'secondary': []},
-        {'name': 'Lux', 'secondary': ['Support']},
-        {'name': 'Malzahar', 'secondary': ['Assassin']},
-        {'name': 'Mel', 'secondary': []},
-        {'name': 'Morgana', 'secondary': ['Support']},
-        {'name': 'Neeko', 'secondary': ['Support']},
-        {'name': 'Orianna', 'secondary': ['Support']},
-        {'name': 'Ryze', 'secondary': ['Fighter']},
-        {'name': 'Seraphine', 'secondary': ['Support']},
-        {'name': 'Swain', 'secondary': ['Fighter']},
-        {'name': 'Sylas', 'secondary': ['Assassin']},
-        {'name': 'Syndra', 'secondary': []},
-        {'name': 'Taliyah', 'secondary': ['Support']},
-        {'name': 'TwistedFate', 'secondary': []},
-        {'name': 'Veigar', 'secondary': []},
-        {'name': 'VelKoz', 'secondary': ['Support']},
-        {'name': 'Vex', 'secondary': []},
-        {'name': 'Viktor', 'secondary': []},
-        {'name': 'Vladimir', 'secondary': ['Tank']},
-        {'name': 'Xerath', 'secondary': ['Support']},
-        {'name': 'Ziggs', 'secondary': []},
-        {'name': 'Zoe', 'secondary': ['Support']},
-        {'name': 'Zyra', 'secondary': ['Support']}
-    ],
-    'Marksman': [
-        {'name': 'Aphelios', 'secondary': []},
-        {'name': 'Ashe', 'secondary': ['Support']},
-        {'name': 'Caitlyn', 'secondary': []},
-        {'name': 'Corki', 'secondary': []},
-        {'name': 'Draven', 'secondary': []},
-        {'name': 'Ezreal', 'secondary': ['Mage']},
-        {'name': 'Graves', 'secondary': []},
-        {'name': 'Jhin', 'secondary': ['Mage']},
-        {'name': 'Jinx', 'secondary': []},
-        {'name': 'KaiSa', 'secondary': ['Assassin']},
-        {'name': 'Kalista', 'secondary': []},
-        {'name': 'Kindred', 'secondary': []},
-        {'name': 'Lucian', 'secondary': []},
-        {'name': 'MissFortune', 'secondary': []},
-        {'name': 'Quinn', 'secondary': ['Assassin']},
-        {'name': 'Samira', 'secondary': []},
-        {'name': 'Senna', 'secondary': ['Support']},
-        {'name': 'Sivir', 'secondary': []},
-        {'name': 'Smolder', 'secondary': []},
-        {'name': 'Teemo', 'secondary': ['Assassin']},
-        {'name': 'Tristana', 'secondary': ['Assassin']},
-        {'name': 'Twitch', 'secondary': ['Assassin']},
-        {'name': 'Varus', 'secondary': ['Mage']},
-        {'name': 'Vayne', 'secondary': ['Assassin']},
-        {'name': 'Xayah', 'secondary': []},
-        {'name': 'Zeri', 'secondary': []}
-    ],
-    'Support': [
-        {'name': 'Bard', 'secondary': ['Mage']},
-        {'name': 'Braum', 'secondary': ['Tank']},
-        {'name': 'Ivern', 'secondary': ['Mage']},
-        {'name': 'Janna', 'secondary': ['Mage']},
-        {'name': 'Karma', 'secondary': ['Mage']},
-        {'name': 'Lulu', 'secondary': ['Mage']},
-        {'name': 'Milio', 'secondary': ['Mage']},
-        {'name': 'Nami', 'secondary': ['Mage']},
-        {'name': 'Rakan', 'secondary': []},
-        {'name': 'Renata', 'secondary': ['Mage']},
-        {'name': 'Sona', 'secondary': ['Mage']},
-        {'name': 'Soraka', 'secondary': ['Mage']},
-        {'name': 'TahmKench', 'secondary': ['Tank']},
-        {'name': 'Taric', 'secondary': ['Fighter']},
-        {'name': 'Thresh', 'secondary': ['Fighter']},
-        {'name': 'Yuumi', 'secondary': ['Mage']},
-        {'name': 'Zilean', 'secondary': ['Mage']}
-    ],
-    'Tank': [
-        {'name': 'Alistar', 'secondary': ['Support']},
-        {'name': 'Amumu', 'secondary': ['Mage']},
-        {'name': 'Blitzcrank', 'secondary': ['Fighter']},
-        {'name': 'ChoGath', 'secondary': ['Mage']},
-        {'name': 'Galio', 'secondary': ['Mage']},
-        {'name': 'JarvanIV', 'secondary': ['Fighter']},
-        {'name': 'KSante', 'secondary': ['Fighter']},
-        {'name': 'Leona', 'secondary': ['Support']},
-        {'name': 'Malphite', 'secondary': ['Fighter']},
-        {'name': 'Maokai', 'secondary': ['Mage']},
-        {'name': 'Nautilus', 'secondary': ['Fighter']},
-        {'name': 'Nunu', 'secondary': ['Fighter']},
-        {'name': 'Ornn', 'secondary': ['Fighter']},
-        {'name': 'Poppy', 'secondary': ['Fighter']},
-        {'name': 'Rammus', 'secondary': ['Fighter']},
-        {'name': 'Rell', 'secondary': ['Support']},
-        {'name': 'Sejuani', 'secondary': ['Fighter']},
-        {'name': 'Shen', 'secondary': ['Fighter']},
-        {'name': 'Singed', 'secondary': ['Fighter']},
-        {'name': 'Sion', 'secondary': ['Fighter']},
-        {'name': 'Zac', 'secondary': ['Fighter']}
-    ]
+# Bump whenever calculate_all output changes (invalidates analytics_cache entries)
+ANALYTICS_VERSION = 2
+
+# Ranked tiers, lowest first (rank score = index * 400 + division * 100 + LP)
+TIER_ORDER = [
+    'IRON', 'BRONZE', 'SILVER', 'GOLD', 'PLATINUM', 'EMERALD', 'DIAMOND',
+    'MASTER', 'GRANDMASTER', 'CHALLENGER',
+]
+
+
+# Per-group breakdowns the slides read, computed together in one pass (group_by.aggregate)
+SLIDE_BREAKDOWNS = {
+    'champion': GroupBy('champion', games=count(), wins=total('win'), kills=total('kills'),
+                        deaths=total('deaths'), assists=total('assists')),
+    'class': GroupBy('class', games=count(), wins=total('win')),
+    'teammate': GroupBy('teammate', games=count(), wins=total('win')),
 }
 
 
+def memoized(method):
+    """
+    Compute a section once per engine: sections reuse each other (the
+    strengths/weaknesses context alone calls ten of them), so each is
+    computed on first demand and shared after that. Results are shared, not
+    copied; callers that adjust them (sample_estimates) own the engine.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._sections:
+            self._sections[key] = method(self, *args, **kwargs)
+        return self._sections[key]
+    return wrapper
+
+
+def apply_percentile_context(section: Dict[str, Any], population, prefetched: Dict[str, Any],
+                             region: str) -> Dict[str, Any]:
+    """
+    Fill in slide 14's fields that don't come from the matches.
+
+    The population index and the ladder change while a player's matches
+    don't, so analytics_cache re-applies these to cached sections.
+
+    Args:
+        section: Slide 14 from calculate_percentile ('tierPercentile',
+            'playerMetrics', 'tier' and the player's leaderboard row)
+        population: Optional PopulationIndex
+        prefetched: 'leaderboardRank' and 'profileIconUrl' from the prefetch phase
+        region: Platform code
+
+    Returns:
+        Updated copy of the section
+    """
+    section = dict(section)
+    tier = section.get('tier', 'UNRANKED')
+    metrics = section.get('playerMetrics') or {}
+    percentile = section['tierPercentile']
+    percentile_source = 'tier_table'
+    
+    # Prefer the observed rank distribution once enough players are indexed
+    metric_percentiles = {}
+    if population is not None:
+        rank_position = None
+        if 'rankScore' in metrics:
+            rank_position = population.percentile('rankScore', metrics['rankScore'], 'ALL', region)
+        if rank_position:
+            percentile = rank_position['percentile']
+            percentile_source = 'population'
+        for metric, value in metrics.items():
+            if metric == 'rankScore':
+                continue
+            result = population.percentile(metric, value, tier, region)
+            if result:
+                metric_percentiles[metric] = dict(result, value=value)
+    
+    # Leaderboard position within tier/division, resolved in the prefetch phase
+    leaderboard_rank = prefetched.get('leaderboardRank') if tier != 'UNRANKED' else None
+    icon_url = prefetched.get('profileIconUrl') or section.get('playerProfileIconUrl')
+    
+    section.update({
+        'rankPercentile': percentile,
+        'percentileSource': percentile_source,
+        'metricPercentiles': metric_percentiles,
+        'comparison': f'Top {100 - percentile}%' if percentile > 50 else f'Bottom {percentile}%',
+        'yourRank': leaderboard_rank,  # None if not available
+        'playerProfileIconUrl': icon_url,
+    })
+    section['leaderboard'] = [dict(entry, rank=leaderboard_rank, profileIconUrl=icon_url) if entry.get('isYou')
+                              else entry for entry in section.get('leaderboard', [])]
+    return section
+
 
 class RiftRewindAnalytics:
     """
     Calculates comprehensive statistics for all 15 slides.
     """
     
-    def __init__(self, raw_data: Dict[str, Any]):
+    def __init__(self, raw_data: Dict[str, Any], population=None):
         """
         Initialize with raw data from league_data Lambda.
         
+        Analytics make no network calls: external inputs (ladder position,
+        icons) are read from raw_data['prefetched'] (see analytics_prefetch).
+        
         Args:
             raw_data: Complete raw data dict from S3
+            population: Optional PopulationIndex for data-driven percentiles
         """
         self.raw_data = raw_data
         self.puuid = raw_data.get('account', {}).get('puuid')
         self.matches = raw_data.get('matches', [])
         self.summoner = raw_data.get('summoner', {})
         self.ranked = raw_data.get('ranked', {})
-        self.region = raw_data.get('metadata', {}).get('region', 'na1')
+        self.region = (raw_data.get('metadata', {}).get('region')
+                       or raw_data.get('account', {}).get('region', 'na1'))
+        self.population = population
+        self.prefetched = raw_data.get('prefetched') or {}
+        self._progress_series = None
+        self._match_table = None
+        self._breakdowns = None
+        self._sections: Dict[tuple, Any] = {}
     
     def _get_participant_stats(self, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -236,7 +160,26 @@ class RiftRewindAnalytics:
         
         return None
     
+    def match_table(self) -> MatchTable:
+        """The player's participant entries as columns (built once)."""
+        if self._match_table is None:
+            self._match_table = MatchTable(self.matches, self.puuid, get_champion_registry())
+        return self._match_table
+    
+    def breakdowns(self) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """
+        SLIDE_BREAKDOWNS over the match table (one pass, computed once).
+        
+        Returns:
+            Breakdown name -> {group key -> reducer values}
+        """
+        if self._breakdowns is None:
+            self._breakdowns = aggregate(self.match_table(), SLIDE_BREAKDOWNS)
+        return self._breakdowns
+    
     # Slide 2: Time Spent & Games Played
+    @memoized
+    @traced('analytics.calculate_time_spent')
     def calculate_time_spent(self) -> Dict[str, Any]:
         """
         Calculate total time played and game counts.
@@ -263,6 +206,8 @@ class RiftRewindAnalytics:
         }
     
     # Slide 3: Favorite Champions
+    @memoized
+    @traced('analytics.get_favorite_champions')
     def get_favorite_champions(self, top_n: int = 5) -> List[Dict[str, Any]]:
         """
         Get player's most played champions.
@@ -273,37 +218,12 @@ class RiftRewindAnalytics:
         Returns:
             List of champion dicts with games, wins, KDA
         """
-        champion_stats = defaultdict(lambda: {
-            'games': 0,
-            'wins': 0,
-            'kills': [],
-            'deaths': [],
-            'assists': []
-        })
-        
-        for match in self.matches:
-            stats = self._get_participant_stats(match)
-            if not stats:
-                continue
-            
-            champion = stats.get('championName', 'Unknown')
-            won = stats.get('win', False)
-            
-            champion_stats[champion]['games'] += 1
-            if won:
-                champion_stats[champion]['wins'] += 1
-            
-            champion_stats[champion]['kills'].append(stats.get('kills', 0))
-            champion_stats[champion]['deaths'].append(stats.get('deaths', 0))
-            champion_stats[champion]['assists'].append(stats.get('assists', 0))
-        
-        # Calculate averages and format
         champions = []
-        for champ, data in champion_stats.items():
+        for champ, data in self.breakdowns()['champion'].items():
             games = data['games']
-            avg_kills = sum(data['kills']) / games if games > 0 else 0
-            avg_deaths = sum(data['deaths']) / games if games > 0 else 0
-            avg_assists = sum(data['assists']) / games if games > 0 else 0
+            avg_kills = data['kills'] / games if games > 0 else 0
+            avg_deaths = data['deaths'] / games if games > 0 else 0
+            avg_assists = data['assists'] / games if games > 0 else 0
             
             champions.append({
                 'name': champ,
@@ -322,6 +242,8 @@ class RiftRewindAnalytics:
         return champions[:top_n]
     
     # Slide 4: Best Match
+    @memoized
+    @traced('analytics.find_best_match')
     def find_best_match(self) -> Optional[Dict[str, Any]]:
         """
         Find player's best performing match based on HIGHEST KILLS.
@@ -370,6 +292,8 @@ class RiftRewindAnalytics:
         return best_match
     
     # Slide 5: KDA Overview
+    @memoized
+    @traced('analytics.calculate_kda')
     def calculate_kda(self) -> Dict[str, Any]:
         """
         Calculate overall KDA statistics.
@@ -418,6 +342,8 @@ class RiftRewindAnalytics:
         }
     
     # Slide 6: Ranked Journey
+    @memoized
+    @traced('analytics.get_ranked_journey')
     def get_ranked_journey(self) -> Dict[str, Any]:
         """
         Get ranked progression using ACTUAL match data from analyzed games.
@@ -426,8 +352,6 @@ class RiftRewindAnalytics:
         Returns:
             Rank info with wins/losses from analyzed matches
         """
-        solo_queue = self.ranked.get('soloQueue')
-        
         # Calculate wins/losses from ACTUAL analyzed matches
         wins = 0
         losses = 0
@@ -442,6 +366,11 @@ class RiftRewindAnalytics:
             else:
                 losses += 1
         
+        return self._rank_summary(wins, losses)
+    
+    def _rank_summary(self, wins: int, losses: int) -> Dict[str, Any]:
+        """Current rank from League-V4 with wins/losses from the analyzed matches."""
+        solo_queue = self.ranked.get('soloQueue')
         total_games = wins + losses
         win_rate = round((wins / total_games * 100), 1) if total_games > 0 else 0
         
@@ -470,6 +399,8 @@ class RiftRewindAnalytics:
         }
     
     # Slide 7: Vision Score
+    @memoized
+    @traced('analytics.calculate_vision_score')
     def calculate_vision_score(self) -> Dict[str, Any]:
         """
         Calculate vision statistics.
@@ -502,6 +433,8 @@ class RiftRewindAnalytics:
         }
     
     # Slide 8: Champion Pool
+    @memoized
+    @traced('analytics.analyze_champion_pool')
     def analyze_champion_pool(self) -> Dict[str, Any]:
         """
         Analyze champion pool diversity.
@@ -509,12 +442,7 @@ class RiftRewindAnalytics:
         Returns:
             Unique champions, diversity metrics
         """
-        unique_champions = set()
-        
-        for match in self.matches:
-            stats = self._get_participant_stats(match)
-            if stats:
-                unique_champions.add(stats.get('championName', 'Unknown'))
+        unique_champions = list(self.breakdowns()['champion'])
         
         total_games = len(self.matches)
         
@@ -522,10 +450,12 @@ class RiftRewindAnalytics:
             'uniqueChampions': len(unique_champions),
             'totalGames': total_games,
             'diversityScore': round((len(unique_champions) / total_games * 100), 1) if total_games > 0 else 0,
-            'championList': list(unique_champions)
+            'championList': unique_champions
         }
     
     # Slide 9: Duo Partner
+    @memoized
+    @traced('analytics.find_duo_partner')
     def find_duo_partner(self) -> Optional[Dict[str, Any]]:
         """
         Find most frequent duo partner.
@@ -533,38 +463,18 @@ class RiftRewindAnalytics:
         Returns:
             Duo partner stats or None
         """
-        duo_stats = defaultdict(lambda: {'games': 0, 'wins': 0})
-        
-        for match in self.matches:
-            participants = match.get('info', {}).get('participants', [])
-            player_stats = self._get_participant_stats(match)
-            
-            if not player_stats:
-                continue
-            
-            player_team = player_stats.get('teamId')
-            won = player_stats.get('win', False)
-            
-            # Find teammates
-            for participant in participants:
-                if participant.get('puuid') != self.puuid and participant.get('teamId') == player_team:
-                    # Use riotIdGameName (new Riot ID system) or fall back to summonerName (deprecated)
-                    partner_name = participant.get('riotIdGameName') or participant.get('summonerName', 'Unknown')
-                    duo_stats[partner_name]['games'] += 1
-                    if won:
-                        duo_stats[partner_name]['wins'] += 1
+        duo_stats = self.breakdowns()['teammate']
         
         if not duo_stats:
             return None
         
         # Find most frequent duo
         best_duo = max(duo_stats.items(), key=lambda x: x[1]['games'])
-        partner_name, stats = best_duo
+        partner, stats = best_duo
+        partner_name = self.match_table().teammate_name(partner)
         
         # Get player's profile icon URL
-        from services.riot_api_client import RiotAPIClient
-        profile_icon_id = self.summoner.get('profileIconId')
-        player_profile_icon_url = RiotAPIClient.get_profile_icon_url(profile_icon_id) if profile_icon_id else None
+        player_profile_icon_url = self._profile_icon_url()
         
         return {
             'partnerName': partner_name,
@@ -575,21 +485,13 @@ class RiftRewindAnalytics:
         }
     
     # Slide 10-11: Strengths & Weaknesses (Advanced Pattern Analysis)
+    @memoized
+    @traced('analytics.analyze_champion_patterns')
     def analyze_champion_patterns(self) -> Dict[str, Any]:
         """
         Analyze champion performance patterns (Best, Worst, Feeder).
         """
-        champ_stats = defaultdict(lambda: {'games': 0, 'wins': 0, 'deaths': 0})
-        
-        for match in self.matches:
-            stats = self._get_participant_stats(match)
-            if not stats: continue
-            
-            name = stats.get('championName', 'Unknown')
-            champ_stats[name]['games'] += 1
-            champ_stats[name]['deaths'] += stats.get('deaths', 0)
-            if stats.get('win'):
-                champ_stats[name]['wins'] += 1
+        champ_stats = self.breakdowns()['champion']
         
         # Filter for champs with min 3 games for meaningful patterns
         significant_champs = {k: v for k, v in champ_stats.items() if v['games'] >= 3}
@@ -619,30 +521,13 @@ class RiftRewindAnalytics:
             'highestDeathAvg': most_deaths[0] if most_deaths else None
         }
 
+    @memoized
+    @traced('analytics.analyze_class_performance')
     def analyze_class_performance(self) -> Dict[str, Any]:
         """
         Analyze performance by champion class (Mage, Fighter, etc).
         """
-        class_stats = defaultdict(lambda: {'games': 0, 'wins': 0})
-        
-        # Reverse lookup map
-        champ_to_class = {}
-        for cls, champs in CHAMPION_CLASSES.items():
-            for c in champs:
-                champ_to_class[c['name']] = cls
-        
-        for match in self.matches:
-            stats = self._get_participant_stats(match)
-            if not stats: continue
-            
-            name = stats.get('championName')
-            # Default to Fighter if unknown, or check secondary logic later
-            primary_class = champ_to_class.get(name, 'Unknown')
-            
-            if primary_class != 'Unknown':
-                class_stats[primary_class]['games'] += 1
-                if stats.get('win'):
-                    class_stats[primary_class]['wins'] += 1
+        class_stats = self.breakdowns()['class']
         
         results = []
         for cls, data in class_stats.items():
@@ -660,6 +545,8 @@ class RiftRewindAnalytics:
             'allClasses': results
         }
 
+    @memoized
+    @traced('analytics.calculate_playstyle_metrics')
     def calculate_playstyle_metrics(self) -> Dict[str, Any]:
         """
         Calculate advanced playstyle metrics (KP, Dmg Share, etc).
@@ -676,17 +563,11 @@ class RiftRewindAnalytics:
             stats = self._get_participant_stats(match)
             if not stats: continue
             
-            # Team totals
-            team_id = stats.get('teamId')
-            team_kills = 0
-            team_dmg = 0
-            team_gold = 0
-            
-            for p in match.get('info', {}).get('participants', []):
-                if p.get('teamId') == team_id:
-                    team_kills += p.get('kills', 0)
-                    team_dmg += p.get('totalDamageDealtToChampions', 0)
-                    team_gold += p.get('goldEarned', 0)
+            # Team totals (precomputed on projected matches)
+            totals = team_totals(match, stats.get('teamId'))
+            team_kills = totals['kills']
+            team_dmg = totals['totalDamageDealtToChampions']
+            team_gold = totals['goldEarned']
             
             # Player stats
             kills = stats.get('kills', 0)
@@ -732,6 +613,8 @@ class RiftRewindAnalytics:
             }
         }
     
+    @memoized
+    @traced('analytics.calculate_objective_control')
     def calculate_objective_control(self) -> Dict[str, Any]:
         """
         Calculate player's objective control metrics.
@@ -798,6 +681,8 @@ class RiftRewindAnalytics:
             'avgTowerDamage': avg_tower_damage
         }
     
+    @memoized
+    @traced('analytics.calculate_cs_efficiency')
     def calculate_cs_efficiency(self) -> Dict[str, Any]:
         """
         Calculate player's CS (Creep Score) efficiency metrics.
@@ -851,6 +736,8 @@ class RiftRewindAnalytics:
             'avgGold': avg_gold
         }
 
+    @memoized
+    @traced('analytics.detect_strengths_weaknesses')
     def detect_strengths_weaknesses(self) -> Dict[str, Any]:
         """
         Prepare comprehensive data for AI-powered strength/weakness analysis.
@@ -914,6 +801,7 @@ class RiftRewindAnalytics:
             'needsAIProcessing': True  # Flag for orchestrator to invoke insights Lambda
         }
     
+    @memoized
     def _calculate_win_rate(self) -> float:
         """Calculate win rate percentage."""
         if not self.matches:
@@ -927,22 +815,70 @@ class RiftRewindAnalytics:
         
         return round((wins / len(self.matches)) * 100, 1)
     
-    # Slide 12: Progress Timeline (requires historical data)
+    def progress_series(self) -> ProgressSeries:
+        """
+        Monthly sums over self.matches.
+        
+        Starts from raw_data['progressSeries'] when present (a live
+        ProgressSeries during a progressive fetch, or its to_dict() form from
+        an earlier run) and only adds the matches it hasn't seen.
+        
+        Returns:
+            ProgressSeries covering every analyzed match
+        """
+        if self._progress_series is None:
+            stored = self.raw_data.get('progressSeries')
+            series = stored if isinstance(stored, ProgressSeries) else ProgressSeries.from_dict(stored)
+            added = series.extend(self.matches, self._get_participant_stats)
+            logger.debug(f"Progress series: {added} new of {len(self.matches)} matches")
+            self._progress_series = series
+        return self._progress_series
+    
+    # Slide 12: Progress Timeline
+    @memoized
+    @traced('analytics.calculate_progress')
     def calculate_progress(self) -> Dict[str, Any]:
         """
-        Calculate progress metrics (limited without historical data).
+        Calculate month-by-month progress over the season.
+        
+        Per-month and rolling-window aggregates come from progress_series(),
+        so the cost is O(new matches) + O(months). Games per month are exact
+        when raw_data carries the windowed histogram ('matchesByMonth'), even
+        if only a sample was fetched; otherwise they're the analyzed games.
         
         Returns:
-            Progress indicators
+            Progress indicators: currentSeason, monthly, rolling, gamesByMonth
         """
-        # This would ideally compare to previous season
-        # For now, return current season stats
+        series = self.progress_series()
+        monthly = series.monthly()
+        totals = series.totals()
+        
+        games_by_month = self.raw_data.get('matchesByMonth')
+        exact = games_by_month is not None
+        if not exact:
+            games_by_month = {month['month']: month['games'] for month in monthly}
+        by_month = [{'month': month, 'games': games_by_month[month]} for month in sorted(games_by_month)]
+        
+        message = 'Progress tracking requires multi-season data'
+        if len(monthly) >= 2:
+            first, last = monthly[0], monthly[-1]
+            change = last['winRate'] - first['winRate']
+            message = (f"Win rate {'up' if change >= 0 else 'down'} {abs(change):.1f}% "
+                       f"from {first['month']} to {last['month']}")
+        
         return {
-            'message': 'Progress tracking requires multi-season data',
-            'currentSeason': self.get_ranked_journey()
+            'message': message,
+            'currentSeason': self._rank_summary(totals['wins'], totals['games'] - totals['wins']),
+            'monthly': monthly,
+            'rolling': series.rolling(),
+            'rollingWindowMonths': ROLLING_WINDOW_MONTHS,
+            'gamesByMonth': by_month,
+            'gamesByMonthExact': exact,
+            'busiestMonth': max(by_month, key=lambda m: m['games'])['month'] if by_month else None
         }
     
     # Slide 13: Achievements
+    @traced('analytics.detect_achievements')
     def detect_achievements(self) -> List[Dict[str, Any]]:
         """
         Detect special achievements.
@@ -992,6 +928,8 @@ class RiftRewindAnalytics:
         return achievements
     
     # Slide 14: Social Comparison
+    @memoized
+    @traced('analytics.calculate_percentile')
     def calculate_percentile(self) -> Dict[str, Any]:
         """
         Calculate player percentile and leaderboard position.
@@ -999,8 +937,6 @@ class RiftRewindAnalytics:
         Returns:
             Percentile, comparison data, and player details for leaderboard display
         """
-        from .riot_api_client import RiotAPIClient
-        
         ranked_info = self.get_ranked_journey()
         kda_stats = self.calculate_kda()
         time_stats = self.calculate_time_spent()
@@ -1048,40 +984,13 @@ class RiftRewindAnalytics:
         
         percentile = round(percentile, 1)  # Round to 1 decimal place
         
-        # Try to get actual leaderboard position
-        summoner_id = self.summoner.get('id')
-        leaderboard_rank = None
-        
-        if summoner_id and tier != 'UNRANKED':
-            try:
-                api_client = RiotAPIClient()
-                division = ranked_info.get('division', 'IV')
-                lp = ranked_info.get('lp', 0)
-                
-                # Get position within tier/division
-                position = api_client.get_league_position_in_tier(
-                    queue='RANKED_SOLO_5x5',
-                    tier=tier,
-                    division=division,
-                    lp=lp,
-                    platform=self.region
-                )
-                
-                if position:
-                    leaderboard_rank = position
-                    logger.info(f"Retrieved leaderboard position: {position}")
-                    
-            except Exception as e:
-                logger.error(f"Failed to get leaderboard position: {e}")
-        
         # Get player details
         game_name = self.raw_data.get('account', {}).get('gameName', 'Player')
         tag_line = self.raw_data.get('account', {}).get('tagLine', '')
         summoner_name = f"{game_name}#{tag_line}" if tag_line else game_name
         
         # Get player's profile icon URL
-        player_icon_id = self.summoner.get('profileIconId', 0)
-        player_profile_icon_url = RiotAPIClient.get_profile_icon_url(player_icon_id)
+        player_profile_icon_url = self._profile_icon_url(default_icon_id=0)
         
         # Get summoner level
         summoner_level = self.summoner.get('summonerLevel', 0)
@@ -1090,18 +999,16 @@ class RiftRewindAnalytics:
         total_games = time_stats['totalGames']
         total_wins = int(total_games * (win_rate / 100)) if win_rate > 0 else 0
         
-        return {
-            'rankPercentile': percentile,
+        section = {
+            'tierPercentile': percentile,
+            'playerMetrics': self.population_metrics(),
             'rank': ranked_info.get('currentRank'),
             'tier': ranked_info.get('tier', 'UNRANKED'),
             'division': ranked_info.get('division', ''),
             'kdaRatio': kda_stats['kdaRatio'],
-            'comparison': f'Top {100 - percentile}%' if percentile > 50 else f'Bottom {percentile}%',
-            'yourRank': leaderboard_rank,  # None if not available
             'playerProfileIconUrl': player_profile_icon_url,
             'summonerLevel': summoner_level,
             'leaderboard': [{
-                'rank': leaderboard_rank,  # None if not available
                 'summonerName': summoner_name,
                 'summonerLevel': summoner_level,
                 'winRate': win_rate,
@@ -1112,6 +1019,45 @@ class RiftRewindAnalytics:
                 'isYou': True
             }]
         }
+        # Population percentiles and ladder position
+        return apply_percentile_context(section, self.population, self.prefetched, self.region)
+    
+    def _profile_icon_url(self, default_icon_id: Optional[int] = None) -> Optional[str]:
+        """Profile icon URL from the prefetch phase, else built from the summoner's icon ID."""
+        if self.prefetched.get('profileIconUrl'):
+            return self.prefetched['profileIconUrl']
+        return profile_icon_url(self.summoner.get('profileIconId', default_icon_id))
+    
+    @memoized
+    def population_metrics(self) -> Dict[str, float]:
+        """
+        Player-level values recorded in (and compared against) the population index.
+        
+        Returns:
+            Dict of metric name -> value (rankScore only for ranked players)
+        """
+        if not self.matches:
+            return {}
+        kda = self.calculate_kda()
+        cs = self.calculate_cs_efficiency()
+        metrics = {
+            'kda': kda['kdaRatio'],
+            'deathsPerGame': kda['avgDeaths'],
+            'visionScore': self.calculate_vision_score()['avgVisionScore'],
+            'csPerMin': cs['csPerMin'],
+            'goldPerMin': cs['goldPerMin'],
+            'killParticipation': self.calculate_playstyle_metrics()['avgKP'],
+            'winRate': self._calculate_win_rate(),
+        }
+        
+        solo_queue = self.ranked.get('soloQueue')
+        if solo_queue and solo_queue.get('tier') in TIER_ORDER:
+            # Comparable ladder score: 400 per tier, 100 per division, plus LP
+            division_map = {'IV': 0, 'III': 1, 'II': 2, 'I': 3}
+            metrics['rankScore'] = (TIER_ORDER.index(solo_queue['tier']) * 400
+                                    + division_map.get(solo_queue.get('rank'), 0) * 100
+                                    + solo_queue.get('leaguePoints', 0))
+        return metrics
     
     # Master function: Calculate all analytics
     def calculate_checkpoint_analytics(self, checkpoint_num: int, total_matches: int) -> Dict[str, Any]:
@@ -1202,27 +1148,24 @@ class RiftRewindAnalytics:
         
         return merged
     
-    def calculate_all(self) -> Dict[str, Any]:
+    @traced('analytics', level=logging.INFO)
+    def calculate_all(self, store: Optional[SectionStore] = None) -> Dict[str, Any]:
         """
         Calculate all analytics for all 15 slides.
         
+        Sections are computed in SLIDE_SECTIONS priority order (cheap slides
+        first) and, with a store, persisted as each one is done.
+        
+        Args:
+            store: Optional SectionStore for per-section persistence
+        
         Returns:
             Complete analytics dict
         """
         
         analytics = {
             'sessionId': self.raw_data.get('metadata', {}).get('sessionId'),
-            'slide2_timeSpent': self.calculate_time_spent(),
-            'slide3_favoriteChampions': self.get_favorite_champions(),
-            'slide4_bestMatch': self.find_best_match(),
-            'slide5_kda': self.calculate_kda(),
-            'slide6_rankedJourney': self.get_ranked_journey(),
-            'slide7_visionScore': self.calculate_vision_score(),
-            'slide8_championPool': self.analyze_champion_pool(),
-            'slide9_duoPartner': self.find_duo_partner(),
-            'slide10_11_analysis': self.detect_strengths_weaknesses(),
-            'slide12_progress': self.calculate_progress(),
-            'slide14_percentile': self.calculate_percentile(),
+            **LazyAnalytics(self, store).compute_all(),
             'metadata': {
                 'calculatedAt': datetime.utcnow().isoformat(),
                 'totalMatches': len(self.matches)
@@ -0,0 +1,161 @@
+"""
+Analytics Result Cache
+======================
+calculate_all() output stored in S3 under a fingerprint of everything it
+depends on: the player, their match IDs, their ranked snapshot and the
+analytics version.
+
+A processor retry, a forced refresh or a repeat visit after the session
+cache expired all list the player's match IDs again; when nothing has
+changed the fingerprint matches, and the pipeline serves the stored result
+without fetching match details or recomputing:
+
+    fingerprint = analytics_fingerprint(raw_data, match_ids)
+    analytics = load_cached_analytics(fingerprint)
+    if analytics is None:
+        analytics = RiftRewindAnalytics(raw_data).calculate_all()
+        save_cached_analytics(fingerprint, analytics)
+
+Slide 14's population percentiles and ladder position change while the
+match set doesn't, so they are re-applied to every hit (refresh_context)
+from the current population index and ladder snapshot instead of being
+served as they were when cached.
+
+Bump ANALYTICS_VERSION (analytics.py) whenever calculate_all output changes;
+entries from other versions are never read again and expire with the
+bucket's cache/ lifecycle.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .analytics import ANALYTICS_VERSION, apply_percentile_context
+from .aws_clients import download_from_s3, upload_to_s3
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_CACHE_PREFIX = 'cache/analytics'
+ANALYTICS_CACHE_TTL_HOURS = float(os.environ.get('ANALYTICS_CACHE_TTL_HOURS', 7 * 24))
+
+
+def _match_ids(raw_data: Dict[str, Any]) -> List[str]:
+    if raw_data.get('allMatchIds') is not None:
+        return raw_data['allMatchIds']
+    return [match.get('metadata', {}).get('matchId') for match in raw_data.get('matches') or []]
+
+
+def analytics_fingerprint(raw_data: Dict[str, Any], match_ids: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Cache key of an analytics run.
+
+    Args:
+        raw_data: Fetcher data with 'account' and 'ranked'
+        match_ids: The player's match IDs (default: raw_data['allMatchIds'],
+            else the IDs of raw_data['matches'])
+
+    Returns:
+        Hex digest, or None without a PUUID or matches (nothing worth caching)
+    """
+    puuid = raw_data.get('account', {}).get('puuid')
+    if match_ids is None:
+        match_ids = _match_ids(raw_data)
+    if not puuid or not match_ids:
+        return None
+    payload = json.dumps({
+        'version': ANALYTICS_VERSION,
+        'puuid': puuid,
+        'matchIds': sorted(mid for mid in match_ids if mid),
+        'ranked': raw_data.get('ranked') or {},
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _cache_key(fingerprint: str) -> str:
+    return f"{ANALYTICS_CACHE_PREFIX}/{fingerprint}.json"
+
+
+def load_cached_analytics(fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Stored calculate_all() output for a fingerprint.
+
+    Args:
+        fingerprint: From analytics_fingerprint (None is a miss)
+
+    Returns:
+        Analytics dict, or None if missing, expired or unreadable
+    """
+    if not fingerprint:
+        return None
+    try:
+        entry_str = download_from_s3(_cache_key(fingerprint))
+        if not entry_str:
+            return None
+        entry = json.loads(entry_str)
+        age_hours = (time.time() - entry.get('cachedAt', 0)) / 3600
+        if entry.get('version') != ANALYTICS_VERSION or age_hours > ANALYTICS_CACHE_TTL_HOURS:
+            return None
+        logger.info(f" Analytics cache hit ({fingerprint[:12]}, {age_hours:.1f}h old)")
+        return entry['analytics']
+    except Exception as e:
+        logger.warning(f" Analytics cache read failed: {e}")
+        return None
+
+
+def save_cached_analytics(fingerprint: Optional[str], analytics: Dict[str, Any]) -> bool:
+    """
+    Store calculate_all() output (before playerInfo and insights are merged in).
+
+    Args:
+        fingerprint: From analytics_fingerprint (None: not stored)
+        analytics: calculate_all() output
+
+    Returns:
+        True if stored
+    """
+    if not fingerprint:
+        return False
+    try:
+        return upload_to_s3(_cache_key(fingerprint), {
+            'version': ANALYTICS_VERSION,
+            'fingerprint': fingerprint,
+            'cachedAt': time.time(),
+            'analytics': analytics,
+        })
+    except Exception as e:
+        logger.warning(f" Analytics cache write failed: {e}")
+        return False
+
+
+def refresh_context(analytics: Dict[str, Any], raw_data: Dict[str, Any], region: str,
+                    riot_client=None) -> Dict[str, Any]:
+    """
+    Bring a cache hit's population percentiles and ladder position up to date.
+
+    Args:
+        analytics: Output of load_cached_analytics
+        raw_data: Fetcher data with 'summoner' and 'ranked' (matches not needed)
+        region: Platform code
+        riot_client: RiotAPIClient for a ladder snapshot miss's background refresh
+
+    Returns:
+        Analytics with slide14_percentile recomputed
+    """
+    section = analytics.get('slide14_percentile')
+    if not section or 'tierPercentile' not in section:
+        return analytics
+    from .analytics_prefetch import leaderboard_position, profile_icon_url
+    from .population_stats import get_population_index
+    try:
+        prefetched = {
+            'leaderboardRank': leaderboard_position(raw_data, region, riot_client),
+            'profileIconUrl': profile_icon_url(raw_data.get('summoner', {}).get('profileIconId')),
+        }
+        return dict(analytics, slide14_percentile=apply_percentile_context(
+            section, get_population_index(), prefetched, region))
+    except Exception as e:
+        logger.warning(f" Analytics context refresh failed: {e}")
+        return analytics
@@ -0,0 +1,137 @@
+"""
+Analytics Prefetch Phase
+========================
+Everything RiftRewindAnalytics needs from outside the match list (ladder
+position, profile icon, Data Dragon champion metadata), gathered up front so the analytics pass itself is
+pure CPU over its inputs.
+
+Only account/summoner/ranked data is needed, so once the analytics cache
+has missed the processor starts the prefetch in a background thread, fetches
+the match details and joins it after:
+
+    prefetch = start_prefetch(raw_data, region, riot_client)
+    matches = fetcher.fetch_match_details_batch(...)
+    raw_data['prefetched'] = join_prefetch(prefetch)
+    RiftRewindAnalytics(raw_data).calculate_all()   # no network
+
+Every input is optional; analytics degrades to omitting the field.
+"""
+
+import concurrent.futures
+import logging
+import time
+from typing import Dict, Any, Optional
+
+from .constants import COMMUNITY_DRAGON_PROFILE_ICON
+from .tracing import span, propagate
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_QUEUE = 'RANKED_SOLO_5x5'
+PREFETCH_TIMEOUT_SECONDS = 30.0
+
+
+def profile_icon_url(profile_icon_id: Optional[int]) -> Optional[str]:
+    """
+    Community Dragon URL for a profile icon (no network).
+
+    Args:
+        profile_icon_id: Profile icon ID from summoner data
+
+    Returns:
+        URL or None without an icon ID
+    """
+    if profile_icon_id is None:
+        return None
+    return COMMUNITY_DRAGON_PROFILE_ICON.format(icon_id=profile_icon_id)
+
+
+def leaderboard_position(raw_data: Dict[str, Any], region: str, riot_client=None) -> Optional[int]:
+    """
+    Solo queue ladder position from the ladder snapshots (no ladder paging).
+
+    Args:
+        raw_data: Fetcher data with 'ranked'
+        region: Platform code
+        riot_client: RiotAPIClient for the background refresh a snapshot miss queues
+
+    Returns:
+        Position within the player's tier/division, or None (unranked, or no snapshot yet)
+    """
+    solo_queue = raw_data.get('ranked', {}).get('soloQueue')
+    if not solo_queue or not solo_queue.get('tier'):
+        return None
+    try:
+        from .ladder_snapshot import get_ladder_service
+        return get_ladder_service(riot_client).position(
+            region, LEADERBOARD_QUEUE, solo_queue['tier'], solo_queue.get('rank', 'IV'),
+            solo_queue.get('leaguePoints', 0)
+        )
+    except Exception as e:
+        logger.warning(f"Leaderboard prefetch failed: {e}")
+        return None
+
+
+def prefetch_analytics_inputs(raw_data: Dict[str, Any], region: str, riot_client=None) -> Dict[str, Any]:
+    """
+    Gather the external inputs of an analytics run.
+
+    Args:
+        raw_data: Fetcher data with at least 'summoner' and 'ranked'
+        region: Platform code
+        riot_client: RiotAPIClient for the background ladder refresh a snapshot
+            miss queues (positions themselves are only read from snapshots)
+
+    Returns:
+        {'leaderboardRank', 'profileIconUrl', 'prefetchedAt'}
+    """
+    with span('analytics.prefetch', region=region):
+        prefetched = {
+            'leaderboardRank': leaderboard_position(raw_data, region, riot_client),
+            'profileIconUrl': profile_icon_url(raw_data.get('summoner', {}).get('profileIconId')),
+            'prefetchedAt': time.time(),
+        }
+
+        # Keeps the champion registry current (at most one fetch a day);
+        # analytics only reads it
+        try:
+            from .champion_registry import refresh_champion_registry
+            refresh_champion_registry()
+        except Exception as e:
+            logger.warning(f"Champion registry refresh failed: {e}")
+
+        return prefetched
+
+
+def start_prefetch(raw_data: Dict[str, Any], region: str, riot_client=None) -> concurrent.futures.Future:
+    """
+    Run prefetch_analytics_inputs in a background thread.
+
+    Returns:
+        Future resolving to the prefetched inputs
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='analytics-prefetch')
+    future = executor.submit(propagate(prefetch_analytics_inputs), raw_data, region, riot_client)
+    executor.shutdown(wait=False)
+    return future
+
+
+def join_prefetch(future: Optional[concurrent.futures.Future],
+                  timeout: float = PREFETCH_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """
+    Wait for a prefetch started with start_prefetch.
+
+    Args:
+        future: Future from start_prefetch (None is allowed)
+        timeout: Seconds to wait once matches are fetched
+
+    Returns:
+        Prefetched inputs, or {} if it failed or timed out
+    """
+    if future is None:
+        return {}
+    try:
+        return future.result(timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Analytics prefetch unavailable: {e!r}")
+        return {}
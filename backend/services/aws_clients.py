@@ -2,12 +2,12 @@
 AWS client initialization utilities
 """
 
-import boto3
 import json
 import os
 from pathlib import Path
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List
 from .constants import AWS_DEFAULT_REGION, S3_BUCKET_NAME
+from .tracing import traced, current_span
 
 
 # Singleton clients
@@ -23,6 +23,7 @@ def get_s3_client():
     """
     global _s3_client
     if _s3_client is None:
+        import boto3  # Deferred: boto3 import dominates Lambda cold start
         _s3_client = boto3.client('s3', region_name=AWS_DEFAULT_REGION)
     return _s3_client
 
@@ -36,6 +37,7 @@ def get_bedrock_client():
     """
     global _bedrock_client
     if _bedrock_client is None:
+        import boto3
         _bedrock_client = boto3.client(
             service_name='bedrock-runtime',
             region_name=AWS_DEFAULT_REGION
@@ -43,6 +45,7 @@ def get_bedrock_client():
     return _bedrock_client
 
 
+@traced('s3.put')
 def upload_to_s3(key: str, data: Union[str, Dict[str, Any]], content_type: str = 'application/json') -> bool:
     """
     Upload data to S3 bucket.
@@ -61,6 +64,7 @@ def upload_to_s3(key: str, data: Union[str, Dict[str, Any]], content_type: str =
         # Convert dict to JSON string if needed
         if isinstance(data, dict):
             data = json.dumps(data, indent=2)
+        current_span().set(key=key, bytes=len(data))
         
         s3_client.put_object(
             Bucket=S3_BUCKET_NAME,
@@ -86,6 +90,7 @@ def upload_to_s3(key: str, data: Union[str, Dict[str, Any]], content_type: str =
             return False
 
 
+@traced('s3.get')
 def download_from_s3(key: str) -> Optional[str]:
     """
     Download data from S3 bucket.
@@ -99,7 +104,9 @@ def download_from_s3(key: str) -> Optional[str]:
     try:
         s3_client = get_s3_client()
         response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=key)
-        return response['Body'].read().decode('utf-8')
+        body = response['Body'].read()
+        current_span().set(key=key, bytes=len(body))
+        return body.decode('utf-8')
     except Exception as e:
         # Fallback: read from local .local_s3 folder
         try:
@@ -113,6 +120,7 @@ def download_from_s3(key: str) -> Optional[str]:
             return None
 
 
+@traced('s3.head')
 def check_s3_object_exists(key: str) -> bool:
     """
     Check if an object exists in S3.
@@ -137,6 +145,7 @@ def check_s3_object_exists(key: str) -> bool:
             return False
 
 
+@traced('s3.delete')
 def delete_from_s3(key: str) -> bool:
     """
     Delete an object from S3 bucket.
@@ -161,3 +170,41 @@ def delete_from_s3(key: str) -> bool:
         except Exception:
             return False
 
+
+def list_s3_keys(prefix: str) -> List[str]:
+    """
+    List object keys under a prefix.
+    
+    Args:
+        prefix: S3 key prefix
+        
+    Returns:
+        Sorted list of keys (empty on error)
+    """
+    try:
+        s3_client = get_s3_client()
+        keys = []
+        token = None
+        while True:
+            kwargs = {'Bucket': S3_BUCKET_NAME, 'Prefix': prefix}
+            if token:
+                kwargs['ContinuationToken'] = token
+            response = s3_client.list_objects_v2(**kwargs)
+            keys.extend(obj['Key'] for obj in response.get('Contents', []))
+            if not response.get('IsTruncated'):
+                return sorted(keys)
+            token = response.get('NextContinuationToken')
+    except Exception:
+        # Fallback: list local .local_s3
+        try:
+            local_root = Path(__file__).resolve().parents[1] / '.local_s3'
+            base = local_root / prefix
+            directory = base if base.is_dir() else base.parent
+            if not directory.exists():
+                return []
+            return sorted(
+                str(path.relative_to(local_root)) for path in directory.rglob('*')
+                if path.is_file() and str(path.relative_to(local_root)).startswith(prefix)
+            )
+        except Exception:
+            return []
@@ -0,0 +1,254 @@
+"""
+Champion Registry
+=================
+One table of champion metadata per process: Riot championId, Data Dragon
+key, display name, primary/secondary class, and a dense integer ID
+(0..N-1) so per-champion aggregation can index arrays instead of hashing
+names.
+
+Names are matched after normalization (lowercase, letters and digits only),
+with CHAMPION_NAME_MAP aliases, so the spellings in match data ('Leblanc',
+'MonkeyKing', 'Kaisa'), Data Dragon ('LeBlanc', 'Wukong', "Kai'Sa") and
+CHAMPION_CLASSES ('LeBlanc', 'Wukong', 'KaiSa') all resolve to one entry.
+
+Sources, merged:
+- Data Dragon champion.json (ids, keys, names, tags), cached on local disk
+  (CHAMPION_DATA_CACHE) and refreshed at most every CHAMPION_DATA_TTL_SECONDS
+  by refresh_champion_registry(), which runs in the analytics prefetch so
+  analytics itself stays offline
+- CHAMPION_CLASSES: curated classes win over Data Dragon tags
+- match data: champions missing from both (a new release) are added on
+  first sight with the next dense ID
+
+get_champion_registry() never touches the network.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from .constants import CHAMPION_CLASSES, CHAMPION_NAME_MAP, DATA_DRAGON_CHAMPION_DATA
+
+logger = logging.getLogger(__name__)
+
+CHAMPION_DATA_CACHE = os.environ.get('CHAMPION_DATA_CACHE', '/tmp/rift-rewind-champion.json')
+CHAMPION_DATA_TTL_SECONDS = 24 * 3600
+# Don't retry a failed Data Dragon fetch more often than this
+REFRESH_RETRY_SECONDS = 600
+
+
+def normalize_name(name: str) -> str:
+    """Lookup key for any spelling of a champion name."""
+    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+
+class ChampionInfo:
+    """
+    One champion.
+    """
+
+    __slots__ = ('dense_id', 'champion_id', 'key', 'name', 'primary', 'secondary')
+
+    def __init__(self, dense_id: int, champion_id: Optional[int], key: str, name: str,
+                 primary: Optional[str] = None, secondary: Optional[List[str]] = None):
+        self.dense_id = dense_id
+        self.champion_id = champion_id
+        self.key = key              # Data Dragon id / Match-V5 championName, e.g. 'MonkeyKing'
+        self.name = name            # Display name, e.g. 'Wukong'
+        self.primary = primary
+        self.secondary = secondary or []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'denseId': self.dense_id, 'championId': self.champion_id, 'key': self.key,
+                'name': self.name, 'primary': self.primary, 'secondary': self.secondary}
+
+
+class ChampionRegistry:
+    """
+    Champion lookups by championId, any name spelling, or dense ID.
+    """
+
+    def __init__(self, champion_data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            champion_data: Data Dragon champion.json payload (None: curated
+                classes only; championIds are then learned from match data)
+        """
+        self.version = (champion_data or {}).get('version')
+        self.champions: List[ChampionInfo] = []
+        self._by_id: Dict[int, ChampionInfo] = {}
+        self._by_name: Dict[str, ChampionInfo] = {}
+        self._lock = threading.Lock()
+
+        curated = {}
+        for primary, entries in CHAMPION_CLASSES.items():
+            for entry in entries:
+                curated[normalize_name(entry['name'])] = (entry['name'], primary, entry.get('secondary', []))
+        aliases = {normalize_name(a): normalize_name(b) for a, b in CHAMPION_NAME_MAP.items()}
+        aliases.update({b: a for a, b in aliases.items()})
+
+        dragon = sorted((champion_data or {}).get('data', {}).values(), key=lambda c: int(c.get('key', 0)))
+        for champion in dragon:
+            key, name = champion['id'], champion.get('name', champion['id'])
+            classes = None
+            for spelling in (key, name):
+                normalized = normalize_name(spelling)
+                classes = curated.pop(normalized, None) or curated.pop(aliases.get(normalized, ''), None)
+                if classes:
+                    break
+            tags = champion.get('tags') or []
+            primary, secondary = (classes[1], classes[2]) if classes else (tags[0] if tags else None, tags[1:])
+            self._add(int(champion['key']), key, name, primary, secondary)
+
+        # Curated champions Data Dragon didn't list (or no Data Dragon data at all)
+        for name, primary, secondary in sorted(curated.values()):
+            self._add(None, name, name, primary, secondary)
+
+        for alias, target in aliases.items():
+            if alias not in self._by_name and target in self._by_name:
+                self._by_name[alias] = self._by_name[target]
+
+    def _add(self, champion_id: Optional[int], key: str, name: str,
+             primary: Optional[str], secondary: List[str]) -> ChampionInfo:
+        info = ChampionInfo(len(self.champions), champion_id, key, name, primary, secondary)
+        self.champions.append(info)
+        if champion_id is not None:
+            self._by_id[champion_id] = info
+        for spelling in (key, name):
+            self._by_name.setdefault(normalize_name(spelling), info)
+        return info
+
+    def __len__(self) -> int:
+        return len(self.champions)
+
+    def get(self, champion: Union[int, str, None]) -> Optional[ChampionInfo]:
+        """
+        Look up a champion.
+
+        Args:
+            champion: championId, or a name in any spelling
+
+        Returns:
+            ChampionInfo or None if unknown
+        """
+        if champion is None:
+            return None
+        if isinstance(champion, int):
+            return self._by_id.get(champion)
+        return self._by_name.get(normalize_name(champion))
+
+    def resolve(self, champion_id: Optional[int], name: Optional[str]) -> ChampionInfo:
+        """
+        The entry for a participant's championId/championName, added if new.
+
+        A name match also teaches the registry the championId, so curated-only
+        registries learn IDs from match data.
+
+        Args:
+            champion_id: Participant championId
+            name: Participant championName
+
+        Returns:
+            ChampionInfo (never None)
+        """
+        info = self._by_id.get(champion_id) if champion_id else None
+        if info is not None:
+            return info
+        name = name or 'Unknown'
+        info = self._by_name.get(normalize_name(name))
+        with self._lock:
+            if info is None:
+                info = self._by_name.get(normalize_name(name)) or self._add(champion_id or None, name, name, None, [])
+            elif champion_id and info.champion_id is None:
+                info.champion_id = champion_id
+                self._by_id[champion_id] = info
+        return info
+
+    def dense_id(self, champion_id: Optional[int], name: Optional[str]) -> int:
+        """Dense ID (index into per-champion arrays) of a participant's champion."""
+        return self.resolve(champion_id, name).dense_id
+
+    def class_of(self, champion: Union[int, str, None]) -> Optional[str]:
+        """Primary class of a champion, or None if unknown."""
+        info = self.get(champion)
+        return info.primary if info else None
+
+
+_registry: Optional[ChampionRegistry] = None
+_registry_lock = threading.Lock()
+_last_refresh_attempt = 0.0
+
+
+def _read_cache(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_champion_registry() -> ChampionRegistry:
+    """
+    The process-wide registry, built on first use from the local
+    champion.json cache (or curated classes alone). No network.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ChampionRegistry(_read_cache(CHAMPION_DATA_CACHE))
+                logger.info(f"Champion registry: {len(_registry)} champions "
+                            f"(Data Dragon {_registry.version or 'unavailable'})")
+    return _registry
+
+
+def refresh_champion_registry(max_age: float = CHAMPION_DATA_TTL_SECONDS) -> ChampionRegistry:
+    """
+    Refresh the cached Data Dragon champion.json if it's older than max_age,
+    and rebuild the registry when it changed. Failures keep the current one.
+
+    Args:
+        max_age: Seconds a cached champion.json stays fresh
+
+    Returns:
+        The (possibly rebuilt) process-wide registry
+    """
+    global _registry, _last_refresh_attempt
+    registry = get_champion_registry()
+    try:
+        fresh = time.time() - os.path.getmtime(CHAMPION_DATA_CACHE) < max_age
+    except OSError:
+        fresh = False
+    if fresh and registry.version:
+        return registry
+    if fresh:
+        # Another process refreshed the cache since this registry was built
+        data = _read_cache(CHAMPION_DATA_CACHE)
+    else:
+        if time.time() - _last_refresh_attempt < REFRESH_RETRY_SECONDS:
+            return registry
+        _last_refresh_attempt = time.time()
+        try:
+            import requests
+            from .riot_api_client import RiotAPIClient
+            version = RiotAPIClient.get_data_dragon_version()
+            response = requests.get(DATA_DRAGON_CHAMPION_DATA.format(version=version), timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            tmp_path = f"{CHAMPION_DATA_CACHE}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, CHAMPION_DATA_CACHE)
+        except Exception as e:
+            logger.warning(f"Champion data refresh failed: {e}")
+            return registry
+
+    if data and data.get('version') != registry.version:
+        rebuilt = ChampionRegistry(data)
+        with _registry_lock:
+            _registry = rebuilt
+        logger.info(f"Champion registry refreshed: {len(rebuilt)} champions (Data Dragon {rebuilt.version})")
+    return _registry
@@ -52,8 +52,12 @@ VALID_REGIONAL = ["americas", "europe", "asia", "sea"]
 REGION_TO_PLATFORM = {region["value"]: region for region in REGIONS}
 
 # Riot API base URLs
-RIOT_API_PLATFORM_BASE = "https://{platform}.api.riotgames.com"
-RIOT_API_REGIONAL_BASE = "https://{regional}.api.riotgames.com"
+# Overridable so the client can be pointed at the local stub server (see backend/stubs),
+# e.g. RIOT_API_PLATFORM_BASE=http://127.0.0.1:8089/{platform}
+import os
+
+RIOT_API_PLATFORM_BASE = os.getenv("RIOT_API_PLATFORM_BASE", "https://{platform}.api.riotgames.com")
+RIOT_API_REGIONAL_BASE = os.getenv("RIOT_API_REGIONAL_BASE", "https://{regional}.api.riotgames.com")
 
 # Riot API endpoints
 RIOT_API_ENDPOINTS = {
@@ -67,6 +71,7 @@ RIOT_API_ENDPOINTS = {
     # LEAGUE-V4 (Platform routing)
     "league_by_summoner": "/lol/league/v4/entries/by-summoner/{encryptedSummonerId}",
     "league_by_puuid": "/lol/league/v4/entries/by-puuid/{encryptedPUUID}",
+    "league_entries": "/lol/league/v4/entries/{queue}/{tier}/{division}",
     
     # MATCH-V5 (Regional routing)
     "match_ids_by_puuid": "/lol/match/v5/matches/by-puuid/{puuid}/ids",
@@ -81,6 +86,9 @@ DATA_DRAGON_SPLASH_ART = f"{DATA_DRAGON_BASE}/cdn/img/champion/splash/{{champion
 DATA_DRAGON_SQUARE_ICON = f"{DATA_DRAGON_BASE}/cdn/{{version}}/img/champion/{{champion}}.png"
 DATA_DRAGON_PROFILE_ICON = f"{DATA_DRAGON_BASE}/cdn/{{version}}/img/profileicon/{{icon_id}}.png"
 
+# Community Dragon CDN (versionless, used for profile icons)
+COMMUNITY_DRAGON_PROFILE_ICON = "https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/profile-icons/{icon_id}.jpg"
+
 # Champion name normalization (Riot API uses different names for some champions)
 CHAMPION_NAME_MAP = {
     'Wukong': 'MonkeyKing',
@@ -96,6 +104,193 @@ CHAMPION_NAME_MAP = {
     "Bel'Veth": 'Belveth',
 }
 
+# Champion classes (primary class -> champions with their secondary classes)
+CHAMPION_CLASSES = {
+    'Assassin': [
+        {'name': 'Akali', 'secondary': []},
+        {'name': 'Akshan', 'secondary': ['Marksman']},
+        {'name': 'Diana', 'secondary': ['Fighter']},
+        {'name': 'Ekko', 'secondary': ['Fighter']},
+        {'name': 'Evelynn', 'secondary': ['Mage']},
+        {'name': 'Fizz', 'secondary': ['Fighter']},
+        {'name': 'Kassadin', 'secondary': ['Mage']},
+        {'name': 'Katarina', 'secondary': ['Mage']},
+        {'name': 'KhaZix', 'secondary': []},
+        {'name': 'LeBlanc', 'secondary': ['Mage']},
+        {'name': 'MasterYi', 'secondary': ['Fighter']},
+        {'name': 'Naafiri', 'secondary': []},
+        {'name': 'Nidalee', 'secondary': ['Mage']},
+        {'name': 'Nocturne', 'secondary': ['Fighter']},
+        {'name': 'Pyke', 'secondary': ['Support']},
+        {'name': 'Qiyana', 'secondary': ['Fighter']},
+        {'name': 'Rengar', 'secondary': ['Fighter']},
+        {'name': 'Shaco', 'secondary': []},
+        {'name': 'Talon', 'secondary': []},
+        {'name': 'Viego', 'secondary': ['Fighter']},
+        {'name': 'Yone', 'secondary': ['Fighter']},
+        {'name': 'Zed', 'secondary': []}
+    ],
+    'Fighter': [
+        {'name': 'Aatrox', 'secondary': ['Tank']},
+        {'name': 'Ambessa', 'secondary': ['Assassin']},
+        {'name': 'BelVeth', 'secondary': []},
+        {'name': 'Briar', 'secondary': ['Assassin']},
+        {'name': 'Camille', 'secondary': ['Tank']},
+        {'name': 'Darius', 'secondary': ['Tank']},
+        {'name': 'DrMundo', 'secondary': ['Tank']},
+        {'name': 'Fiora', 'secondary': ['Assassin']},
+        {'name': 'Gangplank', 'secondary': []},
+        {'name': 'Garen', 'secondary': ['Tank']},
+        {'name': 'Gnar', 'secondary': ['Tank']},
+        {'name': 'Gragas', 'secondary': ['Mage']},
+        {'name': 'Gwen', 'secondary': ['Assassin']},
+        {'name': 'Hecarim', 'secondary': ['Tank']},
+        {'name': 'Illaoi', 'secondary': ['Tank']},
+        {'name': 'Irelia', 'secondary': ['Assassin']},
+        {'name': 'Jax', 'secondary': ['Assassin']},
+        {'name': 'Jayce', 'secondary': ['Marksman']},
+        {'name': 'Kayle', 'secondary': ['Support']},
+        {'name': 'Kayn', 'secondary': ['Assassin']},
+        {'name': 'Kled', 'secondary': ['Tank']},
+        {'name': 'LeeSin', 'secondary': ['Assassin']},
+        {'name': 'Lillia', 'secondary': ['Mage']},
+        {'name': 'Mordekaiser', 'secondary': ['Mage']},
+        {'name': 'Nasus', 'secondary': ['Tank']},
+        {'name': 'Nilah', 'secondary': ['Assassin']},
+        {'name': 'Olaf', 'secondary': ['Tank']},
+        {'name': 'Pantheon', 'secondary': ['Assassin']},
+        {'name': 'RekSai', 'secondary': ['Tank']},
+        {'name': 'Renekton', 'secondary': ['Tank']},
+        {'name': 'Riven', 'secondary': ['Assassin']},
+        {'name': 'Rumble', 'secondary': ['Mage']},
+        {'name': 'Sett', 'secondary': ['Tank']},
+        {'name': 'Shyvana', 'secondary': ['Tank']},
+        {'name': 'Skarner', 'secondary': ['Tank']},
+        {'name': 'Trundle', 'secondary': ['Tank']},
+        {'name': 'Tryndamere', 'secondary': ['Assassin']},
+        {'name': 'Udyr', 'secondary': ['Tank']},
+        {'name': 'Urgot', 'secondary': ['Tank']},
+        {'name': 'Vi', 'secondary': ['Assassin']},
+        {'name': 'Volibear', 'secondary': ['Tank']},
+        {'name': 'Warwick', 'secondary': ['Tank']},
+        {'name': 'Wukong', 'secondary': ['Tank']},
+        {'name': 'XinZhao', 'secondary': ['Assassin']},
+        {'name': 'Yasuo', 'secondary': ['Assassin']},
+        {'name': 'Yorick', 'secondary': ['Tank']}
+    ],
+    'Mage': [
+        {'name': 'Ahri', 'secondary': ['Assassin']},
+        {'name': 'Anivia', 'secondary': ['Support']},
+        {'name': 'Annie', 'secondary': ['Support']},
+        {'name': 'AurelionSol', 'secondary': []},
+        {'name': 'Aurora', 'secondary': ['Assassin']},
+        {'name': 'Azir', 'secondary': ['Marksman']},
+        {'name': 'Brand', 'secondary': []},
+        {'name': 'Cassiopeia', 'secondary': []},
+        {'name': 'Elise', 'secondary': ['Fighter']},
+        {'name': 'Fiddlesticks', 'secondary': ['Support']},
+        {'name': 'Heimerdinger', 'secondary': ['Support']},
+        {'name': 'Hwei', 'secondary': []},
+        {'name': 'Karthus', 'secondary': []},
+        {'name': 'Kennan', 'secondary': ['Marksman']},
+        {'name': 'KogMaw', 'secondary': ['Marksman']},
+        {'name': 'LeBlanc', 'secondary': ['Assassin']},
+        {'name': 'Lissandra', 'secondary': []},
+        {'name': 'Lux', 'secondary': ['Support']},
+        {'name': 'Malzahar', 'secondary': ['Assassin']},
+        {'name': 'Mel', 'secondary': []},
+        {'name': 'Morgana', 'secondary': ['Support']},
+        {'name': 'Neeko', 'secondary': ['Support']},
+        {'name': 'Orianna', 'secondary': ['Support']},
+        {'name': 'Ryze', 'secondary': ['Fighter']},
+        {'name': 'Seraphine', 'secondary': ['Support']},
+        {'name': 'Swain', 'secondary': ['Fighter']},
+        {'name': 'Sylas', 'secondary': ['Assassin']},
+        {'name': 'Syndra', 'secondary': []},
+        {'name': 'Taliyah', 'secondary': ['Support']},
+        {'name': 'TwistedFate', 'secondary': []},
+        {'name': 'Veigar', 'secondary': []},
+        {'name': 'VelKoz', 'secondary': ['Support']},
+        {'name': 'Vex', 'secondary': []},
+        {'name': 'Viktor', 'secondary': []},
+        {'name': 'Vladimir', 'secondary': ['Tank']},
+        {'name': 'Xerath', 'secondary': ['Support']},
+        {'name': 'Ziggs', 'secondary': []},
+        {'name': 'Zoe', 'secondary': ['Support']},
+        {'name': 'Zyra', 'secondary': ['Support']}
+    ],
+    'Marksman': [
+        {'name': 'Aphelios', 'secondary': []},
+        {'name': 'Ashe', 'secondary': ['Support']},
+        {'name': 'Caitlyn', 'secondary': []},
+        {'name': 'Corki', 'secondary': []},
+        {'name': 'Draven', 'secondary': []},
+        {'name': 'Ezreal', 'secondary': ['Mage']},
+        {'name': 'Graves', 'secondary': []},
+        {'name': 'Jhin', 'secondary': ['Mage']},
+        {'name': 'Jinx', 'secondary': []},
+        {'name': 'KaiSa', 'secondary': ['Assassin']},
+        {'name': 'Kalista', 'secondary': []},
+        {'name': 'Kindred', 'secondary': []},
+        {'name': 'Lucian', 'secondary': []},
+        {'name': 'MissFortune', 'secondary': []},
+        {'name': 'Quinn', 'secondary': ['Assassin']},
+        {'name': 'Samira', 'secondary': []},
+        {'name': 'Senna', 'secondary': ['Support']},
+        {'name': 'Sivir', 'secondary': []},
+        {'name': 'Smolder', 'secondary': []},
+        {'name': 'Teemo', 'secondary': ['Assassin']},
+        {'name': 'Tristana', 'secondary': ['Assassin']},
+        {'name': 'Twitch', 'secondary': ['Assassin']},
+        {'name': 'Varus', 'secondary': ['Mage']},
+        {'name': 'Vayne', 'secondary': ['Assassin']},
+        {'name': 'Xayah', 'secondary': []},
+        {'name': 'Zeri', 'secondary': []}
+    ],
+    'Support': [
+        {'name': 'Bard', 'secondary': ['Mage']},
+        {'name': 'Braum', 'secondary': ['Tank']},
+        {'name': 'Ivern', 'secondary': ['Mage']},
+        {'name': 'Janna', 'secondary': ['Mage']},
+        {'name': 'Karma', 'secondary': ['Mage']},
+        {'name': 'Lulu', 'secondary': ['Mage']},
+        {'name': 'Milio', 'secondary': ['Mage']},
+        {'name': 'Nami', 'secondary': ['Mage']},
+        {'name': 'Rakan', 'secondary': []},
+        {'name': 'Renata', 'secondary': ['Mage']},
+        {'name': 'Sona', 'secondary': ['Mage']},
+        {'name': 'Soraka', 'secondary': ['Mage']},
+        {'name': 'TahmKench', 'secondary': ['Tank']},
+        {'name': 'Taric', 'secondary': ['Fighter']},
+        {'name': 'Thresh', 'secondary': ['Fighter']},
+        {'name': 'Yuumi', 'secondary': ['Mage']},
+        {'name': 'Zilean', 'secondary': ['Mage']}
+    ],
+    'Tank': [
+        {'name': 'Alistar', 'secondary': ['Support']},
+        {'name': 'Amumu', 'secondary': ['Mage']},
+        {'name': 'Blitzcrank', 'secondary': ['Fighter']},
+        {'name': 'ChoGath', 'secondary': ['Mage']},
+        {'name': 'Galio', 'secondary': ['Mage']},
+        {'name': 'JarvanIV', 'secondary': ['Fighter']},
+        {'name': 'KSante', 'secondary': ['Fighter']},
+        {'name': 'Leona', 'secondary': ['Support']},
+        {'name': 'Malphite', 'secondary': ['Fighter']},
+        {'name': 'Maokai', 'secondary': ['Mage']},
+        {'name': 'Nautilus', 'secondary': ['Fighter']},
+        {'name': 'Nunu', 'secondary': ['Fighter']},
+        {'name': 'Ornn', 'secondary': ['Fighter']},
+        {'name': 'Poppy', 'secondary': ['Fighter']},
+        {'name': 'Rammus', 'secondary': ['Fighter']},
+        {'name': 'Rell', 'secondary': ['Support']},
+        {'name': 'Sejuani', 'secondary': ['Fighter']},
+        {'name': 'Shen', 'secondary': ['Fighter']},
+        {'name': 'Singed', 'secondary': ['Fighter']},
+        {'name': 'Sion', 'secondary': ['Fighter']},
+        {'name': 'Zac', 'secondary': ['Fighter']}
+    ]
+}
+
 # Rate limiting
 RIOT_API_RATE_LIMIT_PER_SECOND = 20  # Development key limit
 RIOT_API_RATE_LIMIT_PER_2_MINUTES = 100  # Development key limit
@@ -0,0 +1,148 @@
+"""
+Group Rewind Statistics
+=======================
+Group-level stats for a friend group's rewind, computed from each member's
+(slim) matches after the shared fetch in
+LeagueDataFetcher.fetch_group_match_details.
+
+A game counts as "together" for members who were on the same team in it.
+"""
+
+import logging
+from itertools import combinations
+from typing import Dict, Any, List, Optional, Tuple
+
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+def _member_record(match: Dict[str, Any], puuid: str) -> Dict[str, Any]:
+    return next((p for p in match.get('info', {}).get('participants', []) if p.get('puuid') == puuid), {})
+
+
+def _display_name(member: Dict[str, Any]) -> str:
+    return f"{member.get('gameName')}#{member.get('tagLine')}"
+
+
+@traced('group.calculate_stats')
+def calculate_group_stats(members: List[Dict[str, Any]],
+                          matches_by_puuid: Dict[str, List[Dict[str, Any]]],
+                          match_ids_by_puuid: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    Shared-game stats for a group.
+
+    Args:
+        members: Group members ({'puuid', 'gameName', 'tagLine', 'sessionId'})
+        matches_by_puuid: Each member's matches (at least every game two or
+            more members played)
+        match_ids_by_puuid: Each member's full match ID list, for the match
+            counts when matches_by_puuid holds only the shared games
+
+    Returns:
+        Group stats: shared/full-group game counts, group win rate, pair
+        breakdown, per-member stats in shared games and the group MVP
+    """
+    names = {m['puuid']: _display_name(m) for m in members}
+
+    # match ID -> {puuid: participant record}
+    games: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for puuid, matches in matches_by_puuid.items():
+        for match in matches:
+            record = _member_record(match, puuid)
+            if record:
+                games.setdefault(match.get('metadata', {}).get('matchId'), {})[puuid] = record
+
+    shared_games = 0
+    shared_wins = 0
+    full_group_games = 0
+    pair_stats = {pair: {'games': 0, 'wins': 0} for pair in combinations(sorted(names), 2)}
+    member_shared = {puuid: {'games': 0, 'wins': 0, 'kills': 0, 'deaths': 0, 'assists': 0, 'damage': 0}
+                     for puuid in names}
+
+    for records in games.values():
+        # Members on the same team played this game together
+        by_team: Dict[Any, List[str]] = {}
+        for puuid, record in records.items():
+            by_team.setdefault(record.get('teamId'), []).append(puuid)
+        together = max(by_team.values(), key=len)
+        if len(together) < 2:
+            continue
+
+        won = bool(records[together[0]].get('win'))
+        shared_games += 1
+        shared_wins += won
+        if len(together) == len(names):
+            full_group_games += 1
+        for pair in combinations(sorted(together), 2):
+            pair_stats[pair]['games'] += 1
+            pair_stats[pair]['wins'] += won
+        for puuid in together:
+            record, stats = records[puuid], member_shared[puuid]
+            stats['games'] += 1
+            stats['wins'] += won
+            stats['kills'] += record.get('kills', 0)
+            stats['deaths'] += record.get('deaths', 0)
+            stats['assists'] += record.get('assists', 0)
+            stats['damage'] += record.get('totalDamageDealtToChampions', 0)
+
+    def win_rate(wins: int, games: int) -> float:
+        return round(wins / games * 100, 1) if games else 0
+
+    counted = match_ids_by_puuid if match_ids_by_puuid is not None else matches_by_puuid
+    member_stats = []
+    for puuid, stats in member_shared.items():
+        kda = (stats['kills'] + stats['assists']) / max(stats['deaths'], 1)
+        member_stats.append({
+            'player': names[puuid],
+            'totalMatches': len(counted.get(puuid, [])),
+            'gamesWithGroup': stats['games'],
+            'winRateWithGroup': win_rate(stats['wins'], stats['games']),
+            'kdaWithGroup': round(kda, 2) if stats['games'] else 0,
+            'avgDamageWithGroup': round(stats['damage'] / stats['games']) if stats['games'] else 0,
+        })
+
+    pairs = sorted(
+        ({'players': [names[a], names[b]], 'gamesTogether': s['games'], 'wins': s['wins'],
+          'winRate': win_rate(s['wins'], s['games'])} for (a, b), s in pair_stats.items()),
+        key=lambda p: p['gamesTogether'], reverse=True
+    )
+    eligible = [m for m in member_stats if m['gamesWithGroup']]
+    mvp = max(eligible, key=lambda m: m['kdaWithGroup'])['player'] if eligible else None
+
+    member_matches = sum(len(matches) for matches in counted.values())
+    unique_matches = (len({mid for ids in match_ids_by_puuid.values() for mid in ids})
+                      if match_ids_by_puuid is not None else len(games))
+    return {
+        'members': [names[m['puuid']] for m in members],
+        'uniqueMatches': unique_matches,
+        'memberMatches': member_matches,
+        'sharedMatches': shared_games,
+        'fullGroupMatches': full_group_games,
+        'groupWinRate': win_rate(shared_wins, shared_games),
+        'bestDuo': pairs[0] if pairs and pairs[0]['gamesTogether'] else None,
+        'pairs': pairs,
+        'memberStats': member_stats,
+        'mvp': mvp,
+    }
+
+
+def group_status(member_statuses: Dict[str, Optional[str]]) -> Tuple[str, str]:
+    """
+    A group's status from its members' session statuses.
+
+    Args:
+        member_statuses: Session ID -> status.json status (None if unknown)
+
+    Returns:
+        (status, message): 'analyzing' while any member is still running,
+        then 'complete', or 'partial' if any member failed
+    """
+    statuses = list(member_statuses.values())
+    if not all(status in ('complete', 'error') for status in statuses):
+        done = sum(status == 'complete' for status in statuses)
+        return 'analyzing', f"Building everyone's rewind ({done}/{len(statuses)} ready)..."
+    failed = sum(status == 'error' for status in statuses)
+    if failed:
+        return 'partial', f'{failed} member rewind(s) failed'
+    return 'complete', 'Your group rewind is ready!'
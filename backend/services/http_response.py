@@ -0,0 +1,152 @@
+"""
+HTTP Responses
+==============
+API responses keep their body as a native structure until the transport
+sends it. RiftRewindAPI methods return
+
+    {'statusCode': 200, 'headers': {...}, 'body': {...}}
+
+and the transport serializes the body exactly once, then compresses it if
+the client accepts that:
+
+    to_api_gateway(response, accept_encoding)       # Lambda proxy result
+    encode_response(response, accept_encoding)      # (status, headers, bytes), e.g. for Flask
+
+Bodies of at least COMPRESS_MIN_BYTES are compressed with brotli (when the
+brotli package is installed and the client accepts 'br') or gzip. Smaller
+bodies aren't worth the CPU. See benchmarks/responses.py for the numbers
+behind the defaults.
+"""
+
+import base64
+import gzip
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from .json_codec import dumps
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Preference order when the client accepts several equally
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def encode_body(body: Any) -> bytes:
+    """
+    Serialize a response body.
+
+    Args:
+        body: Native structure (JSON-encoded), text or bytes (sent as is),
+            or None (empty body)
+
+    Returns:
+        Body bytes
+    """
+    if body is None:
+        return b''
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    return dumps(body)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. 'gzip, deflate, br;q=0.9'
+
+    Returns:
+        'br', 'gzip', or None for identity
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.lower().split(','):
+        coding, _, params = item.strip().partition(';')
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+    best, best_weight = None, 0.0
+    for coding in ENCODINGS:
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress body bytes with a negotiated content coding."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encode_response(response: Dict[str, Any],
+                    accept_encoding: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Serialize (and maybe compress) an API response.
+
+    Args:
+        response: {'statusCode', 'headers', 'body'} with a native body
+        accept_encoding: The request's Accept-Encoding header
+
+    Returns:
+        (status code, headers, body bytes)
+    """
+    status = response['statusCode']
+    headers = dict(response.get('headers') or {})
+    data = encode_body(response.get('body'))
+    if len(data) >= COMPRESS_MIN_BYTES and 'Content-Encoding' not in headers:
+        # Large enough that the representation depends on the client
+        headers['Vary'] = 'Accept-Encoding'
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding:
+            data = compress(data, encoding)
+            headers['Content-Encoding'] = encoding
+    return status, headers, data
+
+
+def to_api_gateway(response: Dict[str, Any], accept_encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Lambda proxy integration result for an API response.
+
+    Args:
+        response: {'statusCode', 'headers', 'body'} with a native body
+        accept_encoding: The request's Accept-Encoding header
+
+    Returns:
+        {'statusCode', 'headers', 'body', 'isBase64Encoded'} (compressed
+        bodies are base64, which API Gateway decodes before sending)
+    """
+    status, headers, data = encode_response(response, accept_encoding)
+    if 'Content-Encoding' in headers:
+        return {'statusCode': status, 'headers': headers,
+                'body': base64.b64encode(data).decode('ascii'), 'isBase64Encoded': True}
+    return {'statusCode': status, 'headers': headers, 'body': data.decode('utf-8'), 'isBase64Encoded': False}
+
+
+def request_header(headers: Optional[Dict[str, Any]], name: str) -> Optional[str]:
+    """Case-insensitive header lookup (API Gateway passes them as sent)."""
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
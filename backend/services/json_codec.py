@@ -0,0 +1,158 @@
+"""
+JSON Decode Stage
+=================
+Decoding of Riot API payloads, off the fetch threads where possible.
+
+- loads(): orjson when installed (releases no GIL, but is ~3-5x faster than
+  the stdlib), json otherwise. JSON_DECODER=stdlib forces the stdlib.
+- dumps(): the encoding counterpart, straight to compact UTF-8 bytes (API
+  response bodies; see services/http_response.py).
+- DecodePool: optional process pool (MATCH_DECODE_PROCESSES=N) that decodes
+  AND projects each match in a worker process, so only the slim record is
+  pickled back. Falls back to in-thread decode where multiprocessing is
+  unavailable (e.g. AWS Lambda has no /dev/shm).
+
+See benchmarks/decode.py for the numbers behind the defaults.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def _select_decoder():
+    preference = os.environ.get('JSON_DECODER', 'auto').lower()
+    if orjson is not None and preference in ('auto', 'orjson'):
+        return 'orjson', orjson.loads
+    if preference == 'orjson':
+        logger.warning("JSON_DECODER=orjson but orjson is not installed, using json")
+    return 'json', json.loads
+
+
+DECODER_NAME, _loads = _select_decoder()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document with the fastest available parser.
+
+    Args:
+        data: JSON bytes or text
+
+    Returns:
+        Decoded object
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode a JSON document with the fastest available encoder.
+
+    Args:
+        obj: JSON-compatible object (non-string dict keys are stringified)
+
+    Returns:
+        Compact UTF-8 JSON
+    """
+    if DECODER_NAME == 'orjson':
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits: the stdlib handles them
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def decode_and_transform(data: bytes, transform: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Decode a payload and apply an optional transform (module-level so it can
+    run in a worker process; transform must be picklable, e.g. a partial).
+    """
+    decoded = _loads(data)
+    if transform is not None and decoded:
+        decoded = transform(decoded)
+    return decoded
+
+
+class DecodePool:
+    """
+    Process pool for CPU-bound decode + projection of match payloads.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._executor = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None and not self._disabled:
+            with self._lock:
+                if self._executor is None and not self._disabled:
+                    try:
+                        import concurrent.futures
+                        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.processes)
+                        logger.info(f"Match decode pool started ({self.processes} processes, {DECODER_NAME})")
+                    except (OSError, ImportError, NotImplementedError) as e:
+                        logger.warning(f"Process pool unavailable ({e}), decoding in threads")
+                        self._disabled = True
+        return self._executor
+
+    def decode(self, data: bytes, transform: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Decode (and transform) a payload in a worker process.
+
+        Blocks the calling thread without holding the GIL while the worker
+        parses. Falls back to in-thread decode if the pool cannot be used.
+
+        Args:
+            data: Raw JSON bytes
+            transform: Optional picklable transform applied in the worker
+
+        Returns:
+            Decoded (and transformed) object
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return decode_and_transform(data, transform)
+        try:
+            return executor.submit(decode_and_transform, data, transform).result()
+        except Exception as e:
+            # Broken pool or unpicklable transform: don't lose the payload
+            logger.warning(f"Pool decode failed ({e}), decoding in thread")
+            return decode_and_transform(data, transform)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Process-wide pool, created on first use
+_decode_pool: Optional[DecodePool] = None
+
+
+def get_decode_pool() -> Optional[DecodePool]:
+    """
+    Get the process-wide decode pool (singleton pattern).
+
+    Returns:
+        DecodePool when MATCH_DECODE_PROCESSES > 0, otherwise None
+    """
+    global _decode_pool
+    processes = int(os.environ.get('MATCH_DECODE_PROCESSES', '0') or 0)
+    if processes <= 0:
+        return None
+    if _decode_pool is None:
+        _decode_pool = DecodePool(processes)
+    return _decode_pool
@@ -0,0 +1,312 @@
+"""
+Ladder Snapshot Service
+=======================
+Shared, periodically refreshed copies of the League-V4
+entries/{queue}/{tier}/{division} ladders, kept as sorted LP arrays so a
+player's leaderboard position is a binary search instead of Riot calls.
+
+One snapshot per platform x queue x tier x division is shared by every
+session in that division:
+
+    memory (warm container) -> S3 ladder/<platform>/<queue>/<TIER>_<DIV>.json
+
+Paging a whole ladder is the job of the scheduled lambdas/ladder_refresh.py;
+the request path never does it. On a miss (nothing fresh in memory or S3)
+get() returns what it has, possibly None, and at most queues a capped
+refresh of that ladder on a single background thread, so a later session
+finds it. Snapshots store LP values only.
+"""
+
+import bisect
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from .aws_clients import upload_to_s3, download_from_s3
+
+logger = logging.getLogger(__name__)
+
+S3_PREFIX = 'ladder'
+DEFAULT_QUEUE = 'RANKED_SOLO_5x5'
+LADDER_TIERS = ['IRON', 'BRONZE', 'SILVER', 'GOLD', 'PLATINUM', 'EMERALD', 'DIAMOND']
+APEX_TIERS = ['MASTER', 'GRANDMASTER', 'CHALLENGER']
+DIVISIONS = ['I', 'II', 'III', 'IV']
+
+LADDER_TTL_SECONDS = int(os.environ.get('LADDER_TTL_SECONDS', str(6 * 3600)))
+LADDER_MAX_PAGES = int(os.environ.get('LADDER_MAX_PAGES', '500'))
+# Background refresh queued by a session's miss: capped well below a full ladder
+LADDER_MISS_REFRESH_PAGES = int(os.environ.get('LADDER_MISS_REFRESH_PAGES', '25'))
+
+
+def _normalize(tier: str, division: str) -> Tuple[str, str]:
+    tier = (tier or '').upper()
+    # Apex tiers have a single ladder, served as division I
+    return tier, 'I' if tier in APEX_TIERS else (division or '').upper()
+
+
+class LadderSnapshot:
+    """
+    LP values of one tier/division ladder, sorted ascending.
+    """
+
+    def __init__(self, platform: str, queue: str, tier: str, division: str, lp: List[int],
+                 fetched_at: Optional[float] = None, complete: bool = True):
+        self.platform = platform
+        self.queue = queue
+        self.tier = tier
+        self.division = division
+        self.lp = sorted(lp)
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.complete = complete
+
+    @property
+    def size(self) -> int:
+        return len(self.lp)
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def position(self, lp: int) -> int:
+        """
+        1-based position of an LP value (1 = highest LP; ties share a position).
+
+        Args:
+            lp: League points
+
+        Returns:
+            Number of entries with more LP, plus one
+        """
+        return len(self.lp) - bisect.bisect_right(self.lp, lp) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'platform': self.platform,
+            'queue': self.queue,
+            'tier': self.tier,
+            'division': self.division,
+            'lp': self.lp,
+            'fetchedAt': self.fetched_at,
+            'complete': self.complete,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LadderSnapshot':
+        return cls(data['platform'], data['queue'], data['tier'], data['division'], data.get('lp', []),
+                   fetched_at=data.get('fetchedAt'), complete=data.get('complete', True))
+
+
+class LadderSnapshotService:
+    """
+    Loads, refreshes and caches ladder snapshots.
+    """
+
+    def __init__(self, riot_client=None, ttl_seconds: int = LADDER_TTL_SECONDS,
+                 max_pages: int = LADDER_MAX_PAGES, refresh_on_miss: Optional[bool] = None,
+                 miss_refresh_pages: int = LADDER_MISS_REFRESH_PAGES):
+        """
+        Args:
+            riot_client: RiotAPIClient used to page ladders (created lazily if None)
+            ttl_seconds: Age after which a snapshot is refreshed
+            max_pages: Page cap per ladder for refresh() (~205 entries a page)
+            refresh_on_miss: Queue a background refresh when get() finds no
+                fresh snapshot (default: LADDER_REFRESH_ON_MISS, on)
+            miss_refresh_pages: Page cap of those background refreshes
+        """
+        self.riot_client = riot_client
+        self.ttl_seconds = ttl_seconds
+        self.max_pages = max_pages
+        if refresh_on_miss is None:
+            refresh_on_miss = os.environ.get('LADDER_REFRESH_ON_MISS', '1') != '0'
+        self.refresh_on_miss = refresh_on_miss
+        self.miss_refresh_pages = miss_refresh_pages
+        self._snapshots: Dict[tuple, LadderSnapshot] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._refresher: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._refreshing: set = set()  # Ladders with a background refresh queued or running
+
+    @staticmethod
+    def _s3_key(platform: str, queue: str, tier: str, division: str) -> str:
+        return f"{S3_PREFIX}/{platform}/{queue}/{tier}_{division}.json"
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _client(self):
+        if self.riot_client is None:
+            from .riot_api_client import RiotAPIClient
+            self.riot_client = RiotAPIClient()
+        return self.riot_client
+
+    def _load_stored(self, platform: str, queue: str, tier: str, division: str) -> Optional[LadderSnapshot]:
+        content = download_from_s3(self._s3_key(platform, queue, tier, division))
+        if not content:
+            return None
+        try:
+            return LadderSnapshot.from_dict(json.loads(content))
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable ladder snapshot {platform} {tier} {division}: {e}")
+            return None
+
+    def refresh(self, platform: str, queue: str, tier: str, division: str,
+                max_pages: Optional[int] = None) -> Optional[LadderSnapshot]:
+        """
+        Page the whole ladder from Riot and store the snapshot.
+
+        Args:
+            platform: Platform code
+            queue: Queue type
+            tier: Tier
+            division: Division
+            max_pages: Page cap (default: self.max_pages)
+
+        Returns:
+            New snapshot, or None if the first page failed
+        """
+        tier, division = _normalize(tier, division)
+        client = self._client()
+        max_pages = max_pages or self.max_pages
+        lp, page, complete = [], 1, False
+        while page <= max_pages:
+            entries = client.get_league_entries_page(queue, tier, division, platform, page)
+            if entries is None:
+                if page == 1:
+                    return None
+                break
+            lp.extend(entry.get('leaguePoints', 0) for entry in entries)
+            if not entries:
+                complete = True
+                break
+            page += 1
+
+        if not complete:
+            logger.warning(f"Ladder {platform} {tier} {division} truncated at {page - 1} pages")
+
+        snapshot = LadderSnapshot(platform, queue, tier, division, lp, complete=complete)
+        upload_to_s3(self._s3_key(platform, queue, tier, division), snapshot.to_dict())
+        with self._lock:
+            self._snapshots[(platform, queue, tier, division)] = snapshot
+        logger.info(f"Ladder {platform} {tier} {division}: {snapshot.size} entries, {page - 1} pages")
+        return snapshot
+
+    def _refresh_in_background(self, key: tuple):
+        # One capped refresh per ladder at a time, on one thread: never on the
+        # caller's path, and a division's sessions can't fan out into pages
+        with self._lock:
+            if not self.refresh_on_miss or key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresher is None:
+                self._refresher = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                                        thread_name_prefix='ladder-refresh')
+
+        def run():
+            try:
+                self.refresh(*key, max_pages=self.miss_refresh_pages)
+            except Exception as e:
+                logger.warning(f"Background ladder refresh failed for {key[0]} {key[2]} {key[3]}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        logger.info(f"Ladder {key[0]} {key[2]} {key[3]} missing or stale, refreshing in the background")
+        self._refresher.submit(run)
+
+    def get(self, platform: str, queue: str, tier: str, division: str) -> Optional[LadderSnapshot]:
+        """
+        Freshest stored snapshot (memory, then S3). Never pages Riot.
+
+        Without a fresh one, a capped background refresh is queued and the
+        stale snapshot (or None) is returned right away.
+
+        Returns:
+            LadderSnapshot or None
+        """
+        tier, division = _normalize(tier, division)
+        key = (platform, queue, tier, division)
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.age() < self.ttl_seconds:
+            return snapshot
+
+        # One S3 read per ladder; concurrent sessions in the division share it
+        with self._key_lock(key):
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.age() < self.ttl_seconds:
+                return snapshot
+
+            stored = self._load_stored(platform, queue, tier, division)
+            if stored is not None and (snapshot is None or stored.fetched_at > snapshot.fetched_at):
+                snapshot = stored
+                with self._lock:
+                    self._snapshots[key] = snapshot
+            if snapshot is not None and snapshot.age() < self.ttl_seconds:
+                return snapshot
+
+            self._refresh_in_background(key)
+            return snapshot
+
+    def position(self, platform: str, queue: str, tier: str, division: str, lp: int) -> Optional[int]:
+        """
+        Leaderboard position within a tier/division.
+
+        Returns:
+            1-based position or None if no snapshot is available
+        """
+        snapshot = self.get(platform, queue, tier, division)
+        if snapshot is None or not snapshot.size:
+            return None
+        return snapshot.position(lp)
+
+    def refresh_region(self, platform: str, queue: str = DEFAULT_QUEUE,
+                       tiers: Optional[List[str]] = None, stale_only: bool = True) -> Dict[str, int]:
+        """
+        Refresh every ladder of a region (the scheduled job).
+
+        Args:
+            platform: Platform code
+            queue: Queue type
+            tiers: Tiers to refresh (default: all, apex included)
+            stale_only: Skip ladders whose stored snapshot is still fresh
+
+        Returns:
+            Dict of 'TIER DIVISION' -> entries in the snapshot
+        """
+        sizes = {}
+        for tier in tiers or LADDER_TIERS + APEX_TIERS:
+            for division in (['I'] if tier in APEX_TIERS else DIVISIONS):
+                if stale_only:
+                    stored = self._load_stored(platform, queue, tier, division)
+                    if stored is not None and stored.age() < self.ttl_seconds:
+                        sizes[f"{tier} {division}"] = stored.size
+                        continue
+                snapshot = self.refresh(platform, queue, tier, division)
+                sizes[f"{tier} {division}"] = snapshot.size if snapshot else 0
+        return sizes
+
+
+# Process-wide service, shared by all sessions in a warm container
+_ladder_service: Optional[LadderSnapshotService] = None
+
+
+def get_ladder_service(riot_client=None) -> LadderSnapshotService:
+    """
+    Get the process-wide ladder snapshot service (singleton pattern).
+
+    Args:
+        riot_client: RiotAPIClient to use if the service has none yet
+
+    Returns:
+        LadderSnapshotService
+    """
+    global _ladder_service
+    if _ladder_service is None:
+        _ladder_service = LadderSnapshotService(riot_client)
+    elif _ladder_service.riot_client is None and riot_client is not None:
+        _ladder_service.riot_client = riot_client
+    return _ladder_service
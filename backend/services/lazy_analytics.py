@@ -0,0 +1,194 @@
+"""
+Lazy Slide Analytics
+====================
+Slide sections computed on first demand and persisted one at a time, so a
+slide can be served before the whole analytics bundle exists.
+
+SLIDE_SECTIONS declares, in priority order, each section's engine method,
+the sections it builds on, and whether it belongs to first paint (the cheap
+slides the deck opens with). Asking for a section computes and persists its
+dependencies first; the engine memoizes every section method, so nothing is
+computed twice however sections are requested.
+
+    lazy = LazyAnalytics(engine, SectionStore(session_id))
+    lazy.get('slide5_kda')          # KDA only
+    lazy.first_paint()              # the cheap slides
+    lazy.compute_all()              # every section, expensive ones last
+
+Sections land in sessions/<id>/sections/<key>.json. Once analytics.json is
+written it is authoritative; sections only serve the window before it and
+the processor deletes them when it finishes (SectionStore.clear).
+"""
+
+import concurrent.futures
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .aws_clients import delete_from_s3, download_from_s3, upload_to_s3
+from .json_codec import loads
+
+logger = logging.getLogger(__name__)
+
+SECTION_WRITE_WORKERS = 4
+
+
+class Section:
+    """
+    One slide section of calculate_all() output.
+    """
+
+    __slots__ = ('key', 'method', 'depends', 'first_paint', 'slides')
+
+    def __init__(self, key: str, method: str, slides: Sequence[int], depends: Sequence[str] = (),
+                 first_paint: bool = True):
+        self.key = key
+        self.method = method            # RiftRewindAnalytics method computing it
+        self.slides = tuple(slides)     # Slide numbers it feeds
+        self.depends = tuple(depends)   # Sections whose methods it calls
+        self.first_paint = first_paint
+
+
+# Priority order: first paint in deck order, then the sections that build
+# on many others (percentile, the strengths/weaknesses AI context)
+SLIDE_SECTIONS: List[Section] = [
+    Section('slide2_timeSpent', 'calculate_time_spent', (2, 15)),
+    Section('slide3_favoriteChampions', 'get_favorite_champions', (3, 15)),
+    Section('slide4_bestMatch', 'find_best_match', (4,)),
+    Section('slide5_kda', 'calculate_kda', (5,)),
+    Section('slide6_rankedJourney', 'get_ranked_journey', (1, 6, 15)),
+    Section('slide7_visionScore', 'calculate_vision_score', (7,)),
+    Section('slide8_championPool', 'analyze_champion_pool', (8,)),
+    Section('slide9_duoPartner', 'find_duo_partner', (9,)),
+    Section('slide12_progress', 'calculate_progress', (12,)),
+    Section('slide14_percentile', 'calculate_percentile', (14,),
+            depends=('slide2_timeSpent', 'slide5_kda', 'slide6_rankedJourney'), first_paint=False),
+    Section('slide10_11_analysis', 'detect_strengths_weaknesses', (10, 11),
+            depends=('slide2_timeSpent', 'slide3_favoriteChampions', 'slide5_kda', 'slide6_rankedJourney',
+                     'slide7_visionScore', 'slide9_duoPartner'), first_paint=False),
+]
+SECTIONS_BY_KEY: Dict[str, Section] = {section.key: section for section in SLIDE_SECTIONS}
+# calculate_all() key order (deck order)
+DECK_ORDER = sorted(SECTIONS_BY_KEY, key=lambda key: min(n for n in SECTIONS_BY_KEY[key].slides if n != 1))
+
+
+def sections_for_slide(slide_number: int) -> List[str]:
+    """Section keys a slide reads (empty for slides without analytics)."""
+    return [section.key for section in SLIDE_SECTIONS if slide_number in section.slides]
+
+
+class SectionStore:
+    """
+    Persisted sections of one session in S3.
+    """
+
+    def __init__(self, session_id: str, background: bool = False):
+        """
+        Args:
+            session_id: Session ID
+            background: Upload from a small thread pool so computing the
+                next section doesn't wait on S3 (call flush() before returning)
+        """
+        self.session_id = session_id
+        self._pool = (concurrent.futures.ThreadPoolExecutor(max_workers=SECTION_WRITE_WORKERS,
+                                                            thread_name_prefix='section-store')
+                      if background else None)
+        self._pending: List[concurrent.futures.Future] = []
+
+    def _key(self, section: str) -> str:
+        return f"sessions/{self.session_id}/sections/{section}.json"
+
+    def save(self, section: str, value: Any):
+        # Wrapped: best match / duo partner can legitimately be None
+        if self._pool is None:
+            upload_to_s3(self._key(section), {'value': value})
+        else:
+            self._pending.append(self._pool.submit(upload_to_s3, self._key(section), {'value': value}))
+
+    def load(self, sections: Iterable[str]) -> Dict[str, Any]:
+        """
+        Args:
+            sections: Section keys
+
+        Returns:
+            Key -> value for the sections already persisted
+        """
+        found = {}
+        for section in sections:
+            stored = download_from_s3(self._key(section))
+            if stored:
+                found[section] = loads(stored)['value']
+        return found
+
+    def clear(self):
+        """Delete every persisted section (once analytics.json supersedes them)."""
+        for section in SECTIONS_BY_KEY:
+            delete_from_s3(self._key(section))
+
+    def flush(self):
+        """Wait for background uploads."""
+        for future in self._pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f" Section upload failed: {e}")
+        self._pending = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+class LazyAnalytics:
+    """
+    Slide sections of one engine, computed (and persisted) on first demand.
+    """
+
+    def __init__(self, engine, store: Optional[SectionStore] = None):
+        """
+        Args:
+            engine: RiftRewindAnalytics
+            store: Where computed sections are persisted (None: memory only)
+        """
+        self.engine = engine
+        self.store = store
+        self.sections: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Any:
+        """
+        One section, computing its dependencies first.
+
+        Args:
+            key: calculate_all() key, e.g. 'slide5_kda'
+
+        Returns:
+            The section value
+        """
+        if key in self.sections:
+            return self.sections[key]
+        section = SECTIONS_BY_KEY.get(key)
+        if section is None:
+            raise KeyError(f"Unknown section: {key} (expected one of {DECK_ORDER})")
+        for dependency in section.depends:
+            self.get(dependency)
+        value = self.sections[key] = getattr(self.engine, section.method)()
+        if self.store is not None:
+            self.store.save(key, value)
+        return value
+
+    def missing(self) -> List[str]:
+        """Sections not computed yet, in priority order."""
+        return [section.key for section in SLIDE_SECTIONS if section.key not in self.sections]
+
+    def first_paint(self) -> Dict[str, Any]:
+        """The cheap sections the deck opens with."""
+        return {section.key: self.get(section.key) for section in SLIDE_SECTIONS if section.first_paint}
+
+    def compute_all(self) -> Dict[str, Any]:
+        """
+        Every section, computed in priority order.
+
+        Returns:
+            Section key -> value, in deck (calculate_all) order
+        """
+        for section in SLIDE_SECTIONS:
+            self.get(section.key)
+        return {key: self.sections[key] for key in DECK_ORDER}
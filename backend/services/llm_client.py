@@ -0,0 +1,279 @@
+"""
+LLM Client
+==========
+Pluggable text-generation client used by the humor and insights generators.
+
+- BedrockLLMClient: Meta Llama 3.1 on Bedrock (production)
+- StubLLMClient: local stand-in with latency, token throughput, throttling
+  and malformed-JSON injection, for offline load tests and benchmarks
+
+The client is picked by LLM_CLIENT (bedrock | stub). Stub behaviour is
+configured with LLM_STUB_LATENCY_MS, LLM_STUB_TOKENS_PER_SECOND,
+LLM_STUB_THROTTLE_RATE, LLM_STUB_MALFORMED_RATE and LLM_STUB_SEED.
+"""
+
+import abc
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from .aws_clients import get_bedrock_client
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = 'us.meta.llama3-1-70b-instruct-v1:0'  # Cross-region inference profile
+
+# Rough chars-per-token ratio for English Llama output
+CHARS_PER_TOKEN = 4
+
+
+class LLMClient(abc.ABC):
+    """
+    Interface for text-generation backends.
+    """
+
+    name = 'base'
+
+    def __init__(self, model_id: Optional[str] = None):
+        self.model_id = model_id or os.environ.get('BEDROCK_MODEL_ID', DEFAULT_MODEL_ID)
+
+    def complete(self, prompt: str, system: str = '', max_tokens: int = 512,
+                 temperature: float = 0.7, top_p: float = 0.9,
+                 response_format: str = 'text') -> str:
+        """
+        Generate a completion.
+
+        Args:
+            prompt: User prompt
+            system: System prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            top_p: Nucleus sampling threshold
+            response_format: 'text' or 'json' (caller expects a JSON object)
+
+        Returns:
+            Raw generated text
+
+        Raises:
+            botocore.exceptions.ClientError: On throttling and other service errors
+        """
+        with span('llm.invoke', level=logging.DEBUG, client=self.name, model=self.model_id,
+                  format=response_format):
+            return self._complete(prompt, system, max_tokens, temperature, top_p, response_format)
+
+    @abc.abstractmethod
+    def _complete(self, prompt: str, system: str, max_tokens: int, temperature: float,
+                  top_p: float, response_format: str) -> str:
+        """Backend call behind complete() (same arguments, no tracing)."""
+
+
+class BedrockLLMClient(LLMClient):
+    """
+    Meta Llama 3.1 via Bedrock Runtime invoke_model.
+    """
+
+    name = 'bedrock'
+
+    def __init__(self, model_id: Optional[str] = None, bedrock_client=None):
+        super().__init__(model_id)
+        self._bedrock_client = bedrock_client
+
+    @property
+    def bedrock_client(self):
+        # Resolved lazily so swapping aws_clients._bedrock_client is honoured
+        return self._bedrock_client or get_bedrock_client()
+
+    def _complete(self, prompt: str, system: str, max_tokens: int, temperature: float,
+                  top_p: float, response_format: str) -> str:
+        # Meta Llama 3.1 chat template
+        llama_prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
+
+{system}<|eot_id|><|start_header_id|>user<|end_header_id|>
+
+{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>
+
+"""
+        request_body = {
+            "prompt": llama_prompt,
+            "max_gen_len": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p
+        }
+        response = self.bedrock_client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps(request_body)
+        )
+        response_body = json.loads(response['body'].read())
+        return response_body.get('generation', '').strip()
+
+
+# ==================== LOCAL STUB ====================
+
+STUB_QUIPS = [
+    "Your stats called. They want a rematch.",
+    "Consistency is a skill. So is dying in the same bush twice.",
+    "Climbing the ladder one questionable back at a time.",
+    "Your champion pool is deep enough to drown in.",
+    "The enemy jungler knows your name by now.",
+    "You farm like rent is due tomorrow.",
+    "Vision score says you trust the fog more than your team.",
+    "Win or lose, you definitely queued up again.",
+]
+
+STUB_INSIGHTS = {
+    'strengths': [
+        'Consistent laning phase with above-average CS',
+        'Strong objective participation in mid game',
+        'Reliable performance on your most played champions',
+    ],
+    'weaknesses': [
+        'Deaths spike between 15 and 25 minutes',
+        'Champion pool is wide but shallow',
+    ],
+    'coaching_tips': [
+        'Ward river before contesting dragon',
+        'Track the enemy jungler after your first back',
+        'Narrow ranked picks to three champions per role',
+    ],
+    'play_style': 'Methodical team player who scales into the mid game',
+    'personality_title': 'The Steady Climber',
+}
+
+
+def _throttling_error():
+    from botocore.exceptions import ClientError
+    return ClientError(
+        {'Error': {'Code': 'ThrottlingException', 'Message': 'Too many requests, please wait before trying again.'},
+         'ResponseMetadata': {'HTTPStatusCode': 429}},
+        'InvokeModel'
+    )
+
+
+class StubLLMClient(LLMClient):
+    """
+    Local LLM stand-in returning schema-valid humor and insights output.
+
+    Each call sleeps latency_ms plus completion_tokens / tokens_per_second to
+    model time-to-first-token and generation throughput, then either raises a
+    ThrottlingException (throttle_rate), returns malformed output
+    (malformed_rate) or returns a valid completion. Outputs are deterministic
+    per prompt and seed.
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency_ms: float = 0.0, tokens_per_second: float = 0.0,
+                 throttle_rate: float = 0.0, malformed_rate: float = 0.0,
+                 seed: int = 0, model_id: Optional[str] = None):
+        super().__init__(model_id)
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+        self._seed = seed
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'throttled': 0, 'malformed': 0, 'prompt_chars': 0, 'completion_chars': 0}
+
+    @classmethod
+    def from_env(cls) -> 'StubLLMClient':
+        return cls(
+            latency_ms=float(os.environ.get('LLM_STUB_LATENCY_MS', 0)),
+            tokens_per_second=float(os.environ.get('LLM_STUB_TOKENS_PER_SECOND', 0)),
+            throttle_rate=float(os.environ.get('LLM_STUB_THROTTLE_RATE', 0)),
+            malformed_rate=float(os.environ.get('LLM_STUB_MALFORMED_RATE', 0)),
+            seed=int(os.environ.get('LLM_STUB_SEED', 0)),
+        )
+
+    def _pick(self, options, prompt: str) -> Any:
+        digest = hashlib.md5(f'{self._seed}:{prompt}'.encode('utf-8')).digest()
+        return options[digest[0] % len(options)]
+
+    def _generation(self, prompt: str, response_format: str) -> str:
+        if response_format == 'json':
+            return json.dumps(STUB_INSIGHTS, indent=2)
+        return self._pick(STUB_QUIPS, prompt)
+
+    def _malformed(self, text: str, response_format: str) -> str:
+        if response_format == 'json':
+            # Truncated mid-object, the usual failure when max_gen_len runs out
+            return text[:max(1, len(text) // 2)]
+        # Wrapped in quotes and chatter the generators must strip
+        return f'Sure! Here is a roast:\n"{text}" \U0001F602'
+
+    def _complete(self, prompt: str, system: str, max_tokens: int, temperature: float,
+                  top_p: float, response_format: str) -> str:
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['prompt_chars'] += len(system) + len(prompt)
+            roll_throttle = self._rng.random()
+            roll_malformed = self._rng.random()
+
+        text = self._generation(prompt, response_format)
+        malformed = roll_malformed < self.malformed_rate
+        if malformed:
+            text = self._malformed(text, response_format)
+        text = text[:max_tokens * CHARS_PER_TOKEN]
+
+        delay = self.latency_ms / 1000.0
+        if roll_throttle < self.throttle_rate:
+            # Throttles are rejected before generation starts
+            if delay:
+                time.sleep(delay)
+            with self._lock:
+                self.stats['throttled'] += 1
+            raise _throttling_error()
+
+        if self.tokens_per_second:
+            delay += (len(text) / CHARS_PER_TOKEN) / self.tokens_per_second
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self.stats['completion_chars'] += len(text)
+            if malformed:
+                self.stats['malformed'] += 1
+        return text
+
+
+# Singleton client
+_llm_client: Optional[LLMClient] = None
+_llm_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """
+    Get or create the process-wide LLM client (singleton pattern).
+
+    Returns:
+        StubLLMClient when LLM_CLIENT=stub, otherwise BedrockLLMClient
+    """
+    global _llm_client
+    if _llm_client is None:
+        with _llm_lock:
+            if _llm_client is None:
+                kind = os.environ.get('LLM_CLIENT', 'bedrock').lower()
+                if kind == 'stub':
+                    _llm_client = StubLLMClient.from_env()
+                    logger.info(f"Using local LLM stub ({_llm_client.latency_ms}ms latency, "
+                                f"throttle={_llm_client.throttle_rate}, malformed={_llm_client.malformed_rate})")
+                else:
+                    _llm_client = BedrockLLMClient()
+    return _llm_client
+
+
+def set_llm_client(client: Optional[LLMClient]):
+    """
+    Replace the process-wide LLM client (None resets to LLM_CLIENT selection).
+
+    Args:
+        client: Client instance or None
+    """
+    global _llm_client
+    _llm_client = client
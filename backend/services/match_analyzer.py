@@ -10,14 +10,23 @@ Strategy:
 - 501-800 matches: Analyze 25%
 - 800+ matches: Analyze 20%
 
-Samples are distributed proportionally across months to avoid seasonal bias.
+Samples are distributed proportionally across months to avoid seasonal bias;
+months come from the windowed match-ID histogram (services.match_histogram).
+
+For progressive fetching, estimates from a sample come with confidence
+intervals (estimate_mean / estimate_ratio), and the unsampled remainder is
+split into refinement chunks that are each spread across the whole history.
 """
 
-from typing import List, Dict, Any, Tuple
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
 from collections import defaultdict
 import math
 
+# Stratum keys when there is no histogram / for IDs missing from it
+ALL_MONTHS = 'all'
+UNBUCKETED = 'unbucketed'
+
 
 class IntelligentSampler:
     """
@@ -55,47 +64,66 @@ class IntelligentSampler:
         
         return 0.20  # Default to 20% for very high counts
     
-    def extract_month_from_match_id(self, match_id: str) -> str:
+    def group_matches_by_month(
+        self,
+        match_ids: List[str],
+        month_buckets: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, List[str]]:
         """
-        Extract month/year from match ID timestamp.
-        Match IDs contain Unix timestamps in milliseconds.
+        Group match IDs by month.
+        
+        Match IDs hold a sequential game id, not a timestamp, so months come
+        from a windowed histogram (services.match_histogram). Without one the
+        history is a single stratum: IDs are newest first, so evenly spaced
+        picks still span the whole year.
         
         Args:
-            match_id: Match ID (e.g., "KR_1234567890123")
+            match_ids: List of match IDs (most recent first)
+            month_buckets: Month key -> match IDs, from fetch_monthly_histogram
             
         Returns:
-            Month key in format "YYYY-MM"
+            Dictionary mapping month keys to match ID lists (in match_ids order)
         """
-        try:
-            # Match ID format: REGION_TIMESTAMP
-            # Extract timestamp (last 13 digits for milliseconds)
-            timestamp_str = match_id.split('_')[-1]
-            timestamp_ms = int(timestamp_str)
-            timestamp_s = timestamp_ms / 1000
-            
-            date = datetime.fromtimestamp(timestamp_s)
-            return date.strftime("%Y-%m")
-        except:
-            # Fallback to current month if parsing fails
-            return datetime.now().strftime("%Y-%m")
+        if not month_buckets:
+            return {ALL_MONTHS: list(match_ids)} if match_ids else {}
+        
+        month_of = {mid: month for month, ids in month_buckets.items() for mid in ids}
+        monthly_matches = defaultdict(list)
+        
+        for match_id in match_ids:
+            # Games played after the histogram was taken land in their own stratum
+            monthly_matches[month_of.get(match_id, UNBUCKETED)].append(match_id)
+        
+        return dict(monthly_matches)
     
-    def group_matches_by_month(self, match_ids: List[str]) -> Dict[str, List[str]]:
+    @staticmethod
+    def allocate_samples(month_totals: Dict[str, int], sample_count: int) -> Dict[str, int]:
         """
-        Group match IDs by month.
+        Split a sample across months in proportion to their games.
+        
+        Largest-remainder rounding, so the months add up to sample_count;
+        every month with games gets at least one sample.
         
         Args:
-            match_ids: List of match IDs
+            month_totals: Month key -> games that month
+            sample_count: Total samples to allocate
             
         Returns:
-            Dictionary mapping month keys to match ID lists
+            Month key -> samples
         """
-        monthly_matches = defaultdict(list)
-        
-        for match_id in match_ids:
-            month_key = self.extract_month_from_match_id(match_id)
-            monthly_matches[month_key].append(match_id)
-        
-        return dict(monthly_matches)
+        total = sum(month_totals.values())
+        if not total:
+            return {month: 0 for month in month_totals}
+        quotas = {month: sample_count * count / total for month, count in month_totals.items()}
+        allocation = {month: min(month_totals[month], max(1, int(quota))) for month, quota in quotas.items()}
+        spare = sample_count - sum(allocation.values())
+        for month in sorted(quotas, key=lambda m: quotas[m] - int(quotas[m]), reverse=True):
+            if spare <= 0:
+                break
+            if allocation[month] < month_totals[month]:
+                allocation[month] += 1
+                spare -= 1
+        return allocation
     
     def select_samples_from_month(
         self, 
@@ -128,12 +156,17 @@ class IntelligentSampler:
         
         return selected
     
-    def sample_matches(self, match_ids: List[str]) -> Dict[str, Any]:
+    def sample_matches(
+        self,
+        match_ids: List[str],
+        month_buckets: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
         """
         Intelligently sample matches with monthly distribution.
         
         Args:
             match_ids: All match IDs from the year
+            month_buckets: Optional month key -> match IDs histogram
             
         Returns:
             Dictionary containing:
@@ -151,16 +184,19 @@ class IntelligentSampler:
         self.sample_count = int(self.total_matches * self.sample_percentage)
         
         # Group matches by month
-        monthly_matches = self.group_matches_by_month(match_ids)
+        monthly_matches = self.group_matches_by_month(match_ids, month_buckets)
         
         # Calculate samples per month (proportional distribution)
+        allocation = self.allocate_samples(
+            {month: len(ids) for month, ids in monthly_matches.items()}, self.sample_count
+        )
         monthly_samples = {}
         sampled_match_ids = []
         
         for month, month_match_ids in monthly_matches.items():
             month_total = len(month_match_ids)
             month_percentage = month_total / self.total_matches
-            month_sample_count = max(1, int(self.sample_count * month_percentage))
+            month_sample_count = allocation[month]
             
             # Select samples from this month
             selected = self.select_samples_from_month(month_match_ids, month_sample_count)
@@ -232,6 +268,23 @@ class IntelligentSampler:
         # For count-based stats, scale up proportionally
         return sampled_value / self.sample_percentage
     
+    def refinement_chunks(self, remaining_ids: List[str], chunks: int) -> List[List[str]]:
+        """
+        Split the unsampled matches into chunks that each span the whole history.
+
+        Every chunk takes every `chunks`-th match, so the sample plus any
+        number of completed chunks is still spread evenly over time.
+
+        Args:
+            remaining_ids: Match IDs not in the sample (history order)
+            chunks: Number of chunks
+
+        Returns:
+            Non-empty chunks
+        """
+        chunks = max(1, chunks)
+        return [remaining_ids[k::chunks] for k in range(chunks) if remaining_ids[k::chunks]]
+
     def get_sampling_report(self) -> str:
         """
         Generate human-readable sampling report.
@@ -265,6 +318,73 @@ class IntelligentSampler:
         return "\n".join(report)
 
 
+def _interval(estimate: float, variance: float, sample_size: int, z: float) -> Dict[str, Any]:
+    margin = z * math.sqrt(max(variance, 0.0))
+    return {
+        'estimate': estimate,
+        'low': estimate - margin,
+        'high': estimate + margin,
+        'margin': margin,
+        'sampleSize': sample_size
+    }
+
+
+def _finite_population_correction(sample_size: int, population_size: int) -> float:
+    """Variance shrinks to 0 as the sample approaches the whole history."""
+    if population_size <= 1 or sample_size >= population_size:
+        return 0.0
+    return (population_size - sample_size) / (population_size - 1)
+
+
+def estimate_mean(values: List[float], population_size: int, z: float = 1.96) -> Dict[str, Any]:
+    """
+    Mean of a per-match value with a confidence interval.
+
+    Args:
+        values: The value in each sampled match
+        population_size: Matches in the whole history
+        z: Normal quantile (1.96 = 95%)
+
+    Returns:
+        {'estimate', 'low', 'high', 'margin', 'sampleSize'}
+    """
+    n = len(values)
+    if n == 0:
+        return _interval(0.0, 0.0, 0, z)
+    mean = sum(values) / n
+    sample_variance = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    variance = sample_variance / n * _finite_population_correction(n, population_size)
+    return _interval(mean, variance, n, z)
+
+
+def estimate_ratio(numerators: List[float], denominators: List[float], population_size: int,
+                   z: float = 1.96) -> Dict[str, Any]:
+    """
+    Ratio of two per-match totals (e.g. KDA, CS per minute) with a
+    confidence interval (delta method).
+
+    Args:
+        numerators: Numerator in each sampled match
+        denominators: Denominator in each sampled match
+        population_size: Matches in the whole history
+        z: Normal quantile (1.96 = 95%)
+
+    Returns:
+        {'estimate', 'low', 'high', 'margin', 'sampleSize'}
+    """
+    n = len(numerators)
+    total_denominator = sum(denominators)
+    if n == 0 or total_denominator <= 0:
+        return _interval(0.0, 0.0, n, z)
+    ratio = sum(numerators) / total_denominator
+    mean_denominator = total_denominator / n
+    residuals = [y - ratio * x for y, x in zip(numerators, denominators)]
+    residual_variance = sum(r * r for r in residuals) / (n - 1) if n > 1 else 0.0
+    variance = (residual_variance / (n * mean_denominator ** 2)
+                * _finite_population_correction(n, population_size))
+    return _interval(ratio, variance, n, z)
+
+
 # Convenience function for quick sampling
 def sample_matches_intelligently(match_ids: List[str]) -> Tuple[List[str], Dict[str, Any]]:
     """
@@ -298,17 +418,19 @@ if __name__ == "__main__":
     ]
     
     for count, player_type in test_cases:
-        # Generate fake match IDs with timestamps spread across a year
-        base_timestamp = 1672531200000  # Jan 1, 2023
-        year_ms = 365 * 24 * 60 * 60 * 1000
+        # Generate fake matches spread across a year, bucketed by month the
+        # way services.match_histogram would return them
+        base_timestamp = 1672531200  # Jan 1, 2023
+        year_s = 365 * 24 * 60 * 60
         
-        match_ids = [
-            f"KR_{base_timestamp + int(random.random() * year_ms)}"
-            for _ in range(count)
-        ]
+        month_buckets = defaultdict(list)
+        for game in sorted(random.sample(range(year_s), count), reverse=True):
+            month = datetime.fromtimestamp(base_timestamp + game, tz=timezone.utc).strftime("%Y-%m")
+            month_buckets[month].append(f"KR_{7_000_000_000 + game}")
+        match_ids = [mid for ids in month_buckets.values() for mid in ids]
         
         sampler = IntelligentSampler()
-        result = sampler.sample_matches(match_ids)
+        result = sampler.sample_matches(match_ids, dict(month_buckets))
         
         print(f"\n{player_type} ({count} matches):")
         print(f"  Sample: {result['sample_count']} matches ({result['sample_percentage']:.1f}%)")
@@ -0,0 +1,168 @@
+"""
+Monthly Match Histogram
+=======================
+Exact month -> match-ID buckets for a player, without fetching a single
+match detail.
+
+Match IDs carry a sequential game id, not a timestamp, so the month of a
+match can't be read off its ID. Match-V5 does filter ids-by-puuid on
+startTime/endTime, though: one windowed query per month, run in parallel,
+returns each month's IDs directly. The buckets drive stratified sampling
+(IntelligentSampler.sample_matches) and give the progress slide exact
+games-per-month even while only a sample has been fetched.
+
+Windows are queried without a queue filter and intersected with the ranked
+IDs fetch_match_history already has (restrict_histogram): one request per
+month (plus one per extra 100 games that month) instead of one per month
+and queue, issued through the shared RiotRequestScheduler.
+"""
+
+import concurrent.futures
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .constants import SEASON_14_START_TIMESTAMP
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+MAX_WORKERS = 8
+
+
+def month_key(timestamp: float) -> str:
+    """'YYYY-MM' (UTC) of a Unix timestamp in seconds."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m")
+
+
+def month_windows(start_time: int, end_time: Optional[int] = None) -> List[Tuple[str, int, int]]:
+    """
+    Calendar-month windows covering [start_time, end_time].
+
+    Args:
+        start_time: Unix timestamp (s) of the first window's start
+        end_time: Unix timestamp (s) of the last window's end (default: now)
+
+    Returns:
+        (month key, window start, window end) tuples, newest month first;
+        bounds are inclusive seconds and windows don't overlap
+    """
+    end_time = int(end_time if end_time is not None else time.time())
+    windows = []
+    current = datetime.fromtimestamp(start_time, tz=timezone.utc)
+    window_start = start_time
+    while window_start <= end_time:
+        if current.month == 12:
+            following = current.replace(year=current.year + 1, month=1, day=1, hour=0, minute=0, second=0)
+        else:
+            following = current.replace(month=current.month + 1, day=1, hour=0, minute=0, second=0)
+        window_end = min(int(following.timestamp()) - 1, end_time)
+        windows.append((current.strftime("%Y-%m"), window_start, window_end))
+        current = following
+        window_start = int(following.timestamp())
+    windows.reverse()
+    return windows
+
+
+def _fetch_window(riot_client, puuid: str, platform: str, queue: Optional[int], start: int, end: int) -> Optional[List[str]]:
+    ids: List[str] = []
+    index = 0
+    while True:
+        page = riot_client.get_match_ids(puuid=puuid, platform=platform, count=PAGE_SIZE, start=index,
+                                         queue=queue, start_time=start, end_time=end)
+        if page is None:
+            return None
+        ids.extend(page)
+        if len(page) < PAGE_SIZE:
+            return ids
+        index += PAGE_SIZE
+
+
+def _game_number(match_id: str) -> int:
+    try:
+        return int(match_id.rsplit('_', 1)[-1])
+    except ValueError:
+        return 0
+
+
+def fetch_monthly_histogram(
+    riot_client,
+    puuid: str,
+    platform: str,
+    queues: Sequence[Optional[int]] = (None,),
+    start_time: int = SEASON_14_START_TIMESTAMP,
+    end_time: Optional[int] = None,
+    max_workers: int = MAX_WORKERS
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Fetch a player's match IDs bucketed by calendar month.
+
+    Args:
+        riot_client: RiotAPIClient
+        puuid: Player PUUID
+        platform: Platform region
+        queues: Queue filters, one window query each per month (default:
+            a single unfiltered query; narrow it with restrict_histogram)
+        start_time: Unix timestamp (s) of the first month
+        end_time: Unix timestamp (s) of the last month (default: now)
+        max_workers: Concurrent windowed queries
+
+    Returns:
+        Month key -> match IDs (newest first), newest month first, empty
+        months omitted; None if any window failed (a partial histogram
+        would skew the strata)
+    """
+    windows = month_windows(start_time, end_time)
+    jobs = [(month, queue, start, end) for month, start, end in windows for queue in queues]
+    if not jobs:
+        return {}
+
+    results: Dict[Tuple[str, int], Optional[List[str]]] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                                               thread_name_prefix='match-histogram') as pool:
+        futures = {
+            pool.submit(_fetch_window, riot_client, puuid, platform, queue, start, end): (month, queue)
+            for month, queue, start, end in jobs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                logger.warning(f" Histogram window {futures[future]} failed: {e}")
+                results[futures[future]] = None
+
+    if any(ids is None for ids in results.values()):
+        logger.warning(" Monthly histogram incomplete; falling back to unstratified sampling")
+        return None
+
+    histogram: Dict[str, List[str]] = {}
+    for month, _, _ in windows:
+        ids = [mid for queue in queues for mid in results[(month, queue)]]
+        if ids:
+            # Game ids are sequential, so this interleaves queues newest first
+            histogram[month] = sorted(dict.fromkeys(ids), key=_game_number, reverse=True)
+    logger.info(f" Monthly histogram: {sum(len(ids) for ids in histogram.values())} matches over "
+                f"{len(histogram)} months ({len(jobs)} windowed queries)")
+    return histogram
+
+
+def restrict_histogram(histogram: Dict[str, List[str]], match_ids: List[str]) -> Dict[str, List[str]]:
+    """
+    Keep only the given match IDs (e.g. the ranked ones) in each month.
+
+    Args:
+        histogram: Output of fetch_monthly_histogram
+        match_ids: IDs to keep
+
+    Returns:
+        Histogram of match_ids, empty months dropped
+    """
+    keep = set(match_ids)
+    restricted = {month: [mid for mid in ids if mid in keep] for month, ids in histogram.items()}
+    return {month: ids for month, ids in restricted.items() if ids}
+
+
+def histogram_counts(histogram: Dict[str, List[str]]) -> Dict[str, int]:
+    """Month key -> games, oldest month first (the raw_data 'matchesByMonth' form)."""
+    return {month: len(histogram[month]) for month in sorted(histogram)}
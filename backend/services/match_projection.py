@@ -0,0 +1,201 @@
+"""
+Match Projection
+================
+Reduces a full Match-V5 payload (~30-70KB, 10 participants x 100+ fields) to
+the slim record the analytics actually read (~2KB), right after it is fetched.
+
+The slim record keeps the Match-V5 shape so analytics code works on either:
+
+    {
+      'metadata': {'matchId', 'projection'},
+      'info': {
+        <game metadata: gameId, gameCreation, gameDuration, queueId, ...>,
+        'participants': [<player: PLAYER_FIELDS + CHALLENGE_FIELDS>,
+                         <teammates: TEAMMATE_FIELDS (ids and names)>],
+        'teams': [{'teamId', 'win', 'objectives': {name: kills}, 'totals': {...}}]
+      }
+    }
+
+Opponents are reduced to their team's totals. The full payload can be
+re-fetched on demand with fetch_raw_match().
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the projected fields change
+PROJECTION_VERSION = 1
+
+INFO_FIELDS = (
+    'gameId', 'gameCreation', 'gameStartTimestamp', 'gameEndTimestamp', 'gameDuration',
+    'gameMode', 'gameType', 'gameVersion', 'mapId', 'platformId', 'queueId', 'endOfGameResult',
+)
+
+# The analyzed player's participant fields
+PLAYER_FIELDS = (
+    'puuid', 'riotIdGameName', 'riotIdTagline', 'summonerName', 'summonerId', 'participantId',
+    'teamId', 'win', 'championId', 'championName', 'champLevel', 'teamPosition',
+    'individualPosition', 'lane', 'role', 'timePlayed', 'gameEndedInEarlySurrender',
+    'gameEndedInSurrender', 'kills', 'deaths', 'assists', 'doubleKills', 'tripleKills',
+    'quadraKills', 'pentaKills', 'largestMultiKill', 'largestKillingSpree', 'killingSprees',
+    'firstBloodKill', 'firstBloodAssist', 'firstTowerKill', 'firstTowerAssist',
+    'totalDamageDealtToChampions', 'physicalDamageDealtToChampions', 'magicDamageDealtToChampions',
+    'trueDamageDealtToChampions', 'totalDamageTaken', 'damageSelfMitigated',
+    'damageDealtToObjectives', 'damageDealtToTurrets', 'damageDealtToBuildings',
+    'totalHeal', 'totalHealsOnTeammates', 'totalDamageShieldedOnTeammates', 'timeCCingOthers',
+    'goldEarned', 'goldSpent', 'totalMinionsKilled', 'neutralMinionsKilled',
+    'visionScore', 'wardsPlaced', 'wardsKilled', 'visionWardsBoughtInGame', 'detectorWardsPlaced',
+    'dragonKills', 'baronKills', 'turretKills', 'turretTakedowns', 'inhibitorKills',
+    'objectivesStolen', 'totalTimeSpentDead', 'longestTimeSpentLiving',
+    'item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6', 'summoner1Id', 'summoner2Id',
+)
+
+# Subset of participant.challenges kept for the player
+CHALLENGE_FIELDS = (
+    'kda', 'killParticipation', 'teamDamagePercentage', 'damageTakenOnTeamPercentage',
+    'damagePerMinute', 'goldPerMinute', 'visionScorePerMinute', 'laneMinionsFirst10Minutes',
+    'jungleCsBefore10Minutes', 'soloKills', 'takedowns', 'skillshotsHit', 'skillshotsDodged',
+    'controlWardsPlaced', 'turretPlatesTaken', 'dragonTakedowns', 'baronTakedowns',
+    'maxCsAdvantageOnLaneOpponent', 'laningPhaseGoldExpAdvantage', 'perfectGame',
+)
+
+# Teammates keep identity only (duo/premade detection)
+TEAMMATE_FIELDS = (
+    'puuid', 'riotIdGameName', 'riotIdTagline', 'summonerName', 'teamId', 'championName',
+    'teamPosition', 'win',
+)
+
+# Per-team sums over all five participants
+TEAM_TOTAL_FIELDS = (
+    'kills', 'deaths', 'assists', 'goldEarned', 'totalDamageDealtToChampions',
+    'damageDealtToTurrets', 'visionScore', 'totalMinionsKilled', 'neutralMinionsKilled',
+)
+
+
+def _pick(source: Dict[str, Any], fields) -> Dict[str, Any]:
+    return {field: source[field] for field in fields if field in source}
+
+
+def is_projected(match: Dict[str, Any]) -> bool:
+    """Whether a match record is already a slim projection."""
+    return bool(match.get('metadata', {}).get('projection'))
+
+
+def project_match(match: Optional[Dict[str, Any]], puuid: str) -> Optional[Dict[str, Any]]:
+    """
+    Project a full Match-V5 payload to the slim record for one player.
+
+    Args:
+        match: Full match payload (or an already projected record)
+        puuid: The analyzed player's PUUID
+
+    Returns:
+        Slim record, the input unchanged if already projected or the player
+        is not in the match, or None for a missing match
+    """
+    if not match or is_projected(match):
+        return match
+
+    info = match.get('info', {})
+    participants = info.get('participants', [])
+    player = next((p for p in participants if p.get('puuid') == puuid), None)
+    if player is None:
+        logger.warning(f"Player not found in {match.get('metadata', {}).get('matchId')}, keeping full payload")
+        return match
+
+    slim_player = _pick(player, PLAYER_FIELDS)
+    slim_player['challenges'] = _pick(player.get('challenges') or {}, CHALLENGE_FIELDS)
+    teammates = [
+        _pick(p, TEAMMATE_FIELDS) for p in participants
+        if p is not player and p.get('teamId') == player.get('teamId')
+    ]
+
+    totals = {}
+    for p in participants:
+        team = totals.setdefault(p.get('teamId'), dict.fromkeys(TEAM_TOTAL_FIELDS, 0))
+        for field in TEAM_TOTAL_FIELDS:
+            team[field] += p.get(field, 0) or 0
+
+    teams = []
+    for team in info.get('teams', []):
+        team_id = team.get('teamId')
+        teams.append({
+            'teamId': team_id,
+            'win': team.get('win'),
+            'objectives': {name: obj.get('kills', 0) for name, obj in (team.get('objectives') or {}).items()},
+            'totals': totals.get(team_id, dict.fromkeys(TEAM_TOTAL_FIELDS, 0)),
+        })
+
+    slim_info = _pick(info, INFO_FIELDS)
+    slim_info['participants'] = [slim_player] + teammates
+    slim_info['teams'] = teams
+
+    return {
+        'metadata': {
+            'matchId': match.get('metadata', {}).get('matchId'),
+            'projection': PROJECTION_VERSION,
+        },
+        'info': slim_info,
+    }
+
+
+def project_for_players(match: Optional[Dict[str, Any]], puuids, project: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Split one fetched match into a record per group member who played in it.
+
+    Args:
+        match: Full match payload
+        puuids: PUUIDs of the group members
+        project: Slim records per member (False keeps the shared full payload)
+
+    Returns:
+        Dict of puuid -> record, for members found in the match
+    """
+    if not match:
+        return {}
+    present = {p.get('puuid') for p in match.get('info', {}).get('participants', [])}
+    return {
+        puuid: project_match(match, puuid) if project else match
+        for puuid in puuids if puuid in present
+    }
+
+
+def team_totals(match: Dict[str, Any], team_id: int) -> Dict[str, int]:
+    """
+    Per-team sums of TEAM_TOTAL_FIELDS for a full or projected match.
+
+    Args:
+        match: Match record
+        team_id: 100 or 200
+
+    Returns:
+        Dict of field -> team total
+    """
+    info = match.get('info', {})
+    for team in info.get('teams', []):
+        if team.get('teamId') == team_id and 'totals' in team:
+            return team['totals']
+
+    totals = dict.fromkeys(TEAM_TOTAL_FIELDS, 0)
+    for p in info.get('participants', []):
+        if p.get('teamId') == team_id:
+            for field in TEAM_TOTAL_FIELDS:
+                totals[field] += p.get(field, 0) or 0
+    return totals
+
+
+def fetch_raw_match(riot_client, match_id: str, platform: str) -> Optional[Dict[str, Any]]:
+    """
+    Re-fetch the full Match-V5 payload for a projected record.
+
+    Args:
+        riot_client: RiotAPIClient instance
+        match_id: Match ID (slim record's metadata.matchId)
+        platform: Platform code
+
+    Returns:
+        Full match payload or None
+    """
+    return riot_client.get_match_details(match_id, platform)
@@ -0,0 +1,476 @@
+"""
+Population Statistics Index
+===========================
+Mergeable quantile sketches of player-level metrics (KDA, vision, CS/min, ...)
+per metric x tier x region, fed incrementally by every analytics run and
+queried in O(1) during analytics to say where a player actually falls.
+
+Sketches are DDSketch-style log-bucket histograms: relative-error bounded
+(SKETCH_ALPHA), mergeable by adding bucket counts, and small (a few hundred
+buckets per key). Each observation is recorded under four scopes so sparse
+tier x region cells can fall back to wider populations:
+
+    metric|TIER|region, metric|TIER|ALL, metric|ALL|region, metric|ALL|ALL
+
+Each player counts once per season (record_player): re-analyzing a player
+whose match set changed doesn't add them to the population again.
+
+Backends (POPULATION_STATS_BACKEND):
+- s3 (default): snapshot at population/index.json plus one small delta object
+  per recorded player under population/deltas/, listed in the manifest
+  population/deltas.json (so neither the hot path nor loads list the bucket)
+  and compacted into the snapshot every COMPACT_AFTER deltas. A marker per
+  player under population/players/{season}/ records who counted already
+- file: one JSON file (POPULATION_STATS_FILE), updated under an flock
+- off: percentiles disabled
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, List
+
+from .constants import SEASON_14_START_TIMESTAMP
+
+logger = logging.getLogger(__name__)
+
+SKETCH_ALPHA = 0.01          # 1% relative error on reported quantiles
+MIN_VALUE = 1e-3             # Values at or below this land in the zero bucket
+MIN_SAMPLES = 30             # Minimum population before a scope is trusted
+ALL = 'ALL'
+
+S3_PREFIX = 'population'
+COMPACT_AFTER = 50           # Deltas before the S3 snapshot is rewritten
+INDEX_TTL_SECONDS = 600      # How long a loaded index is reused in a warm container
+
+# Players count once per season (the year the rewind covers)
+SEASON = str(time.gmtime(SEASON_14_START_TIMESTAMP).tm_year)
+
+
+class QuantileSketch:
+    """
+    Log-bucket quantile sketch over non-negative values.
+    """
+
+    __slots__ = ('alpha', '_gamma_log', 'bins', 'zero', 'count', 'min', 'max', '_cdf')
+
+    def __init__(self, alpha: float = SKETCH_ALPHA):
+        self.alpha = alpha
+        self._gamma_log = math.log((1 + alpha) / (1 - alpha))
+        self.bins: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._cdf = None
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._gamma_log)
+
+    def _value(self, key: int) -> float:
+        # Representative value of a bucket (midpoint in relative terms)
+        return 2 * math.exp(key * self._gamma_log) / (1 + math.exp(self._gamma_log))
+
+    def add(self, value: float, count: int = 1):
+        if value is None or value != value:  # None / NaN
+            return
+        value = max(float(value), 0.0)
+        if value <= MIN_VALUE:
+            self.zero += count
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._cdf = None
+
+    def merge(self, other: 'QuantileSketch'):
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero += other.zero
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self._cdf = None
+
+    def _build_cdf(self):
+        # Dense cumulative counts from the lowest to highest bucket so rank()
+        # is a single index lookup and quantile() a bisect. Cached until the
+        # next add/merge
+        if not self.bins:
+            self._cdf = (0, [])
+            return
+        low, high = min(self.bins), max(self.bins)
+        running = self.zero
+        cumulative = []
+        for key in range(low, high + 1):
+            running += self.bins.get(key, 0)
+            cumulative.append(running)
+        self._cdf = (low, cumulative)
+
+    def rank(self, value: float) -> float:
+        """
+        Fraction of observations <= value (O(1) after the first query).
+
+        Args:
+            value: Metric value
+
+        Returns:
+            0.0 - 1.0
+        """
+        if not self.count:
+            return 0.0
+        if self._cdf is None:
+            self._build_cdf()
+        low, cumulative = self._cdf
+        if value is None or value < 0:
+            return 0.0
+        if value <= MIN_VALUE or not cumulative:
+            return self.zero / self.count if value <= MIN_VALUE else 1.0
+        index = self._key(value) - low
+        if index < 0:
+            return self.zero / self.count
+        if index >= len(cumulative):
+            return 1.0
+        return cumulative[index] / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate value at quantile q (O(log n) after the first query).
+
+        Args:
+            q: 0.0 - 1.0
+
+        Returns:
+            Value or None for an empty sketch
+        """
+        if not self.count:
+            return None
+        target = q * (self.count - 1)
+        if target < self.zero:
+            return 0.0
+        if self._cdf is None:
+            self._build_cdf()
+        low, cumulative = self._cdf
+        # First bucket whose running count passes the target (a non-empty one,
+        # since empty buckets repeat the previous count)
+        index = bisect.bisect_right(cumulative, target)
+        if index >= len(cumulative):
+            return self.max
+        return self._value(low + index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'alpha': self.alpha, 'zero': self.zero, 'count': self.count, 'min': self.min,
+                'max': self.max, 'bins': {str(k): v for k, v in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(data.get('alpha', SKETCH_ALPHA))
+        sketch.bins = {int(k): v for k, v in data.get('bins', {}).items()}
+        sketch.zero = data.get('zero', 0)
+        sketch.count = data.get('count', 0)
+        sketch.min = data.get('min')
+        sketch.max = data.get('max')
+        return sketch
+
+
+def _scope_key(metric: str, tier: str, region: str) -> str:
+    region = ALL if not region or region == ALL else region.lower()
+    return f"{metric}|{(tier or ALL).upper()}|{region}"
+
+
+class PopulationIndex:
+    """
+    Sketches keyed by metric|tier|region with scope fallback for queries.
+    """
+
+    def __init__(self, sketches: Optional[Dict[str, QuantileSketch]] = None, min_samples: int = MIN_SAMPLES):
+        self.sketches: Dict[str, QuantileSketch] = sketches or {}
+        self.min_samples = min_samples
+        self._pending: Dict[str, QuantileSketch] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scopes(tier: str, region: str) -> List[tuple]:
+        return [(tier, region), (tier, ALL), (ALL, region), (ALL, ALL)]
+
+    def record(self, metrics: Dict[str, float], tier: str, region: str):
+        """
+        Add one player's metric values under every scope.
+
+        Args:
+            metrics: metric name -> value
+            tier: Player tier (UNRANKED allowed)
+            region: Platform code
+        """
+        with self._lock:
+            for metric, value in metrics.items():
+                if value is None:
+                    continue
+                for scope_tier, scope_region in self._scopes(tier, region):
+                    key = _scope_key(metric, scope_tier, scope_region)
+                    for target in (self.sketches, self._pending):
+                        sketch = target.get(key)
+                        if sketch is None:
+                            sketch = target[key] = QuantileSketch()
+                        sketch.add(value)
+
+    def percentile(self, metric: str, value: float, tier: str, region: str) -> Optional[Dict[str, Any]]:
+        """
+        Where a value falls in the narrowest scope with enough samples.
+
+        Args:
+            metric: Metric name
+            value: Player's value
+            tier: Player tier
+            region: Platform code
+
+        Returns:
+            {'percentile', 'sampleSize', 'scope', 'median'} or None if no scope
+            has MIN_SAMPLES observations
+        """
+        for scope_tier, scope_region in self._scopes(tier, region):
+            sketch = self.sketches.get(_scope_key(metric, scope_tier, scope_region))
+            if sketch is not None and sketch.count >= self.min_samples:
+                return {
+                    'percentile': round(sketch.rank(value) * 100, 1),
+                    'sampleSize': sketch.count,
+                    'scope': {'tier': (scope_tier or ALL).upper(), 'region': scope_region or ALL},
+                    'median': round(sketch.quantile(0.5), 2),
+                }
+        return None
+
+    def merge(self, other: 'PopulationIndex'):
+        with self._lock:
+            for key, sketch in other.sketches.items():
+                if key in self.sketches:
+                    self.sketches[key].merge(sketch)
+                else:
+                    self.sketches[key] = QuantileSketch.from_dict(sketch.to_dict())
+
+    def take_pending(self) -> Optional[Dict[str, Any]]:
+        """Observations recorded since the last flush, serialized (and cleared)."""
+        with self._lock:
+            if not self._pending:
+                return None
+            delta = {key: sketch.to_dict() for key, sketch in self._pending.items()}
+            self._pending = {}
+        return {'sketches': delta}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'version': 1, 'alpha': SKETCH_ALPHA,
+                    'sketches': {key: sketch.to_dict() for key, sketch in self.sketches.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'PopulationIndex':
+        sketches = {key: QuantileSketch.from_dict(value)
+                    for key, value in ((data or {}).get('sketches') or {}).items()}
+        return cls(sketches)
+
+
+def player_key(puuid: str) -> str:
+    """Player's ID in the index (hashed: PUUIDs aren't stored with the stats)."""
+    return hashlib.sha256(puuid.encode()).hexdigest()[:20]
+
+
+# ==================== BACKENDS ====================
+
+class FilePopulationBackend:
+    """
+    Single JSON file, merged under an exclusive flock. Recorded players are
+    kept in the same file ({'players': {season: [player_key, ...]}}).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not read population stats {self.path}: {e}")
+            return {}
+
+    def load(self) -> PopulationIndex:
+        return PopulationIndex.from_dict(self._read())
+
+    def has_player(self, player: str) -> bool:
+        return player in self._read().get('players', {}).get(SEASON, [])
+
+    def append(self, delta: Dict[str, Any]):
+        import fcntl
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                data = json.loads(content) if content.strip() else {}
+                index = PopulationIndex.from_dict(data)
+                index.merge(PopulationIndex.from_dict(delta))
+                players = data.get('players', {})
+                season = players.setdefault(SEASON, [])
+                season.extend(player for player in delta.get('players', []) if player not in season)
+                f.seek(0)
+                f.truncate()
+                json.dump(dict(index.to_dict(), players=players), f)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class S3PopulationBackend:
+    """
+    Snapshot + append-only deltas in the sessions bucket.
+
+    The manifest is read-modify-written without a lock: concurrent appends
+    can drop a delta from it and concurrent compactions can double-count a
+    handful of runs. The index is a statistical summary, so that is accepted
+    instead of taking a lock.
+    """
+
+    def __init__(self, prefix: str = S3_PREFIX, compact_after: int = COMPACT_AFTER):
+        self.snapshot_key = f"{prefix}/index.json"
+        self.manifest_key = f"{prefix}/deltas.json"
+        self.delta_prefix = f"{prefix}/deltas/"
+        self.player_prefix = f"{prefix}/players/{SEASON}/"
+        self.compact_after = compact_after
+
+    def _delta_keys(self) -> List[str]:
+        from .aws_clients import download_from_s3
+        manifest = download_from_s3(self.manifest_key)
+        if manifest is None:
+            # Written by the first append; until then (or for deltas from
+            # before the manifest existed) list the prefix
+            from .aws_clients import list_s3_keys
+            return list_s3_keys(self.delta_prefix)
+        return json.loads(manifest).get('deltas', [])
+
+    def _load_with_deltas(self):
+        from .aws_clients import download_from_s3
+        snapshot = download_from_s3(self.snapshot_key)
+        index = PopulationIndex.from_dict(json.loads(snapshot)) if snapshot else PopulationIndex()
+        delta_keys = self._delta_keys()
+        for key in delta_keys:
+            body = download_from_s3(key)
+            if body:
+                index.merge(PopulationIndex.from_dict(json.loads(body)))
+        return index, delta_keys
+
+    def load(self) -> PopulationIndex:
+        try:
+            return self._load_with_deltas()[0]
+        except Exception as e:
+            logger.warning(f"Could not load population stats from S3: {e}")
+            return PopulationIndex()
+
+    def has_player(self, player: str) -> bool:
+        from .aws_clients import check_s3_object_exists
+        return check_s3_object_exists(f"{self.player_prefix}{player}")
+
+    def append(self, delta: Dict[str, Any]):
+        from .aws_clients import upload_to_s3
+        key = f"{self.delta_prefix}{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.json"
+        delta_keys = self._delta_keys() + [key]
+        upload_to_s3(key, json.dumps(delta, separators=(',', ':')))
+        upload_to_s3(self.manifest_key, {'deltas': delta_keys})
+        for player in delta.get('players', []):
+            upload_to_s3(f"{self.player_prefix}{player}", {'recordedAt': time.time()})
+        if len(delta_keys) >= self.compact_after:
+            self.compact()
+
+    def compact(self):
+        """Fold all deltas into the snapshot and delete them."""
+        from .aws_clients import upload_to_s3, delete_from_s3
+        index, delta_keys = self._load_with_deltas()
+        if upload_to_s3(self.snapshot_key, json.dumps(index.to_dict(), separators=(',', ':'))):
+            # Keep deltas appended since the load listed
+            folded = set(delta_keys)
+            upload_to_s3(self.manifest_key, {'deltas': [key for key in self._delta_keys() if key not in folded]})
+            for key in delta_keys:
+                delete_from_s3(key)
+            logger.info(f"Compacted {len(delta_keys)} population deltas")
+
+
+def get_population_backend():
+    """
+    Backend selected by POPULATION_STATS_BACKEND (s3 | file | off).
+
+    Returns:
+        Backend instance or None when disabled
+    """
+    kind = os.environ.get('POPULATION_STATS_BACKEND', 's3').lower()
+    if kind == 'off':
+        return None
+    if kind == 'file':
+        return FilePopulationBackend(os.environ.get('POPULATION_STATS_FILE', '/tmp/rift-rewind-population.json'))
+    return S3PopulationBackend()
+
+
+# Cached index per warm container
+_index: Optional[PopulationIndex] = None
+_index_loaded_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_population_index() -> Optional[PopulationIndex]:
+    """
+    Load (or reuse, for INDEX_TTL_SECONDS) the population index.
+
+    Returns:
+        PopulationIndex or None when the backend is disabled
+    """
+    global _index, _index_loaded_at
+    backend = get_population_backend()
+    if backend is None:
+        return None
+    with _index_lock:
+        if _index is None or time.time() - _index_loaded_at > INDEX_TTL_SECONDS:
+            _index = backend.load()
+            _index_loaded_at = time.time()
+        return _index
+
+
+def record_player(index: Optional[PopulationIndex], puuid: str, metrics: Dict[str, float],
+                  tier: str, region: str) -> bool:
+    """
+    Add a player to the population and persist it, unless they already
+    count this season.
+
+    Args:
+        index: Index returned by get_population_index()
+        puuid: Player PUUID
+        metrics: RiftRewindAnalytics.population_metrics()
+        tier: Player tier (UNRANKED allowed)
+        region: Platform code
+
+    Returns:
+        True if the player was recorded
+    """
+    backend = get_population_backend()
+    if index is None or backend is None or not puuid:
+        return False
+    player = player_key(puuid)
+    try:
+        if backend.has_player(player):
+            return False
+        index.record(metrics, tier, region)
+        delta = index.take_pending()
+        if delta:
+            delta['players'] = [player]
+            backend.append(delta)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to persist population stats: {e}")
+        return False
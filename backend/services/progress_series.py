@@ -0,0 +1,193 @@
+"""
+Monthly Progress Series
+=======================
+Per-month running sums of a player's games, bucketed by gameCreation, for
+the progress slide: games, win rate, KDA, vision, CS/min and top champion
+per month and over rolling windows of months.
+
+Only sums are kept, so adding a match is O(1) and rendering the slide is
+O(months) however long the history is. A series is carried along with the
+data it summarises:
+
+- during a progressive fetch the processor keeps one series across rounds
+  and each preview only adds the matches fetched since the last one,
+- the final series is stored in raw_data['progressSeries']
+  (to_dict/from_dict); analytics over raw_data that has gained games since
+  then only add the new ones.
+
+Matches are deduplicated by match ID, so re-adding a list is harmless.
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .match_histogram import month_key
+
+ROLLING_WINDOW_MONTHS = 3
+SERIES_VERSION = 1
+
+_SUM_FIELDS = ('games', 'wins', 'kills', 'deaths', 'assists', 'visionScore', 'cs', 'seconds')
+
+
+def _month_index(month: str) -> int:
+    year, month_num = month.split('-')
+    return int(year) * 12 + int(month_num) - 1
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    bucket: Dict[str, Any] = {field: 0 for field in _SUM_FIELDS}
+    bucket['champions'] = {}
+    return bucket
+
+
+def _summarize(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    games = bucket['games']
+    if not games:
+        return {'games': 0}
+    deaths = bucket['deaths']
+    minutes = bucket['seconds'] / 60
+    top = max(bucket['champions'].items(), key=lambda item: item[1]) if bucket['champions'] else None
+    return {
+        'games': games,
+        'winRate': round(bucket['wins'] / games * 100, 1),
+        # Same convention as calculate_kda for deathless stretches
+        'kdaRatio': round((bucket['kills'] + bucket['assists']) / deaths, 2) if deaths else 999,
+        'avgKills': round(bucket['kills'] / games, 1),
+        'avgDeaths': round(deaths / games, 1),
+        'avgAssists': round(bucket['assists'] / games, 1),
+        'avgVisionScore': round(bucket['visionScore'] / games, 1),
+        'csPerMin': round(bucket['cs'] / minutes, 1) if minutes else 0,
+        'topChampion': {'name': top[0], 'games': top[1]} if top else None,
+    }
+
+
+def player_stats(puuid: str) -> Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """stats_for callable: a match -> the participant entry of `puuid`."""
+    def stats_for(match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for participant in match.get('info', {}).get('participants', []):
+            if participant.get('puuid') == puuid:
+                return participant
+        return None
+    return stats_for
+
+
+class ProgressSeries:
+    """
+    Mergeable per-month sums over a player's matches.
+    """
+
+    def __init__(self):
+        self.months: Dict[str, Dict[str, Any]] = {}
+        self.match_ids = set()
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+    def add(self, match: Dict[str, Any], stats: Optional[Dict[str, Any]]) -> bool:
+        """
+        Add one match.
+
+        Args:
+            match: Match record (slim or full)
+            stats: The player's participant entry (None: counted as seen only)
+
+        Returns:
+            False if the match was already in the series
+        """
+        info = match.get('info', {})
+        match_id = match.get('metadata', {}).get('matchId')
+        if match_id is not None:
+            if match_id in self.match_ids:
+                return False
+            self.match_ids.add(match_id)
+        created = info.get('gameCreation')
+        if not stats or not created:
+            return True
+
+        bucket = self.months.setdefault(month_key(created / 1000), _empty_bucket())
+        bucket['games'] += 1
+        bucket['wins'] += 1 if stats.get('win') else 0
+        bucket['kills'] += stats.get('kills', 0)
+        bucket['deaths'] += stats.get('deaths', 0)
+        bucket['assists'] += stats.get('assists', 0)
+        bucket['visionScore'] += stats.get('visionScore', 0)
+        bucket['cs'] += stats.get('totalMinionsKilled', 0) + stats.get('neutralMinionsKilled', 0)
+        bucket['seconds'] += info.get('gameDuration', 0)
+        champion = stats.get('championName', 'Unknown')
+        bucket['champions'][champion] = bucket['champions'].get(champion, 0) + 1
+        return True
+
+    def extend(self, matches: Iterable[Dict[str, Any]],
+               stats_for: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> int:
+        """
+        Add every match not already in the series.
+
+        Args:
+            matches: Match records
+            stats_for: Match -> the player's participant entry
+
+        Returns:
+            Matches added
+        """
+        added = 0
+        for match in matches:
+            match_id = match.get('metadata', {}).get('matchId')
+            if match_id is not None and match_id in self.match_ids:
+                continue
+            added += self.add(match, stats_for(match))
+        return added
+
+    def totals(self) -> Dict[str, int]:
+        """Games and wins over the whole series."""
+        return {
+            'games': sum(bucket['games'] for bucket in self.months.values()),
+            'wins': sum(bucket['wins'] for bucket in self.months.values()),
+        }
+
+    def monthly(self) -> List[Dict[str, Any]]:
+        """
+        Per-month aggregates, oldest first (months without games omitted).
+
+        Returns:
+            [{'month': 'YYYY-MM', 'games', 'winRate', 'kdaRatio', ...}, ...]
+        """
+        return [{'month': month, **_summarize(self.months[month])} for month in sorted(self.months)]
+
+    def rolling(self, window: int = ROLLING_WINDOW_MONTHS) -> List[Dict[str, Any]]:
+        """
+        Aggregates over the `window` calendar months ending at each active month.
+
+        Args:
+            window: Months per window
+
+        Returns:
+            [{'month': window end, 'fromMonth': window start, ...}, ...], oldest first
+        """
+        ordered = sorted(self.months)
+        result = []
+        for end, month in enumerate(ordered):
+            start = end
+            while start > 0 and _month_index(month) - _month_index(ordered[start - 1]) < window:
+                start -= 1
+            merged = _empty_bucket()
+            champions = Counter()
+            for key in ordered[start:end + 1]:
+                for field in _SUM_FIELDS:
+                    merged[field] += self.months[key][field]
+                champions.update(self.months[key]['champions'])
+            merged['champions'] = dict(champions)
+            result.append({'month': month, 'fromMonth': ordered[start], **_summarize(merged)})
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'version': SERIES_VERSION, 'months': self.months, 'matchIds': sorted(self.match_ids)}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'ProgressSeries':
+        """Series from to_dict() output (empty if missing or from another version)."""
+        series = cls()
+        if not data or data.get('version') != SERIES_VERSION:
+            return series
+        series.months = {month: {**_empty_bucket(), **bucket} for month, bucket in data.get('months', {}).items()}
+        series.match_ids = set(data.get('matchIds', []))
+        return series
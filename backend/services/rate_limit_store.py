@@ -0,0 +1,456 @@
+"""
+Shared Rate Limit Store
+=======================
+Token buckets shared by every process that uses the same RIOT_API_KEY, so
+ten concurrent processor Lambdas split the app rate limit instead of each
+assuming it owns all of it. RiotRequestScheduler consults the store after
+its own (per-process) windows admit a request.
+
+Backends (RIOT_RATE_STORE):
+    local   no shared state, per-process windows only (default)
+    memory  in-process dict; several schedulers in one process (tests, benchmarks)
+    file    JSON state file under an fcntl lock; processes on one host
+            (dev server + processor workers). RIOT_RATE_STORE_PATH
+    redis   one Lua script per lease against any Redis-protocol server
+            (ElastiCache, a local redis-server). RIOT_RATE_REDIS_URL
+
+Each limit window "count:seconds" is a bucket of count tokens, and a token
+returns to its bucket `seconds` after it was taken: Riot's own sliding
+window, so the processes together never exceed count in any window. Tokens
+are leased in batches (TokenLease): one round trip takes up to
+RIOT_RATE_LEASE_SIZE tokens (at most the host's queue depth) from every
+window's bucket atomically, which the process then spends locally. Tokens
+still unspent after a short TTL are handed back with the next lease.
+
+A store error admits requests on the per-process limits alone (fail open)
+and skips the store for RIOT_RATE_STORE_BACKOFF seconds, so an outage
+costs one timeout per host rather than one per request.
+
+Check a deployment's store with benchmarks/rate_store.py.
+"""
+
+import abc
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SIZE = 4
+LEASE_TTL_FRACTION = 0.05
+STORE_BACKOFF_SECONDS = float(os.environ.get('RIOT_RATE_STORE_BACKOFF', '5'))
+DEFAULT_STORE_PATH = '/tmp/rift-rewind-riot-rate.json'
+DEFAULT_REDIS_URL = 'redis://127.0.0.1:6379/0'
+
+# (key, count, window seconds)
+Bucket = Tuple[str, int, float]
+
+
+def _take(state: Dict[str, List[List[float]]], buckets: List[Bucket], want: int, now: float,
+          give_back: Optional[Tuple[float, int]] = None) -> Tuple[int, float, float]:
+    """
+    Take from a set of buckets (the one algorithm every backend runs).
+
+    Args:
+        state: {key: [[leased_at, tokens], ...] oldest first}, modified in place
+        buckets: Buckets that must all have room
+        want: Tokens requested
+        now: Store clock (seconds)
+        give_back: (leased_at, tokens) left unspent from the caller's
+            previous lease, returned to the buckets first
+
+    Returns:
+        (tokens granted, seconds until one token is back if none were,
+        leased_at of this lease)
+    """
+    granted, wait = want, 0.0
+    for key, count, seconds in buckets:
+        leases = [lease for lease in state.get(key, []) if now - lease[0] < seconds]
+        if give_back:
+            for lease in leases:
+                if lease[0] == give_back[0] and lease[1] >= give_back[1]:
+                    lease[1] -= give_back[1]
+                    break
+            leases = [lease for lease in leases if lease[1] > 0]
+        state[key] = leases
+        available = count - sum(tokens for _, tokens in leases)
+        granted = min(granted, available)
+        if available < 1:
+            # Wait for the oldest leases that free up one token to expire
+            freed = available
+            for leased_at, tokens in leases:
+                freed += tokens
+                if freed >= 1:
+                    wait = max(wait, leased_at + seconds - now)
+                    break
+
+    if granted < 1:
+        return 0, wait, 0.0
+    for key, _, _ in buckets:
+        state[key].append([now, granted])
+    return granted, 0.0, now
+
+
+class TokenBucketStore(abc.ABC):
+    """
+    Interface of a shared token bucket backend.
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def lease(self, buckets: List[Bucket], want: int,
+              give_back: Optional[Tuple[float, int]] = None) -> Tuple[int, float, float]:
+        """
+        Atomically take up to `want` tokens from every bucket.
+
+        Args:
+            buckets: (key, count, seconds) per limit window
+            want: Tokens requested (>= 1)
+            give_back: (leased_at, tokens) left unspent from the previous
+                lease, returned to the buckets first
+
+        Returns:
+            (tokens granted, seconds to wait before retrying when none were,
+            leased_at to give leftovers back with)
+        """
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """
+    Buckets in a dict; shared by the schedulers of one process.
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        self._state: Dict[str, List[List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def lease(self, buckets: List[Bucket], want: int,
+              give_back: Optional[Tuple[float, int]] = None) -> Tuple[int, float, float]:
+        with self._lock:
+            return _take(self._state, buckets, want, time.monotonic(), give_back)
+
+
+class FileTokenBucketStore(TokenBucketStore):
+    """
+    Buckets in a JSON file, updated under an exclusive flock. Shared by every
+    process on the host (not across hosts; use redis for that).
+    """
+
+    name = 'file'
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Args:
+            path: State file (created on first lease)
+        """
+        self.path = path
+        # flock is per open file description, so threads of this process
+        # serialize on a lock of their own first
+        self._lock = threading.Lock()
+
+    def lease(self, buckets: List[Bucket], want: int,
+              give_back: Optional[Tuple[float, int]] = None) -> Tuple[int, float, float]:
+        with self._lock, open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    state = json.loads(content) if content else {}
+                except ValueError:
+                    logger.warning(f"Resetting unreadable rate limit state in {self.path}")
+                    state = {}
+
+                # Wall clock: monotonic clocks are not comparable across processes
+                result = _take(state, buckets, want, time.time(), give_back)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({key: leases for key, leases in state.items() if leases}))
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# KEYS: one list of "leased_at:tokens" entries per limit window.
+# ARGV: want, then count and seconds per key, then optionally the leased_at
+# and token count of the caller's unspent leftovers. Uses the server clock so
+# skew between Lambda hosts doesn't matter.
+_LEASE_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local stamp = string.format('%.6f', now)
+local granted = tonumber(ARGV[1])
+local back_at = ARGV[2 * #KEYS + 2]
+local back = tonumber(ARGV[2 * #KEYS + 3] or '0')
+local wait = 0
+for i, key in ipairs(KEYS) do
+  local count = tonumber(ARGV[2 * i])
+  local seconds = tonumber(ARGV[2 * i + 1])
+  while true do
+    local head = redis.call('LINDEX', key, 0)
+    if not head or now - tonumber(string.match(head, '^([^:]+)')) < seconds then break end
+    redis.call('LPOP', key)
+  end
+  local leases = redis.call('LRANGE', key, 0, -1)
+  local returned = back < 1
+  local available = count
+  local at, tokens = {}, {}
+  for j, lease in ipairs(leases) do
+    local leased_at, n = string.match(lease, '^([^:]+):(%d+)$')
+    n = tonumber(n)
+    if not returned and leased_at == back_at and n >= back then
+      n = n - back
+      redis.call('LSET', key, j - 1, leased_at .. ':' .. n)
+      returned = true
+    end
+    at[j], tokens[j] = tonumber(leased_at), n
+    available = available - n
+  end
+  granted = math.min(granted, available)
+  if available < 1 then
+    local freed = available
+    for j = 1, #at do
+      freed = freed + tokens[j]
+      if freed >= 1 then
+        wait = math.max(wait, at[j] + seconds - now)
+        break
+      end
+    end
+  end
+end
+if granted < 1 then
+  return {0, tostring(wait), '0'}
+end
+for i, key in ipairs(KEYS) do
+  redis.call('RPUSH', key, stamp .. ':' .. granted)
+  redis.call('PEXPIRE', key, math.ceil(tonumber(ARGV[2 * i + 1]) * 1000) + 1000)
+end
+return {granted, '0', stamp}
+"""
+
+
+class RedisError(Exception):
+    """Error reply from the Redis-protocol server."""
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """
+    Buckets as Redis lists, leased with one EVALSHA round trip. Speaks RESP
+    over a plain socket, so no client library is needed in the Lambda bundle.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str = DEFAULT_REDIS_URL, timeout: float = 0.5):
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            timeout: Connect/read timeout in seconds
+        """
+        parsed = urllib.parse.urlsplit(url)
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._sha = hashlib.sha1(_LEASE_SCRIPT.encode()).hexdigest()
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile('rb')
+        if self.password:
+            self._command('AUTH', self.password)
+        if self.db:
+            self._command('SELECT', self.db)
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def _command(self, *args) -> Any:
+        parts = [f'*{len(args)}\r\n'.encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        self._sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('Redis connection closed')
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RedisError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2].decode()
+        if kind == b'*':
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f'Unexpected Redis reply: {line[:32]!r}')
+
+    def lease(self, buckets: List[Bucket], want: int,
+              give_back: Optional[Tuple[float, int]] = None) -> Tuple[int, float, float]:
+        args = [len(buckets)] + [key for key, _, _ in buckets] + [want]
+        for _, count, seconds in buckets:
+            args += [count, repr(seconds)]
+        if give_back:
+            # Same formatting as the script's stamp, so the entry matches
+            args += ['%.6f' % give_back[0], give_back[1]]
+
+        with self._lock:
+            for attempt in range(2):
+                fresh = self._sock is None
+                try:
+                    if fresh:
+                        self._connect()
+                    try:
+                        granted, wait, stamp = self._command('EVALSHA', self._sha, *args)
+                    except RedisError as e:
+                        if not str(e).startswith('NOSCRIPT'):
+                            raise
+                        granted, wait, stamp = self._command('EVAL', _LEASE_SCRIPT, *args)
+                    return int(granted), float(wait), float(stamp)
+                except (OSError, ConnectionError):
+                    # Stale connection (server restart, idle Lambda): reconnect
+                    # once. A failed connect is an outage, so no second timeout.
+                    self._close()
+                    if attempt or fresh:
+                        raise
+
+
+def store_from_env() -> Optional[TokenBucketStore]:
+    """
+    Shared store configured by RIOT_RATE_STORE.
+
+    Returns:
+        Store, or None for 'local' (per-process limits only)
+    """
+    backend = os.environ.get('RIOT_RATE_STORE', 'local').lower()
+    if backend == 'memory':
+        return MemoryTokenBucketStore()
+    if backend == 'file':
+        return FileTokenBucketStore(os.environ.get('RIOT_RATE_STORE_PATH', DEFAULT_STORE_PATH))
+    if backend == 'redis':
+        return RedisTokenBucketStore(os.environ.get('RIOT_RATE_REDIS_URL', DEFAULT_REDIS_URL),
+                                     timeout=float(os.environ.get('RIOT_RATE_REDIS_TIMEOUT', '0.5')))
+    if backend != 'local':
+        logger.warning(f"Unknown RIOT_RATE_STORE={backend!r}, using per-process limits")
+    return None
+
+
+def key_prefix() -> str:
+    """Bucket key prefix: one budget per RIOT_API_KEY (hashed, never stored)."""
+    api_key = os.environ.get('RIOT_API_KEY', '')
+    return f"riot-rate:{hashlib.sha256(api_key.encode()).hexdigest()[:12]}"
+
+
+class TokenLease:
+    """
+    One routing host's tokens leased from a shared store. Not thread-safe:
+    the scheduler lets one request at a time per host call it (_HostQueue.leasing).
+    """
+
+    def __init__(self, store: TokenBucketStore, host: str, limits: List[Tuple[int, float]],
+                 lease_size: int = DEFAULT_LEASE_SIZE, backoff: float = STORE_BACKOFF_SECONDS):
+        """
+        Args:
+            store: Shared backend
+            host: Routing host (part of the bucket keys)
+            limits: (count, seconds) windows of the host
+            lease_size: Most tokens taken per round trip
+            backoff: Seconds to skip the store after it fails
+        """
+        self.store = store
+        self.lease_size = max(1, lease_size)
+        self.backoff = backoff
+        self.buckets: List[Bucket] = [
+            (f"{key_prefix()}:{host}:{count}:{seconds:g}", count, seconds) for count, seconds in limits
+        ]
+        # A token counts against the window from when it was leased, so
+        # leftovers must be spent right away; older ones go back to the store
+        self.ttl = min(seconds for _, seconds in limits) * LEASE_TTL_FRACTION
+        self.tokens = 0
+        self.leased_at = 0.0
+        self.expires = 0.0
+        self.skip_until = 0.0
+        self.round_trips = 0
+        self.leased = 0
+        self.returned = 0
+        self.errors = 0
+
+    def take(self, waiting: int = 1) -> float:
+        """
+        Spend one token, leasing a batch if none are left.
+
+        Args:
+            waiting: Requests queued for this host (caps the batch size)
+
+        Returns:
+            0 if the request may go, else seconds to wait before asking again
+        """
+        now = time.monotonic()
+        if self.tokens and now < self.expires:
+            self.tokens -= 1
+            return 0.0
+        if now < self.skip_until:
+            # Store recently failed: per-process limits only until the backoff ends
+            return 0.0
+
+        give_back = (self.leased_at, self.tokens) if self.tokens else None
+        self.round_trips += 1
+        try:
+            granted, wait, leased_at = self.store.lease(self.buckets, min(self.lease_size, max(waiting, 1)),
+                                                        give_back)
+        except Exception as e:
+            # Fail open to the per-process limits rather than stall every session
+            self.errors += 1
+            self.skip_until = time.monotonic() + self.backoff
+            if self.errors == 1 or self.errors % 100 == 0:
+                logger.warning(f"Shared rate limit store {self.store.name} unavailable ({self.errors}x), "
+                               f"skipping it for {self.backoff:g}s: {e!r}")
+            return 0.0
+
+        if give_back:
+            self.returned += self.tokens
+            self.tokens = 0
+        if not granted:
+            return max(wait, 0.001)
+        self.leased += granted
+        self.tokens = granted - 1
+        self.leased_at = leased_at
+        self.expires = now + self.ttl
+        return 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {'roundTrips': self.round_trips, 'leasedTokens': self.leased, 'returnedTokens': self.returned,
+                'errors': self.errors}
@@ -3,34 +3,74 @@ Riot API Client with rate limiting and error handling
 """
 
 import os
+import re
+import itertools
 import time
 import logging
 import requests
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timedelta
 from .constants import (
     RIOT_API_PLATFORM_BASE,
     RIOT_API_REGIONAL_BASE,
     RIOT_API_ENDPOINTS,
     PLATFORM_TO_REGIONAL,
-    RIOT_API_RATE_LIMIT_PER_SECOND,
+    COMMUNITY_DRAGON_PROFILE_ICON,
 )
+from .tracing import traced, current_span, propagate
+from .riot_metrics import riot_metrics
+from .riot_scheduler import (
+    riot_scheduler,
+    routing_host,
+    priority_for,
+    request_priority,
+    FIRST_PAINT,
+    FIRST_PAINT_MATCHES,
+)
+from . import json_codec
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# URL path -> RIOT_API_ENDPOINTS name, for per-endpoint spans
+_ENDPOINT_PATTERNS = [
+    (name, re.compile(re.sub(r'\{[^}]+\}', '[^/]+', path) + '$'))
+    for name, path in RIOT_API_ENDPOINTS.items()
+]
+
+
+def _endpoint_name(url: str) -> str:
+    """
+    Map a request URL to its RIOT_API_ENDPOINTS name.
+    
+    Args:
+        url: Full request URL
+        
+    Returns:
+        Endpoint name, or 'other' if unrecognized
+    """
+    path = url.split('?', 1)[0]
+    for name, pattern in _ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return name
+    return 'other'
+
 
 class RiotAPIClient:
     """
     Client for interacting with Riot Games API with rate limiting and retry logic.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session_key: Optional[str] = None,
+                 weight: float = 1.0):
         """
         Initialize Riot API client.
         
         Args:
             api_key: Riot API key (defaults to RIOT_API_KEY env var)
+            session_key: Fairness key in the shared request scheduler
+                (defaults to one per client, i.e. per session)
+            weight: This client's share of its priority class
         """
         self.api_key = api_key or os.environ.get('RIOT_API_KEY')
         if not self.api_key:
@@ -41,54 +81,70 @@ class RiotAPIClient:
             'Accept': 'application/json'
         }
         
-        # Simple rate limiting tracking
-        self.request_times = []
-        self.max_requests_per_second = RIOT_API_RATE_LIMIT_PER_SECOND
+        # Rate limiting is process-wide (services/riot_scheduler.py); this client
+        # is one session competing for the shared key's budget
+        self.session_key = session_key or f"client-{id(self):x}"
+        self.weight = weight
+        self._match_requests = itertools.count()
     
-    def _wait_for_rate_limit(self):
-        """
-        Simple rate limiting: ensure we don't exceed max requests per second.
+    def _wait_for_rate_limit(self, url: str, endpoint: str) -> float:
         """
-        now = time.time()
+        Wait for a slot in the shared request scheduler.
         
-        # Remove timestamps older than 1 second
-        self.request_times = [t for t in self.request_times if now - t < 1.0]
-        
-        # If we've hit the limit, wait
-        if len(self.request_times) >= self.max_requests_per_second:
-            sleep_time = 1.0 - (now - self.request_times[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            self.request_times = []
+        Args:
+            url: Request URL (selects the routing host's queue)
+            endpoint: Endpoint name (selects the default priority class)
         
-        self.request_times.append(time.time())
+        Returns:
+            Seconds spent waiting
+        """
+        return riot_scheduler.acquire(routing_host(url), priority_for(endpoint), self.session_key, self.weight)
+    
+    def _backoff(self, endpoint: str, seconds: float):
+        """Sleep before a retry and record it."""
+        riot_metrics.record_retry(endpoint)
+        riot_metrics.record_backoff(endpoint, seconds)
+        time.sleep(seconds)
     
-    def _make_request(self, url: str, max_retries: int = 3) -> Optional[Dict[str, Any]]:
+    @traced('riot.request')
+    def _make_request(self, url: str, max_retries: int = 3, raw: bool = False) -> Optional[Any]:
         """
         Make HTTP request with retry logic.
         
         Args:
             url: The full URL to request
             max_retries: Maximum number of retries
+            raw: Return the undecoded response bytes (caller decodes)
             
         Returns:
-            JSON response or None if failed
+            JSON response (or bytes if raw) or None if failed
         """
-        self._wait_for_rate_limit()
+        endpoint = _endpoint_name(url)
+        span = current_span()
+        span.rename(f"riot.{endpoint}")
         
         for attempt in range(max_retries):
+            # Every attempt spends budget, so retries queue again too
+            riot_metrics.record_rate_limit_wait(endpoint, self._wait_for_rate_limit(url, endpoint))
+            sent_at = time.perf_counter()
+            response = None
             try:
                 response = requests.get(url, headers=self.headers, timeout=10)
+                riot_metrics.record_response(endpoint, response.status_code,
+                                             time.perf_counter() - sent_at, len(response.content))
+                span.set(status=response.status_code, attempts=attempt + 1)
                 
                 if response.status_code == 200:
-                    return response.json()
+                    return response.content if raw else json_codec.loads(response.content)
                 elif response.status_code == 404:
                     logger.warning(f"Resource not found (404): {url}")
                     return None
                 elif response.status_code == 429:
                     retry_after = int(response.headers.get('Retry-After', 2))
                     logger.info(f"Rate limited. Waiting {retry_after} seconds...")
-                    time.sleep(retry_after)
+                    # Hold the host for every session, not just this one
+                    riot_scheduler.pause(routing_host(url), retry_after)
+                    self._backoff(endpoint, retry_after)
                     continue
                 elif response.status_code == 403:
                     logger.error(f" Forbidden (403) - Access Denied")
@@ -112,35 +168,40 @@ class RiotAPIClient:
                 else:
                     logger.error(f"Error {response.status_code}: {url}")
                     if attempt < max_retries - 1:
-                        time.sleep(1)
+                        self._backoff(endpoint, 1)
                         continue
                     return None
                     
             except requests.exceptions.Timeout:
+                riot_metrics.record_error(endpoint, 'timeout', time.perf_counter() - sent_at)
                 logger.warning(f"⏱  Timeout on attempt {attempt + 1}/{max_retries} - retrying...")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    self._backoff(endpoint, 2 ** attempt)  # Exponential backoff
                     continue
                 logger.error(f" Request timed out after {max_retries} attempts")
                 return None
             except requests.exceptions.SSLError as e:
+                riot_metrics.record_error(endpoint, 'ssl', time.perf_counter() - sent_at)
                 logger.warning(f" SSL Error on attempt {attempt + 1}/{max_retries} - connection issue")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    self._backoff(endpoint, 2 ** attempt)  # Exponential backoff
                     continue
                 logger.error(f" SSL Error persists after {max_retries} attempts (skipping)")
                 return None
             except requests.exceptions.ConnectionError as e:
+                riot_metrics.record_error(endpoint, 'connection', time.perf_counter() - sent_at)
                 logger.warning(f" Connection Error on attempt {attempt + 1}/{max_retries} - network issue")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    self._backoff(endpoint, 2 ** attempt)  # Exponential backoff
                     continue
                 logger.error(f" Connection failed after {max_retries} attempts (skipping)")
                 return None
             except Exception as e:
+                if response is None:
+                    riot_metrics.record_error(endpoint, 'other', time.perf_counter() - sent_at)
                 logger.error(f"  Unexpected error: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(1)
+                    self._backoff(endpoint, 1)
                     continue
                 return None
         
@@ -272,6 +333,33 @@ class RiotAPIClient:
         logger.info(f"Fetching ranked info by PUUID: {puuid[:16]}...")
         return self._make_request(url)
     
+    def get_league_entries_page(
+        self,
+        queue: str,
+        tier: str,
+        division: str,
+        platform: str,
+        page: int = 1
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get one page of a tier/division ladder using LEAGUE-V4 (Platform routing).
+        
+        Args:
+            queue: Queue type (e.g., 'RANKED_SOLO_5x5')
+            tier: Tier (e.g., 'GOLD')
+            division: Division ('I'-'IV')
+            platform: Platform code
+            page: 1-based page number (~205 entries per page)
+            
+        Returns:
+            League entries (unordered), empty past the last page, None on error
+        """
+        base_url = RIOT_API_PLATFORM_BASE.format(platform=platform)
+        endpoint = RIOT_API_ENDPOINTS['league_entries'].format(queue=queue, tier=tier, division=division)
+        url = f"{base_url}{endpoint}?page={page}"
+        
+        return self._make_request(url)
+    
     # ==================== MATCH-V5 API ====================
     
     def get_match_ids(
@@ -324,13 +412,14 @@ class RiotAPIClient:
         
         return self._make_request(url)
     
-    def get_match_details(self, match_id: str, platform: str) -> Optional[Dict[str, Any]]:
+    def get_match_details(self, match_id: str, platform: str, raw: bool = False) -> Optional[Any]:
         """
         Get detailed match data using MATCH-V5 (Regional routing).
         
         Args:
             match_id: The match ID
             platform: Platform code (will be converted to regional)
+            raw: Return undecoded JSON bytes
             
         Returns:
             Match details including all participants, timeline, etc.
@@ -344,7 +433,7 @@ class RiotAPIClient:
         endpoint = RIOT_API_ENDPOINTS['match_by_id'].format(matchId=match_id)
         url = base_url + endpoint
         
-        return self._make_request(url)
+        return self._make_request(url, raw=raw)
     
     # ==================== BATCH OPERATIONS ====================
     
@@ -353,7 +442,8 @@ class RiotAPIClient:
         match_ids: List[str],
         platform: str,
         batch_size: int = 10,
-        parallel: bool = True
+        parallel: bool = True,
+        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch multiple match details with optional parallel processing.
@@ -363,6 +453,8 @@ class RiotAPIClient:
             platform: Platform code
             batch_size: Number of concurrent requests (for rate limiting)
             parallel: Use parallel processing (recommended for 20+ matches)
+            transform: Optional per-match projection applied as soon as each
+                payload arrives (so full payloads don't accumulate)
             
         Returns:
             List of match details
@@ -371,16 +463,35 @@ class RiotAPIClient:
         
         if parallel and total > 10:
             # Use parallel processing for better performance
-            return self._get_matches_parallel(match_ids, platform, max_workers=batch_size)
+            return self._get_matches_parallel(match_ids, platform, max_workers=batch_size, transform=transform)
         else:
             # Use sequential processing for small batches
-            return self._get_matches_sequential(match_ids, platform, batch_size)
+            return self._get_matches_sequential(match_ids, platform, batch_size, transform=transform)
+    
+    def _get_match_transformed(self, match_id: str, platform: str, transform=None) -> Optional[Dict[str, Any]]:
+        # This session's first matches drive first paint; the rest is backfill
+        priority = FIRST_PAINT if next(self._match_requests) < FIRST_PAINT_MATCHES else None
+        with request_priority(priority):
+            return self._fetch_match_transformed(match_id, platform, transform)
+    
+    def _fetch_match_transformed(self, match_id: str, platform: str, transform=None) -> Optional[Dict[str, Any]]:
+        decode_pool = json_codec.get_decode_pool()
+        if decode_pool is not None:
+            # Decode + project in a worker process; only the result crosses back
+            raw = self.get_match_details(match_id, platform, raw=True)
+            return decode_pool.decode(raw, transform) if raw else None
+        
+        match_data = self.get_match_details(match_id, platform)
+        if match_data and transform:
+            match_data = transform(match_data)
+        return match_data
     
     def _get_matches_sequential(
         self,
         match_ids: List[str],
         platform: str,
-        batch_size: int
+        batch_size: int,
+        transform=None
     ) -> List[Dict[str, Any]]:
         """
         Sequential match fetching (original implementation).
@@ -394,7 +505,7 @@ class RiotAPIClient:
             batch = match_ids[i:i + batch_size]
             
             for match_id in batch:
-                match_data = self.get_match_details(match_id, platform)
+                match_data = self._get_match_transformed(match_id, platform, transform)
                 if match_data:
                     matches.append(match_data)
                 else:
@@ -411,31 +522,6 @@ class RiotAPIClient:
         
         return matches
     
-    def get_league_entries(
-        self,
-        summoner_id: str,
-        platform: str
-    ) -> List[Dict[str, Any]]:
-        """
-        Get league entries for a summoner (their rank positions).
-        
-        Args:
-            summoner_id: Encrypted summoner ID
-            platform: Platform code (e.g., 'na1', 'euw1')
-            
-        Returns:
-            List of league entries (one per queue)
-        """
-        endpoint = f'/lol/league/v4/entries/by-summoner/{summoner_id}'
-        url = f"{RIOT_API_PLATFORM_BASE[platform]}{endpoint}"
-        
-        try:
-            response = self._make_request('GET', url)
-            return response if response else []
-        except Exception as e:
-            logger.error(f"Failed to get league entries: {e}")
-            return []
-    
     def get_league_position_in_tier(
         self,
         queue: str,
@@ -445,8 +531,9 @@ class RiotAPIClient:
         platform: str
     ) -> Optional[int]:
         """
-        Estimate player's position within their tier/division.
-        Fetches a page of entries to determine approximate position.
+        Player's position within their tier/division ladder.
+        Resolved from the shared ladder snapshot (see services/ladder_snapshot.py),
+        so repeated lookups in the same division cost no Riot calls.
         
         Args:
             queue: Queue type (e.g., 'RANKED_SOLO_5x5')
@@ -456,28 +543,12 @@ class RiotAPIClient:
             platform: Platform code
             
         Returns:
-            Approximate position/rank number
+            1-based position (1 = highest LP) or None if no snapshot is available
         """
-        endpoint = f'/lol/league/v4/entries/{queue}/{tier}/{division}'
-        url = f"{RIOT_API_PLATFORM_BASE[platform]}{endpoint}"
+        from .ladder_snapshot import get_ladder_service
         
         try:
-            # Fetch first page to see LP distribution
-            params = {'page': 1}
-            response = self._make_request('GET', url, params=params)
-            
-            if not response:
-                return None
-            
-            # Count how many players have higher LP
-            higher_lp_count = sum(1 for entry in response if entry.get('leaguePoints', 0) > lp)
-            
-            # Estimate: Assume ~200 players per page, add offset
-            estimated_position = higher_lp_count + 1
-            
-            logger.info(f"Estimated position in {tier} {division}: {estimated_position}")
-            return estimated_position
-            
+            return get_ladder_service(self).position(platform, queue, tier, division, lp)
         except Exception as e:
             logger.error(f"Failed to get league position: {e}")
             return None
@@ -486,7 +557,8 @@ class RiotAPIClient:
         self,
         match_ids: List[str],
         platform: str,
-        max_workers: int = 10
+        max_workers: int = 10,
+        transform=None
     ) -> List[Dict[str, Any]]:
         """
         Parallel match fetching using ThreadPoolExecutor.
@@ -496,6 +568,7 @@ class RiotAPIClient:
             match_ids: List of match IDs to fetch
             platform: Platform code
             max_workers: Maximum concurrent threads (default 10 to respect 20 req/sec limit)
+            transform: Optional per-match projection, run in the worker thread
             
         Returns:
             List of match details
@@ -510,7 +583,7 @@ class RiotAPIClient:
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_id = {
-                executor.submit(self.get_match_details, match_id, platform): match_id
+                executor.submit(propagate(self._get_match_transformed), match_id, platform, transform): match_id
                 for match_id in match_ids
             }
             
@@ -584,5 +657,5 @@ class RiotAPIClient:
         """
         # Use Community Dragon CDN - more reliable and doesn't require version
         # Falls back to latest version automatically, no 403 errors
-        return f"https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/profile-icons/{profile_icon_id}.jpg"
+        return COMMUNITY_DRAGON_PROFILE_ICON.format(icon_id=profile_icon_id)
 
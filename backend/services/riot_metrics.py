@@ -0,0 +1,198 @@
+"""
+Riot API Client Metrics
+=======================
+Process-wide counters and latency histograms for RiotAPIClient._make_request,
+broken down by endpoint (RIOT_API_ENDPOINTS name).
+
+Separates where request time goes:
+- wire: time inside requests.get
+- rate_limit_wait: time queued for a slot in the shared request scheduler
+  (services/riot_scheduler.py, which also reports per-class queue stats)
+- backoff: time sleeping after 429 Retry-After, timeouts and errors
+
+Exposed as a JSON-friendly snapshot() and as Prometheus text (to_prometheus()).
+"""
+
+import threading
+from typing import Dict, Any, List, Tuple
+
+# Request latency buckets (seconds) - Riot responses are typically 50-400ms
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _status_class(status: int) -> str:
+    if 200 <= status < 300:
+        return '2xx'
+    if status in (404, 429):
+        return str(status)
+    if 500 <= status < 600:
+        return '5xx'
+    return '4xx' if 400 <= status < 500 else 'other'
+
+
+class _EndpointMetrics:
+    __slots__ = ('responses', 'retries', 'errors', 'bytes', 'wire_s', 'rate_limit_wait_s',
+                 'backoff_s', 'buckets', 'latency_count')
+
+    def __init__(self):
+        self.responses: Dict[str, int] = {}
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+        self.bytes = 0
+        self.wire_s = 0.0
+        self.rate_limit_wait_s = 0.0
+        self.backoff_s = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.latency_count = 0
+
+
+class RiotClientMetrics:
+    """
+    Thread-safe metrics registry shared by all RiotAPIClient instances.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+
+    def _get(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics()
+        return metrics
+
+    def _observe_latency(self, metrics: _EndpointMetrics, seconds: float):
+        metrics.wire_s += seconds
+        metrics.latency_count += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                metrics.buckets[i] += 1
+                return
+        metrics.buckets[-1] += 1
+
+    def record_response(self, endpoint: str, status: int, wire_s: float, nbytes: int):
+        with self._lock:
+            metrics = self._get(endpoint)
+            key = _status_class(status)
+            metrics.responses[key] = metrics.responses.get(key, 0) + 1
+            metrics.bytes += nbytes
+            self._observe_latency(metrics, wire_s)
+
+    def record_error(self, endpoint: str, kind: str, wire_s: float):
+        """A request that produced no response (timeout, ssl, connection, ...)."""
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.errors[kind] = metrics.errors.get(kind, 0) + 1
+            self._observe_latency(metrics, wire_s)
+
+    def record_retry(self, endpoint: str):
+        with self._lock:
+            self._get(endpoint).retries += 1
+
+    def record_rate_limit_wait(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._get(endpoint).rate_limit_wait_s += seconds
+
+    def record_backoff(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._get(endpoint).backoff_s += seconds
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Point-in-time copy of all metrics.
+
+        Returns:
+            Dict with per-endpoint metrics and process-wide totals (times in ms)
+        """
+        with self._lock:
+            endpoints = {}
+            totals = {'requests': 0, 'retries': 0, 'bytes': 0, 'wireMs': 0.0,
+                      'rateLimitWaitMs': 0.0, 'backoffMs': 0.0, 'responses': {}, 'errors': {}}
+            for name, m in sorted(self._endpoints.items()):
+                requests = sum(m.responses.values()) + sum(m.errors.values())
+                endpoints[name] = {
+                    'requests': requests,
+                    'responses': dict(m.responses),
+                    'errors': dict(m.errors),
+                    'retries': m.retries,
+                    'bytes': m.bytes,
+                    'wireMs': round(m.wire_s * 1000, 1),
+                    'avgWireMs': round(m.wire_s * 1000 / m.latency_count, 1) if m.latency_count else 0.0,
+                    'rateLimitWaitMs': round(m.rate_limit_wait_s * 1000, 1),
+                    'backoffMs': round(m.backoff_s * 1000, 1),
+                    'latencyBuckets': {
+                        **{str(bound): count for bound, count in zip(LATENCY_BUCKETS, m.buckets)},
+                        '+Inf': m.buckets[-1],
+                    },
+                }
+                totals['requests'] += requests
+                totals['retries'] += m.retries
+                totals['bytes'] += m.bytes
+                totals['wireMs'] += m.wire_s * 1000
+                totals['rateLimitWaitMs'] += m.rate_limit_wait_s * 1000
+                totals['backoffMs'] += m.backoff_s * 1000
+                for key, value in m.responses.items():
+                    totals['responses'][key] = totals['responses'].get(key, 0) + value
+                for key, value in m.errors.items():
+                    totals['errors'][key] = totals['errors'].get(key, 0) + value
+
+        for key in ('wireMs', 'rateLimitWaitMs', 'backoffMs'):
+            totals[key] = round(totals[key], 1)
+        return {'endpoints': endpoints, 'totals': totals}
+
+    def to_prometheus(self) -> str:
+        """
+        Render metrics in the Prometheus text exposition format (0.0.4).
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            items: List[Tuple[str, _EndpointMetrics]] = sorted(self._endpoints.items())
+            lines = [
+                '# HELP riot_api_requests_total Riot API responses by endpoint and status class.',
+                '# TYPE riot_api_requests_total counter',
+            ]
+            for name, m in items:
+                for status, count in sorted(m.responses.items()):
+                    lines.append(f'riot_api_requests_total{{endpoint="{name}",status="{status}"}} {count}')
+
+            lines += ['# HELP riot_api_errors_total Riot API requests that got no response, by kind.',
+                      '# TYPE riot_api_errors_total counter']
+            for name, m in items:
+                for kind, count in sorted(m.errors.items()):
+                    lines.append(f'riot_api_errors_total{{endpoint="{name}",kind="{kind}"}} {count}')
+
+            simple = [
+                ('riot_api_retries_total', 'counter', 'Retried Riot API attempts.', 'retries'),
+                ('riot_api_response_bytes_total', 'counter', 'Response body bytes received.', 'bytes'),
+                ('riot_api_rate_limit_wait_seconds_total', 'counter',
+                 'Time queued in the shared request scheduler.', 'rate_limit_wait_s'),
+                ('riot_api_backoff_seconds_total', 'counter',
+                 'Time sleeping after 429s, timeouts and errors.', 'backoff_s'),
+            ]
+            for metric, kind, help_text, attr in simple:
+                lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+                for name, m in items:
+                    lines.append(f'{metric}{{endpoint="{name}"}} {getattr(m, attr)}')
+
+            lines += ['# HELP riot_api_request_duration_seconds Time on the wire per Riot API attempt.',
+                      '# TYPE riot_api_request_duration_seconds histogram']
+            for name, m in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, m.buckets):
+                    cumulative += count
+                    lines.append(f'riot_api_request_duration_seconds_bucket{{endpoint="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'riot_api_request_duration_seconds_bucket{{endpoint="{name}",le="+Inf"}} {m.latency_count}')
+                lines.append(f'riot_api_request_duration_seconds_sum{{endpoint="{name}"}} {m.wire_s}')
+                lines.append(f'riot_api_request_duration_seconds_count{{endpoint="{name}"}} {m.latency_count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry
+riot_metrics = RiotClientMetrics()
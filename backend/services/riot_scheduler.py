@@ -0,0 +1,368 @@
+"""
+Riot API Request Scheduler
+==========================
+Process-wide admission control for the shared RIOT_API_KEY budget. Every
+RiotAPIClient request takes a slot here before going on the wire, so
+concurrent sessions share one limiter instead of each limiting itself.
+
+- One queue per routing host (na1, euw1, americas, ...), matching Riot's
+  per-region app rate limits (RIOT_API_RATE_LIMITS, e.g. "20:1,100:120").
+- Strict priority between classes:
+    interactive  account/summoner/league lookups (the user is waiting)
+    first_paint  match-ID pages and each session's most recent matches
+    backfill     the rest of the match history, ladder pages
+- Within a class, weighted fair queueing between sessions (virtual finish
+  times), so a 3000-match whale gets its share, not the whole budget.
+- A 429 pauses the host for every session (pause()).
+- Optionally, a shared token bucket store (RIOT_RATE_STORE, see
+  rate_limit_store.py) so the limit holds across processes and Lambdas,
+  not just within this one.
+
+Queue depth, grants and wait time per class are kept for /metrics.
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from .constants import RIOT_API_RATE_LIMIT_PER_SECOND
+from .rate_limit_store import TokenBucketStore, TokenLease, store_from_env, DEFAULT_LEASE_SIZE
+
+INTERACTIVE, FIRST_PAINT, BACKFILL = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', FIRST_PAINT: 'first_paint', BACKFILL: 'backfill'}
+
+# Default class per RIOT_API_ENDPOINTS name
+ENDPOINT_PRIORITY = {
+    'account_by_riot_id': INTERACTIVE,
+    'summoner_by_name': INTERACTIVE,
+    'summoner_by_puuid': INTERACTIVE,
+    'league_by_summoner': INTERACTIVE,
+    'league_by_puuid': INTERACTIVE,
+    'match_ids_by_puuid': FIRST_PAINT,
+    'match_by_id': BACKFILL,
+    'league_entries': BACKFILL,
+}
+
+# Most recent matches per batch scheduled as first_paint
+FIRST_PAINT_MATCHES = int(os.environ.get('RIOT_FIRST_PAINT_MATCHES', '20'))
+
+_priority_override: contextvars.ContextVar = contextvars.ContextVar('riot_priority', default=None)
+
+
+@contextlib.contextmanager
+def request_priority(priority: Optional[int]):
+    """
+    Schedule Riot requests made in this block (and thread) at a given class.
+
+    Args:
+        priority: INTERACTIVE, FIRST_PAINT or BACKFILL (None keeps the default)
+    """
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def priority_for(endpoint: str) -> int:
+    """Class for a request: the active request_priority(), else the endpoint default."""
+    override = _priority_override.get()
+    return override if override is not None else ENDPOINT_PRIORITY.get(endpoint, INTERACTIVE)
+
+
+def routing_host(url: str) -> str:
+    """
+    Riot routing value of a request URL (rate limits are per routing value).
+
+    Args:
+        url: Full request URL (real edge or the local stub)
+
+    Returns:
+        e.g. 'na1' or 'americas'
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.hostname and parsed.hostname.endswith('.api.riotgames.com'):
+        return parsed.hostname.split('.', 1)[0]
+    # Stub style: http://host:port/{platform}/lol/...
+    return parsed.path.lstrip('/').split('/', 1)[0] or parsed.netloc
+
+
+def parse_limits(spec: str) -> List[Tuple[int, float]]:
+    """
+    Parse Riot's "count:seconds,count:seconds" rate limit format.
+
+    Returns:
+        List of (count, window seconds)
+    """
+    limits = []
+    for part in spec.split(','):
+        if part.strip():
+            count, seconds = part.split(':')
+            limits.append((int(count), float(seconds)))
+    return limits
+
+
+class _ClassStats:
+    __slots__ = ('depth', 'granted', 'wait_s', 'max_wait_s')
+
+    def __init__(self):
+        self.depth = 0
+        self.granted = 0
+        self.wait_s = 0.0
+        self.max_wait_s = 0.0
+
+
+class _HostQueue:
+    """
+    Waiting requests and rate windows for one routing host.
+    """
+
+    def __init__(self, limits: List[Tuple[int, float]], lease: Optional[TokenLease] = None):
+        self.cond = threading.Condition()
+        self.lease = lease
+        self.windows = [(count, seconds, deque()) for count, seconds in limits]
+        self.heap: List[list] = []
+        self.class_vtime: Dict[int, float] = {}
+        # Latest virtual finish time per session with a request queued
+        self.session_vtime: Dict[Tuple[int, str], float] = {}
+        self.paused_until = 0.0
+        # A store round trip is in flight (made without holding cond)
+        self.leasing = False
+        self.stats = {priority: _ClassStats() for priority in PRIORITY_NAMES}
+
+    def delay(self, now: float) -> float:
+        """Seconds until every window has room and any 429 pause is over."""
+        delay = self.paused_until - now
+        for count, seconds, sent in self.windows:
+            while sent and now - sent[0] >= seconds:
+                sent.popleft()
+            if len(sent) >= count:
+                delay = max(delay, seconds - (now - sent[0]))
+        return delay
+
+    def record_send(self, now: float):
+        for _, _, sent in self.windows:
+            sent.append(now)
+
+
+class RiotRequestScheduler:
+    """
+    Priority + weighted-fair admission for Riot requests, per routing host.
+    """
+
+    def __init__(self, limits: Optional[List[Tuple[int, float]]] = None,
+                 store: Optional[TokenBucketStore] = None, lease_size: Optional[int] = None):
+        """
+        Args:
+            limits: (count, seconds) windows per host (default: RIOT_API_RATE_LIMITS
+                env, else RIOT_API_RATE_LIMIT_PER_SECOND per second)
+            store: Shared token bucket store (default: RIOT_RATE_STORE env,
+                none for per-process limits only)
+            lease_size: Tokens leased from the store per round trip
+                (default: RIOT_RATE_LEASE_SIZE env, else 4)
+        """
+        if limits is None:
+            limits = parse_limits(os.environ.get('RIOT_API_RATE_LIMITS', f'{RIOT_API_RATE_LIMIT_PER_SECOND}:1'))
+        if store is None:
+            store = store_from_env()
+        if lease_size is None:
+            lease_size = int(os.environ.get('RIOT_RATE_LEASE_SIZE', DEFAULT_LEASE_SIZE))
+        self.limits = limits
+        self.store = store
+        self.lease_size = lease_size
+        self._hosts: Dict[str, _HostQueue] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _host(self, host: str) -> _HostQueue:
+        with self._lock:
+            queue = self._hosts.get(host)
+            if queue is None:
+                lease = TokenLease(self.store, host, self.limits, self.lease_size) if self.store else None
+                queue = self._hosts[host] = _HostQueue(self.limits, lease)
+            return queue
+
+    def acquire(self, host: str, priority: int, session: str, weight: float = 1.0) -> float:
+        """
+        Block until this request may be sent.
+
+        Args:
+            host: Routing host (see routing_host)
+            priority: INTERACTIVE, FIRST_PAINT or BACKFILL
+            session: Fairness key (one per rewind session / client)
+            weight: Session's share within its class (default 1)
+
+        Returns:
+            Seconds spent waiting
+        """
+        queue = self._host(host)
+        enqueued = time.monotonic()
+        with queue.cond:
+            # WFQ: a session's next request finishes 1/weight after the later of
+            # its own last one and the class's current virtual time
+            start = max(queue.class_vtime.get(priority, 0.0), queue.session_vtime.get((priority, session), 0.0))
+            finish = start + 1.0 / max(weight, 1e-6)
+            queue.session_vtime[(priority, session)] = finish
+            ticket = [priority, finish, next(self._seq)]
+            heapq.heappush(queue.heap, ticket)
+            stats = queue.stats[priority]
+            stats.depth += 1
+
+            leased = False
+            while True:
+                if leased or (queue.heap[0] is ticket and not queue.leasing):
+                    now = time.monotonic()
+                    delay = queue.delay(now)
+                    if delay <= 0 and queue.lease is not None and not leased:
+                        # This process has room; now ask the shared budget, without
+                        # blocking other sessions from queueing behind us meanwhile
+                        delay = self._lease(queue)
+                        leased = delay <= 0
+                        if leased:
+                            # A 429 may have paused the host during the store call;
+                            # hold the token until the pause is over
+                            now = time.monotonic()
+                            delay = queue.delay(now)
+                    if delay <= 0:
+                        if queue.heap[0] is ticket:
+                            heapq.heappop(queue.heap)
+                        else:
+                            # A higher class queued during the store call; the token is ours
+                            queue.heap.remove(ticket)
+                            heapq.heapify(queue.heap)
+                        queue.record_send(now)
+                        queue.class_vtime[priority] = finish
+                        if queue.session_vtime.get((priority, session)) == finish:
+                            # The session's last queued request; a later one starts at class_vtime anyway
+                            del queue.session_vtime[(priority, session)]
+                        waited = now - enqueued
+                        stats.depth -= 1
+                        stats.granted += 1
+                        stats.wait_s += waited
+                        stats.max_wait_s = max(stats.max_wait_s, waited)
+                        queue.cond.notify_all()
+                        return waited
+                    queue.cond.wait(delay)
+                else:
+                    queue.cond.wait()
+
+    @staticmethod
+    def _lease(queue: _HostQueue) -> float:
+        """
+        Take a shared store token for the head request, releasing queue.cond
+        for the round trip. Called with queue.cond held.
+
+        Returns:
+            TokenLease.take() result
+        """
+        queue.leasing = True
+        waiting = len(queue.heap)
+        queue.cond.release()
+        try:
+            return queue.lease.take(waiting)
+        finally:
+            queue.cond.acquire()
+            queue.leasing = False
+            queue.cond.notify_all()
+
+    def pause(self, host: str, seconds: float):
+        """
+        Hold every request to a host (after a 429 with Retry-After).
+
+        Args:
+            host: Routing host
+            seconds: Pause length
+        """
+        queue = self._host(host)
+        with queue.cond:
+            queue.paused_until = max(queue.paused_until, time.monotonic() + seconds)
+            queue.cond.notify_all()
+
+    def reset(self):
+        with self._lock:
+            self._hosts = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Queue depth and wait time per class, overall and per host.
+
+        Returns:
+            {'limits', 'store', 'classes': {name: {...}}, 'hosts': {host: {name: {...}}}}
+            (times in ms; 'store' has shared-store round trips, None without one)
+        """
+        def render(stats: _ClassStats) -> Dict[str, Any]:
+            return {
+                'queueDepth': stats.depth,
+                'granted': stats.granted,
+                'waitMs': round(stats.wait_s * 1000, 1),
+                'avgWaitMs': round(stats.wait_s * 1000 / stats.granted, 1) if stats.granted else 0.0,
+                'maxWaitMs': round(stats.max_wait_s * 1000, 1),
+            }
+
+        with self._lock:
+            hosts = dict(self._hosts)
+        totals = {priority: _ClassStats() for priority in PRIORITY_NAMES}
+        per_host = {}
+        store = {'backend': self.store.name, 'roundTrips': 0, 'leasedTokens': 0, 'returnedTokens': 0,
+                 'errors': 0} if self.store else None
+        for host, queue in sorted(hosts.items()):
+            with queue.cond:
+                per_host[host] = {PRIORITY_NAMES[p]: render(s) for p, s in queue.stats.items()}
+                if queue.lease is not None:
+                    for key, value in queue.lease.stats().items():
+                        store[key] += value
+                for priority, stats in queue.stats.items():
+                    total = totals[priority]
+                    total.depth += stats.depth
+                    total.granted += stats.granted
+                    total.wait_s += stats.wait_s
+                    total.max_wait_s = max(total.max_wait_s, stats.max_wait_s)
+
+        return {
+            'limits': [f'{count}:{seconds:g}' for count, seconds in self.limits],
+            'store': store,
+            'classes': {PRIORITY_NAMES[p]: render(s) for p, s in totals.items()},
+            'hosts': per_host,
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render scheduler metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text
+        """
+        snapshot = self.snapshot()
+        hosts = snapshot['hosts']
+        series = [
+            ('riot_scheduler_queue_depth', 'gauge', 'Riot requests waiting for a slot.', 'queueDepth', 1),
+            ('riot_scheduler_granted_total', 'counter', 'Riot requests admitted.', 'granted', 1),
+            ('riot_scheduler_wait_seconds_total', 'counter', 'Time Riot requests waited for a slot.', 'waitMs', 1000),
+        ]
+        lines = []
+        for metric, kind, help_text, key, scale in series:
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+            for host, classes in hosts.items():
+                for name, stats in classes.items():
+                    value = stats[key] / scale if scale != 1 else stats[key]
+                    lines.append(f'{metric}{{host="{host}",class="{name}"}} {value}')
+        store = snapshot['store']
+        if store:
+            lines += ['# HELP riot_scheduler_store_round_trips_total Token leases requested from the shared store.',
+                      '# TYPE riot_scheduler_store_round_trips_total counter',
+                      f'riot_scheduler_store_round_trips_total{{backend="{store["backend"]}"}} {store["roundTrips"]}',
+                      '# HELP riot_scheduler_store_errors_total Shared store failures (admitted on local limits).',
+                      '# TYPE riot_scheduler_store_errors_total counter',
+                      f'riot_scheduler_store_errors_total{{backend="{store["backend"]}"}} {store["errors"]}']
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide scheduler shared by all RiotAPIClient instances
+riot_scheduler = RiotRequestScheduler()
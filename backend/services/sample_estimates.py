@@ -0,0 +1,149 @@
+"""
+Approximate Analytics From a Sample
+===================================
+Slides computed from a stratified sample of a player's matches while the
+rest are still being fetched (LeagueDataFetcher.fetch_match_details_progressive).
+
+Averages and rates from an evenly spread sample are already unbiased; what
+changes is:
+- counts (games, hours, totals) are scaled to the whole history with
+  IntelligentSampler.extrapolate_stat (games per month only when there is
+  no windowed histogram; its counts are already exact),
+- headline numbers get 95% confidence intervals, which narrow to zero
+  as the sample approaches the full history (finite population correction),
+- the result is marked approximate, with the sampler's confidence label.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+
+from .analytics import RiftRewindAnalytics
+from .match_analyzer import IntelligentSampler, estimate_mean, estimate_ratio
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+def _round_interval(interval: Dict[str, Any], digits: int = 2, scale: float = 1.0) -> Dict[str, Any]:
+    return {
+        'estimate': round(interval['estimate'] * scale, digits),
+        'low': round(interval['low'] * scale, digits),
+        'high': round(interval['high'] * scale, digits),
+        'margin': round(interval['margin'] * scale, digits),
+    }
+
+
+def _player_rows(engine: RiftRewindAnalytics) -> List[tuple]:
+    rows = []
+    for match in engine.matches:
+        stats = engine._get_participant_stats(match)
+        if stats:
+            rows.append((match, stats))
+    return rows
+
+
+def sample_intervals(engine: RiftRewindAnalytics, total_matches: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Confidence intervals for the headline per-game numbers.
+
+    Args:
+        engine: Analytics over the sampled matches
+        total_matches: Matches in the whole history
+
+    Returns:
+        Metric name -> {'estimate', 'low', 'high', 'margin'}
+    """
+    rows = _player_rows(engine)
+    if not rows:
+        return {}
+    minutes = [m.get('info', {}).get('gameDuration', 0) / 60 for m, _ in rows]
+    kills = [s.get('kills', 0) for _, s in rows]
+    deaths = [s.get('deaths', 0) for _, s in rows]
+    assists = [s.get('assists', 0) for _, s in rows]
+    cs = [s.get('totalMinionsKilled', 0) + s.get('neutralMinionsKilled', 0) for _, s in rows]
+
+    game_length = estimate_mean(minutes, total_matches)
+    intervals = {
+        'winRate': _round_interval(estimate_mean([1.0 if s.get('win') else 0.0 for _, s in rows], total_matches),
+                                   1, 100),
+        'kdaRatio': _round_interval(estimate_ratio([k + a for k, a in zip(kills, assists)], deaths, total_matches)),
+        'avgKills': _round_interval(estimate_mean(kills, total_matches), 1),
+        'avgDeaths': _round_interval(estimate_mean(deaths, total_matches), 1),
+        'avgAssists': _round_interval(estimate_mean(assists, total_matches), 1),
+        'avgVisionScore': _round_interval(estimate_mean([s.get('visionScore', 0) for _, s in rows], total_matches), 1),
+        'csPerMin': _round_interval(estimate_ratio(cs, minutes, total_matches), 1),
+        'avgGameLength': _round_interval(game_length, 1),
+        # Total = games x mean length; the game count itself is exact
+        'totalHours': _round_interval(game_length, 1, total_matches / 60),
+    }
+    if sum(deaths) == 0:
+        intervals.pop('kdaRatio')
+    return intervals
+
+
+@traced('analytics.approximate')
+def approximate_analytics(raw_data: Dict[str, Any], total_matches: int,
+                          sampler: Optional[IntelligentSampler] = None, population=None) -> Dict[str, Any]:
+    """
+    All slides from the matches fetched so far, scaled to the full history.
+
+    Args:
+        raw_data: Fetcher data whose 'matches' are the sample fetched so far
+        total_matches: Matches in the whole history
+        sampler: Sampler used to draw the sample (its percentage is reset to
+            the fraction fetched so far)
+        population: Optional PopulationIndex for percentiles
+
+    Returns:
+        calculate_all() output plus 'approximate' (sample size, confidence
+        label, intervals) and metadata.isApproximate
+    """
+    sampler = sampler or IntelligentSampler()
+    engine = RiftRewindAnalytics(raw_data, population=population)
+    analytics = engine.calculate_all()
+    sample_size = len(engine.matches)
+    if not sample_size or sample_size >= total_matches:
+        return analytics
+
+    sampler.sample_percentage = sample_size / total_matches
+
+    time_spent = analytics.get('slide2_timeSpent', {})
+    time_spent['totalGames'] = total_matches
+    for key, digits in (('totalHours', 1), ('totalMinutes', 0)):
+        if key in time_spent:
+            time_spent[key] = round(sampler.extrapolate_stat(time_spent[key]), digits)
+
+    for slide, keys in (('slide5_kda', ('totalKills', 'totalDeaths', 'totalAssists')),
+                        ('slide7_visionScore', ('totalVisionScore', 'totalWardsPlaced', 'totalControlWards'))):
+        for key in keys:
+            if key in analytics.get(slide, {}):
+                analytics[slide][key] = round(sampler.extrapolate_stat(analytics[slide][key]))
+
+    progress = analytics.get('slide12_progress', {})
+    exact_months = raw_data.get('matchesByMonth')
+    if exact_months is None:
+        # Without the windowed histogram, months were counted from the sample
+        for month in progress.get('gamesByMonth', []):
+            month['games'] = round(sampler.extrapolate_stat(month['games']))
+    month_games = {}
+    for month in progress.get('monthly', []):
+        month['games'] = (exact_months.get(month['month'], 0) if exact_months is not None
+                          else round(sampler.extrapolate_stat(month['games'])))
+        month_games[month['month']] = month['games']
+    for window in progress.get('rolling', []):
+        window['games'] = sum(games for month, games in month_games.items()
+                              if window['fromMonth'] <= month <= window['month'])
+
+    for champion in analytics.get('slide3_favoriteChampions') or []:
+        champion['games'] = round(sampler.extrapolate_stat(champion['games']))
+        champion['wins'] = round(sampler.extrapolate_stat(champion['wins']))
+
+    analytics['approximate'] = {
+        'sampleSize': sample_size,
+        'totalMatches': total_matches,
+        'samplePercentage': round(sample_size / total_matches * 100, 1),
+        'confidence': sampler._calculate_confidence(sample_size),
+        'intervals': sample_intervals(engine, total_matches),
+    }
+    analytics['metadata'].update({'totalMatches': total_matches, 'isApproximate': True})
+    return analytics
@@ -17,6 +17,7 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from services.aws_clients import upload_to_s3, download_from_s3, check_s3_object_exists
+from services.tracing import traced
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -138,6 +139,7 @@ class SessionCacheManager:
             logger.error(f"Error retrieving cached session: {e}")
             return None
     
+    @traced('cache.save', level=logging.INFO)
     def save_session_to_cache(
         self, 
         game_name: str, 
@@ -9,7 +9,6 @@ For long-term user caching (7 days), see session_cache.py (SessionCacheManager)
 """
 
 import json
-import boto3
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import logging
@@ -27,6 +26,7 @@ class SessionManager:
     """
     
     def __init__(self):
+        import boto3  # Deferred so importing this module stays cheap on cold start
         self.s3_client = boto3.client('s3')
         self.bucket_name = 'rift-rewind-sessions'
         self.ttl_hours = 72 
@@ -0,0 +1,224 @@
+"""
+Slide Payloads
+==============
+Ready-to-serve get_slide responses, materialized by the processor: one
+small object per slide with its analytics section, humor text and AI
+headline already merged. get_slide then costs one GET of a few KB however
+large analytics.json grows (its aiContext alone outweighs most slides).
+
+A payload is rewritten whenever one of its inputs changes:
+- every slide once analytics.json is uploaded (no humor yet),
+- a slide when its humor is generated,
+- slides 10 and 11 when insights are merged into the analysis section.
+
+build_slide_payload() is also what get_slide runs when no payload exists
+yet (sections, previews), so both paths return the same body.
+
+SlideDeck versions every write and keeps the whole deck in one more object,
+sessions/<id>/slides/all.json, which GET /api/rewind/<id>/slides serves with
+one GET: its version is the ETag, and each payload carries the version it
+was last written at so a client can ask for what changed `since` the deck
+it holds while humor is still arriving.
+"""
+
+import concurrent.futures
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .aws_clients import download_from_s3, upload_to_s3
+from .json_codec import loads
+
+logger = logging.getLogger(__name__)
+
+SLIDE_COUNT = 15
+PAYLOAD_WRITE_WORKERS = 8
+
+# Slide number -> analytics key (1 and 15 combine several)
+SLIDE_KEYS = {
+    1: None,  # Player details - no analytics
+    2: 'slide2_timeSpent',
+    3: 'slide3_favoriteChampions',
+    4: 'slide4_bestMatch',
+    5: 'slide5_kda',
+    6: 'slide6_rankedJourney',
+    7: 'slide7_visionScore',
+    8: 'slide8_championPool',
+    9: 'slide9_duoPartner',
+    10: 'slide10_11_analysis',
+    11: 'slide10_11_analysis',
+    12: 'slide12_progress',
+    13: 'slide13_achievements',
+    14: 'slide14_percentile',
+    15: None  # Final recap - uses multiple analytics
+}
+
+
+def slide_payload_key(session_id: str, slide_number: int) -> str:
+    return f"sessions/{session_id}/slides/slide_{slide_number}.json"
+
+
+def slide_bundle_key(session_id: str) -> str:
+    return f"sessions/{session_id}/slides/all.json"
+
+
+def slide_data(analytics: Dict[str, Any], slide_number: int) -> Any:
+    """
+    The analytics a slide shows.
+
+    Args:
+        analytics: calculate_all() output (with playerInfo), sections or preview
+        slide_number: Slide number (1-15)
+
+    Returns:
+        Slide data (shares structure with analytics; copy before changing it)
+    """
+    if slide_number == 1:
+        # Player details from analytics (raw_data is deleted after processing)
+        player_info = analytics.get('playerInfo', {})
+        return {
+            'account': {
+                'gameName': player_info.get('gameName'),
+                'tagLine': player_info.get('tagLine')
+            },
+            'summoner': {
+                'summonerLevel': player_info.get('summonerLevel'),
+                'profileIconId': player_info.get('profileIconId'),
+                'profileIconUrl': player_info.get('profileIconUrl')
+            },
+            'ranked': analytics.get('slide6_rankedJourney', {})
+        }
+    if slide_number == 15:
+        # Final recap uses multiple analytics
+        return {
+            'timeSpent': analytics.get('slide2_timeSpent', {}),
+            'rankedJourney': analytics.get('slide6_rankedJourney', {}),
+            'favoriteChampions': analytics.get('slide3_favoriteChampions', [])
+        }
+    return analytics.get(SLIDE_KEYS.get(slide_number), {})
+
+
+def build_slide_payload(session_id: str, slide_number: int, analytics: Dict[str, Any],
+                        humor: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    The get_slide response body for one slide.
+
+    Args:
+        session_id: Session ID
+        slide_number: Slide number (1-15)
+        analytics: calculate_all() output (with playerInfo), sections or preview
+        humor: Stored humor for the slide ('humorText', optional 'headline')
+
+    Returns:
+        {'sessionId', 'slideNumber', 'data', 'humor'} (+ 'approximate' for previews)
+    """
+    data = slide_data(analytics, slide_number)
+    humor_text = None
+    if humor and slide_number > 1:  # Slides 2-15 have humor
+        humor_text = humor.get('humorText')
+        headline = humor.get('headline')
+        # Inject AI-generated headline into slide data if present
+        if headline and slide_number in (10, 11) and isinstance(data, dict):
+            data = dict(data)  # slides 10 and 11 share the analysis section
+            data['strengths' if slide_number == 10 else 'weaknesses'] = [headline]
+
+    body = {
+        'sessionId': session_id,
+        'slideNumber': slide_number,
+        'data': data,
+        'humor': humor_text
+    }
+    if analytics.get('approximate'):
+        body['approximate'] = analytics['approximate']
+    return body
+
+
+def _upload_payloads(session_id: str, payloads: Dict[int, Dict[str, Any]]) -> int:
+    # Concurrently when there are several
+    if len(payloads) == 1:
+        (slide_number, payload), = payloads.items()
+        return int(upload_to_s3(slide_payload_key(session_id, slide_number), payload))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=PAYLOAD_WRITE_WORKERS,
+                                               thread_name_prefix='slide-payloads') as pool:
+        written = pool.map(lambda item: upload_to_s3(slide_payload_key(session_id, item[0]), item[1]),
+                           payloads.items())
+        return sum(bool(ok) for ok in written)
+
+
+class SlideDeck:
+    """
+    The versioned payloads of one session, as the processor writes them.
+
+    Versions are millisecond timestamps forced to increase by at least one
+    per write, so they also keep increasing across a processor retry (a new
+    deck) and any version a client holds stays comparable.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.version = 0
+        self.complete = False
+        self.payloads: Dict[int, Dict[str, Any]] = {}
+
+    def _next_version(self) -> int:
+        self.version = max(self.version + 1, int(time.time() * 1000))
+        return self.version
+
+    def _bundle(self) -> Dict[str, Any]:
+        return {
+            'sessionId': self.session_id,
+            'version': self.version,
+            'complete': self.complete,
+            'slides': [self.payloads[n] for n in sorted(self.payloads)],
+        }
+
+    def write(self, analytics: Dict[str, Any], humor_by_slide: Optional[Dict[int, Dict[str, Any]]] = None,
+              slides: Optional[Iterable[int]] = None) -> int:
+        """
+        Materialize payloads at a new version, then the bundle.
+
+        Args:
+            analytics: Exact analytics (with playerInfo)
+            humor_by_slide: Slide number -> humor ('humorText', 'headline')
+            slides: Slide numbers to write (default: all)
+
+        Returns:
+            Payloads written
+        """
+        humor_by_slide = humor_by_slide or {}
+        slides = list(slides) if slides is not None else list(range(1, SLIDE_COUNT + 1))
+        version = self._next_version()
+        payloads = {}
+        for n in slides:
+            payload = payloads[n] = build_slide_payload(self.session_id, n, analytics, humor_by_slide.get(n))
+            payload['version'] = version
+        written = _upload_payloads(self.session_id, payloads)
+        self.payloads.update(payloads)
+        # After the slides: a reader never sees a bundle newer than its payloads
+        upload_to_s3(slide_bundle_key(self.session_id), self._bundle())
+        return written
+
+    def finish(self) -> bool:
+        """Mark the deck complete (no more humor or insights coming)."""
+        self.complete = True
+        self._next_version()
+        return upload_to_s3(slide_bundle_key(self.session_id), self._bundle())
+
+
+def load_slide_payload(session_id: str, slide_number: int) -> Optional[Dict[str, Any]]:
+    """Materialized payload of a slide, or None if not written (yet)."""
+    payload_str = download_from_s3(slide_payload_key(session_id, slide_number))
+    return loads(payload_str) if payload_str else None
+
+
+def load_slide_bundle(session_id: str) -> Optional[Dict[str, Any]]:
+    """SlideDeck bundle ({'sessionId', 'version', 'complete', 'slides'}), or None."""
+    bundle_str = download_from_s3(slide_bundle_key(session_id))
+    return loads(bundle_str) if bundle_str else None
+
+
+def slides_since(bundle: Dict[str, Any], since: Optional[int]) -> List[Dict[str, Any]]:
+    """Payloads of a bundle written after version `since` (all without one)."""
+    if since is None:
+        return bundle['slides']
+    return [payload for payload in bundle['slides'] if payload.get('version', 0) > since]
@@ -0,0 +1,350 @@
+"""
+Lightweight Tracing
+===================
+Nested timing spans for one unit of work (a start_rewind call, a processor
+invocation). Spans are:
+- logged as structured JSON lines when they finish
+- aggregated into a compact timing summary for status.json
+- optionally exported when the trace ends (TRACE_EXPORTER):
+    log   - structured log lines only (default)
+    otel  - OpenTelemetry SDK if installed, otherwise the file exporter
+    file  - OTLP-style JSON lines appended to TRACE_FILE
+    off   - no span logging or export
+
+Outside an active trace, span() and @traced are no-ops, so library code can
+be instrumented unconditionally.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORTER = os.getenv('TRACE_EXPORTER', 'log').lower()
+TRACE_FILE = os.getenv('TRACE_FILE', os.path.join(tempfile.gettempdir(), 'rift-rewind-traces.jsonl'))
+
+# Bound memory for whale sessions (thousands of Riot calls)
+MAX_SPANS_PER_TRACE = 20000
+
+_current_span = contextvars.ContextVar('rift_rewind_current_span', default=None)
+
+
+class Span:
+    """
+    A single timed operation within a trace.
+    """
+
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'attributes', 'start_ns', 'end_ns', 'status', 'level')
+
+    def __init__(self, trace: 'Trace', name: str, parent_id: Optional[str], level: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = 'ok'
+        self.level = level
+
+    def set(self, **attributes):
+        """Attach attributes to the span."""
+        self.attributes.update(attributes)
+
+    def rename(self, name: str):
+        """Refine the span name once more is known (e.g. the Riot endpoint)."""
+        self.name = name
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round(self.duration_ms, 3),
+            'status': self.status,
+            'attributes': self.attributes,
+        }
+
+
+class _NullSpan:
+    """Returned when no trace is active; swallows attributes."""
+
+    def set(self, **attributes):
+        pass
+
+    def rename(self, name: str):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """
+    All spans recorded for one unit of work.
+    """
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self.root = Span(self, name, None, logging.INFO, dict(attributes or {}))
+
+    def _record(self, span: Span):
+        with self._lock:
+            if len(self.spans) < MAX_SPANS_PER_TRACE:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Compact per-name aggregate of finished spans, in first-seen order.
+
+        Returns:
+            Dict with traceId, totalMs and {name: {count, totalMs, maxMs, errors}}
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = stages.get(span.name)
+            if entry is None:
+                entry = stages[span.name] = {'count': 0, 'totalMs': 0.0, 'maxMs': 0.0}
+            duration = span.duration_ms
+            entry['count'] += 1
+            entry['totalMs'] += duration
+            entry['maxMs'] = max(entry['maxMs'], duration)
+            if span.status != 'ok':
+                entry['errors'] = entry.get('errors', 0) + 1
+        for entry in stages.values():
+            entry['totalMs'] = round(entry['totalMs'], 1)
+            entry['maxMs'] = round(entry['maxMs'], 1)
+
+        summary = {
+            'traceId': self.trace_id,
+            'name': self.name,
+            'totalMs': round(self.root.duration_ms, 1),
+            'spans': stages,
+        }
+        if self.dropped:
+            summary['droppedSpans'] = self.dropped
+        return summary
+
+
+def current_span():
+    """
+    Get the active span, or a no-op span when not tracing.
+
+    Returns:
+        Span or NULL_SPAN
+    """
+    span = _current_span.get()
+    return span if span is not None else NULL_SPAN
+
+
+def current_trace() -> Optional[Trace]:
+    span = _current_span.get()
+    return span.trace if span is not None else None
+
+
+def timing_summary() -> Optional[Dict[str, Any]]:
+    """
+    Timing summary of the active trace, for embedding in status.json.
+
+    Returns:
+        Summary dict or None if not tracing
+    """
+    trace = current_trace()
+    return trace.summary() if trace else None
+
+
+def _log_span(span: Span):
+    if TRACE_EXPORTER == 'off' or not logger.isEnabledFor(span.level):
+        return
+    record = {
+        'event': 'span',
+        'trace': span.trace.trace_id,
+        'span': span.span_id,
+        'parent': span.parent_id,
+        'name': span.name,
+        'ms': round(span.duration_ms, 2),
+    }
+    if span.status != 'ok':
+        record['status'] = span.status
+    if span.attributes:
+        record['attrs'] = span.attributes
+    logger.log(span.level, json.dumps(record, default=str))
+
+
+@contextlib.contextmanager
+def start_trace(name: str, **attributes):
+    """
+    Start a new trace; nested span() calls attach to it.
+
+    Args:
+        name: Root span name (e.g. 'processor')
+        **attributes: Root attributes (session_id, ...)
+
+    Yields:
+        The Trace
+    """
+    trace = Trace(name, attributes)
+    token = _current_span.set(trace.root)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.root.status = 'error'
+        trace.root.set(error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        trace.root.end_ns = time.time_ns()
+        trace._record(trace.root)
+        _log_span(trace.root)
+        export_trace(trace)
+
+
+@contextlib.contextmanager
+def span(name: str, level: int = logging.INFO, **attributes):
+    """
+    Time a block as a child of the active span. No-op outside a trace.
+
+    Args:
+        name: Span name (e.g. 'riot.match_by_id', 's3.put')
+        level: Log level for the structured span line
+        **attributes: Span attributes
+
+    Yields:
+        The Span (or NULL_SPAN when not tracing)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield NULL_SPAN
+        return
+
+    child = Span(parent.trace, name, parent.span_id, level, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.status = 'error'
+        child.set(error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end_ns = time.time_ns()
+        parent.trace._record(child)
+        _log_span(child)
+
+
+def traced(name: Optional[str] = None, level: int = logging.DEBUG, root: bool = False):
+    """
+    Decorator form of span().
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        level: Log level for the structured span line
+        root: Start a new trace when none is active
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                if not root:
+                    return func(*args, **kwargs)
+                with start_trace(span_name):
+                    return func(*args, **kwargs)
+            with span(span_name, level):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def propagate(func):
+    """
+    Bind the caller's active span to func so spans opened in worker threads
+    (ThreadPoolExecutor) nest under it.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return func
+
+    @functools.wraps(func)
+    def runner(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+
+    return runner
+
+
+# ==================== EXPORT ====================
+
+def export_trace(trace: Trace):
+    """
+    Export a finished trace according to TRACE_EXPORTER. Never raises.
+    """
+    try:
+        if TRACE_EXPORTER == 'otel':
+            if not _export_otel(trace):
+                _export_file(trace)
+        elif TRACE_EXPORTER == 'file':
+            _export_file(trace)
+    except Exception as e:
+        logger.warning(f"Trace export failed: {e}")
+
+
+def _export_file(trace: Trace):
+    with trace._lock:
+        spans = list(trace.spans)
+    with open(TRACE_FILE, 'a') as f:
+        for s in spans:
+            f.write(json.dumps(s.to_dict(), default=str) + '\n')
+
+
+def _export_otel(trace: Trace) -> bool:
+    """Replay spans into the OpenTelemetry SDK. Returns False if it isn't installed."""
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        return False
+
+    tracer = otel_trace.get_tracer('rift-rewind')
+    with trace._lock:
+        spans = sorted(trace.spans, key=lambda s: s.start_ns)
+    otel_spans = {}
+    for s in spans:
+        parent = otel_spans.get(s.parent_id)
+        context = otel_trace.set_span_in_context(parent) if parent is not None else None
+        attributes = {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in s.attributes.items()}
+        otel_spans[s.span_id] = tracer.start_span(s.name, context=context, start_time=s.start_ns, attributes=attributes)
+    for s in spans:
+        if s.status != 'ok':
+            otel_spans[s.span_id].set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+        otel_spans[s.span_id].end(end_time=s.end_ns)
+    return True
@@ -0,0 +1,15 @@
+"""
+Local stand-ins for external services (Riot API) used for offline
+development and benchmarking. Nothing in here is packaged into the Lambdas.
+"""
+
+from .synthetic_history import SyntheticWorld, SyntheticPlayer
+from .riot_stub_server import RiotStub, StubConfig, run_server
+
+__all__ = [
+    'SyntheticWorld',
+    'SyntheticPlayer',
+    'RiotStub',
+    'StubConfig',
+    'run_server',
+]
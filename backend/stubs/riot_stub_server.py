@@ -0,0 +1,447 @@
+"""
+Riot API Stub Server
+====================
+Offline stand-in for the Account-V1, Summoner-V4, League-V4 and Match-V5
+endpoints in RIOT_API_ENDPOINTS, backed by a SyntheticWorld.
+
+Behaves like the real edge as far as the client can tell:
+- X-App-Rate-Limit / X-Method-Rate-Limit headers with live counts
+- 429 with Retry-After and X-Rate-Limit-Type when a window is exceeded
+- 401 without an X-Riot-Token, 404 for unknown accounts/matches
+- configurable latency, jitter and injected 500/503 faults
+
+The routing host (na1, americas, ...) is taken from the first path segment,
+so point the client at it with:
+
+    RIOT_API_PLATFORM_BASE=http://127.0.0.1:8089/{platform}
+    RIOT_API_REGIONAL_BASE=http://127.0.0.1:8089/{regional}
+
+Usage:
+    python -m stubs.riot_stub_server --port 8089 --player "Faker#KR1:na1:500"
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+from stubs.synthetic_history import SyntheticWorld, build_default_world
+
+logger = logging.getLogger(__name__)
+
+# Method name -> route pattern (matched against the path after the routing host)
+ROUTES = [
+    ('account_by_riot_id', re.compile(r'^/riot/account/v1/accounts/by-riot-id/(?P<gameName>[^/]+)/(?P<tagLine>[^/]+)$')),
+    ('summoner_by_puuid', re.compile(r'^/lol/summoner/v4/summoners/by-puuid/(?P<puuid>[^/]+)$')),
+    ('league_by_puuid', re.compile(r'^/lol/league/v4/entries/by-puuid/(?P<puuid>[^/]+)$')),
+    ('league_by_summoner', re.compile(r'^/lol/league/v4/entries/by-summoner/(?P<summonerId>[^/]+)$')),
+    ('league_entries', re.compile(r'^/lol/league/v4/entries/(?P<queue>[A-Z0-9_x]+)/(?P<tier>[A-Za-z]+)/(?P<division>I|II|III|IV)$')),
+    ('match_ids_by_puuid', re.compile(r'^/lol/match/v5/matches/by-puuid/(?P<puuid>[^/]+)/ids$')),
+    ('match_by_id', re.compile(r'^/lol/match/v5/matches/(?P<matchId>[A-Za-z0-9]+_\d+)$')),
+]
+
+# Development-key limits per routing host, as Riot hands them out
+DEFAULT_APP_RATE_LIMIT = '20:1,100:120'
+DEFAULT_METHOD_RATE_LIMITS = {
+    'account_by_riot_id': '1000:60',
+    'summoner_by_puuid': '1600:60',
+    'league_by_puuid': '100:60',
+    'league_by_summoner': '100:60',
+    'league_entries': '50:10',
+    'match_ids_by_puuid': '2000:10',
+    'match_by_id': '2000:10',
+}
+
+
+def _parse_limits(spec: str) -> List[Tuple[int, int]]:
+    """Parse a Riot limit header value ("20:1,100:120") into (count, seconds) pairs."""
+    limits = []
+    for part in spec.split(','):
+        part = part.strip()
+        if part:
+            count, seconds = part.split(':')
+            limits.append((int(count), int(seconds)))
+    return limits
+
+
+class StubConfig:
+    """
+    Knobs for the stub's rate limiting, latency and fault behaviour.
+    """
+
+    def __init__(self, app_rate_limit: str = DEFAULT_APP_RATE_LIMIT,
+                 method_rate_limits: Optional[Dict[str, str]] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 fault_rate: float = 0.0, slow_rate: float = 0.0, slow_ms: float = 2000.0,
+                 enforce_rate_limits: bool = True, require_token: bool = True,
+                 seed: int = 1337):
+        """
+        Args:
+            app_rate_limit: X-App-Rate-Limit value, e.g. "20:1,100:120"
+            method_rate_limits: Per-method X-Method-Rate-Limit overrides
+            latency_ms: Base latency added to every response
+            jitter_ms: Uniform +/- jitter on top of latency_ms
+            fault_rate: Fraction of requests answered with a 500/503
+            slow_rate: Fraction of requests delayed by slow_ms (exercise client timeouts)
+            slow_ms: Extra delay for slow requests
+            enforce_rate_limits: Return 429s when a window is exceeded
+            require_token: Return 401 when X-Riot-Token is missing
+            seed: Seed for jitter/fault draws
+        """
+        self.app_rate_limit = app_rate_limit
+        self.method_rate_limits = dict(DEFAULT_METHOD_RATE_LIMITS)
+        self.method_rate_limits.update(method_rate_limits or {})
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fault_rate = fault_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.enforce_rate_limits = enforce_rate_limits
+        self.require_token = require_token
+        self.seed = seed
+
+
+class _SlidingWindow:
+    """Request timestamps for one limit bucket, checked against several windows."""
+
+    def __init__(self, limits: List[Tuple[int, int]]):
+        self.limits = limits
+        self.longest = max(seconds for _, seconds in limits) if limits else 0
+        self.times = deque()
+
+    def counts(self, now: float) -> List[int]:
+        while self.times and now - self.times[0] >= self.longest:
+            self.times.popleft()
+        return [sum(1 for t in self.times if now - t < seconds) for _, seconds in self.limits]
+
+    def retry_after(self, now: float) -> Optional[int]:
+        """Seconds until a slot frees up, or None if a request is allowed now."""
+        wait = 0.0
+        for (count, seconds), used in zip(self.limits, self.counts(now)):
+            if used >= count:
+                in_window = [t for t in self.times if now - t < seconds]
+                wait = max(wait, in_window[used - count] + seconds - now)
+        return max(1, int(wait + 0.999)) if wait > 0 else None
+
+    def header(self, now: float) -> str:
+        return ','.join(f"{used}:{seconds}" for (_, seconds), used in zip(self.limits, self.counts(now)))
+
+
+class RiotStub:
+    """
+    Request handler logic, independent of the HTTP transport so it can also be
+    called in-process.
+    """
+
+    def __init__(self, world: Optional[SyntheticWorld] = None, config: Optional[StubConfig] = None):
+        self.world = world or build_default_world()
+        self.config = config or StubConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[str, ...], _SlidingWindow] = {}
+        # Serialized match payloads; building one costs more than serving it
+        self._payload_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._payload_cache_size = 2000
+        self.stats = {'requests': 0, 'rate_limited': 0, 'faults': 0, 'by_method': {}}
+
+    def handle(self, method: str, path: str, query: Optional[Dict[str, List[str]]] = None,
+               headers: Optional[Dict[str, str]] = None, sleep: bool = True) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Serve one request.
+
+        Args:
+            method: HTTP method
+            path: Request path including the routing host segment (e.g. /na1/lol/...)
+            query: Parsed query string (parse_qs format)
+            headers: Request headers
+            sleep: Apply configured latency with time.sleep (False returns immediately)
+
+        Returns:
+            Tuple of (status code, response headers, body bytes)
+        """
+        query = query or {}
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = path.split('/', 2)
+        if len(parts) < 3 or not parts[1]:
+            return self._error(404, 'Not found')
+        host, route_path = parts[1].lower(), '/' + parts[2]
+
+        if method.upper() != 'GET':
+            return self._error(405, 'Method not allowed')
+        if self.config.require_token and not headers.get('x-riot-token'):
+            return self._error(401, 'Unauthorized')
+
+        route = None
+        for name, pattern in ROUTES:
+            match = pattern.match(route_path)
+            if match:
+                route = (name, match.groupdict())
+                break
+        if route is None:
+            return self._error(404, 'Not found')
+        name, params = route
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_method'][name] = self.stats['by_method'].get(name, 0) + 1
+            limited, rl_headers = self._check_rate_limit(host, headers.get('x-riot-token', ''), name)
+            if limited:
+                self.stats['rate_limited'] += 1
+                return 429, rl_headers, json.dumps({'status': {'message': 'Rate limit exceeded', 'status_code': 429}}).encode('utf-8')
+            fault_draw = self._rng.random()
+            slow_draw = self._rng.random()
+            jitter = self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+
+        delay_ms = max(0.0, self.config.latency_ms + jitter)
+        if slow_draw < self.config.slow_rate:
+            delay_ms += self.config.slow_ms
+        if sleep and delay_ms:
+            time.sleep(delay_ms / 1000.0)
+
+        if fault_draw < self.config.fault_rate:
+            with self._lock:
+                self.stats['faults'] += 1
+            status = 503 if fault_draw < self.config.fault_rate / 2 else 500
+            status, _, body = self._error(status, 'Service unavailable' if status == 503 else 'Internal server error')
+            return status, rl_headers, body
+
+        status, body = self._dispatch(name, host, params, query)
+        return status, rl_headers, body
+
+    # ==================== RATE LIMITING ====================
+
+    def _window(self, key: Tuple[str, ...], spec: str) -> _SlidingWindow:
+        window = self._windows.get(key)
+        if window is None:
+            window = _SlidingWindow(_parse_limits(spec))
+            self._windows[key] = window
+        return window
+
+    def _check_rate_limit(self, host: str, token: str, method_name: str) -> Tuple[bool, Dict[str, str]]:
+        now = time.monotonic()
+        app = self._window(('app', host, token), self.config.app_rate_limit)
+        method = self._window(('method', host, token, method_name), self.config.method_rate_limits[method_name])
+
+        if self.config.enforce_rate_limits:
+            for limit_type, window in (('application', app), ('method', method)):
+                retry_after = window.retry_after(now)
+                if retry_after is not None:
+                    return True, {
+                        'Content-Type': 'application/json;charset=utf-8',
+                        'Retry-After': str(retry_after),
+                        'X-Rate-Limit-Type': limit_type,
+                        'X-App-Rate-Limit': self.config.app_rate_limit,
+                        'X-App-Rate-Limit-Count': app.header(now),
+                        'X-Method-Rate-Limit': self.config.method_rate_limits[method_name],
+                        'X-Method-Rate-Limit-Count': method.header(now),
+                    }
+
+        app.times.append(now)
+        method.times.append(now)
+        return False, {
+            'Content-Type': 'application/json;charset=utf-8',
+            'X-App-Rate-Limit': self.config.app_rate_limit,
+            'X-App-Rate-Limit-Count': app.header(now),
+            'X-Method-Rate-Limit': self.config.method_rate_limits[method_name],
+            'X-Method-Rate-Limit-Count': method.header(now),
+        }
+
+    # ==================== ENDPOINTS ====================
+
+    def _dispatch(self, name: str, host: str, params: Dict[str, str],
+                  query: Dict[str, List[str]]) -> Tuple[int, bytes]:
+        world = self.world
+
+        if name == 'account_by_riot_id':
+            player = world.find_account(urllib.parse.unquote(params['gameName']),
+                                        urllib.parse.unquote(params['tagLine']))
+            if player is None:
+                return self._not_found('Data not found - No results found for player with riot id')
+            return 200, self._json(world.account_payload(player))
+
+        if name == 'summoner_by_puuid':
+            player = world.get_player(params['puuid'])
+            if player is None or player.platform != host:
+                return self._not_found('Data not found - summoner not found')
+            return 200, self._json(world.summoner_payload(player))
+
+        if name == 'league_by_puuid':
+            player = world.get_player(params['puuid'])
+            if player is None or player.platform != host:
+                return 200, b'[]'
+            return 200, self._json(world.league_entries(player))
+
+        if name == 'league_by_summoner':
+            player = next((p for p in world.players.values() if p.summoner_id == params['summonerId']), None)
+            if player is None or player.platform != host:
+                return self._not_found('Data not found - summoner not found')
+            return 200, self._json(world.league_entries(player))
+
+        if name == 'league_entries':
+            page = self._int_param(query, 'page', 1)
+            return 200, self._json(world.ladder_page(host, params['queue'], params['tier'], params['division'], page))
+
+        if name == 'match_ids_by_puuid':
+            ids = world.match_ids(
+                params['puuid'],
+                start=self._int_param(query, 'start', 0),
+                count=self._int_param(query, 'count', 20),
+                queue=self._int_param(query, 'queue', None),
+                start_time=self._int_param(query, 'startTime', None),
+                end_time=self._int_param(query, 'endTime', None),
+            )
+            return 200, self._json(ids or [])
+
+        if name == 'match_by_id':
+            body = self._match_bytes(params['matchId'])
+            if body is None:
+                return self._not_found('Data not found - match file not found')
+            return 200, body
+
+        return self._not_found('Not found')
+
+    def _match_bytes(self, match_id: str) -> Optional[bytes]:
+        with self._lock:
+            cached = self._payload_cache.get(match_id)
+            if cached is not None:
+                self._payload_cache.move_to_end(match_id)
+                return cached
+        payload = self.world.match_payload(match_id)
+        if payload is None:
+            return None
+        body = self._json(payload)
+        with self._lock:
+            self._payload_cache[match_id] = body
+            if len(self._payload_cache) > self._payload_cache_size:
+                self._payload_cache.popitem(last=False)
+        return body
+
+    @staticmethod
+    def _int_param(query: Dict[str, List[str]], key: str, default: Optional[int]) -> Optional[int]:
+        values = query.get(key)
+        if not values:
+            return default
+        try:
+            return int(values[0])
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _json(data: Any) -> bytes:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    def _not_found(self, message: str) -> Tuple[int, bytes]:
+        return 404, self._json({'status': {'message': message, 'status_code': 404}})
+
+    def _error(self, status: int, message: str) -> Tuple[int, Dict[str, str], bytes]:
+        body = self._json({'status': {'message': message, 'status_code': status}})
+        return status, {'Content-Type': 'application/json;charset=utf-8'}, body
+
+
+def _make_handler(stub: RiotStub):
+    class StubRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parsed = urllib.parse.urlsplit(self.path)
+            status, headers, body = stub.handle('GET', parsed.path, urllib.parse.parse_qs(parsed.query),
+                                                dict(self.headers.items()))
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("stub: " + format % args)
+
+    return StubRequestHandler
+
+
+def run_server(stub: RiotStub, host: str = '127.0.0.1', port: int = 8089,
+               background: bool = False) -> ThreadingHTTPServer:
+    """
+    Serve a RiotStub over HTTP.
+
+    Args:
+        stub: Stub to serve
+        host: Bind address
+        port: Bind port (0 picks a free one)
+        background: Serve from a daemon thread and return immediately
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((host, port), _make_handler(stub))
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Riot API stub server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--seed', type=int, default=1337)
+    parser.add_argument('--player', action='append', default=[],
+                        help='Riot ID with optional platform and match count: "Name#TAG[:platform][:matches]"')
+    parser.add_argument('--app-rate-limit', default=DEFAULT_APP_RATE_LIMIT)
+    parser.add_argument('--no-rate-limit', action='store_true', help='Report limits but never return 429')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--fault-rate', type=float, default=0.0)
+    parser.add_argument('--slow-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.player:
+        world = SyntheticWorld(seed=args.seed)
+        for spec in args.player:
+            riot_id, *rest = spec.split(':')
+            game_name, tag_line = riot_id.split('#', 1)
+            platform = rest[0] if rest and not rest[0].isdigit() else 'na1'
+            matches = int(rest[-1]) if rest and rest[-1].isdigit() else 100
+            world.add_player(game_name, tag_line, platform, match_count=matches)
+    else:
+        world = build_default_world(args.seed)
+
+    config = StubConfig(
+        app_rate_limit=args.app_rate_limit,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fault_rate=args.fault_rate,
+        slow_rate=args.slow_rate,
+        enforce_rate_limits=not args.no_rate_limit,
+        seed=args.seed,
+    )
+    stub = RiotStub(world, config)
+
+    print(f"Riot API stub listening on http://{args.host}:{args.port}")
+    print("Point the backend at it with:")
+    print(f"  export RIOT_API_PLATFORM_BASE=http://{args.host}:{args.port}/{{platform}}")
+    print(f"  export RIOT_API_REGIONAL_BASE=http://{args.host}:{args.port}/{{regional}}")
+    print("  export RIOT_API_KEY=stub-key")
+    print("Players:")
+    for player in world.players.values():
+        print(f"  {player.riot_id:<24} {player.platform:<5} {len(player.history):>5} matches  {player.tier} {player.division}")
+
+    run_server(stub, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
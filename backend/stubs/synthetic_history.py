@@ -0,0 +1,743 @@
+"""
+Synthetic Match History Generator
+=================================
+Deterministic, realistic-looking Riot API data for the local stub server.
+
+A SyntheticWorld holds a set of players, each with a season of ranked
+matches (10-5000). Only a compact spec is kept per match; full Match-V5
+payloads (~60KB, 10 participants, challenges, perks, teams) are built on
+demand. Everything derives from the world seed, so two runs with the same
+seed serve identical responses.
+"""
+
+import bisect
+import hashlib
+import math
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+from services.constants import PLATFORM_TO_REGIONAL, SEASON_14_START_TIMESTAMP
+
+
+# (championId, championName as Match-V5 spells it, primary position)
+CHAMPIONS = [
+    (1, 'Annie', 'MIDDLE'), (2, 'Olaf', 'TOP'), (3, 'Galio', 'MIDDLE'),
+    (4, 'TwistedFate', 'MIDDLE'), (5, 'XinZhao', 'JUNGLE'), (7, 'Leblanc', 'MIDDLE'),
+    (8, 'Vladimir', 'MIDDLE'), (10, 'Kayle', 'TOP'), (11, 'MasterYi', 'JUNGLE'),
+    (12, 'Alistar', 'UTILITY'), (13, 'Ryze', 'MIDDLE'), (14, 'Sion', 'TOP'),
+    (15, 'Sivir', 'BOTTOM'), (16, 'Soraka', 'UTILITY'), (17, 'Teemo', 'TOP'),
+    (18, 'Tristana', 'BOTTOM'), (19, 'Warwick', 'JUNGLE'), (21, 'MissFortune', 'BOTTOM'),
+    (22, 'Ashe', 'BOTTOM'), (24, 'Jax', 'TOP'), (25, 'Morgana', 'UTILITY'),
+    (28, 'Evelynn', 'JUNGLE'), (31, 'Chogath', 'TOP'), (32, 'Amumu', 'JUNGLE'),
+    (36, 'DrMundo', 'TOP'), (37, 'Sona', 'UTILITY'), (39, 'Irelia', 'TOP'),
+    (40, 'Janna', 'UTILITY'), (51, 'Caitlyn', 'BOTTOM'), (53, 'Blitzcrank', 'UTILITY'),
+    (54, 'Malphite', 'TOP'), (55, 'Katarina', 'MIDDLE'), (59, 'JarvanIV', 'JUNGLE'),
+    (62, 'MonkeyKing', 'JUNGLE'), (64, 'LeeSin', 'JUNGLE'), (67, 'Vayne', 'BOTTOM'),
+    (76, 'Nidalee', 'JUNGLE'), (81, 'Ezreal', 'BOTTOM'), (84, 'Akali', 'MIDDLE'),
+    (86, 'Garen', 'TOP'), (89, 'Leona', 'UTILITY'), (92, 'Riven', 'TOP'),
+    (99, 'Lux', 'UTILITY'), (103, 'Ahri', 'MIDDLE'), (104, 'Graves', 'JUNGLE'),
+    (105, 'Fizz', 'MIDDLE'), (111, 'Nautilus', 'UTILITY'), (113, 'Sejuani', 'JUNGLE'),
+    (117, 'Lulu', 'UTILITY'), (121, 'Khazix', 'JUNGLE'), (122, 'Darius', 'TOP'),
+    (134, 'Syndra', 'MIDDLE'), (145, 'Kaisa', 'BOTTOM'), (157, 'Yasuo', 'MIDDLE'),
+    (161, 'Velkoz', 'UTILITY'), (200, 'Belveth', 'JUNGLE'), (202, 'Jhin', 'BOTTOM'),
+    (222, 'Jinx', 'BOTTOM'), (234, 'Viego', 'JUNGLE'), (236, 'Lucian', 'BOTTOM'),
+    (238, 'Zed', 'MIDDLE'), (245, 'Ekko', 'JUNGLE'), (266, 'Aatrox', 'TOP'),
+    (267, 'Nami', 'UTILITY'), (412, 'Thresh', 'UTILITY'), (421, 'RekSai', 'JUNGLE'),
+    (497, 'Rakan', 'UTILITY'), (517, 'Sylas', 'MIDDLE'), (555, 'Pyke', 'UTILITY'),
+    (777, 'Yone', 'MIDDLE'), (875, 'Sett', 'TOP'), (887, 'Gwen', 'TOP'),
+    (897, 'KSante', 'TOP'), (901, 'Smolder', 'BOTTOM'), (910, 'Hwei', 'MIDDLE'),
+]
+
+POSITIONS = ['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY']
+
+# Ranked queues fetched by LeagueDataFetcher, with their share of a typical history
+QUEUE_MIX = [(420, 0.75), (440, 0.22), (700, 0.03)]
+
+TIERS = ['IRON', 'BRONZE', 'SILVER', 'GOLD', 'PLATINUM', 'EMERALD', 'DIAMOND',
+         'MASTER', 'GRANDMASTER', 'CHALLENGER']
+TIER_WEIGHTS = [5, 18, 22, 22, 17, 8, 5, 1.5, 1, 0.5]
+DIVISIONS = ['IV', 'III', 'II', 'I']
+APEX_TIERS = ('MASTER', 'GRANDMASTER', 'CHALLENGER')
+
+LADDER_PAGE_SIZE = 205  # League-V4 entries endpoint page size
+
+# Bulk of a real participant block - mostly small integers
+CHALLENGE_KEYS = [
+    '12AssistStreakCount', 'abilityUses', 'acesBefore15Minutes', 'alliedJungleMonsterKills',
+    'baronTakedowns', 'blastConeOppositeOpponentCount', 'bountyGold', 'buffsStolen',
+    'completeSupportQuestInTime', 'controlWardsPlaced', 'damageTakenOnTeamPercentage',
+    'dancedWithRiftHerald', 'deathsByEnemyChamps', 'dodgeSkillShotsSmallWindow', 'doubleAces',
+    'dragonTakedowns', 'earlyLaningPhaseGoldExpAdvantage', 'effectiveHealAndShielding',
+    'elderDragonKillsWithOpposingSoul', 'elderDragonMultikills', 'enemyChampionImmobilizations',
+    'enemyJungleMonsterKills', 'epicMonsterKillsNearEnemyJungler',
+    'epicMonsterKillsWithin30SecondsOfSpawn', 'epicMonsterSteals', 'epicMonsterStolenWithoutSmite',
+    'firstTurretKilled', 'flawlessAces', 'fullTeamTakedown', 'getTakedownsInAllLanesEarlyJungleAsLaner',
+    'hadOpenNexus', 'immobilizeAndKillWithAlly', 'initialBuffCount', 'initialCrabCount',
+    'jungleCsBefore10Minutes', 'junglerTakedownsNearDamagedEpicMonster',
+    'kTurretsDestroyedBeforePlatesFall', 'killAfterHiddenWithAlly', 'killedChampTookFullTeamDamageSurvived',
+    'killingSprees', 'killsNearEnemyTurret', 'killsOnOtherLanesEarlyJungleAsLaner',
+    'killsOnRecentlyHealedByAramPack', 'killsUnderOwnTurret', 'killsWithHelpFromEpicMonster',
+    'knockEnemyIntoTeamAndKill', 'landSkillShotsEarlyGame', 'laneMinionsFirst10Minutes',
+    'laningPhaseGoldExpAdvantage', 'legendaryCount', 'lostAnInhibitor', 'maxCsAdvantageOnLaneOpponent',
+    'maxKillDeficit', 'maxLevelLeadLaneOpponent', 'mejaisFullStackInTime', 'moreEnemyJungleThanOpponent',
+    'multiKillOneSpell', 'multiTurretRiftHeraldCount', 'multikills', 'multikillsAfterAggressiveFlash',
+    'outerTurretExecutesBefore10Minutes', 'outnumberedKills', 'outnumberedNexusKill',
+    'perfectDragonSoulsTaken', 'perfectGame', 'pickKillWithAlly', 'poroExplosions', 'quickCleanse',
+    'quickFirstTurret', 'quickSoloKills', 'riftHeraldTakedowns', 'saveAllyFromDeath', 'scuttleCrabKills',
+    'skillshotsDodged', 'skillshotsHit', 'snowballsHit', 'soloBaronKills', 'soloKills',
+    'stealthWardsPlaced', 'survivedSingleDigitHpCount', 'survivedThreeImmobilizesInFight',
+    'takedownOnFirstTurret', 'takedowns', 'takedownsAfterGainingLevelAdvantage',
+    'takedownsBeforeJungleMinionSpawn', 'takedownsFirstXMinutes', 'takedownsInAlcove',
+    'takedownsInEnemyFountain', 'teamBaronKills', 'teamElderDragonKills', 'teamRiftHeraldKills',
+    'tookLargeDamageSurvived', 'turretPlatesTaken', 'turretTakedowns', 'turretsTakenWithRiftHerald',
+    'twentyMinionsIn3SecondsCount', 'twoWardsOneSweeperCount', 'unseenRecalls',
+    'visionScoreAdvantageLaneOpponent', 'voidMonsterKill', 'wardTakedowns', 'wardTakedownsBefore20M',
+    'wardsGuarded',
+]
+
+PING_KEYS = [
+    'allInPings', 'assistMePings', 'basicPings', 'commandPings', 'dangerPings', 'enemyMissingPings',
+    'enemyVisionPings', 'getBackPings', 'holdPings', 'needVisionPings', 'onMyWayPings',
+    'pushPings', 'retreatPings', 'visionClearedPings',
+]
+
+ITEM_POOL = [1001, 1055, 1056, 2003, 2055, 3006, 3020, 3031, 3036, 3047, 3071, 3074, 3078, 3089,
+             3094, 3111, 3135, 3153, 3157, 3158, 3165, 3190, 3340, 3363, 3364, 4645, 6333, 6653,
+             6655, 6672, 6691, 6692]
+
+
+def _stable_id(*parts: Any, length: int = 78) -> str:
+    """Deterministic opaque id shaped like a Riot PUUID / encrypted id."""
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+    out = []
+    counter = 0
+    seed = ':'.join(str(p) for p in parts)
+    while len(out) < length:
+        digest = hashlib.sha256(f"{seed}:{counter}".encode('utf-8')).digest()
+        out.extend(alphabet[b % 64] for b in digest)
+        counter += 1
+    return ''.join(out[:length])
+
+
+class SyntheticPlayer:
+    """
+    A player known to the synthetic world (has an account, rank and history).
+    """
+
+    def __init__(self, game_name: str, tag_line: str, platform: str, seed: int,
+                 tier: Optional[str] = None, division: Optional[str] = None):
+        self.game_name = game_name
+        self.tag_line = tag_line
+        self.platform = platform
+        self.puuid = _stable_id('puuid', seed, game_name.lower(), tag_line.lower(), platform)
+        self.summoner_id = _stable_id('summoner', seed, self.puuid, length=47)
+
+        rng = random.Random(f"{seed}:profile:{self.puuid}")
+        self.profile_icon_id = rng.randint(1, 6000)
+        self.summoner_level = rng.randint(30, 900)
+
+        self.tier = tier or rng.choices(TIERS, weights=TIER_WEIGHTS)[0]
+        self.division = 'I' if self.tier in APEX_TIERS else (division or rng.choice(DIVISIONS))
+        self.league_points = rng.randint(0, 99) if self.tier not in APEX_TIERS else rng.randint(0, 1500)
+
+        # Skill profile drives per-game stat draws
+        tier_index = TIERS.index(self.tier)
+        self.win_probability = min(0.62, max(0.40, 0.47 + tier_index * 0.008 + rng.uniform(-0.03, 0.03)))
+        self.kill_mean = rng.uniform(3.5, 8.5)
+        self.death_mean = rng.uniform(3.5, 7.5)
+        self.assist_mean = rng.uniform(5.0, 11.0)
+        self.vision_per_min = rng.uniform(0.4, 2.2)
+        self.cs_per_min = rng.uniform(4.5, 8.5)
+
+        self.position = rng.choice(POSITIONS)
+        role_champs = [c for c in CHAMPIONS if c[2] == self.position]
+        pool_size = rng.randint(3, 12)
+        pool = rng.sample(role_champs, min(pool_size, len(role_champs)))
+        if pool_size > len(pool):
+            others = [c for c in CHAMPIONS if c not in pool]
+            pool += rng.sample(others, pool_size - len(pool))
+        # Zipf-like preference: a main, a couple of secondaries, a long tail
+        self.champion_pool = pool
+        self.champion_weights = [1.0 / (i + 1) ** 1.2 for i in range(len(pool))]
+
+        # Recurring teammates outside the world (duo partners, premade friends)
+        self.regulars = [
+            {
+                'puuid': _stable_id('regular', seed, self.puuid, i),
+                'riotIdGameName': f"{game_name[:6]}Pal{i + 1}",
+                'riotIdTagline': tag_line,
+                'rate': rate,
+            }
+            for i, rate in enumerate([0.30, 0.12, 0.06])
+        ]
+
+        # Newest first, like the Match-V5 ids endpoint
+        self.history: List[Tuple[int, str, int]] = []  # (gameCreation ms, matchId, queueId)
+
+    @property
+    def riot_id(self) -> str:
+        return f"{self.game_name}#{self.tag_line}"
+
+    def pick_champion(self, rng: random.Random) -> Tuple[int, str, str]:
+        return rng.choices(self.champion_pool, weights=self.champion_weights)[0]
+
+
+class SyntheticWorld:
+    """
+    Deterministic universe of players, matches and ladders served by the stub.
+    """
+
+    def __init__(self, seed: int = 1337, season_start: int = SEASON_14_START_TIMESTAMP,
+                 season_days: int = 300, ladder_size: int = 1200):
+        """
+        Args:
+            seed: Master seed; every generated value derives from it
+            season_start: Unix timestamp (s) of the first generated game
+            season_days: Length of the window games are spread across
+            ladder_size: Entries per tier/division ladder (League-V4 entries endpoint)
+        """
+        self.seed = seed
+        self.season_start = season_start
+        self.season_end = season_start + season_days * 86400
+        self.ladder_size = ladder_size
+        self.players: Dict[str, SyntheticPlayer] = {}      # puuid -> player
+        self._by_riot_id: Dict[str, SyntheticPlayer] = {}  # "name#tag" lower -> player
+        self.matches: Dict[str, Dict[str, Any]] = {}       # matchId -> compact spec
+        self._used_game_ids = set()
+
+    # ==================== WORLD BUILDING ====================
+
+    def add_player(self, game_name: str, tag_line: str, platform: str = 'na1',
+                   match_count: int = 100, tier: Optional[str] = None,
+                   division: Optional[str] = None) -> SyntheticPlayer:
+        """
+        Add a player with a generated ranked history.
+
+        Args:
+            game_name: Riot ID game name
+            tag_line: Riot ID tag line
+            platform: Platform code (e.g. 'na1')
+            match_count: Number of ranked games in the season (10-5000)
+            tier: Optional fixed tier, otherwise drawn from the population
+            division: Optional fixed division
+
+        Returns:
+            The created player
+        """
+        if platform not in PLATFORM_TO_REGIONAL:
+            raise ValueError(f"Unknown platform: {platform}")
+        match_count = max(0, min(int(match_count), 5000))
+
+        player = SyntheticPlayer(game_name, tag_line, platform, self.seed, tier, division)
+        self.players[player.puuid] = player
+        self._by_riot_id[player.riot_id.lower()] = player
+
+        rng = random.Random(f"{self.seed}:history:{player.puuid}")
+        for creation_ms in self._draw_creation_times(rng, match_count):
+            queue_id = self._draw_queue(rng)
+            team_id = rng.choice((100, 200))
+            won = rng.random() < player.win_probability
+            winner = team_id if won else (300 - team_id)
+            self._register_match(player.platform, creation_ms, queue_id, winner,
+                                 {player.puuid: (team_id, player.position)}, rng)
+        return player
+
+    def add_group(self, members: List[SyntheticPlayer], shared_matches: int) -> List[str]:
+        """
+        Add premade games where every member is on the same team.
+        Shared games are appended on top of each member's solo history.
+
+        Args:
+            members: Players (2-5, same platform) who queue together
+            shared_matches: Number of games they played together
+
+        Returns:
+            Match IDs of the shared games
+        """
+        if not 2 <= len(members) <= 5:
+            raise ValueError("A group must have 2-5 members")
+        platform = members[0].platform
+        if any(m.platform != platform for m in members):
+            raise ValueError("Group members must share a platform")
+
+        key = ':'.join(sorted(m.puuid for m in members))
+        rng = random.Random(f"{self.seed}:group:{key}")
+        # Members keep their main role when free, otherwise take what's left
+        positions = {}
+        free = list(POSITIONS)
+        for member in members:
+            pos = member.position if member.position in free else free[0]
+            free.remove(pos)
+            positions[member.puuid] = pos
+
+        avg_wp = sum(m.win_probability for m in members) / len(members)
+        match_ids = []
+        for creation_ms in self._draw_creation_times(rng, shared_matches):
+            queue_id = 440 if len(members) > 2 else self._draw_queue(rng)
+            team_id = rng.choice((100, 200))
+            winner = team_id if rng.random() < avg_wp else (300 - team_id)
+            slots = {m.puuid: (team_id, positions[m.puuid]) for m in members}
+            match_ids.append(self._register_match(platform, creation_ms, queue_id, winner, slots, rng))
+        return match_ids
+
+    def _draw_creation_times(self, rng: random.Random, count: int) -> List[int]:
+        span = self.season_end - self.season_start
+        # Sessions cluster on evenings/weekends; a beta gives realistic bunching
+        times = sorted(int((self.season_start + rng.betavariate(1.3, 1.1) * span) * 1000) for _ in range(count))
+        return times
+
+    def _draw_queue(self, rng: random.Random) -> int:
+        return rng.choices([q for q, _ in QUEUE_MIX], weights=[w for _, w in QUEUE_MIX])[0]
+
+    def _register_match(self, platform: str, creation_ms: int, queue_id: int, winner: int,
+                        slots: Dict[str, Tuple[int, str]], rng: random.Random) -> str:
+        # Game ids are sequential and grow with time, but are NOT timestamps
+        game_id = 5_100_000_000 + (creation_ms // 1000 - self.season_start) * 3
+        while game_id in self._used_game_ids:
+            game_id += 1
+        self._used_game_ids.add(game_id)
+        match_id = f"{platform.upper()}_{game_id}"
+
+        duration = int(min(3000, max(900, rng.gauss(1800, 360))))
+        self.matches[match_id] = {
+            'platform': platform,
+            'gameId': game_id,
+            'gameCreation': creation_ms,
+            'gameDuration': duration,
+            'queueId': queue_id,
+            'winner': winner,
+            'slots': slots,
+        }
+        for puuid in slots:
+            bisect.insort(self.players[puuid].history, (creation_ms, match_id, queue_id), key=lambda h: -h[0])
+        return match_id
+
+    # ==================== LOOKUPS ====================
+
+    def find_account(self, game_name: str, tag_line: str) -> Optional[SyntheticPlayer]:
+        return self._by_riot_id.get(f"{game_name}#{tag_line}".lower())
+
+    def get_player(self, puuid: str) -> Optional[SyntheticPlayer]:
+        return self.players.get(puuid)
+
+    def match_ids(self, puuid: str, start: int = 0, count: int = 20, queue: Optional[int] = None,
+                  start_time: Optional[int] = None, end_time: Optional[int] = None) -> Optional[List[str]]:
+        """Match-V5 ids-by-puuid semantics: newest first, filters applied before paging."""
+        player = self.players.get(puuid)
+        if player is None:
+            return None
+        ids = []
+        for creation_ms, match_id, queue_id in player.history:
+            if queue is not None and queue_id != queue:
+                continue
+            if start_time is not None and creation_ms < start_time * 1000:
+                continue
+            if end_time is not None and creation_ms > end_time * 1000:
+                continue
+            ids.append(match_id)
+        count = max(0, min(count, 100))
+        return ids[start:start + count]
+
+    def account_payload(self, player: SyntheticPlayer) -> Dict[str, Any]:
+        return {'puuid': player.puuid, 'gameName': player.game_name, 'tagLine': player.tag_line}
+
+    def summoner_payload(self, player: SyntheticPlayer) -> Dict[str, Any]:
+        return {
+            'id': player.summoner_id,
+            'accountId': _stable_id('account', self.seed, player.puuid, length=56),
+            'puuid': player.puuid,
+            'profileIconId': player.profile_icon_id,
+            'revisionDate': self.season_end * 1000,
+            'summonerLevel': player.summoner_level,
+        }
+
+    def league_entries(self, player: SyntheticPlayer) -> List[Dict[str, Any]]:
+        solo_games = sum(1 for h in player.history if h[2] == 420)
+        flex_games = sum(1 for h in player.history if h[2] == 440)
+        entries = []
+        for queue_type, games in (('RANKED_SOLO_5x5', solo_games), ('RANKED_FLEX_SR', flex_games)):
+            if games == 0:
+                continue
+            wins = int(round(games * player.win_probability))
+            entries.append({
+                'leagueId': _stable_id('league', self.seed, player.tier, player.division, queue_type, length=36),
+                'queueType': queue_type,
+                'tier': player.tier,
+                'rank': player.division,
+                'summonerId': player.summoner_id,
+                'puuid': player.puuid,
+                'leaguePoints': player.league_points,
+                'wins': wins,
+                'losses': games - wins,
+                'veteran': games > 500,
+                'inactive': False,
+                'freshBlood': games < 50,
+                'hotStreak': False,
+            })
+        return entries
+
+    def ladder_page(self, platform: str, queue: str, tier: str, division: str, page: int) -> List[Dict[str, Any]]:
+        """
+        League-V4 entries/{queue}/{tier}/{division} page (1-based, 205 entries a page).
+        Entries come back in no particular LP order, like the real endpoint.
+        """
+        tier = tier.upper()
+        if tier not in TIERS or division not in DIVISIONS or page < 1:
+            return []
+        rng = random.Random(f"{self.seed}:ladder:{platform}:{queue}:{tier}:{division}")
+        entries = []
+        for i in range(self.ladder_size):
+            wins = rng.randint(20, 400)
+            entries.append({
+                'leagueId': _stable_id('league', self.seed, tier, division, queue, length=36),
+                'queueType': queue,
+                'tier': tier,
+                'rank': division,
+                'puuid': _stable_id('ladder', self.seed, platform, queue, tier, division, i),
+                'leaguePoints': rng.randint(0, 99) if tier not in APEX_TIERS else rng.randint(0, 1500),
+                'wins': wins,
+                'losses': int(wins * rng.uniform(0.85, 1.15)),
+                'veteran': False, 'inactive': False, 'freshBlood': False, 'hotStreak': False,
+            })
+        for player in self.players.values():
+            if (player.platform == platform and player.tier == tier and player.division == division
+                    and queue == 'RANKED_SOLO_5x5'):
+                entries.extend(e for e in self.league_entries(player) if e['queueType'] == queue)
+        rng.shuffle(entries)
+        offset = (page - 1) * LADDER_PAGE_SIZE
+        return entries[offset:offset + LADDER_PAGE_SIZE]
+
+    # ==================== MATCH-V5 PAYLOAD ====================
+
+    def match_payload(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Build the full Match-V5 payload for a match id.
+
+        Args:
+            match_id: Match ID (e.g. 'NA1_5100123456')
+
+        Returns:
+            Match-V5 JSON-compatible dict or None if unknown
+        """
+        spec = self.matches.get(match_id)
+        if spec is None:
+            return None
+        rng = random.Random(f"{self.seed}:match:{match_id}")
+        duration = spec['gameDuration']
+        minutes = duration / 60
+
+        # Assign the 10 seats: known players first, then their regulars, then randoms
+        seats: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for puuid, (team_id, position) in spec['slots'].items():
+            seats[(team_id, position)] = {'player': self.players[puuid]}
+        for puuid, (team_id, _) in spec['slots'].items():
+            for regular in self.players[puuid].regulars:
+                if rng.random() < regular['rate']:
+                    free = [p for p in POSITIONS if (team_id, p) not in seats]
+                    if free:
+                        seats[(team_id, rng.choice(free))] = {'regular': regular}
+
+        used_champs = set()
+        participants = []
+        for team_id in (100, 200):
+            for position in POSITIONS:
+                seat = seats.get((team_id, position), {})
+                won = spec['winner'] == team_id
+                if 'player' in seat:
+                    player = seat['player']
+                    champ = player.pick_champion(rng)
+                    if champ[0] in used_champs:
+                        champ = self._filler_champion(rng, position, used_champs)
+                    identity = {
+                        'puuid': player.puuid,
+                        'riotIdGameName': player.game_name,
+                        'riotIdTagline': player.tag_line,
+                        'summonerId': player.summoner_id,
+                        'profileIcon': player.profile_icon_id,
+                        'summonerLevel': player.summoner_level,
+                    }
+                    profile = player
+                else:
+                    champ = self._filler_champion(rng, position, used_champs)
+                    if 'regular' in seat:
+                        regular = seat['regular']
+                        identity = {
+                            'puuid': regular['puuid'],
+                            'riotIdGameName': regular['riotIdGameName'],
+                            'riotIdTagline': regular['riotIdTagline'],
+                        }
+                    else:
+                        filler_id = _stable_id('filler', self.seed, match_id, team_id, position)
+                        identity = {
+                            'puuid': filler_id,
+                            'riotIdGameName': f"Summoner{int(hashlib.md5(filler_id.encode()).hexdigest()[:8], 16) % 100000}",
+                            'riotIdTagline': spec['platform'].upper().rstrip('0123456789') or 'NA',
+                        }
+                    identity.setdefault('summonerId', _stable_id('summoner', self.seed, identity['puuid'], length=47))
+                    identity.setdefault('profileIcon', rng.randint(1, 6000))
+                    identity.setdefault('summonerLevel', rng.randint(30, 700))
+                    profile = None
+                used_champs.add(champ[0])
+                participants.append(self._participant(rng, identity, champ, team_id, position,
+                                                      won, minutes, profile, len(participants) + 1))
+
+        self._fill_team_shares(participants)
+        creation = spec['gameCreation']
+        start_ts = creation + rng.randint(20000, 90000)
+        return {
+            'metadata': {
+                'dataVersion': '2',
+                'matchId': match_id,
+                'participants': [p['puuid'] for p in participants],
+            },
+            'info': {
+                'endOfGameResult': 'GameComplete',
+                'gameCreation': creation,
+                'gameDuration': duration,
+                'gameEndTimestamp': start_ts + duration * 1000,
+                'gameId': spec['gameId'],
+                'gameMode': 'CLASSIC',
+                'gameName': f"teambuilder-match-{spec['gameId']}",
+                'gameStartTimestamp': start_ts,
+                'gameType': 'MATCHED_GAME',
+                'gameVersion': f"15.{1 + (creation // 1000 - self.season_start) // (14 * 86400)}.{rng.randint(600, 700)}.1234",
+                'mapId': 11,
+                'participants': participants,
+                'platformId': spec['platform'].upper(),
+                'queueId': spec['queueId'],
+                'teams': [self._team(rng, team_id, spec['winner'] == team_id, participants) for team_id in (100, 200)],
+                'tournamentCode': '',
+            },
+        }
+
+    def _filler_champion(self, rng: random.Random, position: str, used: set) -> Tuple[int, str, str]:
+        options = [c for c in CHAMPIONS if c[2] == position and c[0] not in used]
+        if not options:
+            options = [c for c in CHAMPIONS if c[0] not in used]
+        return rng.choice(options)
+
+    def _participant(self, rng: random.Random, identity: Dict[str, Any], champ: Tuple[int, str, str],
+                     team_id: int, position: str, won: bool, minutes: float,
+                     profile: Optional[SyntheticPlayer], participant_id: int) -> Dict[str, Any]:
+        scale = minutes / 30.0
+        win_boost = 1.25 if won else 0.8
+        kill_mean = (profile.kill_mean if profile else 5.5) * scale * win_boost
+        death_mean = (profile.death_mean if profile else 5.5) * scale / win_boost
+        assist_mean = (profile.assist_mean if profile else 7.5) * scale * win_boost
+        vision_pm = profile.vision_per_min if profile else rng.uniform(0.5, 1.8)
+        cs_pm = profile.cs_per_min if profile else rng.uniform(4.0, 8.0)
+        if position == 'UTILITY':
+            cs_pm *= 0.2
+            vision_pm *= 1.8
+        elif position == 'JUNGLE':
+            cs_pm *= 0.8
+
+        kills = self._poisson(rng, kill_mean)
+        deaths = self._poisson(rng, death_mean)
+        assists = self._poisson(rng, assist_mean)
+        cs = int(cs_pm * minutes * rng.uniform(0.85, 1.15))
+        neutral = int(cs * (0.85 if position == 'JUNGLE' else 0.05))
+        minions = cs - neutral
+        gold = int(minutes * rng.uniform(330, 480) + kills * 300 + assists * 120)
+        dmg_champs = int(minutes * rng.uniform(450, 1100))
+        vision = int(vision_pm * minutes * rng.uniform(0.8, 1.2))
+        wards = int(vision * rng.uniform(0.35, 0.5))
+        control = int(rng.uniform(0, 0.15) * minutes) if position != 'UTILITY' else int(rng.uniform(0.1, 0.3) * minutes)
+        time_played = int(minutes * 60)
+        quadra = 1 if kills >= 12 and rng.random() < 0.15 else 0
+        penta = 1 if quadra and rng.random() < 0.2 else 0
+
+        p = {
+            'allInPings': 0,
+            'assists': assists,
+            'baronKills': 1 if rng.random() < 0.1 else 0,
+            'basicPings': 0,
+            'bountyLevel': 0,
+            'champExperience': int(minutes * rng.uniform(550, 700)),
+            'champLevel': min(18, int(6 + minutes / 2.5)),
+            'championId': champ[0],
+            'championName': champ[1],
+            'championTransform': 0,
+            'consumablesPurchased': rng.randint(1, 12),
+            'damageDealtToBuildings': int(rng.uniform(0, 9000) * scale),
+            'damageDealtToObjectives': int(rng.uniform(500, 25000) * scale),
+            'damageDealtToTurrets': int(rng.uniform(0, 8000) * scale),
+            'damageSelfMitigated': int(rng.uniform(3000, 40000) * scale),
+            'deaths': deaths,
+            'detectorWardsPlaced': control,
+            'doubleKills': kills // 5,
+            'dragonKills': 1 if rng.random() < 0.15 else 0,
+            'eligibleForProgression': True,
+            'firstBloodAssist': False,
+            'firstBloodKill': rng.random() < 0.1,
+            'firstTowerAssist': False,
+            'firstTowerKill': rng.random() < 0.1,
+            'gameEndedInEarlySurrender': False,
+            'gameEndedInSurrender': minutes < 28 and rng.random() < 0.5,
+            'goldEarned': gold,
+            'goldSpent': int(gold * rng.uniform(0.85, 1.0)),
+            'individualPosition': position,
+            'inhibitorKills': 1 if won and rng.random() < 0.3 else 0,
+            'inhibitorTakedowns': 1 if won and rng.random() < 0.5 else 0,
+            'inhibitorsLost': 0 if won else rng.randint(0, 2),
+            'killingSprees': kills // 3,
+            'kills': kills,
+            'lane': {'UTILITY': 'BOTTOM', 'MIDDLE': 'MIDDLE'}.get(position, position),
+            'largestCriticalStrike': rng.randint(0, 1200),
+            'largestKillingSpree': min(kills, rng.randint(0, 8)),
+            'largestMultiKill': 5 if penta else (4 if quadra else min(3, max(1, kills // 4))),
+            'longestTimeSpentLiving': int(time_played / (deaths + 1)),
+            'magicDamageDealt': int(rng.uniform(2000, 90000) * scale),
+            'magicDamageDealtToChampions': int(dmg_champs * rng.uniform(0, 0.8)),
+            'magicDamageTaken': int(rng.uniform(3000, 15000) * scale),
+            'neutralMinionsKilled': neutral,
+            'nexusKills': 1 if won and rng.random() < 0.2 else 0,
+            'nexusLost': 0 if won else 1,
+            'objectivesStolen': 0,
+            'participantId': participant_id,
+            'pentaKills': penta,
+            'physicalDamageDealt': int(rng.uniform(5000, 150000) * scale),
+            'physicalDamageDealtToChampions': int(dmg_champs * rng.uniform(0.2, 0.9)),
+            'physicalDamageTaken': int(rng.uniform(5000, 25000) * scale),
+            'placement': 0,
+            'profileIcon': identity['profileIcon'],
+            'puuid': identity['puuid'],
+            'quadraKills': quadra,
+            'riotIdGameName': identity['riotIdGameName'],
+            'riotIdTagline': identity['riotIdTagline'],
+            'role': {'UTILITY': 'SUPPORT', 'BOTTOM': 'CARRY', 'JUNGLE': 'NONE'}.get(position, 'SOLO'),
+            'sightWardsBoughtInGame': 0,
+            'spell1Casts': rng.randint(20, 250),
+            'spell2Casts': rng.randint(20, 200),
+            'spell3Casts': rng.randint(10, 150),
+            'spell4Casts': rng.randint(2, 30),
+            'summoner1Casts': rng.randint(2, 8),
+            'summoner1Id': 4,
+            'summoner2Casts': rng.randint(2, 8),
+            'summoner2Id': 11 if position == 'JUNGLE' else rng.choice((7, 12, 14, 3)),
+            'summonerId': identity['summonerId'],
+            'summonerLevel': identity['summonerLevel'],
+            'summonerName': '',
+            'teamEarlySurrendered': False,
+            'teamId': team_id,
+            'teamPosition': position,
+            'timeCCingOthers': rng.randint(0, 60),
+            'timePlayed': time_played,
+            'totalAllyJungleMinionsKilled': int(neutral * 0.8),
+            'totalDamageDealt': int(rng.uniform(60000, 250000) * scale),
+            'totalDamageDealtToChampions': dmg_champs,
+            'totalDamageShieldedOnTeammates': int(rng.uniform(0, 8000) * scale),
+            'totalDamageTaken': int(rng.uniform(12000, 45000) * scale),
+            'totalEnemyJungleMinionsKilled': int(neutral * 0.2),
+            'totalHeal': int(rng.uniform(1000, 20000) * scale),
+            'totalHealsOnTeammates': int(rng.uniform(0, 6000) * scale),
+            'totalMinionsKilled': minions,
+            'totalTimeCCDealt': rng.randint(50, 900),
+            'totalTimeSpentDead': deaths * rng.randint(15, 45),
+            'totalUnitsHealed': rng.randint(1, 5),
+            'tripleKills': kills // 8,
+            'trueDamageDealt': int(rng.uniform(1000, 20000) * scale),
+            'trueDamageDealtToChampions': int(dmg_champs * rng.uniform(0, 0.1)),
+            'trueDamageTaken': int(rng.uniform(200, 3000) * scale),
+            'turretKills': rng.randint(0, 3) if won else rng.randint(0, 1),
+            'turretTakedowns': rng.randint(0, 5) if won else rng.randint(0, 2),
+            'turretsLost': rng.randint(0, 5) if won else rng.randint(5, 11),
+            'unrealKills': 0,
+            'visionClearedPings': 0,
+            'visionScore': vision,
+            'visionWardsBoughtInGame': control,
+            'wardsKilled': int(vision * rng.uniform(0.05, 0.2)),
+            'wardsPlaced': wards,
+            'win': won,
+        }
+        for slot in range(7):
+            p[f'item{slot}'] = rng.choice(ITEM_POOL) if slot < 6 and rng.random() < 0.85 else (3340 if slot == 6 else 0)
+        for key in PING_KEYS:
+            p.setdefault(key, rng.randint(0, 12))
+        for i in range(1, 7):
+            p[f'playerAugment{i}'] = 0
+        p['missions'] = {f'playerScore{j}': 0 for j in range(12)}
+        p['perks'] = {
+            'statPerks': {'defense': 5001, 'flex': 5008, 'offense': 5005},
+            'styles': [
+                {'description': 'primaryStyle', 'style': 8000, 'selections': [
+                    {'perk': perk, 'var1': rng.randint(0, 3000), 'var2': rng.randint(0, 300), 'var3': 0}
+                    for perk in (8010, 9111, 9104, 8299)
+                ]},
+                {'description': 'subStyle', 'style': 8400, 'selections': [
+                    {'perk': perk, 'var1': rng.randint(0, 1500), 'var2': 0, 'var3': 0}
+                    for perk in (8444, 8242)
+                ]},
+            ],
+        }
+        challenges = {key: rng.randint(0, 6) for key in CHALLENGE_KEYS}
+        challenges.update({
+            'kda': round((kills + assists) / max(1, deaths), 6),
+            'goldPerMinute': round(gold / minutes, 6),
+            'damagePerMinute': round(dmg_champs / minutes, 6),
+            'visionScorePerMinute': round(vision / minutes, 6),
+            'gameLength': round(minutes * 60, 6),
+            'controlWardsPlaced': control,
+            'abilityUses': rng.randint(150, 700),
+            'skillshotsHit': rng.randint(0, 120),
+            'skillshotsDodged': rng.randint(0, 90),
+            'takedowns': kills + assists,
+        })
+        p['challenges'] = challenges
+        return p
+
+    def _fill_team_shares(self, participants: List[Dict[str, Any]]):
+        for team_id in (100, 200):
+            team = [p for p in participants if p['teamId'] == team_id]
+            team_kills = sum(p['kills'] for p in team) or 1
+            team_dmg = sum(p['totalDamageDealtToChampions'] for p in team) or 1
+            team_taken = sum(p['totalDamageTaken'] for p in team) or 1
+            for p in team:
+                p['challenges']['killParticipation'] = round(min(1.0, (p['kills'] + p['assists']) / team_kills), 6)
+                p['challenges']['teamDamagePercentage'] = round(p['totalDamageDealtToChampions'] / team_dmg, 6)
+                p['challenges']['damageTakenOnTeamPercentage'] = round(p['totalDamageTaken'] / team_taken, 6)
+
+    def _team(self, rng: random.Random, team_id: int, won: bool, participants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        team = [p for p in participants if p['teamId'] == team_id]
+        kills = sum(p['kills'] for p in team)
+        dragons = rng.randint(2, 5) if won else rng.randint(0, 2)
+        return {
+            'bans': [{'championId': rng.choice(CHAMPIONS)[0], 'pickTurn': i + (1 if team_id == 100 else 6)} for i in range(5)],
+            'objectives': {
+                'atakhan': {'first': False, 'kills': 0},
+                'baron': {'first': won and rng.random() < 0.6, 'kills': rng.randint(0, 2) if won else 0},
+                'champion': {'first': rng.random() < 0.5, 'kills': kills},
+                'dragon': {'first': won and rng.random() < 0.6, 'kills': dragons},
+                'horde': {'first': rng.random() < 0.5, 'kills': rng.randint(0, 6)},
+                'inhibitor': {'first': won, 'kills': rng.randint(1, 3) if won else rng.randint(0, 1)},
+                'riftHerald': {'first': rng.random() < 0.5, 'kills': rng.randint(0, 1)},
+                'tower': {'first': rng.random() < 0.5, 'kills': rng.randint(6, 11) if won else rng.randint(0, 5)},
+            },
+            'teamId': team_id,
+            'win': won,
+        }
+
+    @staticmethod
+    def _poisson(rng: random.Random, mean: float) -> int:
+        # Knuth's method; means here stay small (< 30)
+        limit = math.exp(-max(mean, 0.01))
+        k, prod = 0, rng.random()
+        while prod > limit:
+            k += 1
+            prod *= rng.random()
+        return k
+
+
+def build_default_world(seed: int = 1337) -> SyntheticWorld:
+    """
+    World used by the stub server when no players are configured:
+    a small, a median and a whale player on NA, plus a duo and a 5-stack.
+    """
+    world = SyntheticWorld(seed=seed)
+    world.add_player('SmallFry', 'NA1', 'na1', match_count=40)
+    world.add_player('MedianMain', 'NA1', 'na1', match_count=300)
+    world.add_player('WhaleWatcher', 'NA1', 'na1', match_count=3200)
+    stack = [world.add_player(f'Stack{i}', 'FIVE', 'na1', match_count=150) for i in range(1, 6)]
+    world.add_group(stack[:2], shared_matches=120)
+    world.add_group(stack, shared_matches=80)
+    return world
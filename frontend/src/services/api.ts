@@ -57,6 +57,13 @@ export interface SlideData {
   humor?: string;
 }
 
+export interface SlidesBundle {
+  sessionId: string;
+  version: number;
+  complete: boolean;
+  slides: (SlideData & { version?: number })[];
+}
+
 export interface HealthCheck {
   status: string;
   testMode: boolean;
@@ -193,6 +200,16 @@ class RiftRewindAPIService {
     );
   }
 
+  /**
+   * Get every slide in one request. The browser revalidates with the ETag
+   * (304 when unchanged); pass the version you hold as `since` to get only
+   * the slides written after it while humor is still arriving.
+   */
+  async getSlides(sessionId: string, since?: number): Promise<SlidesBundle> {
+    const query = since !== undefined ? `?since=${since}` : '';
+    return this.request<SlidesBundle>(`/api/rewind/${sessionId}/slides${query}`);
+  }
+
   /**
    * Poll for session completion
    * Returns when analytics are ready